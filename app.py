@@ -24,12 +24,18 @@ from dashboard.dashboard import DashboardManager
 from config.courses import COURSES_BY_CATEGORY, RESUME_VIDEOS, INTERVIEW_VIDEOS, get_courses_for_role, get_category_for_role
 from config.job_roles import JOB_ROLES
 from config.database import (
-    get_database_connection, save_resume_data, save_analysis_data,
-    init_database, verify_admin, log_admin_action, save_ai_analysis_data,
+    get_database_connection, init_database, verify_admin, log_admin_action,
     get_ai_analysis_stats, reset_ai_analysis_stats, get_detailed_ai_analysis_stats,
-    get_all_resume_data, get_admin_analytics
+    get_daily_resume_counts, get_admin_analytics, get_pool_stats, get_stats_cache_stats,
+    search_resumes, search_ai_analyses
 )
+from config.write_queue import get_write_queue, queue_resume_data, queue_ai_analysis_data, get_write_queue_stats
 from utils.ai_resume_analyzer import AIResumeAnalyzer
+from utils.analysis_parser import parse_analysis_sections
+from utils.rate_limiter import get_governor_metrics
+from utils.tiered_analysis import start_tiered_analysis
+from utils.report_cache import submit_report
+from utils.report_export import export_reports_zip
 from utils.resume_builder import ResumeBuilder
 from utils.resume_analyzer import ResumeAnalyzer
 from utils.portfolio_generator import PortfolioGenerator
@@ -103,6 +109,9 @@ class ResumeApp:
         # Initialize database and create default admin
         init_database()
 
+        # Start the write-behind queue, replaying writes left over from a crash
+        get_write_queue()
+
         # Initialize session state
         if 'user_id' not in st.session_state:
             st.session_state.user_id = 'default_user'
@@ -575,6 +584,7 @@ class ResumeApp:
         admin_tabs = st.tabs([
             "📊 Analytics Overview", 
             "👥 User Data", 
+            "🔍 Search",
             "📄 Resume Files", 
             "💬 Feedback & Ratings",
             "📈 Detailed Charts"
@@ -582,7 +592,6 @@ class ResumeApp:
         
         # Get admin analytics data
         analytics = get_admin_analytics()
-        all_resume_data = get_all_resume_data()
         
         with admin_tabs[0]:  # Analytics Overview
             st.subheader("📊 System Overview")
@@ -607,64 +616,43 @@ class ResumeApp:
         
         with admin_tabs[1]:  # User Data
             st.subheader("👥 All User Data")
+            self.dashboard_manager.render_resume_table(key="admin_user_data")
+        
+        with admin_tabs[2]:  # Search
+            st.subheader("🔍 Search Resumes & Analyses")
             
-            if all_resume_data:
-                # Convert to DataFrame
-                columns = [
-                    'ID', 'Name', 'Email', 'Phone', 'LinkedIn', 'GitHub', 'Portfolio',
-                    'Summary', 'Target Role', 'Target Category', 'Education', 'Experience',
-                    'Projects', 'Skills', 'Template', 'Created At', 'Score', 'ATS Score',
-                    'Predicted Role', 'Experience Level', 'Analysis Date', 'Model Used'
-                ]
-                
-                df = pd.DataFrame(all_resume_data, columns=columns)
-                
-                # Display data with filters
-                st.write(f"**Total Records:** {len(df)}")
-                
-                # Filters
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if 'Target Role' in df.columns and not df['Target Role'].isna().all():
-                        role_filter = st.selectbox("Filter by Role", 
-                                                 ['All'] + list(df['Target Role'].dropna().unique()))
-                    else:
-                        role_filter = 'All'
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                search_text = st.text_input(
+                    "Search by name, skill, role or phrase",
+                    placeholder='e.g. kubernetes terraform, "reduced costs"',
+                    key="admin_search_text"
+                )
+            with col2:
+                search_scope = st.radio("Search in", ["Resumes", "AI Analyses"], key="admin_search_scope")
+            
+            if search_text.strip():
+                start = time.perf_counter()
+                if search_scope == "Resumes":
+                    results = search_resumes(search_text, limit=50)
+                else:
+                    results = search_ai_analyses(search_text, limit=50)
+                search_ms = (time.perf_counter() - start) * 1000
                 
-                with col2:
-                    if 'Experience Level' in df.columns and not df['Experience Level'].isna().all():
-                        exp_filter = st.selectbox("Filter by Experience", 
-                                                ['All'] + list(df['Experience Level'].dropna().unique()))
+                st.caption(f"{len(results)} best matches in {search_ms:.0f} ms")
+                for result in results:
+                    if search_scope == "Resumes":
+                        title = f"**{result['name']}** · {result['target_role'] or 'No target role'} · {result['email']}"
                     else:
-                        exp_filter = 'All'
-                
-                with col3:
-                    score_filter = st.slider("Minimum Score", 0, 100, 0)
-                
-                # Apply filters
-                filtered_df = df.copy()
-                if role_filter != 'All':
-                    filtered_df = filtered_df[filtered_df['Target Role'] == role_filter]
-                if exp_filter != 'All':
-                    filtered_df = filtered_df[filtered_df['Experience Level'] == exp_filter]
-                if score_filter > 0:
-                    filtered_df = filtered_df[filtered_df['Score'] >= score_filter]
-                
-                # Display filtered data
-                st.dataframe(filtered_df, use_container_width=True)
-                
-                # Download CSV
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"resume_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            else:
-                st.info("No user data available yet.")
-        
-        with admin_tabs[2]:  # Resume Files
+                        title = (f"**{result['job_role'] or 'No job role'}** · score {result['resume_score']} · "
+                                 f"{result['model_used']} (resume #{result['resume_id']})")
+                    # Resume text is user-supplied, so no raw HTML here
+                    st.markdown(f"{title}  \n{result['snippet']}")
+                    st.caption(str(result['created_at']))
+                if not results:
+                    st.info("No matches. All words must appear; try fewer or shorter words.")
+        
+        with admin_tabs[3]:  # Resume Files
             st.subheader("📄 Uploaded Resume Files")
             
             # Create uploads directory if it doesn't exist
@@ -707,8 +695,53 @@ class ResumeApp:
             
             except Exception as e:
                 st.error(f"Error accessing uploads directory: {e}")
+            
+            # Bulk export of the AI analysis PDF reports
+            st.markdown("---")
+            st.subheader("📦 Bulk PDF Report Export")
+            today = datetime.now().date()
+            export_range = st.date_input(
+                "Analysis date range",
+                value=(today.replace(day=1), today),
+                max_value=today,
+                key="report_export_range"
+            )
+            if st.button("Export Reports as ZIP", key="report_export_button"):
+                if isinstance(export_range, (list, tuple)) and len(export_range) == 2:
+                    start_date, end_date = export_range
+                    os.makedirs("exports", exist_ok=True)
+                    zip_path = os.path.join("exports", f"reports_{start_date}_{end_date}.zip")
+                    export_progress = st.progress(0)
+                    export_status = st.empty()
+                    
+                    def show_export_progress(done, total):
+                        export_progress.progress(done / total if total else 1.0)
+                        export_status.write(f"{done}/{total} reports")
+                    
+                    try:
+                        summary = export_reports_zip(start_date, end_date, zip_path, on_progress=show_export_progress)
+                        st.session_state.report_export = summary
+                    except Exception as e:
+                        st.error(f"Error exporting reports: {e}")
+                else:
+                    st.warning("Please select a start and end date.")
+            
+            summary = st.session_state.get('report_export')
+            if summary and os.path.exists(summary['path']):
+                st.write(
+                    f"**{summary['reports']} reports** ({summary['rendered']} rendered, {summary['reused']} reused). "
+                    f"{summary['unavailable']} analyses have no saved report data and {summary['failed']} failed."
+                )
+                with open(summary['path'], "rb") as f:
+                    st.download_button(
+                        "⬇️ Download ZIP",
+                        f,
+                        file_name=os.path.basename(summary['path']),
+                        mime="application/zip",
+                        key="report_export_download"
+                    )
         
-        with admin_tabs[3]:  # Feedback & Ratings
+        with admin_tabs[4]:  # Feedback & Ratings
             st.subheader("💬 User Feedback & Ratings")
             
             # This would connect to feedback system
@@ -719,7 +752,7 @@ class ResumeApp:
             st.write("- Bug reports")
             st.write("- Improvement suggestions")
         
-        with admin_tabs[4]:  # Detailed Charts
+        with admin_tabs[5]:  # Detailed Charts
             st.subheader("📈 Detailed Analytics Charts")
             
             if analytics:
@@ -750,25 +783,15 @@ class ResumeApp:
                                      title="Resume Score Ranges")
                     st.plotly_chart(fig_score, use_container_width=True)
                 
-                # User Registration Timeline (if we have date data)
-                if all_resume_data:
+                # User Registration Timeline (from the daily submission rollup)
+                daily_submissions = get_daily_resume_counts()
+                if daily_submissions:
                     st.subheader("📅 User Registration Timeline")
-                    df = pd.DataFrame(all_resume_data, columns=[
-                        'ID', 'Name', 'Email', 'Phone', 'LinkedIn', 'GitHub', 'Portfolio',
-                        'Summary', 'Target Role', 'Target Category', 'Education', 'Experience',
-                        'Projects', 'Skills', 'Template', 'Created At', 'Score', 'ATS Score',
-                        'Predicted Role', 'Experience Level', 'Analysis Date', 'Model Used'
-                    ])
+                    daily_users = pd.DataFrame(daily_submissions, columns=['Date', 'Count'])
                     
-                    if 'Created At' in df.columns:
-                        df['Created At'] = pd.to_datetime(df['Created At'])
-                        df['Date'] = df['Created At'].dt.date
-                        
-                        daily_users = df.groupby('Date').size().reset_index(name='Count')
-                        
-                        fig_timeline = px.line(daily_users, x='Date', y='Count',
-                                             title="Daily User Registrations")
-                        st.plotly_chart(fig_timeline, use_container_width=True)
+                    fig_timeline = px.line(daily_users, x='Date', y='Count',
+                                         title="Daily User Registrations")
+                    st.plotly_chart(fig_timeline, use_container_width=True)
             else:
                 st.info("No analytics data available yet.")
 
@@ -1167,8 +1190,8 @@ class ResumeApp:
                     resume_buffer = self.builder.generate_resume(resume_data)
                     if resume_buffer:
                         try:
-                            # Save resume data to database
-                            save_resume_data(resume_data)
+                            # Queue resume data for saving to the database
+                            queue_resume_data(resume_data)
 
                             # Offer the resume for download
                             st.success("✅ Resume generated successfully!")
@@ -2138,6 +2161,487 @@ class ResumeApp:
             </div>
         """, unsafe_allow_html=True)
 
+    def render_tiered_summary(self, quick_result, analysis_result=None):
+        """Render the instant rule-based result, merged with the AI refinement once available"""
+        quick_result = quick_result or {}
+        keyword_match = quick_result.get('keyword_match', {})
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("ATS Score (rule-based)", f"{quick_result.get('ats_score', 0)}%")
+        with col2:
+            st.metric("Keyword Match", f"{int(keyword_match.get('score', 0))}%")
+        with col3:
+            if analysis_result:
+                st.metric("AI Resume Score", f"{analysis_result.get('resume_score', 0)}/100")
+            else:
+                st.metric("AI Resume Score", "Refining...")
+
+        if analysis_result:
+            strengths = analysis_result.get('strengths', [])
+            weaknesses = analysis_result.get('weaknesses', [])
+        else:
+            strengths = [f"Skill found: {skill}" for skill in keyword_match.get('found_skills', [])[:5]]
+            weaknesses = quick_result.get('suggestions', [])[:5]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**💪 Strengths**")
+            for item in strengths[:5] or ["No strengths identified yet"]:
+                st.markdown(f"- {item}")
+        with col2:
+            st.markdown("**🎯 Areas for Improvement**")
+            for item in weaknesses[:5] or ["No improvement areas identified yet"]:
+                st.markdown(f"- {item}")
+
+    def render_ai_analysis(self):
+        """Rule-based result of the latest AI analysis, merged with the model's once it answers"""
+        state = st.session_state.get('ai_job')
+        if not state:
+            return
+        job = state["job"]
+        if not job.done():
+            @st.fragment(run_every=1.0)
+            def poll_analysis():
+                # Only this fragment reruns while the model works, the page stays responsive
+                if job.done():
+                    st.rerun()
+                self.render_tiered_summary(job.quick_result)
+                # Show queue position if the provider is saturated
+                ai_model = state["ai_model"]
+                position = job.queue_position
+                st.info(f"⏳ {ai_model} is busy - you are #{position} in the queue..." if position
+                        else f"⏳ Waiting for {ai_model} rate limit..." if position == 0
+                        else f"🧠 {ai_model} is refining your analysis...")
+
+            poll_analysis()
+            return
+
+        ai_model = state["ai_model"]
+        job_role = state["job_role"]
+        selected_role = state["selected_role"]
+        selected_model = state["selected_model"]
+        custom_job_description = state["custom_job_description"]
+        try:
+            analysis_result = job.result()
+
+            # Replace the quick result with the merged view
+            if analysis_result and "error" not in analysis_result:
+                self.render_tiered_summary(job.quick_result, analysis_result)
+            else:
+                self.render_tiered_summary(job.quick_result)
+
+            # Saved once, not on every rerun
+            if not state["saved"]:
+                state["saved"] = True
+                # Save the analysis to the database
+                if analysis_result and "error" not in analysis_result:
+                    # Extract the resume score
+                    resume_score = analysis_result.get(
+                        "resume_score", 0)
+
+                    # Queue for saving to the database (a Future of the analysis id)
+                    analysis_id = queue_ai_analysis_data(
+                        None,  # No user_id needed
+                        {
+                            "model_used": ai_model,
+                            "resume_score": resume_score,
+                            "job_role": job_role,
+                            "analysis_text": analysis_result.get("analysis", "")
+                        }
+                    )
+
+                    # Start rendering the PDF report while the analysis is displayed
+                    used_custom_job_desc = st.session_state.get('used_custom_job_desc', False)
+                    content_hash, report_future = submit_report(
+                        analysis_id,
+                        {
+                            "score": resume_score,
+                            "ats_score": analysis_result.get("ats_score", 0),
+                            "model_used": analysis_result.get("model_used", selected_model),
+                            "full_response": analysis_result.get("analysis", ""),
+                            "strengths": analysis_result.get("strengths", []),
+                            "weaknesses": analysis_result.get("weaknesses", []),
+                            "used_custom_job_desc": used_custom_job_desc,
+                            "custom_job_description": custom_job_description if used_custom_job_desc else "",
+                            "generated_on": datetime.date.today().isoformat()
+                        },
+                        st.session_state.get('candidate_name', 'Candidate'),
+                        selected_role
+                    )
+                    # Kept across reruns, so the download button serves the rendered report
+                    st.session_state['ai_report'] = {
+                        "content_hash": content_hash,
+                        "future": report_future,
+                        "file_name": f"resume_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+                    }
+                # show snowflake effect
+                st.snow()
+
+            # Display the analysis result
+            if analysis_result and "error" not in analysis_result:
+                st.success("✅ Analysis complete!")
+
+                # Extract data from the analysis
+                full_response = analysis_result.get(
+                    "analysis", "")
+                resume_score = analysis_result.get(
+                    "resume_score", 0)
+                ats_score = analysis_result.get(
+                    "ats_score", 0)
+                ats_title = "ATS Optimization Score"
+                if not ats_score:
+                    # Display the rule-based score when the model gave none (never saved as the AI score)
+                    ats_score = analysis_result.get("rule_based", {}).get("ats_score", 0)
+                    ats_title = "ATS Optimization Score (rule-based)"
+                model_used = analysis_result.get(
+                    "model_used", selected_model)
+
+                # Store the full response in session state for download
+                st.session_state['full_analysis'] = full_response
+
+                # Display the analysis in a nice format
+                st.markdown("## Full Analysis Report")
+
+                # Get current date
+                current_date = datetime.datetime.now().strftime("%B %d, %Y")
+
+                # Create a modern styled header for the report
+                st.markdown(f"""
+                <div style="background-color: #262730; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
+                    <h2 style="color: #ffffff; margin-bottom: 10px;">AI Resume Analysis Report</h2>
+                    <div style="display: flex; flex-wrap: wrap; gap: 20px;">
+                        <div style="flex: 1; min-width: 200px;">
+                            <p style="color: #ffffff;"><strong>Job Role:</strong> {job_role if job_role else "Not specified"}</p>
+                            <p style="color: #ffffff;"><strong>Analysis Date:</strong> {current_date}</p>                                                                                                                                        </div>
+                        <div style="flex: 1; min-width: 200px;">
+                            <p style="color: #ffffff;"><strong>AI Model:</strong> {model_used}</p>
+                            <p style="color: #ffffff;"><strong>Overall Score:</strong> {resume_score}/100 - {"Excellent" if resume_score >= 80 else "Good" if resume_score >= 60 else "Needs Improvement"}</p>
+                            {f'<p style="color: #4CAF50;"><strong>✓ Custom Job Description Used</strong></p>' if st.session_state.get('used_custom_job_desc', False) else ''}
+                </div>
+                """, unsafe_allow_html=True)
+
+                # Add gauge charts for scores
+                import plotly.graph_objects as go
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    # Resume Score Gauge
+                    fig1 = go.Figure(go.Indicator(
+                        mode="gauge+number",
+                        value=resume_score,
+                        domain={'x': [0, 1], 'y': [0, 1]},
+                        title={'text': "Resume Score", 'font': {'size': 16}},
+                        gauge={
+                            'axis': {'range': [0, 100], 'tickwidth': 1},
+                            'bar': {'color': "#4CAF50" if resume_score >= 80 else "#FFA500" if resume_score >= 60 else "#FF4444"},
+                            'bgcolor': "white",
+                            'borderwidth': 2,
+                            'bordercolor': "gray",
+                            'steps': [
+                                {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
+                                {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
+                                {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
+                                {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
+                            ],
+                            'threshold': {
+                                'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75,
+                                'value': 60
+                            }
+                        }
+                    ))
+
+                    fig1.update_layout(
+                        height=250,
+                        margin=dict(l=20, r=20, t=50, b=20),
+                    )
+
+                    st.plotly_chart(fig1, use_container_width=True)
+
+                    status = "Excellent" if resume_score >= 80 else "Good" if resume_score >= 60 else "Needs Improvement"
+                    st.markdown(f"<div style='text-align: center; font-weight: bold;'>{status}</div>", unsafe_allow_html=True)
+
+                with col2:
+                    # ATS Score Gauge
+                    fig2 = go.Figure(go.Indicator(
+                        mode="gauge+number",
+                        value=ats_score,
+                        domain={'x': [0, 1], 'y': [0, 1]},
+                        title={'text': ats_title, 'font': {'size': 16}},
+                        gauge={
+                            'axis': {'range': [0, 100], 'tickwidth': 1},
+                            'bar': {'color': "#4CAF50" if ats_score >= 80 else "#FFA500" if ats_score >= 60 else "#FF4444"},
+                            'bgcolor': "white",
+                            'borderwidth': 2,
+                            'bordercolor': "gray",
+                            'steps': [
+                                {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
+                                {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
+                                {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
+                                {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
+                            ],
+                            'threshold': {
+                                'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75,
+                                'value': 60
+                            }
+                        }
+                    ))
+
+                    fig2.update_layout(
+                        height=250,
+                        margin=dict(l=20, r=20, t=50, b=20),
+                    )
+
+                    st.plotly_chart(fig2, use_container_width=True)
+
+                    status = "Excellent" if ats_score >= 80 else "Good" if ats_score >= 60 else "Needs Improvement"
+                    st.markdown(f"<div style='text-align: center; font-weight: bold;'>{status}</div>", unsafe_allow_html=True)
+
+                # Add Job Description Match Score if custom job description was used
+                if st.session_state.get('used_custom_job_desc', False) and custom_job_description:
+                    # Extract job match score from analysis result or calculate it
+                    job_match_score = analysis_result.get("job_match_score", 0)
+                    if not job_match_score and "job_match" in analysis_result:
+                        job_match_score = analysis_result["job_match"].get("score", 0)
+
+                    # If we have a job match score, display it
+                    if job_match_score:
+                        st.markdown("""
+                        <h3 style="background: linear-gradient(90deg, #4d7c0f, #84cc16); color: white; padding: 10px; border-radius: 5px; margin-top: 20px;">
+                            <i class="fas fa-handshake"></i> Job Description Match Analysis
+                        </h3>
+                        """, unsafe_allow_html=True)
+
+                        col1, col2 = st.columns(2)
+
+                        with col1:
+                            # Job Match Score Gauge
+                            fig3 = go.Figure(go.Indicator(
+                                mode="gauge+number",
+                                value=job_match_score,
+                                domain={'x': [0, 1], 'y': [0, 1]},
+                                title={'text': "Job Match Score", 'font': {'size': 16}},
+                                gauge={
+                                    'axis': {'range': [0, 100], 'tickwidth': 1},
+                                    'bar': {'color': "#4CAF50" if job_match_score >= 80 else "#FFA500" if job_match_score >= 60 else "#FF4444"},
+                                    'bgcolor': "white",
+                                    'borderwidth': 2,
+                                    'bordercolor': "gray",
+                                    'steps': [
+                                        {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
+                                        {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
+                                        {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
+                                        {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
+                                    ],
+                                    'threshold': {
+                                        'line': {'color': "red", 'width': 4},
+                                        'thickness': 0.75,
+                                        'value': 60
+                                    }
+                                }
+                            ))
+
+                            fig3.update_layout(
+                                height=250,
+                                margin=dict(l=20, r=20, t=50, b=20),
+                            )
+
+                            st.plotly_chart(fig3, use_container_width=True)
+
+                            match_status = "Excellent Match" if job_match_score >= 80 else "Good Match" if job_match_score >= 60 else "Low Match"
+                            st.markdown(f"<div style='text-align: center; font-weight: bold;'>{match_status}</div>", unsafe_allow_html=True)
+
+                        with col2:
+                            st.markdown("""
+                            <div style="background-color: #262730; padding: 20px; border-radius: 10px; height: 100%;">
+                                <h4 style="color: #ffffff; margin-bottom: 15px;">What This Means</h4>
+                                <p style="color: #ffffff;">This score represents how well your resume matches the specific job description you provided.</p>
+                                <ul style="color: #ffffff; padding-left: 20px;">
+                                    <li><strong>80-100:</strong> Excellent match - your resume is highly aligned with this job</li>
+                                    <li><strong>60-79:</strong> Good match - your resume matches many requirements</li>
+                                    <li><strong>Below 60:</strong> Consider tailoring your resume more specifically to this job</li>
+                                </ul>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+
+                # Format the full response with better styling
+                formatted_analysis = full_response
+
+                # Replace section headers with styled headers
+                section_styles = {
+                    "## Overall Assessment": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #1e3a8a, #3b82f6); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-chart-line"></i> Overall Assessment
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Professional Profile Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #047857, #10b981); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-user-tie"></i> Professional Profile Analysis
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Skills Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #4f46e5, #818cf8); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-tools"></i> Skills Analysis
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Experience Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #9f1239, #e11d48); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-briefcase"></i> Experience Analysis
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Education Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #854d0e, #eab308); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-graduation-cap"></i> Education Analysis
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Key Strengths": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #166534, #22c55e); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-check-circle"></i> Key Strengths
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Areas for Improvement": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #9f1239, #fb7185); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-exclamation-circle"></i> Areas for Improvement
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## ATS Optimization Assessment": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #0e7490, #06b6d4); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-robot"></i> ATS Optimization Assessment
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Recommended Courses": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #5b21b6, #8b5cf6); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-book"></i> Recommended Courses
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Resume Score": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #0369a1, #0ea5e9); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-star"></i> Resume Score
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Role Alignment Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #7c2d12, #ea580c); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-bullseye"></i> Role Alignment Analysis
+                        </h3>
+                        <div class="section-content">""",
+
+                    "## Job Match Analysis": """<div class="report-section">
+                        <h3 style="background: linear-gradient(90deg, #4d7c0f, #84cc16); color: white; padding: 10px; border-radius: 5px;">
+                            <i class="fas fa-handshake"></i> Job Match Analysis
+                        </h3>
+                        <div class="section-content">""",
+                }
+
+                # Apply the styling to each section from the parsed section map
+                parsed_sections = parse_analysis_sections(full_response)
+                formatted_parts = [parsed_sections.preamble] if parsed_sections.preamble else []
+                for section_title, section_name, section_body in parsed_sections.items():
+                    style = section_styles.get(f"## {section_name}")
+                    if style:
+                        formatted_parts.append(f"{style}\n{section_body}\n</div></div>")
+                    else:
+                        formatted_parts.append(f"## {section_title}\n{section_body}")
+                if formatted_parts:
+                    formatted_analysis = "\n\n".join(formatted_parts)
+
+                # Clean up any visible HTML tags that might appear in the text
+                formatted_analysis = formatted_analysis.replace("&lt;/div&gt;", "")
+                formatted_analysis = formatted_analysis.replace("&lt;div&gt;", "")
+                formatted_analysis = formatted_analysis.replace("<div>", "<div>")  # Ensure proper opening
+                formatted_analysis = formatted_analysis.replace("</div>", "</div>")  # Ensure proper closing
+
+                # Add CSS for the report
+                st.markdown("""
+                <style>
+                    .report-section {
+                        margin-bottom: 25px;
+                        border: 1px solid #4B4B4B;
+                        border-radius: 8px;
+                        overflow: hidden;
+                    }
+                    .section-content {
+                        padding: 15px;
+                        background-color: #262730;
+                        color: #ffffff;
+                    }
+                    .report-section h3 {
+                        margin-top: 0;
+                        font-weight: 600;
+                    }
+                    .report-section ul {
+                        padding-left: 20px;
+                    }
+                    .report-section p {
+                        color: #ffffff;
+                        margin-bottom: 10px;
+                    }
+                    .report-section li {
+                        color: #ffffff;
+                        margin-bottom: 5px;
+                    }
+                </style>
+                """, unsafe_allow_html=True)
+
+                # Display the formatted analysis
+                st.markdown(f"""
+                <div style="background-color: #262730; padding: 20px; border-radius: 10px; border: 1px solid #4B4B4B; color: #ffffff;">
+                    {formatted_analysis}
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.error(f"Analysis failed: {analysis_result.get('error', 'Unknown error')}")
+        except Exception as ai_error:
+            st.error(f"Error during AI analysis: {str(ai_error)}")
+            import traceback as tb
+            st.code(tb.format_exc())
+
+    def render_report_download(self):
+        """Download button for the latest analysis' PDF report, polling while it renders"""
+        report = st.session_state.get('ai_report')
+        if not report:
+            return
+        if report["future"].done():
+            self.render_report_button(report)
+            return
+
+        @st.fragment(run_every=1.0)
+        def poll_report():
+            # Only this fragment reruns, the analysis above stays on the page
+            if report["future"].done():
+                self.render_report_button(report)
+            else:
+                st.info("📄 Preparing your PDF report...")
+
+        poll_report()
+
+    def render_report_button(self, report):
+        pdf_bytes = report["future"].result()
+        if pdf_bytes:
+            st.download_button(
+                label="📊 Download PDF Report",
+                data=pdf_bytes,
+                file_name=report["file_name"],
+                mime="application/pdf",
+                use_container_width=True,
+                on_click=lambda: st.balloons()
+            )
+        else:
+            st.error("PDF generation failed. Please try again later.")
+
     def render_analyzer(self):
         """Render the resume analyzer page"""
         apply_modern_styles()
@@ -2290,13 +2794,9 @@ class ResumeApp:
                             'template': ''
                         }
 
-                        # Save to database
+                        # Queue the resume and its analysis for saving to the database
                         try:
-                            resume_id = save_resume_data(resume_data)
-
-                            # Save analysis data
                             analysis_data = {
-                                'resume_id': resume_id,
                                 'ats_score': analysis['ats_score'],
                                 'keyword_match_score': analysis['keyword_match']['score'],
                                 'format_score': analysis['format_score'],
@@ -2304,7 +2804,7 @@ class ResumeApp:
                                 'missing_skills': ','.join(analysis['keyword_match']['missing_skills']),
                                 'recommendations': ','.join(analysis['suggestions'])
                             }
-                            save_analysis_data(resume_id, analysis_data)
+                            queue_resume_data(resume_data, analysis_data)
                             st.success("Resume data saved successfully!")
                         except Exception as e:
                             st.error(f"Error saving to database: {str(e)}")
@@ -2594,7 +3094,8 @@ class ResumeApp:
                 "Kimi K2": "🎯 Moonshot AI's model - Focused and precise analysis",
                 "Qwen3 4B Thinking": "🤔 Alibaba's thinking model - Deep analytical reasoning",
                 "Qwen2.5 Coder 3B": "💻 Alibaba's coding model - Specialized for technical resumes",
-                "Hunyuan A13B": "🌟 Tencent's advanced model - Comprehensive professional analysis"
+                "Hunyuan A13B": "🌟 Tencent's advanced model - Comprehensive professional analysis",
+                "Local (Offline)": "🖥️ Offline backend - Runs on this machine without network access"
             }
             
             if ai_model in model_info:
@@ -2637,6 +3138,26 @@ class ResumeApp:
                             # Refresh the page to show updated stats
                             st.experimental_rerun()
 
+                        # Show LLM provider saturation for admins
+                        provider_metrics = get_governor_metrics()
+                        if provider_metrics:
+                            st.markdown("#### LLM Provider Load")
+                            st.dataframe(pd.DataFrame(provider_metrics), use_container_width=True, hide_index=True)
+
+                        # Show database connection pool usage for admins
+                        pool_stats = get_pool_stats()
+                        if pool_stats:
+                            st.markdown("#### Database Connection Pool")
+                            st.dataframe(pd.DataFrame(pool_stats), use_container_width=True, hide_index=True)
+
+                        # Show the write-behind queue backlog and batch sizes
+                        st.markdown("#### Write-Behind Queue")
+                        st.dataframe(pd.DataFrame([get_write_queue_stats()]), use_container_width=True, hide_index=True)
+
+                        # Show how often statistics are served from the shared cache
+                        st.markdown("#### Statistics Cache")
+                        st.dataframe(pd.DataFrame([get_stats_cache_stats()]), use_container_width=True, hide_index=True)
+
                     # Get detailed AI analysis statistics
                     from config.database import get_detailed_ai_analysis_stats
                     ai_stats = get_detailed_ai_analysis_stats()
@@ -3246,6 +3767,8 @@ class ResumeApp:
                                 key="analyze_ai_button")
 
                 if analyze_ai:
+                    st.session_state.pop('ai_report', None)
+                    st.session_state.pop('ai_job', None)
                     with st.spinner(f"Analyzing your resume with {ai_model}..."):
                         # Get file content
                         text = ""
@@ -3275,7 +3798,7 @@ class ResumeApp:
                                 progress_bar.progress(10)
                                 
                                 # Extract text from the resume
-                                analyzer = AIResumeAnalyzer()
+                                analyzer = self.ai_analyzer
                                 if uploaded_file.type == "application/pdf":
                                     resume_text = analyzer.extract_text_from_pdf(
                                         uploaded_file)
@@ -3295,430 +3818,34 @@ class ResumeApp:
                                 # Update progress
                                 progress_bar.progress(50)
                                 
-                                # Analyze the resume with selected AI model
-                                if use_custom_job_desc and custom_job_description:
-                                    # Use custom job description for analysis
-                                    if ai_model == "Google Gemini":
-                                        analysis_result = analyzer.analyze_resume_with_gemini(
-                                            resume_text, job_role=job_role, job_description=custom_job_description)
-                                    else:
-                                        # Use A4F models
-                                        a4f_model = analyzer.available_models[ai_model]
-                                        analysis_result = analyzer.analyze_resume_with_a4f(
-                                            resume_text, job_role=job_role, job_description=custom_job_description, model_name=a4f_model)
-                                    # Show that custom job description was used
-                                    st.session_state['used_custom_job_desc'] = True
-                                else:
-                                    # Use standard role-based analysis
-                                    if ai_model == "Google Gemini":
-                                        analysis_result = analyzer.analyze_resume_with_gemini(
-                                            resume_text, job_role=job_role)
-                                    else:
-                                        # Use A4F models
-                                        a4f_model = analyzer.available_models[ai_model]
-                                        analysis_result = analyzer.analyze_resume_with_a4f(
-                                            resume_text, job_role=job_role, model_name=a4f_model)
-                                    st.session_state['used_custom_job_desc'] = False
-
-                                
-                                # Update progress
-                                progress_bar.progress(80)
+                                # Rule-based analysis is instant; the AI model refines it in the background
+                                job_description = custom_job_description if use_custom_job_desc and custom_job_description else None
+                                st.session_state['used_custom_job_desc'] = bool(job_description)
+                                job = start_tiered_analysis(
+                                    self.analyzer, analyzer, resume_text, role_info, job_role, ai_model, job_description)
                                 
-                                # Save the analysis to the database
-                                if analysis_result and "error" not in analysis_result:
-                                    # Extract the resume score
-                                    resume_score = analysis_result.get(
-                                        "resume_score", 0)
-                                    
-                                    # Save to database
-                                    save_ai_analysis_data(
-                                        None,  # No user_id needed
-                                        {
-                                            "model_used": ai_model,
-                                            "resume_score": resume_score,
-                                            "job_role": job_role
-                                        }
-                                    )
-                                # show snowflake effect
-                                st.snow()
-
-                                # Complete the progress
-                                progress_bar.progress(100)
-                                
-                                # Display the analysis result
-                                if analysis_result and "error" not in analysis_result:
-                                    st.success("✅ Analysis complete!")
-                                    
-                                    # Extract data from the analysis
-                                    full_response = analysis_result.get(
-                                        "analysis", "")
-                                    resume_score = analysis_result.get(
-                                        "resume_score", 0)
-                                    ats_score = analysis_result.get(
-                                        "ats_score", 0)
-                                    model_used = analysis_result.get(
-                                        "model_used", selected_model)
-                                    
-                                    # Store the full response in session state for download
-                                    st.session_state['full_analysis'] = full_response
-                                    
-                                    # Display the analysis in a nice format
-                                    st.markdown("## Full Analysis Report")
-                                    
-                                    # Get current date
-                                    current_date = datetime.datetime.now().strftime("%B %d, %Y")
-                                    
-                                    # Create a modern styled header for the report
-                                    st.markdown(f"""
-                                    <div style="background-color: #262730; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
-                                        <h2 style="color: #ffffff; margin-bottom: 10px;">AI Resume Analysis Report</h2>
-                                        <div style="display: flex; flex-wrap: wrap; gap: 20px;">
-                                            <div style="flex: 1; min-width: 200px;">
-                                                <p style="color: #ffffff;"><strong>Job Role:</strong> {job_role if job_role else "Not specified"}</p>
-                                                <p style="color: #ffffff;"><strong>Analysis Date:</strong> {current_date}</p>                                                                                                                                        </div>
-                                            <div style="flex: 1; min-width: 200px;">
-                                                <p style="color: #ffffff;"><strong>AI Model:</strong> {model_used}</p>
-                                                <p style="color: #ffffff;"><strong>Overall Score:</strong> {resume_score}/100 - {"Excellent" if resume_score >= 80 else "Good" if resume_score >= 60 else "Needs Improvement"}</p>
-                                                {f'<p style="color: #4CAF50;"><strong>✓ Custom Job Description Used</strong></p>' if st.session_state.get('used_custom_job_desc', False) else ''}
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    
-                                    # Add gauge charts for scores
-                                    import plotly.graph_objects as go
-                                    
-                                    col1, col2 = st.columns(2)
-                                    
-                                    with col1:
-                                        # Resume Score Gauge
-                                        fig1 = go.Figure(go.Indicator(
-                                            mode="gauge+number",
-                                            value=resume_score,
-                                            domain={'x': [0, 1], 'y': [0, 1]},
-                                            title={'text': "Resume Score", 'font': {'size': 16}},
-                                            gauge={
-                                                'axis': {'range': [0, 100], 'tickwidth': 1},
-                                                'bar': {'color': "#4CAF50" if resume_score >= 80 else "#FFA500" if resume_score >= 60 else "#FF4444"},
-                                                'bgcolor': "white",
-                                                'borderwidth': 2,
-                                                'bordercolor': "gray",
-                                                'steps': [
-                                                    {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
-                                                    {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
-                                                    {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
-                                                    {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
-                                                ],
-                                                'threshold': {
-                                                    'line': {'color': "red", 'width': 4},
-                                                    'thickness': 0.75,
-                                                    'value': 60
-                                                }
-                                            }
-                                        ))
-                                        
-                                        fig1.update_layout(
-                                            height=250,
-                                            margin=dict(l=20, r=20, t=50, b=20),
-                                        )
-                                        
-                                        st.plotly_chart(fig1, use_container_width=True)
-                                        
-                                        status = "Excellent" if resume_score >= 80 else "Good" if resume_score >= 60 else "Needs Improvement"
-                                        st.markdown(f"<div style='text-align: center; font-weight: bold;'>{status}</div>", unsafe_allow_html=True)
-                                    
-                                    with col2:
-                                        # ATS Score Gauge
-                                        fig2 = go.Figure(go.Indicator(
-                                            mode="gauge+number",
-                                            value=ats_score,
-                                            domain={'x': [0, 1], 'y': [0, 1]},
-                                            title={'text': "ATS Optimization Score", 'font': {'size': 16}},
-                                            gauge={
-                                                'axis': {'range': [0, 100], 'tickwidth': 1},
-                                                'bar': {'color': "#4CAF50" if ats_score >= 80 else "#FFA500" if ats_score >= 60 else "#FF4444"},
-                                                'bgcolor': "white",
-                                                'borderwidth': 2,
-                                                'bordercolor': "gray",
-                                                'steps': [
-                                                    {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
-                                                    {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
-                                                    {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
-                                                    {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
-                                                ],
-                                                'threshold': {
-                                                    'line': {'color': "red", 'width': 4},
-                                                    'thickness': 0.75,
-                                                    'value': 60
-                                                }
-                                            }
-                                        ))
-                                        
-                                        fig2.update_layout(
-                                            height=250,
-                                            margin=dict(l=20, r=20, t=50, b=20),
-                                        )
-                                        
-                                        st.plotly_chart(fig2, use_container_width=True)
-                                        
-                                        status = "Excellent" if ats_score >= 80 else "Good" if ats_score >= 60 else "Needs Improvement"
-                                        st.markdown(f"<div style='text-align: center; font-weight: bold;'>{status}</div>", unsafe_allow_html=True)
-
-                                    # Add Job Description Match Score if custom job description was used
-                                    if st.session_state.get('used_custom_job_desc', False) and custom_job_description:
-                                        # Extract job match score from analysis result or calculate it
-                                        job_match_score = analysis_result.get("job_match_score", 0)
-                                        if not job_match_score and "job_match" in analysis_result:
-                                            job_match_score = analysis_result["job_match"].get("score", 0)
-                                        
-                                        # If we have a job match score, display it
-                                        if job_match_score:
-                                            st.markdown("""
-                                            <h3 style="background: linear-gradient(90deg, #4d7c0f, #84cc16); color: white; padding: 10px; border-radius: 5px; margin-top: 20px;">
-                                                <i class="fas fa-handshake"></i> Job Description Match Analysis
-                                            </h3>
-                                            """, unsafe_allow_html=True)
-                                            
-                                            col1, col2 = st.columns(2)
-                                            
-                                            with col1:
-                                                # Job Match Score Gauge
-                                                fig3 = go.Figure(go.Indicator(
-                                                    mode="gauge+number",
-                                                    value=job_match_score,
-                                                    domain={'x': [0, 1], 'y': [0, 1]},
-                                                    title={'text': "Job Match Score", 'font': {'size': 16}},
-                                                    gauge={
-                                                        'axis': {'range': [0, 100], 'tickwidth': 1},
-                                                        'bar': {'color': "#4CAF50" if job_match_score >= 80 else "#FFA500" if job_match_score >= 60 else "#FF4444"},
-                                                        'bgcolor': "white",
-                                                        'borderwidth': 2,
-                                                        'bordercolor': "gray",
-                                                        'steps': [
-                                                            {'range': [0, 40], 'color': 'rgba(255, 68, 68, 0.2)'},
-                                                            {'range': [40, 60], 'color': 'rgba(255, 165, 0, 0.2)'},
-                                                            {'range': [60, 80], 'color': 'rgba(255, 214, 0, 0.2)'},
-                                                            {'range': [80, 100], 'color': 'rgba(76, 175, 80, 0.2)'}
-                                                        ],
-                                                        'threshold': {
-                                                            'line': {'color': "red", 'width': 4},
-                                                            'thickness': 0.75,
-                                                            'value': 60
-                                                        }
-                                                    }
-                                                ))
-                                                
-                                                fig3.update_layout(
-                                                    height=250,
-                                                    margin=dict(l=20, r=20, t=50, b=20),
-                                                )
-                                                
-                                                st.plotly_chart(fig3, use_container_width=True)
-                                                
-                                                match_status = "Excellent Match" if job_match_score >= 80 else "Good Match" if job_match_score >= 60 else "Low Match"
-                                                st.markdown(f"<div style='text-align: center; font-weight: bold;'>{match_status}</div>", unsafe_allow_html=True)
-                                            
-                                            with col2:
-                                                st.markdown("""
-                                                <div style="background-color: #262730; padding: 20px; border-radius: 10px; height: 100%;">
-                                                    <h4 style="color: #ffffff; margin-bottom: 15px;">What This Means</h4>
-                                                    <p style="color: #ffffff;">This score represents how well your resume matches the specific job description you provided.</p>
-                                                    <ul style="color: #ffffff; padding-left: 20px;">
-                                                        <li><strong>80-100:</strong> Excellent match - your resume is highly aligned with this job</li>
-                                                        <li><strong>60-79:</strong> Good match - your resume matches many requirements</li>
-                                                        <li><strong>Below 60:</strong> Consider tailoring your resume more specifically to this job</li>
-                                                    </ul>
-                                                </div>
-                                                """, unsafe_allow_html=True)
-                                    
-
-                                    # Format the full response with better styling
-                                    formatted_analysis = full_response
-                                    
-                                    # Replace section headers with styled headers
-                                    section_styles = {
-                                        "## Overall Assessment": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #1e3a8a, #3b82f6); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-chart-line"></i> Overall Assessment
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Professional Profile Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #047857, #10b981); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-user-tie"></i> Professional Profile Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Skills Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #4f46e5, #818cf8); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-tools"></i> Skills Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Experience Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #9f1239, #e11d48); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-briefcase"></i> Experience Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Education Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #854d0e, #eab308); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-graduation-cap"></i> Education Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Key Strengths": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #166534, #22c55e); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-check-circle"></i> Key Strengths
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Areas for Improvement": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #9f1239, #fb7185); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-exclamation-circle"></i> Areas for Improvement
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## ATS Optimization Assessment": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #0e7490, #06b6d4); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-robot"></i> ATS Optimization Assessment
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Recommended Courses": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #5b21b6, #8b5cf6); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-book"></i> Recommended Courses
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Resume Score": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #0369a1, #0ea5e9); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-star"></i> Resume Score
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Role Alignment Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #7c2d12, #ea580c); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-bullseye"></i> Role Alignment Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                            
-                                        "## Job Match Analysis": """<div class="report-section">
-                                            <h3 style="background: linear-gradient(90deg, #4d7c0f, #84cc16); color: white; padding: 10px; border-radius: 5px;">
-                                                <i class="fas fa-handshake"></i> Job Match Analysis
-                                            </h3>
-                                            <div class="section-content">""",
-                                    }
-                                    
-                                    # Apply the styling to each section
-                                    for section, style in section_styles.items():
-                                        if section in formatted_analysis:
-                                            formatted_analysis = formatted_analysis.replace(
-                                                section, style)
-                                            # Add closing div tags
-                                            next_section = False
-                                            for next_sec in section_styles.keys():
-                                                if next_sec != section and next_sec in formatted_analysis.split(style)[1]:
-                                                    split_text = formatted_analysis.split(style)[1].split(next_sec)
-                                                    formatted_analysis = formatted_analysis.split(style)[0] + style + split_text[0] + "</div></div>" + next_sec + "".join(split_text[1:])
-                                                    next_section = True
-                                                    break
-                                            if not next_section:
-                                                formatted_analysis = formatted_analysis + "</div></div>"
-                                    
-                                    # Remove any extra closing div tags that might have been added
-                                    formatted_analysis = formatted_analysis.replace("</div></div></div></div>", "</div></div>")
-                                    
-                                    # Ensure we don't have any orphaned closing tags at the end
-                                    if formatted_analysis.endswith("</div>"):
-                                        # Count opening and closing div tags
-                                        open_tags = formatted_analysis.count("<div")
-                                        close_tags = formatted_analysis.count("</div>")
-                                        
-                                        # If we have more closing than opening tags, remove the extras
-                                        if close_tags > open_tags:
-                                            excess = close_tags - open_tags
-                                            formatted_analysis = formatted_analysis[:-6 * excess]
-                                    
-                                    # Clean up any visible HTML tags that might appear in the text
-                                    formatted_analysis = formatted_analysis.replace("&lt;/div&gt;", "")
-                                    formatted_analysis = formatted_analysis.replace("&lt;div&gt;", "")
-                                    formatted_analysis = formatted_analysis.replace("<div>", "<div>")  # Ensure proper opening
-                                    formatted_analysis = formatted_analysis.replace("</div>", "</div>")  # Ensure proper closing
-                                    
-                                    # Add CSS for the report
-                                    st.markdown("""
-                                    <style>
-                                        .report-section {
-                                            margin-bottom: 25px;
-                                            border: 1px solid #4B4B4B;
-                                            border-radius: 8px;
-                                            overflow: hidden;
-                                        }
-                                        .section-content {
-                                            padding: 15px;
-                                            background-color: #262730;
-                                            color: #ffffff;
-                                        }
-                                        .report-section h3 {
-                                            margin-top: 0;
-                                            font-weight: 600;
-                                        }
-                                        .report-section ul {
-                                            padding-left: 20px;
-                                        }
-                                        .report-section p {
-                                            color: #ffffff;
-                                            margin-bottom: 10px;
-                                        }
-                                        .report-section li {
-                                            color: #ffffff;
-                                            margin-bottom: 5px;
-                                        }
-                                    </style>
-                                    """, unsafe_allow_html=True)
-
-                                    # Display the formatted analysis
-                                    st.markdown(f"""
-                                    <div style="background-color: #262730; padding: 20px; border-radius: 10px; border: 1px solid #4B4B4B; color: #ffffff;">
-                                        {formatted_analysis}
-                                    </div>
-                                    """, unsafe_allow_html=True)
-
-                                    # Create a PDF report
-                                    pdf_buffer = self.ai_analyzer.generate_pdf_report(
-                                        analysis_result={
-                                            "score": resume_score,
-                                            "ats_score": ats_score,
-                                            "model_used": model_used,
-                                            "full_response": full_response,
-                                            "strengths": analysis_result.get("strengths", []),
-                                            "weaknesses": analysis_result.get("weaknesses", []),
-                                            "used_custom_job_desc": st.session_state.get('used_custom_job_desc', False),
-                                            "custom_job_description": custom_job_description if st.session_state.get('used_custom_job_desc', False) else ""
-                                        },
-                                        candidate_name=st.session_state.get(
-                                            'candidate_name', 'Candidate'),
-                                        job_role=selected_role
-                                    )
-
-                                    # PDF download button
-                                    if pdf_buffer:
-                                        st.download_button(
-                                            label="📊 Download PDF Report",
-                                            data=pdf_buffer,
-                                            file_name=f"resume_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                                            mime="application/pdf",
-                                            use_container_width=True,
-                                            on_click=lambda: st.balloons()
-                                        )
-                                    else:
-                                        st.error("PDF generation failed. Please try again later.")
-                                else:
-                                    st.error(f"Analysis failed: {analysis_result.get('error', 'Unknown error')}")
+                                # Kept across reruns; render_ai_analysis polls it without blocking the page
+                                st.session_state['ai_job'] = {
+                                    "job": job,
+                                    "ai_model": ai_model,
+                                    "job_role": job_role,
+                                    "selected_role": selected_role,
+                                    "selected_model": selected_model,
+                                    "custom_job_description": custom_job_description,
+                                    "saved": False
+                                }
+                                progress_bar.empty()
                         except Exception as ai_error:
                             st.error(f"Error during AI analysis: {str(ai_error)}")
                             import traceback as tb
                             st.code(tb.format_exc())
 
+                # Latest AI analysis, refined in place once the model answers
+                self.render_ai_analysis()
+
+                # PDF report of the latest analysis, rendered in the background
+                self.render_report_download()
+
 
     def render_home(self):
         apply_modern_styles()
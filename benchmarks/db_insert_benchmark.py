@@ -0,0 +1,97 @@
+"""
+Benchmark resume insert throughput through the repository in config/database.py
+
+Saves synthetic resumes with their skills and ATS analyses into a scratch
+database, first one at a time (save_resume_data + save_analysis_data, as the
+analyzer page does) and then in batches with save_resume_data_bulk.
+
+    python -m benchmarks.db_insert_benchmark --rows 20000 --batch-size 500
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+ROLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "UI/UX Designer", "Product Manager"]
+CATEGORIES = ["Software Development", "Data Science", "Cloud", "Design", "Management"]
+SKILLS = ["Python", "SQL", "Docker", "AWS", "React", "Java", "Scrum", "Kubernetes", "MongoDB", "Figma"]
+
+
+def sample_resumes(count, seed=7):
+    """(resume_data, analysis_data) pairs shaped like the analyzer page's"""
+    rng = random.Random(seed)
+    for i in range(count):
+        resume = {
+            'personal_info': {'full_name': f"User {i}", 'email': f"user{i}@example.com", 'phone': "555-0100"},
+            'summary': "Experienced professional",
+            'target_role': rng.choice(ROLES),
+            'target_category': rng.choice(CATEGORIES),
+            'skills': rng.sample(SKILLS, 5),
+            'template': ''
+        }
+        analysis = {
+            'ats_score': rng.randint(20, 100),
+            'keyword_match_score': rng.randint(20, 100),
+            'format_score': rng.randint(20, 100),
+            'section_score': rng.randint(20, 100),
+            'missing_skills': "Go,Rust",
+            'recommendations': "Add metrics"
+        }
+        yield resume, analysis
+
+
+def insert_one_by_one(pairs):
+    from config.database import save_resume_data, save_analysis_data
+
+    for resume, analysis in pairs:
+        resume_id = save_resume_data(resume)
+        save_analysis_data(resume_id, analysis)
+
+
+def insert_in_batches(pairs, batch_size):
+    from config.database import save_resume_data_bulk
+
+    pairs = list(pairs)
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        save_resume_data_bulk([resume for resume, _ in batch], [analysis for _, analysis in batch])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs bulk resume inserts")
+    parser.add_argument("--rows", type=int, default=20000, help="resumes to insert with each method")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="resume-insert-bench-"), "bench.db")
+    os.environ["DATABASE_PATH"] = db_path
+
+    from config.database import init_database, get_database_connection
+
+    init_database()
+    pairs = list(sample_resumes(args.rows))
+
+    results = []
+    for name, run in [
+        ("one by one", lambda: insert_one_by_one(pairs)),
+        (f"bulk ({args.batch_size}/batch)", lambda: insert_in_batches(pairs, args.batch_size)),
+    ]:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        results.append((name, elapsed))
+
+    conn = get_database_connection()
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ("resume_data", "resume_skills", "resume_analysis")]
+    conn.close()
+
+    print(f"{'method':<22} {'seconds':>8} {'resumes/s':>10}")
+    for name, elapsed in results:
+        print(f"{name:<22} {elapsed:>8.2f} {args.rows / elapsed:>10.0f}")
+    print(f"Rows written: {counts[0]:,} resumes, {counts[1]:,} skills, {counts[2]:,} analyses ({db_path})")
+
+
+if __name__ == "__main__":
+    main()
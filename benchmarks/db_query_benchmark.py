@@ -0,0 +1,274 @@
+"""
+Benchmark dashboard query latency on a large resume database
+
+Fills a scratch database with synthetic resumes, analyses and AI analyses spread
+over the last year. The dashboard and admin statistics queries are timed twice:
+first as they ran before the schema migrations, as full scans with DATE()
+predicates on the unmigrated database, then through the current code after the
+migrations add indexes and daily rollup tables. "full dashboard" is every query of
+one dashboard render, which the current code computes as a single metrics snapshot.
+
+    python -m benchmarks.db_query_benchmark --rows 1000000
+"""
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+CATEGORIES = ["Software Development", "Data Science", "Cloud", "Design", "Management", None]
+MODELS = ["Google Gemini", "GPT-4o", "Claude 3 Sonnet", "Local (Offline)"]
+ROLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "UI/UX Designer", "Product Manager"]
+
+# Dashboard queries as they ran before the migrations (full scans, DATE() predicates)
+LEGACY_RESUME_METRICS = """
+    SELECT
+        COUNT(DISTINCT rd.id) as total_resumes,
+        ROUND(AVG(ra.ats_score), 1) as avg_ats_score,
+        ROUND(AVG(ra.keyword_match_score), 1) as avg_keyword_score,
+        COUNT(DISTINCT CASE WHEN ra.ats_score >= 70 THEN rd.id END) as high_scoring
+    FROM resume_data rd
+    LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
+    WHERE rd.created_at >= ?
+"""
+
+LEGACY_WEEKLY_TREND = """
+    SELECT COUNT(*)
+    FROM resume_data
+    WHERE DATE(created_at) = DATE(?)
+"""
+
+LEGACY_JOB_CATEGORY_STATS = """
+    SELECT
+        COALESCE(target_category, 'Other') as category,
+        COUNT(*) as count,
+        ROUND(AVG(CASE WHEN ra.ats_score >= 70 THEN 1 ELSE 0 END) * 100, 1) as success_rate
+    FROM resume_data rd
+    LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
+    GROUP BY category
+    ORDER BY count DESC
+    LIMIT 5
+"""
+
+LEGACY_DATABASE_STATS = [
+    "SELECT COUNT(*) FROM resume_data",
+    "SELECT COUNT(*) FROM resume_data WHERE DATE(created_at) = DATE('now')",
+]
+
+LEGACY_TREND_INDICATORS = [
+    """
+    SELECT (COUNT(*) - (SELECT COUNT(*) FROM resume_data WHERE created_at < date('now', '-7 days'))) * 100.0
+           / NULLIF((SELECT COUNT(*) FROM resume_data WHERE created_at < date('now', '-7 days')), 0)
+    FROM resume_data
+    """,
+    """
+    SELECT (AVG(ats_score) - (SELECT AVG(ats_score) FROM resume_analysis WHERE created_at < date('now', '-7 days'))) * 100.0
+           / NULLIF((SELECT AVG(ats_score) FROM resume_analysis WHERE created_at < date('now', '-7 days')), 0)
+    FROM resume_analysis
+    """,
+]
+
+LEGACY_QUICK_STATS = [
+    "SELECT COUNT(*) FROM resume_data",
+    "SELECT AVG(ats_score) FROM resume_analysis",
+    "SELECT COUNT(*) FROM resume_analysis WHERE ats_score >= 70",
+]
+
+LEGACY_AI_ANALYSIS_STATS = [
+    "SELECT COUNT(*) FROM ai_analysis",
+    "SELECT model_used, COUNT(*) as count FROM ai_analysis GROUP BY model_used ORDER BY count DESC",
+    "SELECT AVG(resume_score) FROM ai_analysis",
+    "SELECT job_role, COUNT(*) as count FROM ai_analysis GROUP BY job_role ORDER BY count DESC LIMIT 5",
+]
+
+
+def populate(db_path, rows, seed=7):
+    """Create the schema (without migrations) and insert rows into each table"""
+    rng = random.Random(seed)
+    now = datetime.datetime.utcnow()
+
+    def timestamp():
+        return (now - datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))).strftime('%Y-%m-%d %H:%M:%S')
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript("""
+        CREATE TABLE resume_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, email TEXT NOT NULL,
+            phone TEXT NOT NULL, linkedin TEXT, github TEXT, portfolio TEXT, summary TEXT,
+            target_role TEXT, target_category TEXT, education TEXT, experience TEXT,
+            projects TEXT, skills TEXT, template TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE resume_skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, resume_id INTEGER, skill_name TEXT NOT NULL,
+            skill_category TEXT NOT NULL, proficiency_score REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE resume_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, resume_id INTEGER, ats_score REAL,
+            keyword_match_score REAL, format_score REAL, section_score REAL, missing_skills TEXT,
+            recommendations TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE admin_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, admin_email TEXT NOT NULL, action TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE admin (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT NOT NULL UNIQUE, password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE ai_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, resume_id INTEGER, model_used TEXT,
+            resume_score INTEGER, job_role TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO resume_data (name, email, phone, target_role, target_category, skills, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((f"User {i}", f"user{i}@example.com", "555-0100", rng.choice(ROLES), rng.choice(CATEGORIES),
+          "Python, SQL, Docker", timestamp()) for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO resume_analysis (resume_id, ats_score, keyword_match_score, format_score, section_score, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((i + 1, rng.randint(20, 100), rng.randint(20, 100), rng.randint(20, 100), rng.randint(20, 100), timestamp())
+         for i in range(rows))
+    )
+    conn.executemany(
+        "INSERT INTO ai_analysis (model_used, resume_score, job_role, created_at) VALUES (?, ?, ?, ?)",
+        ((rng.choice(MODELS), rng.randint(0, 100), rng.choice(ROLES), timestamp()) for _ in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _run_all(conn, statements, params=()):
+    return [conn.execute(statement, params).fetchall() for statement in statements]
+
+
+def legacy_queries(conn):
+    """(name, callable) pairs running the pre-migration SQL"""
+    now = datetime.datetime.now()
+    period_starts = [
+        now.replace(hour=0, minute=0, second=0, microsecond=0),
+        now - datetime.timedelta(days=now.weekday()),
+        now.replace(day=1),
+        datetime.datetime(2000, 1, 1),
+    ]
+    week = [(now - datetime.timedelta(days=x)).strftime('%Y-%m-%d') for x in range(6, -1, -1)]
+    return [
+        ("resume metrics", lambda: [
+            conn.execute(LEGACY_RESUME_METRICS, (start.strftime('%Y-%m-%d %H:%M:%S'),)).fetchone()
+            for start in period_starts
+        ]),
+        ("weekly trends", lambda: [conn.execute(LEGACY_WEEKLY_TREND, (day,)).fetchone() for day in week]),
+        ("job category stats", lambda: conn.execute(LEGACY_JOB_CATEGORY_STATS).fetchall()),
+        ("database stats", lambda: _run_all(conn, LEGACY_DATABASE_STATS)),
+        ("trend indicators", lambda: _run_all(conn, LEGACY_TREND_INDICATORS)),
+        ("quick stats", lambda: _run_all(conn, LEGACY_QUICK_STATS)),
+        ("AI analysis stats", lambda: _run_all(conn, LEGACY_AI_ANALYSIS_STATS)),
+    ]
+
+
+def full_dashboard(queries):
+    """Every dashboard query of a page render, one after another"""
+    dashboard_names = {"resume metrics", "weekly trends", "job category stats", "database stats",
+                       "trend indicators", "quick stats"}
+    calls = [query for name, query in queries if name in dashboard_names]
+    return ("full dashboard", lambda: [call() for call in calls])
+
+
+def current_queries():
+    """(name, callable) pairs exercising the real dashboard and admin code paths"""
+    from config.database import get_ai_analysis_stats
+    from dashboard.dashboard import DashboardManager
+
+    dashboard = DashboardManager()
+
+    def fresh(method):
+        # Recompute the snapshot on every call, as each dashboard render does
+        def call():
+            dashboard.get_metrics_snapshot(refresh=True)
+            return method()
+        return call
+
+    return [
+        ("resume metrics", fresh(dashboard.get_resume_metrics)),
+        ("weekly trends", fresh(dashboard.get_weekly_trends)),
+        ("job category stats", fresh(dashboard.get_job_category_stats)),
+        ("database stats", fresh(dashboard.get_database_stats)),
+        ("trend indicators", fresh(dashboard.get_trend_indicators)),
+        ("quick stats", fresh(dashboard.get_quick_stats)),
+        ("AI analysis stats", get_ai_analysis_stats),
+        ("full dashboard", lambda: dashboard.get_metrics_snapshot(refresh=True)),
+    ]
+
+
+def time_queries(queries, repeat):
+    results = {}
+    for name, query in queries:
+        query()  # warm the page cache
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard queries before and after the migrations")
+    parser.add_argument("--rows", type=int, default=1000000, help="rows per table")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default=None, help="scratch database path (default: a temp file)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="resume-db-bench-"), "bench.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.environ["DATABASE_PATH"] = db_path
+
+    start = time.perf_counter()
+    populate(db_path, args.rows)
+    print(f"Populated {args.rows:,} rows per table in {time.perf_counter() - start:.1f}s ({db_path})")
+
+    conn = sqlite3.connect(db_path)
+    legacy = legacy_queries(conn)
+    legacy.append(full_dashboard(legacy))
+    before = time_queries(legacy, args.repeat)
+    conn.close()
+
+    from config.database import get_database_connection
+    from config.migrations import apply_migrations
+
+    conn = get_database_connection()
+    start = time.perf_counter()
+    apply_migrations(conn)
+    conn.close()
+    print(f"Migrations took {time.perf_counter() - start:.1f}s")
+
+    current = current_queries()
+    after = time_queries(current, args.repeat)
+
+    print(f"{'query':<22} {'legacy (ms)':>12} {'current (ms)':>13} {'speedup':>8}")
+    for name, _ in legacy:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<22} {before[name]:>12.1f} {after[name]:>13.1f} {speedup:>7.1f}x")
+
+    from dashboard.dashboard import DashboardManager
+
+    from dashboard.metrics import get_dashboard_snapshot
+
+    snapshot = DashboardManager().get_metrics_snapshot()
+    cached = time_queries([("cached", get_dashboard_snapshot)], args.repeat)["cached"]
+    print(f"Dashboard snapshot from the statistics cache: {cached:.3f} ms")
+    sections = ", ".join(f"{name} {ms:.1f} ms" for name, ms in snapshot.section_ms.items())
+    print(f"Dashboard snapshot sections: {sections} (total {snapshot.total_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
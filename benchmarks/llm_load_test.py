@@ -0,0 +1,172 @@
+"""
+Load test for AIResumeAnalyzer against the local LLM stand-in server
+
+Starts the stand-in server in-process (or uses --base-url), drives concurrent
+analyses through AIResumeAnalyzer.analyze_resume_with_model, and reports
+throughput, p50/p95/p99 latency and the error mix.
+
+    python -m benchmarks.llm_load_test --provider a4f --requests 200 --concurrency 16 \
+        --latency-ms 800 --latency-jitter-ms 300 --latency-dist lognormal --rate-limit-rate 0.05
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.llm_standin_server import add_server_arguments, config_from_args, start_server
+
+SAMPLE_SKILLS = ["Python", "Java", "React", "SQL", "Docker", "AWS", "Kubernetes", "Excel",
+                 "Machine Learning", "Git", "Linux", "Agile", "Leadership", "Communication"]
+
+
+def synthetic_resumes(count, seed=0):
+    """Distinct, deterministic resume texts"""
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        skills = rng.sample(SAMPLE_SKILLS, 6)
+        years = rng.randint(1, 12)
+        resumes.append(
+            f"Candidate {i}\ncandidate{i}@example.com\n\nSummary\n"
+            f"Engineer with {years} years of experience in {skills[0]} and {skills[1]}.\n\n"
+            f"Experience\nSoftware Engineer, Company {rng.randint(1, 500)} ({2024 - years}-2024)\n"
+            f"- Built services using {skills[2]} and {skills[3]}, cutting latency by {rng.randint(10, 60)}%\n"
+            f"- Led a team of {rng.randint(2, 9)} engineers\n\n"
+            f"Education\nB.Sc. Computer Science, University {rng.randint(1, 50)}\n\n"
+            f"Skills\n{', '.join(skills)}\n"
+        )
+    return resumes
+
+
+def load_resumes(pattern):
+    resumes = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            resumes.append(f.read())
+    return resumes
+
+
+def classify(result):
+    """Bucket an analysis result into ok / rate_limited / server_error / timeout / other"""
+    error = (result or {}).get("error")
+    if not error:
+        return "ok"
+    text = error.lower()
+    if "429" in text or "rate limit" in text or "resource has been exhausted" in text:
+        return "rate_limited"
+    if "timed out" in text or "timeout" in text:
+        return "timeout"
+    if "500" in text or "internal" in text:
+        return "server_error"
+    return "other"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_load_test(analyzer, model, resumes, requests, concurrency, job_role="Software Engineer"):
+    """Run `requests` analyses on `concurrency` threads; returns the summary dict"""
+    latencies = []
+    outcomes = {}
+
+    def one(index):
+        start = time.perf_counter()
+        result = analyzer.analyze_resume_with_model(resumes[index % len(resumes)], model, job_role=job_role)
+        return time.perf_counter() - start, classify(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, outcome in pool.map(one, range(requests)):
+            latencies.append(latency)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "model": model,
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "latency_max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0,
+        "outcomes": outcomes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test AIResumeAnalyzer against the LLM stand-in server")
+    parser.add_argument("--provider", choices=["a4f", "gemini"], default="a4f")
+    parser.add_argument("--model", help="Model display name (default: GPT 5 Nano / Google Gemini)")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--resumes", help="Glob of resume text files (default: synthetic resumes)")
+    parser.add_argument("--base-url", help="Use an already running stand-in server instead of starting one")
+    parser.add_argument("--client-rpm", type=float, help="Override the client-side rate limit (requests/minute)")
+    parser.add_argument("--client-concurrency", type=int, help="Override the client-side concurrency cap")
+    parser.add_argument("--use-cache", action="store_true", help="Keep the near-duplicate analysis cache enabled")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_server(config_from_args(args))
+
+    # Route the real client code at the stand-in before anything creates a client
+    prefix = f"LLM_{args.provider.upper()}_"
+    os.environ.update({
+        "A4F_BASE_URL": f"{base_url}/v1",
+        "A4F_API_KEY": "standin",
+        "GEMINI_API_ENDPOINT": base_url,
+        "GOOGLE_API_KEY": "standin",
+        "ANALYSIS_CACHE_ENABLED": "true" if args.use_cache else "false",
+    })
+    os.environ.pop("LLM_PROVIDER", None)
+    if args.client_rpm:
+        os.environ[prefix + "RPM"] = str(args.client_rpm)
+        os.environ[prefix + "BURST"] = str(max(1, args.client_rpm / 60))
+    if args.client_concurrency:
+        os.environ[prefix + "CONCURRENCY"] = str(args.client_concurrency)
+
+    from utils.ai_resume_analyzer import AIResumeAnalyzer
+    from utils.rate_limiter import get_governor_metrics
+
+    model = args.model or ("Google Gemini" if args.provider == "gemini" else "GPT 5 Nano")
+    resumes = load_resumes(args.resumes) if args.resumes else synthetic_resumes(max(1, args.requests), args.seed)
+
+    summary = run_load_test(AIResumeAnalyzer(), model, resumes, args.requests, args.concurrency)
+    summary["governors"] = get_governor_metrics()
+    if server:
+        summary["server"] = dict(server.RequestHandlerClass.config.counts)
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"\nModel: {summary['model']}  requests: {summary['requests']}  concurrency: {summary['concurrency']}")
+    print(f"Elapsed: {summary['elapsed_seconds']}s  throughput: {summary['throughput_rps']} req/s")
+    print(f"Latency p50: {summary['latency_p50_ms']} ms  p95: {summary['latency_p95_ms']} ms  "
+          f"p99: {summary['latency_p99_ms']} ms  max: {summary['latency_max_ms']} ms")
+    print("Outcomes: " + ", ".join(f"{name}={count}" for name, count in sorted(summary["outcomes"].items())))
+    if "server" in summary:
+        print("Server: " + ", ".join(f"{name}={count}" for name, count in summary["server"].items()))
+    for governor in summary["governors"]:
+        print(f"Governor {governor['provider']}/{governor['model']}: avg wait {governor['avg_wait_seconds']}s, "
+              f"max queue {governor['max_queue_length']}, 429s {governor['rate_limited_responses']}")
+
+
+if __name__ == "__main__":
+    main()
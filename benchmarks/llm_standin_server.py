@@ -0,0 +1,260 @@
+"""
+Local stand-in for the OpenAI-compatible (A4F) and Gemini REST APIs
+
+Replays recorded responses (JSONL written via LLM_RECORD_RESPONSES) or, without
+recordings, the deterministic stub analysis from utils.llm_providers. Latency,
+error rate and 429 behavior are configurable so AIResumeAnalyzer can be load-tested
+without spending provider quota.
+
+    python -m benchmarks.llm_standin_server --port 8085 --latency-ms 800 --latency-dist lognormal \
+        --error-rate 0.02 --rate-limit-rate 0.05 --rpm 600
+
+Point the app at it with A4F_BASE_URL=http://127.0.0.1:8085/v1 and
+GEMINI_API_ENDPOINT=http://127.0.0.1:8085 (any API key works).
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.llm_providers import stub_response
+from utils.rate_limiter import TokenBucket
+
+GEMINI_PATH_PATTERN = re.compile(r'^/v1(?:beta)?/models/([^:/]+):generateContent')
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+class StandinConfig:
+    """Behavior of the stand-in server"""
+
+    def __init__(self, recordings=None, latency_ms=0.0, jitter_ms=0.0, latency_dist="fixed",
+                 error_rate=0.0, rate_limit_rate=0.0, rpm=0.0, seed=0):
+        self.recordings = recordings or []
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_dist = latency_dist
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.bucket = TokenBucket(rpm / 60.0, max(1.0, rpm / 60.0)) if rpm else None
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "server_error": 0}
+
+    def sample_latency(self):
+        """Seconds to wait before answering, drawn from the configured distribution"""
+        mean, spread = self.latency_ms, self.jitter_ms
+        with self.lock:
+            if self.latency_dist == "uniform":
+                value = self.rng.uniform(max(0.0, mean - spread), mean + spread)
+            elif self.latency_dist == "normal":
+                value = self.rng.gauss(mean, spread)
+            elif self.latency_dist == "lognormal" and mean > 0:
+                # Parameterized so the distribution's mean and standard deviation match the flags
+                sigma = math.sqrt(math.log(1 + (spread / mean) ** 2))
+                value = self.rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+            elif self.latency_dist == "exponential" and mean > 0:
+                value = self.rng.expovariate(1.0 / mean)
+            else:
+                value = mean
+        return max(0.0, value) / 1000.0
+
+    def outcome(self):
+        """'ok', 'rate_limited' or 'server_error' for the next request"""
+        with self.lock:
+            self.counts["requests"] += 1
+            roll = self.rng.random()
+        if self.bucket and self.bucket.try_acquire() > 0:
+            result = "rate_limited"
+        elif roll < self.rate_limit_rate:
+            result = "rate_limited"
+        elif roll < self.rate_limit_rate + self.error_rate:
+            result = "server_error"
+        else:
+            result = "ok"
+        with self.lock:
+            self.counts[result] += 1
+        return result
+
+    def response_for(self, provider, model, prompt):
+        """Recorded response for this provider/model (chosen by prompt hash), else the stub"""
+        candidates = [r for r in self.recordings if r.get("provider") == provider and r.get("model") == model]
+        candidates = candidates or self.recordings
+        if not candidates:
+            return stub_response(prompt)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        exact = [r for r in candidates if r.get("prompt_sha256") == digest]
+        if exact:
+            return exact[0]["response"]
+        return candidates[int(digest, 16) % len(candidates)]["response"]
+
+
+def load_recordings(path):
+    """Read a JSONL file of {"provider", "model", "prompt_sha256", "response"} records"""
+    recordings = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                recordings.append(json.loads(line))
+    return recordings
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    config = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/health", "/stats"):
+            with self.config.lock:
+                self._send_json(200, dict(self.config.counts))
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        path = self.path.split("?", 1)[0]
+        gemini_match = GEMINI_PATH_PATTERN.match(path)
+        if path.endswith("/chat/completions"):
+            provider, model = "a4f", body.get("model", "")
+            prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        elif gemini_match:
+            provider, model = "gemini", gemini_match.group(1)
+            prompt = "\n".join(
+                part.get("text", "")
+                for content in body.get("contents", [])
+                for part in content.get("parts", [])
+            )
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {path}"}})
+            return
+
+        time.sleep(self.config.sample_latency())
+        outcome = self.config.outcome()
+        if outcome == "rate_limited":
+            if provider == "gemini":
+                error = {"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).",
+                                   "status": "RESOURCE_EXHAUSTED"}}
+            else:
+                error = {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error",
+                                   "code": "rate_limit_exceeded"}}
+            self._send_json(429, error, headers={"Retry-After": "1"})
+            return
+        if outcome == "server_error":
+            if provider == "gemini":
+                error = {"error": {"code": 500, "message": "Internal error encountered.", "status": "INTERNAL"}}
+            else:
+                error = {"error": {"message": "Internal server error", "type": "server_error"}}
+            self._send_json(500, error)
+            return
+
+        text = self.config.response_for(provider, model, prompt)
+        prompt_tokens, output_tokens = len(prompt) // 4, len(text) // 4
+        if provider == "gemini":
+            self._send_json(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens
+                }
+            })
+        else:
+            self._send_json(200, {
+                "id": f"chatcmpl-{hashlib.md5(prompt.encode('utf-8')).hexdigest()[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": output_tokens,
+                    "total_tokens": prompt_tokens + output_tokens
+                }
+            })
+
+
+def start_server(config, host="127.0.0.1", port=0):
+    """Start the stand-in server on a background thread; returns (server, base_url)"""
+    handler = type("ConfiguredStandinHandler", (StandinHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="llm-standin", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--recordings", help="JSONL file of recorded responses (LLM_RECORD_RESPONSES output)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Spread (std dev / half-range)")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rpm", type=float, default=0.0, help="Server-side rate limit; excess requests get 429")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args):
+    return StandinConfig(
+        recordings=load_recordings(args.recordings) if args.recordings else None,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_jitter_ms,
+        latency_dist=args.latency_dist,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rpm=args.rpm,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in OpenAI/Gemini server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8085)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_server(config_from_args(args), args.host, args.port)
+    print(f"LLM stand-in listening on {base_url} (A4F_BASE_URL={base_url}/v1, GEMINI_API_ENDPOINT={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
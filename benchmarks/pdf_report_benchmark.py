@@ -0,0 +1,70 @@
+"""
+Benchmark PDF report rendering throughput
+
+Renders the full and simple analysis reports from a representative analysis
+(the offline stub's output) and reports reports/sec and the average size.
+
+    python -m benchmarks.pdf_report_benchmark --reports 200
+"""
+import argparse
+import time
+
+from utils.llm_providers import stub_analysis
+from utils.report_renderer import render_report
+
+SAMPLE_RESUME = """Summary
+Backend engineer with 6 years of experience building Python and SQL services.
+Experience
+Senior Engineer - built Docker and Kubernetes deployments on AWS, led a team of 4.
+Education
+B.Sc. Computer Science
+Skills
+Python, SQL, Docker, Kubernetes, AWS, Git, Linux, Agile, Communication
+Projects
+Resume analytics platform with React and Node
+"""
+
+
+def sample_analysis_result(resume_text=SAMPLE_RESUME, job_role="Software Engineer"):
+    analysis = stub_analysis(resume_text, job_role=job_role, job_match=True)
+    return {
+        "score": 78,
+        "ats_score": 74,
+        "model_used": "Google Gemini",
+        "full_response": analysis,
+        "strengths": [],
+        "weaknesses": [],
+    }
+
+
+def benchmark(reports, simple=False):
+    analysis_result = sample_analysis_result()
+    render_report(analysis_result, "Jane Doe", "Software Engineer", simple=simple)  # warm-up
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(reports):
+        total_bytes += len(render_report(analysis_result, "Jane Doe", "Software Engineer", simple=simple).getvalue())
+    elapsed = time.perf_counter() - start
+    return {
+        "report": "simple" if simple else "full",
+        "reports": reports,
+        "reports_per_second": round(reports / elapsed, 2),
+        "avg_ms": round(elapsed / reports * 1000, 2),
+        "avg_kb": round(total_bytes / reports / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF report rendering")
+    parser.add_argument("--reports", type=int, default=100)
+    args = parser.parse_args()
+
+    for simple in (False, True):
+        result = benchmark(args.reports, simple=simple)
+        print(f"{result['report']:>6}: {result['reports_per_second']} reports/sec "
+              f"({result['avg_ms']} ms/report, {result['avg_kb']} KB)")
+
+
+if __name__ == "__main__":
+    main()
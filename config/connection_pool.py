@@ -0,0 +1,167 @@
+"""
+SQLite connection manager with WAL journaling and per-thread connection reuse
+
+Each thread keeps one open connection per database file and gets it back on every
+get_database_connection() call instead of reconnecting. Callers keep the usual
+open/commit/close pattern: close() on a pooled connection only returns it to the
+pool, rolling back anything left uncommitted once the outermost caller is done.
+Connections of threads that have exited are closed on the next checkout.
+
+New connections run in WAL mode (dashboard reads no longer block analysis writes)
+with tuned synchronous, cache_size and mmap_size pragmas and a busy timeout. All of
+them can be overridden from the environment:
+
+    DATABASE_PATH           database file (default resume_data.db)
+    DB_BUSY_TIMEOUT_MS      wait for locks before raising "database is locked" (5000)
+    DB_SYNCHRONOUS          NORMAL is durable in WAL mode except on power loss (NORMAL)
+    DB_CACHE_SIZE_KB        page cache per connection (16384)
+    DB_MMAP_SIZE_MB         memory-mapped I/O size (128)
+"""
+import os
+import sqlite3
+import threading
+import time
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_database_path():
+    return os.getenv("DATABASE_PATH", "resume_data.db")
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its thread's pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._closed = False
+
+    def close(self):
+        """Release this checkout; the last release discards uncommitted work and resets row_factory"""
+        if self._closed:
+            return
+        self._checkouts = max(0, self._checkouts - 1)
+        if self._checkouts == 0:
+            if self.in_transaction:
+                self.rollback()
+            self.row_factory = None
+
+    def close_connection(self):
+        """Really close the underlying connection"""
+        if not self._closed:
+            self._closed = True
+            super().close()
+
+
+class ConnectionManager:
+    """Per-thread pool of tuned SQLite connections to one database file"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []  # (owner thread, connection)
+        self._stats = {"opened": 0, "reused": 0, "closed": 0, "checkouts": 0, "connect_ms": 0.0}
+
+    def _configure(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={os.getenv('DB_SYNCHRONOUS', 'NORMAL')}")
+        conn.execute(f"PRAGMA cache_size=-{_env_int('DB_CACHE_SIZE_KB', 16384)}")
+        conn.execute(f"PRAGMA mmap_size={_env_int('DB_MMAP_SIZE_MB', 128) * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+    def _open(self):
+        start = time.perf_counter()
+        # check_same_thread is off only so exited threads' connections can be closed
+        # from another thread; a connection is never used outside its owner thread
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=_env_int("DB_BUSY_TIMEOUT_MS", 5000) / 1000,
+            check_same_thread=False,
+            factory=PooledConnection
+        )
+        self._configure(conn)
+        with self._lock:
+            self._stats["opened"] += 1
+            self._stats["connect_ms"] += (time.perf_counter() - start) * 1000
+            self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    def _prune(self):
+        """Close connections whose owner thread has exited"""
+        with self._lock:
+            dead = [(thread, conn) for thread, conn in self._connections if not thread.is_alive()]
+            self._connections = [(thread, conn) for thread, conn in self._connections if thread.is_alive()]
+            self._stats["closed"] += len(dead)
+        for _, conn in dead:
+            try:
+                conn.close_connection()
+            except sqlite3.Error:
+                pass
+
+    def connection(self):
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn._closed:
+            self._prune()
+            conn = self._local.conn = self._open()
+        else:
+            with self._lock:
+                self._stats["reused"] += 1
+        conn._checkouts += 1
+        with self._lock:
+            self._stats["checkouts"] += 1
+        return conn
+
+    def close_all(self):
+        """Close every pooled connection (threads reconnect on their next checkout)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._stats["closed"] += len(connections)
+        for _, conn in connections:
+            try:
+                conn.close_connection()
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        with self._lock:
+            opened = self._stats["opened"]
+            return {
+                "db_path": self.db_path,
+                "open_connections": len(self._connections),
+                "in_use": sum(1 for _, conn in self._connections if conn._checkouts > 0),
+                "opened": opened,
+                "reused": self._stats["reused"],
+                "closed": self._stats["closed"],
+                "checkouts": self._stats["checkouts"],
+                "reuse_rate": round(self._stats["reused"] / self._stats["checkouts"], 3) if self._stats["checkouts"] else 0.0,
+                "avg_connect_ms": round(self._stats["connect_ms"] / opened, 2) if opened else 0.0,
+            }
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path=None):
+    """Process-wide connection manager for a database file (DATABASE_PATH by default)"""
+    db_path = db_path or get_database_path()
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = _managers[db_path] = ConnectionManager(db_path)
+        return manager
+
+
+def get_pool_stats():
+    """Pool metrics for every database opened through the manager"""
+    with _managers_lock:
+        managers = list(_managers.values())
+    return [manager.stats() for manager in managers]
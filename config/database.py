@@ -1,10 +1,16 @@
-import sqlite3
-from datetime import datetime
+import copy
+import json
+import re
+from datetime import datetime, timedelta
+
+from config.storage import get_storage, get_pool_stats, dialect_for
+from config.migrations import apply_migrations, PG_RESUME_DOCUMENT, PG_ANALYSIS_DOCUMENT
+from config.stats_cache import get_stats_cache, invalidate_stats_cache, get_stats_cache_stats
+from utils.skill_normalizer import skill_rows
 
 def get_database_connection():
-    """Create and return a database connection"""
-    conn = sqlite3.connect('resume_data.db')
-    return conn
+    """Return this thread's pooled connection to DATABASE_URL (close() returns it to the pool)"""
+    return get_storage().connection()
 
 def init_database():
     """Initialize database tables"""
@@ -83,44 +89,90 @@ def init_database():
     ''')
     
     conn.commit()
+    
+    # Add indexes and other schema changes to existing databases
+    apply_migrations(conn)
     conn.close()
     
     # Create default admin if none exists
     create_default_admin()
 
+RESUME_INSERT = '''
+INSERT INTO resume_data (
+    name, email, phone, linkedin, github, portfolio,
+    summary, target_role, target_category, education, 
+    experience, projects, skills, template
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+ANALYSIS_INSERT = '''
+INSERT INTO resume_analysis (
+    resume_id, ats_score, keyword_match_score,
+    format_score, section_score, missing_skills,
+    recommendations
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+AI_ANALYSIS_INSERT = '''
+INSERT INTO ai_analysis (
+    resume_id, model_used, resume_score, job_role, analysis_text
+) VALUES (?, ?, ?, ?, ?)
+'''
+
+def _resume_row(data):
+    personal_info = data.get('personal_info', {})
+    return (
+        personal_info.get('full_name', ''),
+        personal_info.get('email', ''),
+        personal_info.get('phone', ''),
+        personal_info.get('linkedin', ''),
+        personal_info.get('github', ''),
+        personal_info.get('portfolio', ''),
+        data.get('summary', ''),
+        data.get('target_role', ''),
+        data.get('target_category', ''),
+        str(data.get('education', [])),
+        str(data.get('experience', [])),
+        str(data.get('projects', [])),
+        str(data.get('skills', [])),
+        data.get('template', '')
+    )
+
+def _analysis_row(resume_id, analysis):
+    return (
+        resume_id,
+        float(analysis.get('ats_score', 0)),
+        float(analysis.get('keyword_match_score', 0)),
+        float(analysis.get('format_score', 0)),
+        float(analysis.get('section_score', 0)),
+        analysis.get('missing_skills', ''),
+        analysis.get('recommendations', '')
+    )
+
+def _ai_analysis_row(resume_id, analysis_data):
+    return (
+        resume_id,
+        analysis_data.get('model_used', ''),
+        analysis_data.get('resume_score', 0),
+        analysis_data.get('job_role', ''),
+        analysis_data.get('analysis_text', '')
+    )
+
 def save_resume_data(data):
     """Save resume data to database"""
     conn = get_database_connection()
     cursor = conn.cursor()
     
     try:
-        personal_info = data.get('personal_info', {})
+        cursor.execute(RESUME_INSERT, _resume_row(data))
+        resume_id = cursor.lastrowid
         
-        cursor.execute('''
-        INSERT INTO resume_data (
-            name, email, phone, linkedin, github, portfolio,
-            summary, target_role, target_category, education, 
-            experience, projects, skills, template
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            personal_info.get('full_name', ''),
-            personal_info.get('email', ''),
-            personal_info.get('phone', ''),
-            personal_info.get('linkedin', ''),
-            personal_info.get('github', ''),
-            personal_info.get('portfolio', ''),
-            data.get('summary', ''),
-            data.get('target_role', ''),
-            data.get('target_category', ''),
-            str(data.get('education', [])),
-            str(data.get('experience', [])),
-            str(data.get('projects', [])),
-            str(data.get('skills', [])),
-            data.get('template', '')
-        ))
+        # Store the skills split and categorized for the dashboard
+        save_resume_skills(cursor, resume_id, data.get('skills', []))
         
         conn.commit()
-        return cursor.lastrowid
+        invalidate_stats_cache()
+        return resume_id
     except Exception as e:
         print(f"Error saving resume data: {str(e)}")
         conn.rollback()
@@ -128,35 +180,136 @@ def save_resume_data(data):
     finally:
         conn.close()
 
+def save_resume_skills(cursor, resume_id, skills):
+    """Insert a resume's normalized skills into resume_skills (in the caller's transaction)"""
+    return save_resume_skills_bulk(cursor, [(resume_id, skills)])
+
+def save_resume_skills_bulk(cursor, resume_skills):
+    """Insert the normalized skills of many (resume_id, skills) pairs with one executemany"""
+    rows = [
+        (resume_id, name, category)
+        for resume_id, skills in resume_skills
+        for name, category in skill_rows(skills)
+    ]
+    cursor.executemany('''
+    INSERT INTO resume_skills (resume_id, skill_name, skill_category)
+    VALUES (?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+def save_resume_data_bulk(resumes, analyses=None):
+    """
+    Save many resumes, their skills and optionally their analyses in one transaction
+    
+    analyses, when given, lines up with resumes (None for a resume without one).
+    Returns the new resume ids in input order. Unlike save_resume_data, errors are
+    raised: nothing is saved if any row fails.
+    """
+    resumes = list(resumes)
+    if not resumes:
+        return []
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        resume_ids = dialect_for(conn).insert_many(cursor, RESUME_INSERT, [_resume_row(data) for data in resumes])
+        
+        save_resume_skills_bulk(cursor, [
+            (resume_id, data.get('skills', [])) for resume_id, data in zip(resume_ids, resumes)
+        ])
+        if analyses:
+            cursor.executemany(ANALYSIS_INSERT, [
+                _analysis_row(resume_id, analysis)
+                for resume_id, analysis in zip(resume_ids, analyses) if analysis is not None
+            ])
+        
+        conn.commit()
+        invalidate_stats_cache()
+        return resume_ids
+    except Exception as e:
+        print(f"Error bulk saving resume data: {str(e)}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def backfill_resume_skills(batch_size=1000, on_progress=None):
+    """
+    Populate resume_skills for resumes saved before skills were normalized
+    
+    Walks resume_data by id in batches, skipping resumes that already have skills, and
+    commits each batch, so it can be stopped and rerun safely. on_progress(done, total)
+    is called after each batch. Returns (resumes processed, skills inserted).
+    """
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('SELECT COUNT(*) FROM resume_data')
+        total = cursor.fetchone()[0]
+        last_id, done, inserted = 0, 0, 0
+        while True:
+            cursor.execute('''
+            SELECT rd.id, rd.skills
+            FROM resume_data rd
+            WHERE rd.id > ?
+            AND NOT EXISTS (SELECT 1 FROM resume_skills rs WHERE rs.resume_id = rd.id)
+            ORDER BY rd.id
+            LIMIT ?
+            ''', (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            inserted += save_resume_skills_bulk(cursor, [(resume_id, skills or '') for resume_id, skills in rows])
+            conn.commit()
+            last_id = rows[-1][0]
+            done += len(rows)
+            if on_progress:
+                on_progress(done, total)
+        return done, inserted
+    except Exception as e:
+        print(f"Error backfilling resume skills: {str(e)}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def save_analysis_data(resume_id, analysis):
     """Save resume analysis data"""
     conn = get_database_connection()
     cursor = conn.cursor()
     
     try:
-        cursor.execute('''
-        INSERT INTO resume_analysis (
-            resume_id, ats_score, keyword_match_score,
-            format_score, section_score, missing_skills,
-            recommendations
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            resume_id,
-            float(analysis.get('ats_score', 0)),
-            float(analysis.get('keyword_match_score', 0)),
-            float(analysis.get('format_score', 0)),
-            float(analysis.get('section_score', 0)),
-            analysis.get('missing_skills', ''),
-            analysis.get('recommendations', '')
-        ))
+        cursor.execute(ANALYSIS_INSERT, _analysis_row(resume_id, analysis))
         
         conn.commit()
+        invalidate_stats_cache()
     except Exception as e:
         print(f"Error saving analysis data: {str(e)}")
         conn.rollback()
     finally:
         conn.close()
 
+def save_analysis_data_bulk(analyses):
+    """Save many (resume_id, analysis) pairs with one executemany; returns the number saved"""
+    rows = [_analysis_row(resume_id, analysis) for resume_id, analysis in analyses]
+    if not rows:
+        return 0
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.executemany(ANALYSIS_INSERT, rows)
+        conn.commit()
+        invalidate_stats_cache()
+        return len(rows)
+    except Exception as e:
+        print(f"Error bulk saving analysis data: {str(e)}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def get_resume_stats():
     """Get statistics about resumes"""
     conn = get_database_connection()
@@ -225,36 +378,182 @@ def get_admin_logs():
     finally:
         conn.close()
 
-def get_all_resume_data():
-    """Get all resume data for admin dashboard"""
+RESUME_PAGE_SORTS = {
+    # name: (sort key, direction); ties are broken by resume id in the same direction
+    'newest': ('r.created_at', 'DESC'),
+    'oldest': ('r.created_at', 'ASC'),
+    # latest_ats_score is kept by a trigger on resume_analysis (-1 without a scored analysis)
+    'highest_ats': ('r.latest_ats_score', 'DESC'),
+    'lowest_ats': ('r.latest_ats_score', 'ASC'),
+}
+
+RESUME_PAGE_QUERY = '''
+    SELECT 
+        r.id,
+        r.name,
+        r.email,
+        r.phone,
+        r.linkedin,
+        r.github,
+        r.portfolio,
+        r.target_role,
+        r.target_category,
+        r.created_at,
+        a.ats_score,
+        a.keyword_match_score,
+        a.format_score,
+        a.section_score,
+        {sort_key}
+    FROM resume_data r
+    LEFT JOIN resume_analysis a ON a.id = r.latest_analysis_id
+    {where}
+    ORDER BY {sort_key} {direction}, r.id {direction}
+    LIMIT ?
+'''
+
+def _resume_filter_conditions(filters):
+    """SQL conditions and parameters for the admin resume listing filters"""
+    conditions, params = [], []
+    if filters.get('role'):
+        conditions.append('r.target_role = ?')
+        params.append(filters['role'])
+    if filters.get('category'):
+        conditions.append('r.target_category = ?')
+        params.append(filters['category'])
+    if filters.get('min_score') is not None or filters.get('max_score') is not None:
+        # Resumes without a scored analysis only match unfiltered scores
+        conditions.append('r.latest_ats_score >= 0')
+    if filters.get('min_score') is not None:
+        conditions.append('r.latest_ats_score >= ?')
+        params.append(filters['min_score'])
+    if filters.get('max_score') is not None:
+        conditions.append('r.latest_ats_score <= ?')
+        params.append(filters['max_score'])
+    if filters.get('start_date'):
+        conditions.append('r.created_at >= ?')
+        params.append(str(filters['start_date']))
+    if filters.get('end_date'):
+        conditions.append('r.created_at < ?')
+        params.append(str(filters['end_date'] + timedelta(days=1)))
+    return conditions, params
+
+def get_resume_page(filters=None, sort='newest', after=None, page_size=50):
+    """
+    One page of resumes with their latest ATS analysis for the admin listing
+    
+    filters may set role, category, min_score/max_score (ATS) and start_date/end_date
+    (inclusive dates). Pages are keyset-paginated: pass the returned cursor as after
+    to get the next page. Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    sort_key, direction = RESUME_PAGE_SORTS[sort]
+    conditions, params = _resume_filter_conditions(filters or {})
+    if after is not None:
+        # Continue after the last row of the previous page, using the sort key's index
+        conditions.append(f"({sort_key}, r.id) {'<' if direction == 'DESC' else '>'} (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute(
+            RESUME_PAGE_QUERY.format(sort_key=sort_key, direction=direction, where=where),
+            params + [page_size + 1]
+        )
+        rows = cursor.fetchall()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = (rows[-1][-1], rows[-1][0])
+        return [row[:-1] for row in rows], next_cursor
+    except Exception as e:
+        print(f"Error getting resume page: {str(e)}")
+        return [], None
+    finally:
+        conn.close()
+
+def count_resumes(filters=None):
+    """Number of resumes matching the listing filters (cached, see config.stats_cache)"""
+    filters = {key: value for key, value in (filters or {}).items() if value is not None and value != ''}
+    
+    def compute():
+        conn = get_database_connection()
+        cursor = conn.cursor()
+        try:
+            if set(filters) <= {'category', 'start_date', 'end_date'}:
+                # Answerable from the daily rollup without touching resume_data
+                conditions, params = [], []
+                if 'category' in filters:
+                    conditions.append('target_category = ?')
+                    params.append(filters['category'])
+                if 'start_date' in filters:
+                    conditions.append('day >= ?')
+                    params.append(str(filters['start_date']))
+                if 'end_date' in filters:
+                    conditions.append('day <= ?')
+                    params.append(str(filters['end_date']))
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+                cursor.execute(f'SELECT SUM(submissions) FROM daily_resume_stats {where}', params)
+            else:
+                conditions, params = _resume_filter_conditions(filters)
+                cursor.execute(f'''
+                    SELECT COUNT(*)
+                    FROM resume_data r
+                    WHERE {' AND '.join(conditions)}
+                ''', params)
+            return cursor.fetchone()[0] or 0
+        finally:
+            conn.close()
+    
+    try:
+        return get_stats_cache().get(f"resume_count:{sorted(filters.items())}", compute)
+    except Exception as e:
+        print(f"Error counting resumes: {str(e)}")
+        return 0
+
+def get_resume_filter_options():
+    """Distinct target roles and categories for the listing filters (cached)"""
+    def compute():
+        conn = get_database_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT DISTINCT target_role FROM resume_data
+                WHERE target_role IS NOT NULL AND target_role <> ''
+                ORDER BY target_role
+            ''')
+            roles = [row[0] for row in cursor.fetchall()]
+            cursor.execute('''
+                SELECT DISTINCT target_category FROM daily_resume_stats
+                WHERE target_category <> ''
+                ORDER BY target_category
+            ''')
+            return {"roles": roles, "categories": [row[0] for row in cursor.fetchall()]}
+        finally:
+            conn.close()
+    
+    try:
+        return copy.deepcopy(get_stats_cache().get("resume_filter_options", compute))
+    except Exception as e:
+        print(f"Error getting resume filter options: {str(e)}")
+        return {"roles": [], "categories": []}
+
+def get_daily_resume_counts():
+    """(day, submissions) for every day with submissions, oldest first"""
     conn = get_database_connection()
     cursor = conn.cursor()
     
     try:
-        # Get resume data joined with analysis data
         cursor.execute('''
-        SELECT 
-            r.id,
-            r.name,
-            r.email,
-            r.phone,
-            r.linkedin,
-            r.github,
-            r.portfolio,
-            r.target_role,
-            r.target_category,
-            r.created_at,
-            a.ats_score,
-            a.keyword_match_score,
-            a.format_score,
-            a.section_score
-        FROM resume_data r
-        LEFT JOIN resume_analysis a ON r.id = a.resume_id
-        ORDER BY r.created_at DESC
+            SELECT day, SUM(submissions)
+            FROM daily_resume_stats
+            GROUP BY day
+            ORDER BY day
         ''')
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error getting resume data: {str(e)}")
+        print(f"Error getting daily resume counts: {str(e)}")
         return []
     finally:
         conn.close()
@@ -313,26 +612,6 @@ def create_default_admin():
     finally:
         conn.close()
 
-def get_all_resume_data():
-    """Get all resume data for admin dashboard"""
-    conn = get_database_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            SELECT rd.*, ra.score, ra.ats_score, ra.predicted_role, ra.experience_level,
-                   ra.analysis_date, ra.model_used
-            FROM resume_data rd
-            LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
-            ORDER BY rd.created_at DESC
-        ''')
-        return cursor.fetchall()
-    except Exception as e:
-        print(f"Error getting resume data: {str(e)}")
-        return []
-    finally:
-        conn.close()
-
 def get_admin_analytics():
     """Get analytics data for admin dashboard"""
     conn = get_database_connection()
@@ -411,23 +690,16 @@ def save_ai_analysis_data(resume_id, analysis_data):
                 resume_score INTEGER,
                 job_role TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                analysis_text TEXT,
                 FOREIGN KEY (resume_id) REFERENCES resume_data (id)
             )
         """)
         
         # Insert the analysis data
-        cursor.execute("""
-            INSERT INTO ai_analysis (
-                resume_id, model_used, resume_score, job_role
-            ) VALUES (?, ?, ?, ?)
-        """, (
-            resume_id,
-            analysis_data.get('model_used', ''),
-            analysis_data.get('resume_score', 0),
-            analysis_data.get('job_role', '')
-        ))
+        cursor.execute(AI_ANALYSIS_INSERT, _ai_analysis_row(resume_id, analysis_data))
         
         conn.commit()
+        invalidate_stats_cache()
         return cursor.lastrowid
     except Exception as e:
         print(f"Error saving AI analysis data: {e}")
@@ -443,11 +715,7 @@ def get_ai_analysis_stats():
     
     try:
         # Check if the ai_analysis table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master WHERE type='table' AND name='ai_analysis'
-        """)
-        
-        if not cursor.fetchone():
+        if not dialect_for(conn).table_exists(cursor, 'ai_analysis'):
             return {
                 "total_analyses": 0,
                 "model_usage": [],
@@ -455,22 +723,18 @@ def get_ai_analysis_stats():
                 "top_job_roles": []
             }
         
-        # Get total number of analyses
-        cursor.execute("SELECT COUNT(*) FROM ai_analysis")
-        total_analyses = cursor.fetchone()[0]
-        
-        # Get model usage statistics
+        # Get model usage, total analyses and average score from the daily rollup
         cursor.execute("""
-            SELECT model_used, COUNT(*) as count
-            FROM ai_analysis
+            SELECT model_used, SUM(analyses) as count, SUM(score_sum), SUM(score_count)
+            FROM daily_ai_stats
             GROUP BY model_used
             ORDER BY count DESC
         """)
-        model_usage = [{"model": row[0], "count": row[1]} for row in cursor.fetchall()]
-        
-        # Get average resume score
-        cursor.execute("SELECT AVG(resume_score) FROM ai_analysis")
-        average_score = cursor.fetchone()[0] or 0
+        rows = cursor.fetchall()
+        model_usage = [{"model": row[0], "count": row[1]} for row in rows]
+        total_analyses = sum(row[1] for row in rows)
+        score_count = sum(row[3] for row in rows)
+        average_score = sum(row[2] for row in rows) / score_count if score_count else 0
         
         # Get top job roles
         cursor.execute("""
@@ -500,17 +764,28 @@ def get_ai_analysis_stats():
         conn.close()
 
 def get_detailed_ai_analysis_stats():
-    """Get detailed statistics about AI analyzer usage including daily trends"""
+    """Get detailed statistics about AI analyzer usage including daily trends (cached, see config.stats_cache)"""
+    try:
+        return copy.deepcopy(get_stats_cache().get("detailed_ai_analysis_stats", _compute_detailed_ai_analysis_stats))
+    except Exception as e:
+        print(f"Error getting detailed AI analysis stats: {e}")
+        return {
+            "total_analyses": 0,
+            "model_usage": [],
+            "average_score": 0,
+            "top_job_roles": [],
+            "daily_trend": [],
+            "score_distribution": [],
+            "recent_analyses": []
+        }
+
+def _compute_detailed_ai_analysis_stats():
     conn = get_database_connection()
     cursor = conn.cursor()
     
     try:
         # Check if the ai_analysis table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master WHERE type='table' AND name='ai_analysis'
-        """)
-        
-        if not cursor.fetchone():
+        if not dialect_for(conn).table_exists(cursor, 'ai_analysis'):
             return {
                 "total_analyses": 0,
                 "model_usage": [],
@@ -521,22 +796,18 @@ def get_detailed_ai_analysis_stats():
                 "recent_analyses": []
             }
         
-        # Get total number of analyses
-        cursor.execute("SELECT COUNT(*) FROM ai_analysis")
-        total_analyses = cursor.fetchone()[0]
-        
-        # Get model usage statistics
+        # Get model usage, total analyses and average score from the daily rollup
         cursor.execute("""
-            SELECT model_used, COUNT(*) as count
-            FROM ai_analysis
+            SELECT model_used, SUM(analyses) as count, SUM(score_sum), SUM(score_count)
+            FROM daily_ai_stats
             GROUP BY model_used
             ORDER BY count DESC
         """)
-        model_usage = [{"model": row[0], "count": row[1]} for row in cursor.fetchall()]
-        
-        # Get average resume score
-        cursor.execute("SELECT AVG(resume_score) FROM ai_analysis")
-        average_score = cursor.fetchone()[0] or 0
+        rows = cursor.fetchall()
+        model_usage = [{"model": row[0], "count": row[1]} for row in rows]
+        total_analyses = sum(row[1] for row in rows)
+        score_count = sum(row[3] for row in rows)
+        average_score = sum(row[2] for row in rows) / score_count if score_count else 0
         
         # Get top job roles
         cursor.execute("""
@@ -550,12 +821,12 @@ def get_detailed_ai_analysis_stats():
         
         # Get daily trend for the last 7 days
         cursor.execute("""
-            SELECT DATE(created_at) as date, COUNT(*) as count
-            FROM ai_analysis
-            WHERE created_at >= date('now', '-7 days')
-            GROUP BY DATE(created_at)
-            ORDER BY date
-        """)
+            SELECT day as date, SUM(analyses) as count
+            FROM daily_ai_stats
+            WHERE day >= ?
+            GROUP BY day
+            ORDER BY day
+        """, ((datetime.utcnow().date() - timedelta(days=7)).isoformat(),))
         daily_trend = [{"date": row[0], "count": row[1]} for row in cursor.fetchall()]
         
         # Get score distribution
@@ -578,7 +849,7 @@ def get_detailed_ai_analysis_stats():
         
         # Get recent analyses
         cursor.execute("""
-            SELECT model_used, resume_score, job_role, datetime(created_at) as date
+            SELECT model_used, resume_score, job_role, created_at as date
             FROM ai_analysis
             ORDER BY created_at DESC
             LIMIT 5
@@ -601,17 +872,6 @@ def get_detailed_ai_analysis_stats():
             "score_distribution": score_distribution,
             "recent_analyses": recent_analyses
         }
-    except Exception as e:
-        print(f"Error getting detailed AI analysis stats: {e}")
-        return {
-            "total_analyses": 0,
-            "model_usage": [],
-            "average_score": 0,
-            "top_job_roles": [],
-            "daily_trend": [],
-            "score_distribution": [],
-            "recent_analyses": []
-        }
     finally:
         conn.close()
 
@@ -622,16 +882,14 @@ def reset_ai_analysis_stats():
     
     try:
         # Check if the ai_analysis table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master WHERE type='table' AND name='ai_analysis'
-        """)
-        
-        if not cursor.fetchone():
+        if not dialect_for(conn).table_exists(cursor, 'ai_analysis'):
             return {"success": False, "message": "AI analysis table does not exist"}
         
         # Delete all records from the ai_analysis table
         cursor.execute("DELETE FROM ai_analysis")
+        cursor.execute("DELETE FROM daily_ai_stats")
         conn.commit()
+        invalidate_stats_cache()
         
         return {"success": True, "message": "AI analysis statistics have been reset successfully"}
     except Exception as e:
@@ -639,4 +897,294 @@ def reset_ai_analysis_stats():
         print(f"Error resetting AI analysis stats: {e}")
         return {"success": False, "message": f"Error resetting AI analysis statistics: {str(e)}"}
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+def save_report_artifact(analysis_id, content_hash, artifact):
+    """Record a rendered PDF report (location, size, generation time and the analysis it was built from)"""
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS report_artifacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                analysis_id INTEGER,
+                content_hash TEXT NOT NULL,
+                file_path TEXT,
+                size_bytes INTEGER,
+                generation_ms REAL,
+                candidate_name TEXT,
+                job_role TEXT,
+                analysis_json TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (analysis_id, content_hash)
+            )
+        """)
+        
+        cursor.execute("""
+            INSERT INTO report_artifacts (
+                analysis_id, content_hash, file_path, size_bytes, generation_ms,
+                candidate_name, job_role, analysis_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (analysis_id, content_hash) DO UPDATE SET
+                file_path = excluded.file_path,
+                size_bytes = excluded.size_bytes,
+                generation_ms = excluded.generation_ms,
+                candidate_name = excluded.candidate_name,
+                job_role = excluded.job_role,
+                analysis_json = excluded.analysis_json
+        """, (
+            analysis_id,
+            content_hash,
+            artifact.get('file_path'),
+            artifact.get('size_bytes', 0),
+            artifact.get('generation_ms', 0),
+            artifact.get('candidate_name', ''),
+            artifact.get('job_role', ''),
+            artifact.get('analysis_json', '')
+        ))
+        
+        conn.commit()
+        return cursor.lastrowid
+    except Exception as e:
+        print(f"Error saving report artifact: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+def get_report_artifact(analysis_id, content_hash):
+    """Get a recorded report artifact, or None"""
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT file_path, size_bytes, generation_ms, candidate_name, job_role, analysis_json
+            FROM report_artifacts
+            WHERE (analysis_id = ? OR (analysis_id IS NULL AND ? IS NULL)) AND content_hash = ?
+        """, (analysis_id, analysis_id, content_hash))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            "file_path": row[0],
+            "size_bytes": row[1],
+            "generation_ms": row[2],
+            "candidate_name": row[3],
+            "job_role": row[4],
+            "analysis_json": row[5]
+        }
+    except get_storage().Error:
+        # No reports rendered yet
+        return None
+    finally:
+        conn.close()
+
+def get_report_sources(start_date, end_date):
+    """
+    AI analyses created between two dates (inclusive) with the metadata of their latest rendered report
+
+    Only ids and metadata are loaded; get_report_input() loads each report's inputs.
+    available is False for analyses with neither a rendered report nor analysis text.
+    """
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT a.id, a.job_role, a.created_at, ra.id, ra.content_hash, ra.candidate_name, ra.job_role,
+                   rd.name, ra.id IS NOT NULL OR COALESCE(a.analysis_text, '') <> ''
+            FROM ai_analysis a
+            LEFT JOIN report_artifacts ra ON ra.id = (
+                SELECT MAX(id) FROM report_artifacts WHERE analysis_id = a.id
+            )
+            LEFT JOIN resume_data rd ON rd.id = a.resume_id
+            WHERE a.created_at >= ? AND a.created_at < ?
+            ORDER BY a.created_at, a.id
+        """, (str(start_date), str(end_date + timedelta(days=1))))
+        return [
+            {
+                "analysis_id": row[0],
+                "job_role": row[6] or row[1],
+                "created_at": row[2],
+                "artifact_id": row[3],
+                "content_hash": row[4],
+                "candidate_name": row[5] or row[7],
+                "available": bool(row[8])
+            }
+            for row in cursor.fetchall()
+        ]
+    except get_storage().Error:
+        # No analyses or reports recorded yet
+        return []
+    finally:
+        conn.close()
+
+def get_report_input(source):
+    """
+    The analysis a report source (from get_report_sources) renders
+    
+    The inputs of its latest rendered report, or else one built from the saved
+    analysis: its text, score and model.
+    """
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        if source["artifact_id"] is not None:
+            cursor.execute("SELECT analysis_json FROM report_artifacts WHERE id = ?", (source["artifact_id"],))
+            return json.loads(cursor.fetchone()[0])
+        cursor.execute("""
+            SELECT analysis_text, resume_score, model_used, created_at
+            FROM ai_analysis
+            WHERE id = ?
+        """, (source["analysis_id"],))
+        analysis_text, resume_score, model_used, created_at = cursor.fetchone()
+        return {
+            "score": resume_score or 0,
+            "model_used": model_used or "AI",
+            "full_response": analysis_text or "",
+            "generated_on": str(created_at)[:10]
+        }
+    finally:
+        conn.close()
+
+SEARCH_QUERIES = {
+    # Ranked full-text search per dialect (indexes from migrations 6 and 9)
+    'sqlite': {
+        'resumes': '''
+            SELECT r.id, r.name, r.email, r.target_role, r.target_category, r.created_at,
+                   snippet(resume_search, -1, '**', '**', '…', 16), -rank
+            FROM resume_search
+            JOIN resume_data r ON r.id = resume_search.rowid
+            WHERE resume_search MATCH :query
+              AND rank MATCH 'bm25(10.0, 8.0, 5.0, 3.0, 1.0)'
+            ORDER BY rank
+            LIMIT :limit
+        ''',
+        'analyses': '''
+            SELECT a.id, a.resume_id, a.job_role, a.model_used, a.resume_score, a.created_at,
+                   snippet(analysis_search, -1, '**', '**', '…', 16), -rank
+            FROM analysis_search
+            JOIN ai_analysis a ON a.id = analysis_search.rowid
+            WHERE analysis_search MATCH :query
+              AND rank MATCH 'bm25(8.0, 2.0, 1.0)'
+            ORDER BY rank
+            LIMIT :limit
+        ''',
+    },
+    'postgresql': {
+        'resumes': f'''
+            SELECT id, name, email, target_role, target_category, created_at,
+                   ts_headline('english', COALESCE(name, '') || ' ' || COALESCE(target_role, '') || ' ' ||
+                               COALESCE(skills, '') || ' ' || COALESCE(summary, '') || ' ' ||
+                               COALESCE(experience, ''), query,
+                               'StartSel=**, StopSel=**, MaxWords=16, MinWords=6'),
+                   relevance
+            FROM (
+                SELECT r.*, query, ts_rank({PG_RESUME_DOCUMENT}, query) AS relevance
+                FROM resume_data r, to_tsquery('english', :query) query
+                WHERE {PG_RESUME_DOCUMENT} @@ query
+                ORDER BY relevance DESC
+                LIMIT :limit
+            ) matches
+            ORDER BY relevance DESC
+        ''',
+        'analyses': f'''
+            SELECT a.id, a.resume_id, a.job_role, a.model_used, a.resume_score, a.created_at,
+                   ts_headline('english', COALESCE(matches.job_role, '') || ' ' || COALESCE(matches.model_used, '') || ' ' ||
+                               COALESCE(matches.analysis_text, ''), query,
+                               'StartSel=**, StopSel=**, MaxWords=16, MinWords=6'),
+                   relevance
+            FROM (
+                SELECT s.*, query, ts_rank({PG_ANALYSIS_DOCUMENT}, query) AS relevance
+                FROM analysis_search s, to_tsquery('english', :query) query
+                WHERE {PG_ANALYSIS_DOCUMENT} @@ query
+                ORDER BY relevance DESC
+                LIMIT :limit
+            ) matches
+            JOIN ai_analysis a ON a.id = matches.analysis_id
+            ORDER BY relevance DESC
+        ''',
+    },
+}
+
+def _search_terms(text):
+    """
+    Search box text as (words, prefix) terms, all of which must match
+    
+    "Quoted phrases" are one term matched as a phrase, every other word is its own
+    term. The last word also matches as a prefix while it is still being typed.
+    Only words are kept, so search operators in the input are never interpreted.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\w+)', text):
+        words = re.findall(r'\w+', phrase) if phrase else [word]
+        if words:
+            terms.append((words, False))
+    if terms and re.search(r'\w$', text):
+        terms[-1] = (terms[-1][0], True)
+    return terms
+
+def _fts5_query(terms):
+    return ' '.join(f'"{" ".join(words)}"' + ('*' if prefix else '') for words, prefix in terms)
+
+def _tsquery(terms):
+    return ' & '.join(
+        '(' + ' <-> '.join(words) + (':*' if prefix else '') + ')' for words, prefix in terms
+    )
+
+def _search(kind, text, limit):
+    terms = _search_terms(text)
+    if not terms:
+        return []
+    conn = get_database_connection()
+    cursor = conn.cursor()
+    
+    try:
+        dialect = dialect_for(conn).name
+        query = _fts5_query(terms) if dialect == 'sqlite' else _tsquery(terms)
+        cursor.execute(SEARCH_QUERIES[dialect][kind], {'query': query, 'limit': limit})
+        return cursor.fetchall()
+    except Exception as e:
+        print(f"Error searching {kind}: {str(e)}")
+        return []
+    finally:
+        conn.close()
+
+def search_resumes(text, limit=20):
+    """
+    Resumes ranked by how well their name, role, skills, summary and experience match the search text
+    
+    Every word must match (see _search_terms). Returns up to limit results with a
+    snippet of the best matching text, matches in **bold**.
+    """
+    return [
+        {
+            "id": row[0],
+            "name": row[1],
+            "email": row[2],
+            "target_role": row[3],
+            "target_category": row[4],
+            "created_at": row[5],
+            "snippet": row[6],
+            "relevance": row[7]
+        }
+        for row in _search('resumes', text, limit)
+    ]
+
+def search_ai_analyses(text, limit=20):
+    """AI analyses ranked by how well their job role, model and analysis text match the search text"""
+    return [
+        {
+            "id": row[0],
+            "resume_id": row[1],
+            "job_role": row[2],
+            "model_used": row[3],
+            "resume_score": row[4],
+            "created_at": row[5],
+            "snippet": row[6],
+            "relevance": row[7]
+        }
+        for row in _search('analyses', text, limit)
+    ]
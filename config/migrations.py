@@ -0,0 +1,587 @@
+"""
+Versioned schema migrations for the resume database
+
+Each migration is a numbered list of statements applied once, in order, inside its
+own transaction; applied versions are recorded in the schema_migrations table.
+init_database() runs any pending migrations on startup, so existing databases pick
+up new indexes without manual steps. Add new migrations to the end of MIGRATIONS
+and never edit one that has shipped.
+
+A statement is a string, or a dict of statements keyed by dialect name
+("sqlite", "postgresql") where the SQL differs between backends; a dialect
+missing from the dict skips that statement.
+"""
+import time
+
+from config.storage import dialect_for
+
+
+def _pg_trigger(trigger, table, event, function, body):
+    """PostgreSQL row trigger running body (statements using NEW/OLD) after event on table"""
+    return f"""
+        CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+        BEGIN
+            {body}
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        DROP TRIGGER IF EXISTS {trigger} ON {table};
+        CREATE TRIGGER {trigger} AFTER {event} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {function}()
+        """
+
+
+def _pg_rollup_trigger(table, function, body):
+    """PostgreSQL trigger running body (INSERT ... ; statements using NEW) after each insert into table"""
+    return _pg_trigger(f"trg_{table}_rollup", table, "INSERT", function, body)
+
+
+def _sqlite_json_text(column):
+    """Every string value in a JSON column joined by spaces (the column itself if it isn't JSON)"""
+    return f"""CASE WHEN json_valid({column})
+        THEN (SELECT group_concat(value, ' ') FROM json_tree({column}) WHERE type = 'text')
+        ELSE {column} END"""
+
+
+# Documents indexed for PostgreSQL full-text search; queries must use the same expressions
+PG_RESUME_DOCUMENT = (
+    "to_tsvector('english', COALESCE(name, '') || ' ' || COALESCE(target_role, '') || ' ' || "
+    "COALESCE(skills, '') || ' ' || COALESCE(summary, '') || ' ' || COALESCE(experience, ''))"
+)
+PG_ANALYSIS_DOCUMENT = (
+    "to_tsvector('english', COALESCE(job_role, '') || ' ' || COALESCE(model_used, '') || ' ' || "
+    "COALESCE(analysis_text, ''))"
+)
+
+
+MIGRATIONS = [
+    (1, "Indexes for dashboard filters, joins and date ranges", [
+        # ai_analysis is otherwise created lazily on the first saved analysis
+        """
+        CREATE TABLE IF NOT EXISTS ai_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            resume_id INTEGER,
+            model_used TEXT,
+            resume_score INTEGER,
+            job_role TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (resume_id) REFERENCES resume_data (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_resume_data_created_at ON resume_data (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_data_target_category ON resume_data (target_category)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_analysis_resume_id ON resume_analysis (resume_id, ats_score, keyword_match_score)",
+        # Covers the weekly ATS score comparisons without table lookups
+        "CREATE INDEX IF NOT EXISTS idx_resume_analysis_created_at ON resume_analysis (created_at, ats_score)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_skills_resume_id ON resume_skills (resume_id)",
+        "CREATE INDEX IF NOT EXISTS idx_ai_analysis_created_at ON ai_analysis (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ai_analysis_model_used ON ai_analysis (model_used)",
+        "CREATE INDEX IF NOT EXISTS idx_ai_analysis_job_role ON ai_analysis (job_role)",
+        "CREATE INDEX IF NOT EXISTS idx_admin_logs_timestamp ON admin_logs (timestamp)",
+        # Give the query planner row counts for choosing between the new indexes
+        "ANALYZE",
+    ]),
+    (2, "Skill and category indexes for normalized resume_skills", [
+        {
+            "sqlite": "CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill_name COLLATE NOCASE)",
+            "postgresql": "CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (LOWER(skill_name))",
+        },
+        "CREATE INDEX IF NOT EXISTS idx_resume_skills_category ON resume_skills (skill_category)",
+    ]),
+    (3, "Daily rollup tables maintained by insert triggers", [
+        """
+        CREATE TABLE IF NOT EXISTS daily_resume_stats (
+            day TEXT NOT NULL,
+            target_category TEXT NOT NULL,
+            submissions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, target_category)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS daily_ats_stats (
+            day TEXT NOT NULL,
+            target_category TEXT NOT NULL,
+            analyses INTEGER NOT NULL DEFAULT 0,
+            ats_sum REAL NOT NULL DEFAULT 0,
+            ats_count INTEGER NOT NULL DEFAULT 0,
+            keyword_sum REAL NOT NULL DEFAULT 0,
+            keyword_count INTEGER NOT NULL DEFAULT 0,
+            high_scoring INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, target_category)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS daily_ai_stats (
+            day TEXT NOT NULL,
+            model_used TEXT NOT NULL,
+            analyses INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            score_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, model_used)
+        )
+        """,
+        # Seed the rollups from existing rows
+        {
+            "sqlite": """
+            INSERT OR REPLACE INTO daily_resume_stats (day, target_category, submissions)
+            SELECT substr(created_at, 1, 10), COALESCE(target_category, ''), COUNT(*)
+            FROM resume_data
+            GROUP BY 1, 2
+            """,
+            "postgresql": """
+            INSERT INTO daily_resume_stats (day, target_category, submissions)
+            SELECT substr(created_at::text, 1, 10), COALESCE(target_category, ''), COUNT(*)
+            FROM resume_data
+            GROUP BY 1, 2
+            """,
+        },
+        {
+            "sqlite": """
+            INSERT OR REPLACE INTO daily_ats_stats (
+                day, target_category, analyses, ats_sum, ats_count, keyword_sum, keyword_count, high_scoring
+            )
+            SELECT substr(ra.created_at, 1, 10), COALESCE(rd.target_category, ''), COUNT(*),
+                   COALESCE(SUM(ra.ats_score), 0), COUNT(ra.ats_score),
+                   COALESCE(SUM(ra.keyword_match_score), 0), COUNT(ra.keyword_match_score),
+                   SUM(CASE WHEN ra.ats_score >= 70 THEN 1 ELSE 0 END)
+            FROM resume_analysis ra
+            LEFT JOIN resume_data rd ON rd.id = ra.resume_id
+            GROUP BY 1, 2
+            """,
+            "postgresql": """
+            INSERT INTO daily_ats_stats (
+                day, target_category, analyses, ats_sum, ats_count, keyword_sum, keyword_count, high_scoring
+            )
+            SELECT substr(ra.created_at::text, 1, 10), COALESCE(rd.target_category, ''), COUNT(*),
+                   COALESCE(SUM(ra.ats_score), 0), COUNT(ra.ats_score),
+                   COALESCE(SUM(ra.keyword_match_score), 0), COUNT(ra.keyword_match_score),
+                   SUM(CASE WHEN ra.ats_score >= 70 THEN 1 ELSE 0 END)
+            FROM resume_analysis ra
+            LEFT JOIN resume_data rd ON rd.id = ra.resume_id
+            GROUP BY 1, 2
+            """,
+        },
+        {
+            "sqlite": """
+            INSERT OR REPLACE INTO daily_ai_stats (day, model_used, analyses, score_sum, score_count)
+            SELECT substr(created_at, 1, 10), COALESCE(model_used, ''), COUNT(*),
+                   COALESCE(SUM(resume_score), 0), COUNT(resume_score)
+            FROM ai_analysis
+            GROUP BY 1, 2
+            """,
+            "postgresql": """
+            INSERT INTO daily_ai_stats (day, model_used, analyses, score_sum, score_count)
+            SELECT substr(created_at::text, 1, 10), COALESCE(model_used, ''), COUNT(*),
+                   COALESCE(SUM(resume_score), 0), COUNT(resume_score)
+            FROM ai_analysis
+            GROUP BY 1, 2
+            """,
+        },
+        # Keep them current on every insert, whichever code path writes
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_data_rollup AFTER INSERT ON resume_data
+            BEGIN
+                INSERT INTO daily_resume_stats (day, target_category, submissions)
+                VALUES (substr(NEW.created_at, 1, 10), COALESCE(NEW.target_category, ''), 1)
+                ON CONFLICT (day, target_category) DO UPDATE SET submissions = submissions + 1;
+            END
+            """,
+            "postgresql": _pg_rollup_trigger("resume_data", "rollup_resume_data", """
+                    INSERT INTO daily_resume_stats (day, target_category, submissions)
+                    VALUES (substr(NEW.created_at::text, 1, 10), COALESCE(NEW.target_category, ''), 1)
+                    ON CONFLICT (day, target_category) DO UPDATE SET
+                        submissions = daily_resume_stats.submissions + 1;
+                """),
+        },
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_analysis_rollup AFTER INSERT ON resume_analysis
+            BEGIN
+                INSERT INTO daily_ats_stats (
+                    day, target_category, analyses, ats_sum, ats_count, keyword_sum, keyword_count, high_scoring
+                )
+                VALUES (
+                    substr(NEW.created_at, 1, 10),
+                    COALESCE((SELECT target_category FROM resume_data WHERE id = NEW.resume_id), ''),
+                    1,
+                    COALESCE(NEW.ats_score, 0), NEW.ats_score IS NOT NULL,
+                    COALESCE(NEW.keyword_match_score, 0), NEW.keyword_match_score IS NOT NULL,
+                    COALESCE(NEW.ats_score >= 70, 0)
+                )
+                ON CONFLICT (day, target_category) DO UPDATE SET
+                    analyses = analyses + 1,
+                    ats_sum = ats_sum + excluded.ats_sum,
+                    ats_count = ats_count + excluded.ats_count,
+                    keyword_sum = keyword_sum + excluded.keyword_sum,
+                    keyword_count = keyword_count + excluded.keyword_count,
+                    high_scoring = high_scoring + excluded.high_scoring;
+            END
+            """,
+            "postgresql": _pg_rollup_trigger("resume_analysis", "rollup_resume_analysis", """
+                    INSERT INTO daily_ats_stats (
+                        day, target_category, analyses, ats_sum, ats_count, keyword_sum, keyword_count, high_scoring
+                    )
+                    VALUES (
+                        substr(NEW.created_at::text, 1, 10),
+                        COALESCE((SELECT target_category FROM resume_data WHERE id = NEW.resume_id), ''),
+                        1,
+                        COALESCE(NEW.ats_score, 0), (NEW.ats_score IS NOT NULL)::int,
+                        COALESCE(NEW.keyword_match_score, 0), (NEW.keyword_match_score IS NOT NULL)::int,
+                        COALESCE((NEW.ats_score >= 70)::int, 0)
+                    )
+                    ON CONFLICT (day, target_category) DO UPDATE SET
+                        analyses = daily_ats_stats.analyses + 1,
+                        ats_sum = daily_ats_stats.ats_sum + excluded.ats_sum,
+                        ats_count = daily_ats_stats.ats_count + excluded.ats_count,
+                        keyword_sum = daily_ats_stats.keyword_sum + excluded.keyword_sum,
+                        keyword_count = daily_ats_stats.keyword_count + excluded.keyword_count,
+                        high_scoring = daily_ats_stats.high_scoring + excluded.high_scoring;
+                """),
+        },
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_ai_analysis_rollup AFTER INSERT ON ai_analysis
+            BEGIN
+                INSERT INTO daily_ai_stats (day, model_used, analyses, score_sum, score_count)
+                VALUES (
+                    substr(NEW.created_at, 1, 10), COALESCE(NEW.model_used, ''), 1,
+                    COALESCE(NEW.resume_score, 0), NEW.resume_score IS NOT NULL
+                )
+                ON CONFLICT (day, model_used) DO UPDATE SET
+                    analyses = analyses + 1,
+                    score_sum = score_sum + excluded.score_sum,
+                    score_count = score_count + excluded.score_count;
+            END
+            """,
+            "postgresql": _pg_rollup_trigger("ai_analysis", "rollup_ai_analysis", """
+                    INSERT INTO daily_ai_stats (day, model_used, analyses, score_sum, score_count)
+                    VALUES (
+                        substr(NEW.created_at::text, 1, 10), COALESCE(NEW.model_used, ''), 1,
+                        COALESCE(NEW.resume_score, 0), (NEW.resume_score IS NOT NULL)::int
+                    )
+                    ON CONFLICT (day, model_used) DO UPDATE SET
+                        analyses = daily_ai_stats.analyses + 1,
+                        score_sum = daily_ai_stats.score_sum + excluded.score_sum,
+                        score_count = daily_ai_stats.score_count + excluded.score_count;
+                """),
+        },
+    ]),
+    (4, "Progress of the write-behind queue journal", [
+        # Highest journal sequence number committed, so replay after a crash skips applied records
+        """
+        CREATE TABLE IF NOT EXISTS write_queue_state (
+            journal TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+    ]),
+    (5, "Indexes for the filtered, keyset-paginated admin resume listing", [
+        # Filter by role or category and page by submission date from one index
+        "CREATE INDEX IF NOT EXISTS idx_resume_data_role_created_at ON resume_data (target_role, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_data_category_created_at ON resume_data (target_category, created_at)",
+        # Superseded by the category/date index
+        "DROP INDEX IF EXISTS idx_resume_data_target_category",
+    ]),
+    (6, "Full-text search over resumes and AI analyses, maintained by triggers", [
+        # report_artifacts is otherwise created lazily on the first rendered report
+        """
+        CREATE TABLE IF NOT EXISTS report_artifacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            analysis_id INTEGER,
+            content_hash TEXT NOT NULL,
+            file_path TEXT,
+            size_bytes INTEGER,
+            generation_ms REAL,
+            candidate_name TEXT,
+            job_role TEXT,
+            analysis_json TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (analysis_id, content_hash)
+        )
+        """,
+        # Resumes: an index over resume_data's own text columns
+        {
+            "sqlite": """
+            CREATE VIRTUAL TABLE IF NOT EXISTS resume_search USING fts5(
+                name, target_role, skills, summary, experience,
+                content = 'resume_data', content_rowid = 'id', tokenize = 'porter unicode61'
+            )
+            """,
+            "postgresql": f"CREATE INDEX IF NOT EXISTS idx_resume_data_search ON resume_data USING GIN ({PG_RESUME_DOCUMENT})",
+        },
+        {"sqlite": "INSERT INTO resume_search (resume_search) VALUES ('rebuild')"},
+        {"sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_data_search_insert AFTER INSERT ON resume_data
+            BEGIN
+                INSERT INTO resume_search (rowid, name, target_role, skills, summary, experience)
+                VALUES (NEW.id, NEW.name, NEW.target_role, NEW.skills, NEW.summary, NEW.experience);
+            END
+            """},
+        {"sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_data_search_delete AFTER DELETE ON resume_data
+            BEGIN
+                INSERT INTO resume_search (resume_search, rowid, name, target_role, skills, summary, experience)
+                VALUES ('delete', OLD.id, OLD.name, OLD.target_role, OLD.skills, OLD.summary, OLD.experience);
+            END
+            """},
+        {"sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_data_search_update AFTER UPDATE ON resume_data
+            BEGIN
+                INSERT INTO resume_search (resume_search, rowid, name, target_role, skills, summary, experience)
+                VALUES ('delete', OLD.id, OLD.name, OLD.target_role, OLD.skills, OLD.summary, OLD.experience);
+                INSERT INTO resume_search (rowid, name, target_role, skills, summary, experience)
+                VALUES (NEW.id, NEW.name, NEW.target_role, NEW.skills, NEW.summary, NEW.experience);
+            END
+            """},
+        # AI analyses: job role and model from ai_analysis, text from the latest rendered report's analysis
+        {
+            "sqlite": """
+            CREATE VIRTUAL TABLE IF NOT EXISTS analysis_search USING fts5(
+                job_role, model_used, analysis_text, tokenize = 'porter unicode61'
+            )
+            """,
+            "postgresql": """
+            CREATE TABLE IF NOT EXISTS analysis_search (
+                analysis_id INTEGER PRIMARY KEY,
+                job_role TEXT,
+                model_used TEXT,
+                analysis_text TEXT
+            )
+            """,
+        },
+        {"postgresql": f"CREATE INDEX IF NOT EXISTS idx_analysis_search ON analysis_search USING GIN ({PG_ANALYSIS_DOCUMENT})"},
+        {"postgresql": """
+            CREATE OR REPLACE FUNCTION analysis_search_text(doc TEXT) RETURNS TEXT AS $$
+            BEGIN
+                RETURN (
+                    SELECT string_agg(value #>> '{}', ' ')
+                    FROM jsonb_path_query(doc::jsonb, 'strict $.** ? (@.type() == "string")') AS value
+                );
+            EXCEPTION WHEN others THEN
+                RETURN doc;
+            END
+            $$ LANGUAGE plpgsql IMMUTABLE
+            """},
+        {
+            "sqlite": f"""
+            INSERT INTO analysis_search (rowid, job_role, model_used, analysis_text)
+            SELECT a.id, a.job_role, a.model_used, COALESCE({_sqlite_json_text('ra.analysis_json')}, '')
+            FROM ai_analysis a
+            LEFT JOIN report_artifacts ra ON ra.id = (
+                SELECT MAX(id) FROM report_artifacts WHERE analysis_id = a.id
+            )
+            """,
+            "postgresql": """
+            INSERT INTO analysis_search (analysis_id, job_role, model_used, analysis_text)
+            SELECT a.id, a.job_role, a.model_used, COALESCE(analysis_search_text(ra.analysis_json), '')
+            FROM ai_analysis a
+            LEFT JOIN report_artifacts ra ON ra.id = (
+                SELECT MAX(id) FROM report_artifacts WHERE analysis_id = a.id
+            )
+            """,
+        },
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_ai_analysis_search_insert AFTER INSERT ON ai_analysis
+            BEGIN
+                INSERT INTO analysis_search (rowid, job_role, model_used, analysis_text)
+                VALUES (NEW.id, NEW.job_role, NEW.model_used, '');
+            END
+            """,
+            "postgresql": _pg_trigger("trg_ai_analysis_search_insert", "ai_analysis", "INSERT", "search_ai_analysis_insert", """
+                    INSERT INTO analysis_search (analysis_id, job_role, model_used, analysis_text)
+                    VALUES (NEW.id, NEW.job_role, NEW.model_used, '');
+                """),
+        },
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_ai_analysis_search_delete AFTER DELETE ON ai_analysis
+            BEGIN
+                DELETE FROM analysis_search WHERE rowid = OLD.id;
+            END
+            """,
+            "postgresql": _pg_trigger("trg_ai_analysis_search_delete", "ai_analysis", "DELETE", "search_ai_analysis_delete", """
+                    DELETE FROM analysis_search WHERE analysis_id = OLD.id;
+                """),
+        },
+        {
+            # Fires for new reports and for re-rendered ones (save_report_artifact upserts)
+            "sqlite": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_report_artifacts_search AFTER INSERT ON report_artifacts
+            WHEN NEW.analysis_id IS NOT NULL
+            BEGIN
+                UPDATE analysis_search SET analysis_text = COALESCE({_sqlite_json_text('NEW.analysis_json')}, '')
+                WHERE rowid = NEW.analysis_id;
+            END
+            """,
+            "postgresql": _pg_trigger("trg_report_artifacts_search", "report_artifacts", "INSERT OR UPDATE", "search_report_artifacts", """
+                    UPDATE analysis_search SET analysis_text = COALESCE(analysis_search_text(NEW.analysis_json), '')
+                    WHERE analysis_id = NEW.analysis_id;
+                """),
+        },
+        {"sqlite": f"""
+            CREATE TRIGGER IF NOT EXISTS trg_report_artifacts_search_update AFTER UPDATE ON report_artifacts
+            WHEN NEW.analysis_id IS NOT NULL
+            BEGIN
+                UPDATE analysis_search SET analysis_text = COALESCE({_sqlite_json_text('NEW.analysis_json')}, '')
+                WHERE rowid = NEW.analysis_id;
+            END
+            """},
+    ]),
+    (7, "Key write-behind queue progress by instance id", [
+        # Every replica sharing the database used the same journal file name as key
+        "ALTER TABLE write_queue_state RENAME COLUMN journal TO instance_id",
+        # Journal file name -> instance id (write_queue.journal is adopted as write_queue)
+        """
+        UPDATE write_queue_state SET instance_id = substr(instance_id, 1, length(instance_id) - 8)
+        WHERE substr(instance_id, length(instance_id) - 7) = '.journal'
+        """,
+    ]),
+    (8, "Latest ATS analysis stored on resume_data for the admin resume listing", [
+        "ALTER TABLE resume_data ADD COLUMN latest_analysis_id INTEGER",
+        # -1 until the resume has an analysis with a score, so it sorts below every score
+        {
+            "sqlite": "ALTER TABLE resume_data ADD COLUMN latest_ats_score REAL NOT NULL DEFAULT -1",
+            "postgresql": "ALTER TABLE resume_data ADD COLUMN latest_ats_score DOUBLE PRECISION NOT NULL DEFAULT -1",
+        },
+        """
+        UPDATE resume_data SET latest_analysis_id = (
+            SELECT MAX(id) FROM resume_analysis WHERE resume_id = resume_data.id
+        )
+        """,
+        """
+        UPDATE resume_data SET latest_ats_score = COALESCE(
+            (SELECT ats_score FROM resume_analysis WHERE id = resume_data.latest_analysis_id), -1
+        )
+        """,
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_analysis_latest AFTER INSERT ON resume_analysis
+            BEGIN
+                UPDATE resume_data SET latest_analysis_id = NEW.id, latest_ats_score = COALESCE(NEW.ats_score, -1)
+                WHERE id = NEW.resume_id AND (latest_analysis_id IS NULL OR latest_analysis_id < NEW.id);
+            END
+            """,
+            "postgresql": _pg_trigger("trg_resume_analysis_latest", "resume_analysis", "INSERT", "latest_resume_analysis", """
+                    UPDATE resume_data SET latest_analysis_id = NEW.id, latest_ats_score = COALESCE(NEW.ats_score, -1)
+                    WHERE id = NEW.resume_id AND (latest_analysis_id IS NULL OR latest_analysis_id < NEW.id);
+                """),
+        },
+        # Page by score straight from the index
+        "CREATE INDEX IF NOT EXISTS idx_resume_data_latest_ats_score ON resume_data (latest_ats_score, id)",
+        # Only changes to indexed text need to touch the search index, not every new analysis
+        {"sqlite": "DROP TRIGGER IF EXISTS trg_resume_data_search_update"},
+        {"sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_resume_data_search_update
+            AFTER UPDATE OF name, target_role, skills, summary, experience ON resume_data
+            BEGIN
+                INSERT INTO resume_search (resume_search, rowid, name, target_role, skills, summary, experience)
+                VALUES ('delete', OLD.id, OLD.name, OLD.target_role, OLD.skills, OLD.summary, OLD.experience);
+                INSERT INTO resume_search (rowid, name, target_role, skills, summary, experience)
+                VALUES (NEW.id, NEW.name, NEW.target_role, NEW.skills, NEW.summary, NEW.experience);
+            END
+            """},
+        "ANALYZE",
+    ]),
+    (9, "Index AI analysis text when the analysis is saved instead of when its report renders", [
+        "ALTER TABLE ai_analysis ADD COLUMN analysis_text TEXT",
+        # Keep the text already indexed from rendered reports
+        {
+            "sqlite": """
+            UPDATE ai_analysis SET analysis_text = (
+                SELECT NULLIF(analysis_text, '') FROM analysis_search WHERE rowid = ai_analysis.id
+            )
+            """,
+            "postgresql": """
+            UPDATE ai_analysis SET analysis_text = (
+                SELECT NULLIF(analysis_text, '') FROM analysis_search WHERE analysis_id = ai_analysis.id
+            )
+            """,
+        },
+        {"sqlite": "DROP TRIGGER IF EXISTS trg_report_artifacts_search"},
+        {"sqlite": "DROP TRIGGER IF EXISTS trg_report_artifacts_search_update"},
+        {"postgresql": "DROP TRIGGER IF EXISTS trg_report_artifacts_search ON report_artifacts"},
+        {"postgresql": "DROP FUNCTION IF EXISTS search_report_artifacts()"},
+        {"sqlite": "DROP TRIGGER IF EXISTS trg_ai_analysis_search_insert"},
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_ai_analysis_search_insert AFTER INSERT ON ai_analysis
+            BEGIN
+                INSERT INTO analysis_search (rowid, job_role, model_used, analysis_text)
+                VALUES (NEW.id, NEW.job_role, NEW.model_used, COALESCE(NEW.analysis_text, ''));
+            END
+            """,
+            "postgresql": _pg_trigger("trg_ai_analysis_search_insert", "ai_analysis", "INSERT", "search_ai_analysis_insert", """
+                    INSERT INTO analysis_search (analysis_id, job_role, model_used, analysis_text)
+                    VALUES (NEW.id, NEW.job_role, NEW.model_used, COALESCE(NEW.analysis_text, ''));
+                """),
+        },
+        {
+            "sqlite": """
+            CREATE TRIGGER IF NOT EXISTS trg_ai_analysis_search_update
+            AFTER UPDATE OF job_role, model_used, analysis_text ON ai_analysis
+            BEGIN
+                UPDATE analysis_search SET job_role = NEW.job_role, model_used = NEW.model_used,
+                    analysis_text = COALESCE(NEW.analysis_text, '')
+                WHERE rowid = NEW.id;
+            END
+            """,
+            "postgresql": _pg_trigger("trg_ai_analysis_search_update", "ai_analysis", "UPDATE OF job_role, model_used, analysis_text",
+                                      "search_ai_analysis_update", """
+                    UPDATE analysis_search SET job_role = NEW.job_role, model_used = NEW.model_used,
+                        analysis_text = COALESCE(NEW.analysis_text, '')
+                    WHERE analysis_id = NEW.id;
+                """),
+        },
+    ]),
+]
+
+
+def get_schema_version(conn):
+    """Highest applied migration version (0 for a fresh database)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    """Apply pending migrations in order; returns the versions applied"""
+    current = get_schema_version(conn)
+    conn.commit()
+    applied = []
+    for version, description, statements in migrations:
+        if version <= current:
+            continue
+        start = time.perf_counter()
+        try:
+            # Take the write lock first and re-check, so concurrent app processes migrate once
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            for statement in statements:
+                if isinstance(statement, dict):
+                    statement = statement.get(dialect_for(conn).name)
+                    if statement is None:
+                        continue
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description, duration_ms) VALUES (?, ?, ?)",
+                (version, description, round((time.perf_counter() - start) * 1000, 1))
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error applying database migration {version} ({description}): {str(e)}")
+            raise
+        applied.append(version)
+        print(f"Applied database migration {version}: {description}")
+    return applied
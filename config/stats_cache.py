@@ -0,0 +1,165 @@
+"""
+Process-wide cache for dashboard and admin statistics
+
+Statistics are computed once and shared by every session and rerun in the
+process. An entry is fresh for STATS_CACHE_TTL_SECONDS (default 30; 0 disables
+caching). Once it expires, or once a write invalidates it, readers keep getting
+the previous value while a background thread recomputes it (stale-while-
+revalidate), so dashboards render from memory even under load. Only a key that
+has never been computed is computed in the calling thread.
+
+save_resume_data, save_analysis_data and save_ai_analysis_data call
+invalidate_stats_cache() after they commit.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class _Entry:
+    __slots__ = ("value", "computed_at", "generation")
+
+    def __init__(self, value, computed_at, generation):
+        self.value = value
+        self.computed_at = computed_at
+        self.generation = generation
+
+
+class StatsCache:
+    """TTL cache with background refresh of expired or invalidated entries"""
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._key_locks = {}
+        self._refreshing = set()
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-cache")
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "invalidations": 0}
+
+    def _is_fresh(self, entry):
+        return (
+            entry.generation == self._generation
+            and time.monotonic() - entry.computed_at < self.ttl_seconds
+        )
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _compute(self, key, compute):
+        with self._lock:
+            generation = self._generation
+        value = compute()
+        entry = _Entry(value, time.monotonic(), generation)
+        with self._lock:
+            current = self._entries.get(key)
+            # A slower, older computation must not replace a newer one
+            if current is None or current.generation <= generation:
+                self._entries[key] = entry
+        return value
+
+    def _refresh_in_background(self, key, compute):
+        def run():
+            try:
+                with self._key_lock(key):
+                    self._compute(key, compute)
+                with self._lock:
+                    self._stats["refreshes"] += 1
+            except Exception as e:
+                print(f"Error refreshing cached statistics '{key}': {str(e)}")
+                with self._lock:
+                    self._stats["refresh_errors"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(run)
+
+    def get(self, key, compute):
+        """Cached value for key, computing it with compute() on first use"""
+        if self.ttl_seconds <= 0:
+            return compute()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and self._is_fresh(entry)
+            if fresh:
+                self._stats["hits"] += 1
+            elif entry is not None:
+                self._stats["stale_hits"] += 1
+        if fresh:
+            return entry.value
+        if entry is not None:
+            self._refresh_in_background(key, compute)
+            return entry.value
+
+        # Nothing to serve yet: compute once while concurrent callers wait for it
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry.value
+            with self._lock:
+                self._stats["misses"] += 1
+            return self._compute(key, compute)
+
+    def refresh(self, key, compute):
+        """Recompute key now, in the calling thread, and cache the result"""
+        if self.ttl_seconds <= 0:
+            return compute()
+        with self._key_lock(key):
+            return self._compute(key, compute)
+
+    def invalidate(self):
+        """Mark every entry stale; the next read of each triggers a background refresh"""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            reads = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "entries": len(self._entries),
+                **self._stats,
+                "hit_rate": round((self._stats["hits"] + self._stats["stale_hits"]) / reads, 3) if reads else 0.0,
+                "oldest_entry_age_s": round(max((now - e.computed_at for e in self._entries.values()), default=0.0), 1),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_stats_cache():
+    """The process-wide statistics cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = StatsCache(_env_float("STATS_CACHE_TTL_SECONDS", 30.0))
+        return _cache
+
+
+def invalidate_stats_cache():
+    """Mark all cached statistics stale after a write"""
+    get_stats_cache().invalidate()
+
+
+def get_stats_cache_stats():
+    return get_stats_cache().stats()
@@ -0,0 +1,484 @@
+"""
+Write-behind queue for analysis results
+
+Resumes, ATS analyses and AI analyses are queued in memory and written by a
+background thread in batched transactions, so pages never wait on SQLite.
+Each queue_* call returns a Future that resolves to the new row id once the
+record is committed.
+
+Records are appended to a journal file before they are queued. Every batch
+records the last journal sequence number it committed in write_queue_state within
+the same transaction, and records still in the journal after a crash are queued
+again on the next start without writing any twice. The journal is truncated (down
+to a checkpoint of the last sequence number) whenever the queue drains. Journal
+appends are flushed to the OS but not fsynced, which survives a process crash; set
+WRITE_QUEUE_FSYNC=1 to also survive power loss.
+
+Every process has its own journal, WRITE_QUEUE_DIR/<instance id>.journal, and holds
+a lock on it while running. The instance id is WRITE_QUEUE_INSTANCE_ID, or the host
+name and process id; progress in write_queue_state is keyed by it, so replicas
+sharing one database never skip each other's records. On start, journals in the directory that no running process
+holds are adopted and drained under their own id, so records left by a crashed
+process are written even though its replacement runs under a new process id.
+(Without fcntl, e.g. on Windows, journals are not locked and not adopted; set a
+stable WRITE_QUEUE_INSTANCE_ID per process there.)
+
+While the database fails (locked, unreachable) a batch is retried whole with
+exponential backoff. Only a record that is itself invalid (integrity or data
+errors) is skipped for good, failing its Future.
+
+The queue holds at most WRITE_QUEUE_CAPACITY records; when full, callers wait for
+room (back-pressure) rather than records being dropped. Pending records are
+flushed on interpreter shutdown.
+
+    WRITE_QUEUE_DIR                 journal directory (default write_queue)
+    WRITE_QUEUE_INSTANCE_ID         this process' journal (default <hostname>-<pid>)
+    WRITE_QUEUE_CAPACITY            records held in memory (1000)
+    WRITE_QUEUE_BATCH_SIZE          records per transaction (100)
+    WRITE_QUEUE_FLUSH_INTERVAL_MS   wait for a batch to fill up (200)
+    WRITE_QUEUE_FSYNC               fsync every journal append (0)
+"""
+import atexit
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from config.database import (
+    get_database_connection, save_resume_skills,
+    RESUME_INSERT, ANALYSIS_INSERT, AI_ANALYSIS_INSERT,
+    _resume_row, _analysis_row, _ai_analysis_row
+)
+from config.stats_cache import invalidate_stats_cache
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Journal written by versions that kept one journal per working directory
+LEGACY_JOURNAL = "write_queue.journal"
+CHECKPOINT = "checkpoint"
+
+RETRY_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+
+# DB-API errors from locks, timeouts and lost connections (sqlite3 and psycopg2 share the names)
+TRANSIENT_ERROR_NAMES = ("OperationalError", "InterfaceError", "InternalError")
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _lock_journal(journal):
+    """Take the journal's lock without waiting; False if a running process holds it"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def default_instance_id():
+    return re.sub(r'[^A-Za-z0-9._-]', '_', f"{socket.gethostname()}-{os.getpid()}")
+
+
+def journal_instance_id(journal_path):
+    """Instance id of a journal file: its name without the .journal extension"""
+    name = os.path.basename(journal_path)
+    return name[:-len(".journal")] if name.endswith(".journal") else name
+
+
+def _is_transient_error(error):
+    """Whether a write failed because of the database (worth retrying) rather than the record"""
+    names = [cls.__name__ for cls in type(error).__mro__]
+    # A bare Error (e.g. no free pooled connection) is not about any one record either
+    return names[0] == "Error" or any(name in TRANSIENT_ERROR_NAMES for name in names)
+
+
+def _write_record(cursor, kind, payload):
+    """Insert one queued record in the caller's transaction; returns its row id"""
+    if kind == "resume":
+        cursor.execute(RESUME_INSERT, _resume_row(payload["resume"]))
+        resume_id = cursor.lastrowid
+        save_resume_skills(cursor, resume_id, payload["resume"].get("skills", []))
+        if payload.get("analysis") is not None:
+            cursor.execute(ANALYSIS_INSERT, _analysis_row(resume_id, payload["analysis"]))
+        return resume_id
+    if kind == "ai_analysis":
+        cursor.execute(AI_ANALYSIS_INSERT, _ai_analysis_row(payload["resume_id"], payload["analysis"]))
+        return cursor.lastrowid
+    raise ValueError(f"Unknown write queue record kind '{kind}'")
+
+
+class WriteBehindQueue:
+    """Bounded in-memory queue flushed to SQLite in batches by a background thread"""
+
+    def __init__(self, journal_path, instance_id=None, capacity=1000, batch_size=100, flush_interval=0.2,
+                 fsync=False):
+        self.journal_path = journal_path
+        # Key of this journal's progress in write_queue_state
+        self.instance_id = instance_id or journal_instance_id(journal_path)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._in_flight = 0
+        self._seq = 0
+        self._committed_seq = 0
+        self._stopping = False
+        self._journal = None
+        self._thread = None
+        self._stats = {"queued": 0, "written": 0, "failed": 0, "batches": 0, "replayed": 0,
+                       "waits_for_capacity": 0, "total_flush_ms": 0.0}
+
+    def start(self):
+        """
+        Lock the journal, queue the records a crash left in it and start the flusher thread
+
+        Returns False (and does nothing) if a running process holds the journal. Database
+        errors are only logged: the flusher writes the records once the database is back.
+        """
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        journal = open(self.journal_path, "a+", encoding="utf-8")
+        if not _lock_journal(journal):
+            journal.close()
+            return False
+        journal.seek(0, os.SEEK_END)
+        if journal.tell() > 0:
+            journal.seek(journal.tell() - 1)
+            if journal.read(1) != "\n":
+                # End a line torn by a crash mid-append, so the next record starts on its own line
+                journal.write("\n")
+                journal.flush()
+        self._journal = journal
+
+        records = self._read_journal()
+        try:
+            last_seq = self._last_committed_seq()
+        except Exception as e:
+            print(f"Error reading write queue progress for {self.journal_path}: {str(e)}")
+            last_seq = 0
+        # The flusher skips records the database already has, whatever last_seq said here
+        replay = [record for record in records if record.get("kind") != CHECKPOINT and record["seq"] > last_seq]
+        self._seq = max([last_seq] + [record["seq"] for record in records])
+        self._committed_seq = replay[0]["seq"] - 1 if replay else self._seq
+        for record in replay:
+            self._pending.append((record, Future()))
+        if replay:
+            self._stats["replayed"] += len(replay)
+            print(f"Replaying {len(replay)} queued writes from {self.journal_path}")
+
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        return True
+
+    def drain_and_remove(self):
+        """Write everything left in an exited process' journal, then delete the journal"""
+        if not self.start():
+            return False
+        print(f"Adopted write queue journal {self.journal_path}")
+        self.flush()
+        try:
+            self._forget_progress()
+            # Still locked, so no other process adopts it meanwhile
+            os.remove(self.journal_path)
+        except Exception as e:
+            # Keep the journal: its checkpoint still guards the recorded progress
+            print(f"Error removing write queue journal {self.journal_path}: {str(e)}")
+        self.shutdown()
+        return True
+
+    def _forget_progress(self):
+        conn = get_database_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM write_queue_state WHERE instance_id = ?", (self.instance_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _last_committed_seq(self):
+        conn = get_database_connection()
+        try:
+            return self._committed_seq_in(conn.cursor())
+        finally:
+            conn.close()
+
+    def _committed_seq_in(self, cursor):
+        cursor.execute("SELECT last_seq FROM write_queue_state WHERE instance_id = ?", (self.instance_id,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def _read_journal(self):
+        records = []
+        if not os.path.exists(self.journal_path):
+            return records
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A line torn by a crash mid-append was never acknowledged
+                    continue
+        return records
+
+    def enqueue(self, kind, payload):
+        """Journal and queue a record; returns a Future of its row id"""
+        future = Future()
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("Write queue is shut down")
+            if len(self._pending) >= self.capacity:
+                self._stats["waits_for_capacity"] += 1
+                while len(self._pending) >= self.capacity:
+                    self._cond.wait()
+            self._seq += 1
+            record = {"seq": self._seq, "kind": kind, "payload": payload}
+            self._journal.write(json.dumps(record, default=str) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._pending.append((record, future))
+            self._stats["queued"] += 1
+            self._cond.notify_all()
+        return future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Give concurrent writers a moment to fill the batch
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.batch_size or self._stopping, self.flush_interval
+                )
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+
+            results = self._write_batch_with_retry([record for record, _ in batch])
+            if results is None:
+                # Shutting down with the database unavailable: the journal keeps the records for replay
+                for _, future in batch:
+                    future.set_exception(RuntimeError("Write queue stopped before the record was written"))
+                return
+
+            with self._cond:
+                self._in_flight = 0
+                self._committed_seq = batch[-1][0]["seq"]
+                if not self._pending:
+                    # Everything journaled is committed; the checkpoint keeps sequence numbers
+                    # increasing after a restart even if write_queue_state can't be read then
+                    self._journal.seek(0)
+                    self._journal.truncate()
+                    self._journal.write(json.dumps({"seq": self._committed_seq, "kind": CHECKPOINT}) + "\n")
+                    self._journal.flush()
+                self._cond.notify_all()
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _write_batch_with_retry(self, records):
+        """
+        Write a batch, retrying it whole with backoff while the database fails (locked,
+        unreachable); returns a row id or exception per record, or None if stopped meanwhile
+        """
+        results = {}
+        delay = RETRY_DELAY_SECONDS
+        start = time.perf_counter()
+        while True:
+            try:
+                self._write_batch(records, results)
+                break
+            except Exception as e:
+                print(f"Error flushing the write queue, retrying in {delay:.0f}s: {str(e)}")
+                with self._cond:
+                    if self._stopping:
+                        return None
+                    self._cond.wait(delay)
+                    if self._stopping:
+                        return None
+                delay = min(delay * 2, RETRY_MAX_DELAY_SECONDS)
+
+        results = [results.get(record["seq"]) for record in records]
+        invalidate_stats_cache()
+        with self._cond:
+            failed = sum(1 for result in results if isinstance(result, Exception))
+            self._stats["written"] += len(results) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["total_flush_ms"] += (time.perf_counter() - start) * 1000
+        return results
+
+    def _write_batch(self, records, results):
+        """
+        Write records in one transaction, adding their row ids to results (by seq)
+
+        Records the database already has as committed are skipped, so a retry after a
+        commit that failed partway never writes one twice (their id is left as None if
+        it was not seen). Lock, timeout and connection errors are raised for the caller
+        to retry the whole batch. Any other error means a record itself is bad (integrity
+        or data errors): the batch is then written one record per transaction and only
+        that record is skipped, with its exception as the result.
+        """
+        conn = get_database_connection()
+        cursor = conn.cursor()
+        try:
+            committed = self._committed_seq_in(cursor)
+            records = [record for record in records if record["seq"] > committed]
+            if not records:
+                return
+            try:
+                ids = [_write_record(cursor, record["kind"], record["payload"]) for record in records]
+                self._save_progress(cursor, records[-1]["seq"])
+                conn.commit()
+                results.update((record["seq"], row_id) for record, row_id in zip(records, ids))
+                return
+            except Exception as e:
+                conn.rollback()
+                if _is_transient_error(e):
+                    raise
+                print(f"Error writing a batch of {len(records)} queued records, retrying one at a time: {str(e)}")
+
+            for record in records:
+                try:
+                    result = _write_record(cursor, record["kind"], record["payload"])
+                except Exception as record_error:
+                    conn.rollback()
+                    if _is_transient_error(record_error):
+                        raise
+                    # Skip it for good, a bad record would fail on every replay too
+                    print(f"Error writing queued {record['kind']} record {record['seq']}: {str(record_error)}")
+                    result = record_error
+                self._save_progress(cursor, record["seq"])
+                conn.commit()
+                results[record["seq"]] = result
+        finally:
+            conn.close()
+
+    def _save_progress(self, cursor, seq):
+        cursor.execute("""
+            INSERT INTO write_queue_state (instance_id, last_seq) VALUES (?, ?)
+            ON CONFLICT (instance_id) DO UPDATE SET last_seq = excluded.last_seq
+        """, (self.instance_id, seq))
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is committed; returns False on timeout"""
+        with self._cond:
+            target = self._seq
+            return self._cond.wait_for(lambda: self._committed_seq >= target, timeout)
+
+    def shutdown(self, timeout=30):
+        """Flush pending records and stop the flusher thread"""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            if self._journal is not None and not self._pending:
+                self._journal.close()
+
+    def stats(self):
+        with self._cond:
+            batches = self._stats["batches"]
+            return {
+                "instance_id": self.instance_id,
+                "journal": self.journal_path,
+                "pending": len(self._pending) + self._in_flight,
+                "capacity": self.capacity,
+                "queued": self._stats["queued"],
+                "written": self._stats["written"],
+                "failed": self._stats["failed"],
+                "replayed": self._stats["replayed"],
+                "batches": batches,
+                "avg_batch_size": round(self._stats["written"] / batches, 1) if batches else 0.0,
+                "avg_flush_ms": round(self._stats["total_flush_ms"] / batches, 1) if batches else 0.0,
+                "waits_for_capacity": self._stats["waits_for_capacity"],
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def _new_queue(journal_path, instance_id=None):
+    return WriteBehindQueue(
+        journal_path,
+        instance_id,
+        capacity=max(1, _env_int("WRITE_QUEUE_CAPACITY", 1000)),
+        batch_size=max(1, _env_int("WRITE_QUEUE_BATCH_SIZE", 100)),
+        flush_interval=_env_int("WRITE_QUEUE_FLUSH_INTERVAL_MS", 200) / 1000,
+        fsync=os.getenv("WRITE_QUEUE_FSYNC", "0") == "1"
+    )
+
+
+def adopt_orphaned_journals(journal_dir, own_path):
+    """Drain, in the background, the journals in journal_dir that no running process holds"""
+    if fcntl is None:
+        return
+    paths = [os.path.join(journal_dir, name) for name in sorted(os.listdir(journal_dir)) if name.endswith(".journal")]
+    if os.path.exists(LEGACY_JOURNAL):
+        paths.append(LEGACY_JOURNAL)
+    for path in paths:
+        if os.path.abspath(path) != os.path.abspath(own_path):
+            orphan = _new_queue(path)
+            threading.Thread(target=orphan.drain_and_remove, name="write-behind-adopt", daemon=True).start()
+
+
+def get_write_queue():
+    """The process-wide write-behind queue, started (and its journal replayed) on first use"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            journal_dir = os.getenv("WRITE_QUEUE_DIR", "write_queue")
+            instance_id = os.getenv("WRITE_QUEUE_INSTANCE_ID") or default_instance_id()
+            queue = _new_queue(os.path.join(journal_dir, f"{instance_id}.journal"), instance_id)
+            if not queue.start():
+                print(f"Write queue journal {queue.journal_path} is held by another process, "
+                      f"check WRITE_QUEUE_INSTANCE_ID; using a journal for this process only")
+                instance_id = f"{instance_id}-{os.getpid()}"
+                queue = _new_queue(os.path.join(journal_dir, f"{instance_id}.journal"), instance_id)
+                if not queue.start():
+                    raise RuntimeError(f"Write queue journal {queue.journal_path} is held by another process")
+            atexit.register(queue.shutdown)
+            adopt_orphaned_journals(journal_dir, queue.journal_path)
+            _queue = queue
+        return _queue
+
+
+def queue_resume_data(data, analysis=None):
+    """Queue a resume (with its skills and optional ATS analysis); Future of the resume id"""
+    return get_write_queue().enqueue("resume", {"resume": data, "analysis": analysis})
+
+
+def queue_ai_analysis_data(resume_id, analysis_data):
+    """Queue an AI analysis; Future of the ai_analysis id"""
+    return get_write_queue().enqueue("ai_analysis", {"resume_id": resume_id, "analysis": analysis_data})
+
+
+def flush_write_queue(timeout=None):
+    return get_write_queue().flush(timeout)
+
+
+def get_write_queue_stats():
+    return get_write_queue().stats()
@@ -3,15 +3,25 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from config.database import get_database_connection
+from config.database import get_database_connection, get_resume_page, count_resumes, get_resume_filter_options
+from config.storage import dialect_for
+from .metrics import get_dashboard_snapshot, TREND_WINDOWS, DEFAULT_TREND_WINDOW
 import io
 import uuid
 from plotly.subplots import make_subplots
 from io import BytesIO
 
+RESUME_SORT_LABELS = {
+    'newest': "Newest first",
+    'oldest': "Oldest first",
+    'highest_ats': "Highest ATS score",
+    'lowest_ats': "Lowest ATS score"
+}
+
 class DashboardManager:
     def __init__(self):
         self.conn = get_database_connection()
+        self._snapshot = None
         self.colors = {
             'primary': '#4CAF50',
             'secondary': '#2196F3',
@@ -109,135 +119,35 @@ class DashboardManager:
             </style>
         """, unsafe_allow_html=True)
 
+    def get_metrics_snapshot(self, refresh=False):
+        """Dashboard metrics bundle from the shared statistics cache; refresh=True recomputes it now"""
+        if refresh or self._snapshot is None:
+            self._snapshot = get_dashboard_snapshot(refresh=refresh)
+        return self._snapshot
+
     def get_resume_metrics(self):
-        """Get resume-related metrics from database"""
-        cursor = self.conn.cursor()
-        
-        # Get current date
-        now = datetime.now()
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        start_of_week = now - timedelta(days=now.weekday())
-        start_of_month = now.replace(day=1)
-        
-        # Fetch metrics for different time periods
-        metrics = {}
-        for period, start_date in [
-            ('Today', start_of_day),
-            ('This Week', start_of_week),
-            ('This Month', start_of_month),
-            ('All Time', datetime(2000, 1, 1))
-        ]:
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT rd.id) as total_resumes,
-                    ROUND(AVG(ra.ats_score), 1) as avg_ats_score,
-                    ROUND(AVG(ra.keyword_match_score), 1) as avg_keyword_score,
-                    COUNT(DISTINCT CASE WHEN ra.ats_score >= 70 THEN rd.id END) as high_scoring
-                FROM resume_data rd
-                LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
-                WHERE rd.created_at >= ?
-            """, (start_date.strftime('%Y-%m-%d %H:%M:%S'),))
-            
-            row = cursor.fetchone()
-            if row:
-                metrics[period] = {
-                    'total': row[0] or 0,
-                    'ats_score': row[1] or 0,
-                    'keyword_score': row[2] or 0,
-                    'high_scoring': row[3] or 0
-                }
-            else:
-                metrics[period] = {
-                    'total': 0,
-                    'ats_score': 0,
-                    'keyword_score': 0,
-                    'high_scoring': 0
-                }
-        
-        return metrics
+        """Get resume-related metrics from the daily rollups"""
+        snapshot = self.get_metrics_snapshot()
+        return {period: vars(metrics).copy() for period, metrics in snapshot.periods.items()}
 
     def get_skill_distribution(self):
         """Get skill distribution data"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            WITH RECURSIVE split(skill, rest) AS (
-                SELECT '', skills || ','
-                FROM resume_data
-                UNION ALL
-                SELECT
-                    substr(rest, 0, instr(rest, ',')),
-                    substr(rest, instr(rest, ',') + 1)
-                FROM split
-                WHERE rest <> ''
-            ),
-            SkillCategories AS (
-                SELECT 
-                    CASE 
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%python%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%java%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%javascript%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%c++%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%programming%' THEN 'Programming'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%sql%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%database%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%mongodb%' THEN 'Database'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%aws%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%cloud%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%azure%' THEN 'Cloud'
-                        WHEN LOWER(TRIM(skill, '[]" ')) LIKE '%agile%' OR LOWER(TRIM(skill, '[]" ')) LIKE '%scrum%' OR 
-                             LOWER(TRIM(skill, '[]" ')) LIKE '%management%' THEN 'Management'
-                        ELSE 'Other'
-                    END as category,
-                    COUNT(*) as count
-                FROM split
-                WHERE skill <> ''
-                GROUP BY category
-            )
-            SELECT category, count
-            FROM SkillCategories
-            ORDER BY count DESC
-        """)
-        
-        categories, counts = [], []
-        for row in cursor.fetchall():
-            categories.append(row[0])
-            counts.append(row[1])
-            
+        # Skills are split and categorized on insert (config.database.save_resume_skills)
+        skill_categories = self.get_metrics_snapshot().skill_categories
+        categories = [category for category, _ in skill_categories]
+        counts = [count for _, count in skill_categories]
         return categories, counts
 
     def get_weekly_trends(self):
         """Get weekly submission trends"""
-        cursor = self.conn.cursor()
-        now = datetime.now()
-        dates = [(now - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(6, -1, -1)]
-        
-        submissions = []
-        for date in dates:
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM resume_data 
-                WHERE DATE(created_at) = DATE(?)
-            """, (date,))
-            submissions.append(cursor.fetchone()[0])
-            
-        return [d[-3:] for d in dates], submissions  # Return shortened date format (e.g., 'Mon', 'Tue')
+        snapshot = self.get_metrics_snapshot()
+        return [d[-3:] for d in snapshot.weekly_days], list(snapshot.weekly_submissions)  # Return shortened date format (e.g., 'Mon', 'Tue')
 
     def get_job_category_stats(self):
         """Get statistics by job category"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                COALESCE(target_category, 'Other') as category,
-                COUNT(*) as count,
-                ROUND(AVG(CASE WHEN ra.ats_score >= 70 THEN 1 ELSE 0 END) * 100, 1) as success_rate
-            FROM resume_data rd
-            LEFT JOIN resume_analysis ra ON rd.id = ra.resume_id
-            GROUP BY category
-            ORDER BY count DESC
-            LIMIT 5
-        """)
-        
-        categories, success_rates = [], []
-        for row in cursor.fetchall():
-            categories.append(row[0])
-            success_rates.append(row[2] or 0)
-            
+        job_categories = self.get_metrics_snapshot().job_categories
+        categories = [stats.category for stats in job_categories]
+        success_rates = [stats.success_rate for stats in job_categories]
         return categories, success_rates
 
     def render_admin_panel(self):
@@ -296,133 +206,129 @@ class DashboardManager:
             - Storage Used: {stats['storage_size']}
         """)
 
-    def get_resume_data(self):
-        """Get all resume data"""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute('''
-            SELECT 
-                r.id,
-                r.name,
-                r.email,
-                r.phone,
-                r.linkedin,
-                r.github,
-                r.portfolio,
-                r.target_role,
-                r.target_category,
-                r.created_at,
-                a.ats_score,
-                a.keyword_match_score,
-                a.format_score,
-                a.section_score
-            FROM resume_data r
-            LEFT JOIN resume_analysis a ON r.id = a.resume_id
-            ORDER BY r.created_at DESC
-            ''')
-            return cursor.fetchall()
-        except Exception as e:
-            print(f"Error fetching resume data: {str(e)}")
-            return []
+    def get_resume_data(self, filters=None, sort='newest', after=None, page_size=50):
+        """Get one page of resume data (see config.database.get_resume_page)"""
+        return get_resume_page(filters, sort=sort, after=after, page_size=page_size)
+
+    def render_resume_table(self, key="resume_table"):
+        """Render a filterable resume table that fetches one page per rerun"""
+        options = get_resume_filter_options()
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            target_role = st.selectbox(
+                "Filter by Target Role",
+                options=["All"] + options['roles'],
+                key=f"{key}_role"
+            )
+        with col2:
+            target_category = st.selectbox(
+                "Filter by Category",
+                options=["All"] + options['categories'],
+                key=f"{key}_category"
+            )
+        with col3:
+            min_score, max_score = st.slider("ATS Score", 0, 100, (0, 100), key=f"{key}_score")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            start_date = st.date_input("Submitted From", value=None, key=f"{key}_start")
+        with col2:
+            end_date = st.date_input("Submitted Until", value=None, key=f"{key}_end")
+        with col3:
+            sort = st.selectbox(
+                "Sort By",
+                options=list(RESUME_SORT_LABELS),
+                format_func=RESUME_SORT_LABELS.get,
+                key=f"{key}_sort"
+            )
+        with col4:
+            page_size = st.selectbox("Rows per Page", options=[25, 50, 100], index=1, key=f"{key}_page_size")
+        
+        filters = {
+            'role': target_role if target_role != "All" else None,
+            'category': target_category if target_category != "All" else None,
+            'min_score': min_score if min_score > 0 else None,
+            'max_score': max_score if max_score < 100 else None,
+            'start_date': start_date,
+            'end_date': end_date
+        }
+        
+        # Cursors of the pages visited so far; changing a filter starts again from page one
+        signature = repr((sorted(filters.items()), sort, page_size))
+        if st.session_state.get(f"{key}_signature") != signature:
+            st.session_state[f"{key}_signature"] = signature
+            st.session_state[f"{key}_pages"] = [None]
+        pages = st.session_state[f"{key}_pages"]
+        
+        resume_data, next_cursor = self.get_resume_data(filters, sort=sort, after=pages[-1], page_size=page_size)
+        if not resume_data:
+            st.info("No resume submissions match these filters" if len(pages) == 1 else "No more resume submissions")
+            return
+        
+        columns = [
+            'ID', 'Name', 'Email', 'Phone', 'LinkedIn', 'GitHub', 
+            'Portfolio', 'Target Role', 'Target Category', 'Submission Date',
+            'ATS Score', 'Keyword Match', 'Format Score', 'Section Score'
+        ]
+        df = pd.DataFrame(resume_data, columns=columns)
+        
+        # Format scores as percentages
+        score_columns = ['ATS Score', 'Keyword Match', 'Format Score', 'Section Score']
+        for col in score_columns:
+            df[col] = df[col].apply(lambda x: f"{x:.1f}%" if pd.notnull(x) else "N/A")
+        
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        
+        # Page navigation
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", disabled=len(pages) == 1, key=f"{key}_previous"):
+                pages.pop()
+                st.rerun()
+        with col2:
+            st.markdown(
+                f"<p style='text-align: center;'>Page {len(pages)} · about {count_resumes(filters):,} matching resumes</p>",
+                unsafe_allow_html=True
+            )
+        with col3:
+            if st.button("Next ➡️", disabled=next_cursor is None, key=f"{key}_next"):
+                pages.append(next_cursor)
+                st.rerun()
+        
+        # Download the page on screen; the sidebar export has every row
+        excel_buffer = BytesIO()
+        df.to_excel(excel_buffer, index=False, engine='openpyxl')
+        excel_buffer.seek(0)
+        
+        st.download_button(
+            label="📥 Download This Page",
+            data=excel_buffer,
+            file_name=f"resume_data_page{len(pages)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"{key}_download_page"
+        )
 
     def render_resume_data_section(self):
         """Render resume data section with Excel download"""
         st.markdown("<h2 class='section-title'>Resume Submissions</h2>", unsafe_allow_html=True)
         
-        # Get resume data
-        resume_data = self.get_resume_data()
+        # Style the table container
+        st.markdown("""
+        <style>
+        .resume-data {
+            background-color: #2D2D2D;
+            border-radius: 10px;
+            padding: 1rem;
+            margin-bottom: 1rem;
+        }
+        </style>
+        """, unsafe_allow_html=True)
         
-        if resume_data:
-            # Convert to DataFrame
-            columns = [
-                'ID', 'Name', 'Email', 'Phone', 'LinkedIn', 'GitHub', 
-                'Portfolio', 'Target Role', 'Target Category', 'Submission Date',
-                'ATS Score', 'Keyword Match', 'Format Score', 'Section Score'
-            ]
-            df = pd.DataFrame(resume_data, columns=columns)
-            
-            # Format scores as percentages
-            score_columns = ['ATS Score', 'Keyword Match', 'Format Score', 'Section Score']
-            for col in score_columns:
-                df[col] = df[col].apply(lambda x: f"{x*100:.1f}%" if pd.notnull(x) else "N/A")
-            
-            # Style the dataframe
-            st.markdown("""
-            <style>
-            .resume-data {
-                background-color: #2D2D2D;
-                border-radius: 10px;
-                padding: 1rem;
-                margin-bottom: 1rem;
-            }
-            </style>
-            """, unsafe_allow_html=True)
-            
-            with st.container():
-                st.markdown('<div class="resume-data">', unsafe_allow_html=True)
-                
-                # Add filters
-                col1, col2 = st.columns(2)
-                with col1:
-                    target_role = st.selectbox(
-                        "Filter by Target Role",
-                        options=["All"] + list(df['Target Role'].unique()),
-                        key="role_filter"
-                    )
-                with col2:
-                    target_category = st.selectbox(
-                        "Filter by Category",
-                        options=["All"] + list(df['Target Category'].unique()),
-                        key="category_filter"
-                    )
-                
-                # Apply filters
-                filtered_df = df.copy()
-                if target_role != "All":
-                    filtered_df = filtered_df[filtered_df['Target Role'] == target_role]
-                if target_category != "All":
-                    filtered_df = filtered_df[filtered_df['Target Category'] == target_category]
-                
-                # Display filtered data
-                st.dataframe(
-                    filtered_df,
-                    use_container_width=True,
-                    hide_index=True
-                )
-                
-                # Add download buttons
-                col1, col2 = st.columns(2)
-                with col1:
-                    # Download filtered data
-                    excel_buffer = BytesIO()
-                    filtered_df.to_excel(excel_buffer, index=False, engine='openpyxl')
-                    excel_buffer.seek(0)
-                    
-                    st.download_button(
-                        label="📥 Download Filtered Data",
-                        data=excel_buffer,
-                        file_name=f"resume_data_filtered_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_filtered_data"
-                    )
-                
-                with col2:
-                    # Download all data
-                    excel_buffer_all = BytesIO()
-                    df.to_excel(excel_buffer_all, index=False, engine='openpyxl')
-                    excel_buffer_all.seek(0)
-                    
-                    st.download_button(
-                        label="📥 Download All Data",
-                        data=excel_buffer_all,
-                        file_name=f"resume_data_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_all_data"
-                    )
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.info("No resume submissions available")
+        with st.container():
+            st.markdown('<div class="resume-data">', unsafe_allow_html=True)
+            self.render_resume_table()
+            st.markdown('</div>', unsafe_allow_html=True)
 
     def render_admin_section(self):
         """Render admin section with logs and Excel download"""
@@ -566,27 +472,14 @@ class DashboardManager:
 
     def get_database_stats(self):
         """Get database statistics"""
-        cursor = self.conn.cursor()
-        stats = {}
-        
-        # Total resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_data")
-        stats['total_resumes'] = cursor.fetchone()[0]
-        
-        # Today's submissions
-        cursor.execute("""
-            SELECT COUNT(*) 
-            FROM resume_data 
-            WHERE DATE(created_at) = DATE('now')
-        """)
-        stats['today_submissions'] = cursor.fetchone()[0]
+        snapshot = self.get_metrics_snapshot()
+        stats = {
+            'total_resumes': snapshot.total_resumes,
+            'today_submissions': snapshot.today_submissions
+        }
         
         # Database size (approximate)
-        cursor.execute("PRAGMA page_count")
-        page_count = cursor.fetchone()[0]
-        cursor.execute("PRAGMA page_size")
-        page_size = cursor.fetchone()[0]
-        size_bytes = page_count * page_size
+        size_bytes = dialect_for(self.conn).database_size(self.conn.cursor())
         
         if size_bytes < 1024:
             stats['storage_size'] = f"{size_bytes} bytes"
@@ -736,6 +629,10 @@ class DashboardManager:
                 </div>
             """.format(datetime.now().strftime('%B %d, %Y %I:%M %p')), unsafe_allow_html=True)
 
+        # One consistent set of numbers for every card, chart and insight on this render,
+        # taken from the shared cache rather than recomputed on every rerun
+        self._snapshot = get_dashboard_snapshot()
+
         # Quick Stats
         stats = self.get_quick_stats()
         trend_indicators = self.get_trend_indicators()
@@ -842,97 +739,49 @@ class DashboardManager:
         if st.session_state.get('is_admin', False):
             self.render_admin_section()
 
-    def get_trend_indicators(self):
-        """Get trend indicators for stats"""
-        cursor = self.conn.cursor()
+    def get_trend_indicators(self, window=DEFAULT_TREND_WINDOW):
+        """Get trend indicators for stats, comparing the last day, week or month with the one before"""
+        if window not in TREND_WINDOWS:
+            raise ValueError(f"Unknown trend window '{window}', expected one of {', '.join(TREND_WINDOWS)}")
+        trends = self.get_metrics_snapshot().trends[window]
         indicators = {}
         
-        # Compare with last week's data
-        for metric in ['resumes', 'ats', 'high_performing', 'success_rate']:
-            try:
-                if metric == 'resumes':
-                    cursor.execute("""
-                        SELECT 
-                            (COUNT(*) - (
-                                SELECT COUNT(*) 
-                                FROM resume_data 
-                                WHERE created_at < date('now', '-7 days')
-                            )) * 100.0 / 
-                            NULLIF((
-                                SELECT COUNT(*) 
-                                FROM resume_data 
-                                WHERE created_at < date('now', '-7 days')
-                            ), 0)
-                        FROM resume_data
-                    """)
-                elif metric == 'ats':
-                    cursor.execute("""
-                        SELECT 
-                            (AVG(ats_score) - (
-                                SELECT AVG(ats_score) 
-                                FROM resume_analysis 
-                                WHERE created_at < date('now', '-7 days')
-                            )) * 100.0 / 
-                            NULLIF((
-                                SELECT AVG(ats_score) 
-                                FROM resume_analysis 
-                                WHERE created_at < date('now', '-7 days')
-                            ), 0)
-                        FROM resume_analysis
-                    """)
-                
-                change = cursor.fetchone()[0] or 0
-                indicators[metric] = {
-                    'value': abs(round(change, 1)),
-                    'icon': '↑' if change >= 0 else '↓',
-                    'class': 'trend-up' if change >= 0 else 'trend-down'
-                }
-            except Exception:
+        for metric, trend in trends.items():
+            if trend.change is None:
                 indicators[metric] = {
                     'value': 0,
                     'icon': '→',
                     'class': 'trend-neutral'
                 }
+            else:
+                indicators[metric] = {
+                    'value': abs(round(trend.change, 1)),
+                    'icon': '↑' if trend.change >= 0 else '↓',
+                    'class': 'trend-up' if trend.change >= 0 else 'trend-down'
+                }
         
         return indicators
 
     def get_detailed_insights(self):
         """Get detailed insights from the database"""
-        cursor = self.conn.cursor()
+        snapshot = self.get_metrics_snapshot()
         insights = []
         
         # Most Successful Job Category
-        cursor.execute("""
-            SELECT target_category, AVG(ats_score) as avg_score,
-                   COUNT(*) as submission_count
-            FROM resume_data rd
-            JOIN resume_analysis ra ON rd.id = ra.resume_id
-            GROUP BY target_category
-            ORDER BY avg_score DESC
-            LIMIT 1
-        """)
-        top_category = cursor.fetchone()
+        top_category = snapshot.top_category
         if top_category:
             insights.append({
                 'title': 'Top Performing Category',
                 'icon': '🏆',
-                'description': f"{top_category[0]} leads with {top_category[1]:.1f}% average ATS score across {top_category[2]} submissions",
+                'description': f"{top_category.category} leads with {top_category.avg_ats_score:.1f}% average ATS score across {top_category.analyses} submissions",
                 'trend_class': 'trend-up',
                 'trend_icon': '↑',
-                'trend_value': f"{top_category[1]:.1f}%"
+                'trend_value': f"{top_category.avg_ats_score:.1f}%"
             })
         
         # Recent Improvement
-        cursor.execute("""
-            SELECT 
-                (SELECT AVG(ats_score) FROM resume_analysis 
-                 WHERE created_at >= date('now', '-7 days')) as recent_score,
-                (SELECT AVG(ats_score) FROM resume_analysis 
-                 WHERE created_at < date('now', '-7 days')) as old_score
-        """)
-        scores = cursor.fetchone()
-        if scores and scores[0] and scores[1]:
-            change = scores[0] - scores[1]
+        if snapshot.recent_ats_score and snapshot.previous_ats_score:
+            change = snapshot.recent_ats_score - snapshot.previous_ats_score
             insights.append({
                 'title': 'Weekly Trend',
                 'icon': '📈',
@@ -943,33 +792,9 @@ class DashboardManager:
             })
         
         # Most Common Skills
-        cursor.execute("""
-            WITH RECURSIVE
-            split(skill, rest) AS (
-                SELECT '', skills || ',' 
-                FROM resume_data 
-                WHERE skills IS NOT NULL
-                UNION ALL
-                SELECT
-                    substr(rest, 0, instr(rest, ',')),
-                    substr(rest, instr(rest, ',') + 1)
-                FROM split 
-                WHERE rest <> ''
-            ),
-            cleaned_skills AS (
-                SELECT TRIM(REPLACE(REPLACE(skill, '[', ''), ']', '')) as skill
-                FROM split 
-                WHERE skill <> ''
-            )
-            SELECT skill, COUNT(*) as count
-            FROM cleaned_skills
-            GROUP BY skill
-            ORDER BY count DESC
-            LIMIT 3
-        """)
-        top_skills = cursor.fetchall()
+        top_skills = snapshot.top_skills
         if top_skills:
-            skills_text = f"Most in-demand skills: Python ({top_skills[0][1]} resumes), Java ({top_skills[1][1]} resumes), Express ({top_skills[2][1]} resumes)"
+            skills_text = ", ".join(f"{skill} ({count} resumes)" for skill, count in top_skills)
             insights.append({
                 'title': 'Top Skills',
                 'icon': '💡',
@@ -983,28 +808,12 @@ class DashboardManager:
 
     def get_quick_stats(self):
         """Get quick statistics for the dashboard"""
-        cursor = self.conn.cursor()
-        
-        # Total Resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_data")
-        total_resumes = cursor.fetchone()[0]
-        
-        # Average ATS Score
-        cursor.execute("SELECT AVG(ats_score) FROM resume_analysis")
-        avg_ats = cursor.fetchone()[0] or 0
-        
-        # High Performing Resumes
-        cursor.execute("SELECT COUNT(*) FROM resume_analysis WHERE ats_score >= 70")
-        high_performing = cursor.fetchone()[0]
-        
-        # Success Rate
-        success_rate = (high_performing / total_resumes * 100) if total_resumes > 0 else 0
-        
+        snapshot = self.get_metrics_snapshot()
         return {
-            "Total Resumes": f"{total_resumes:,}",
-            "Avg ATS Score": f"{avg_ats:.1f}%",
-            "High Performing": f"{high_performing:,}",
-            "Success Rate": f"{success_rate:.1f}%"
+            "Total Resumes": f"{snapshot.total_resumes:,}",
+            "Avg ATS Score": f"{snapshot.avg_ats_score:.1f}%",
+            "High Performing": f"{snapshot.high_performing:,}",
+            "Success Rate": f"{snapshot.success_rate:.1f}%"
         }
 
     def create_enhanced_ats_gauge(self, value):
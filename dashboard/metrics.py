@@ -0,0 +1,362 @@
+"""
+Consolidated dashboard metrics service
+
+compute_dashboard_snapshot() computes everything the dashboard shows (cards,
+trends, charts and insights) in one read transaction over the daily rollup and
+resume_skills tables, so every section sees the same data. The result is a typed
+DashboardSnapshot; section_ms records how long each section took to compute.
+
+get_dashboard_snapshot() serves it from the process-wide statistics cache
+(config.stats_cache), shared by every session and refreshed in the background.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config.database import get_database_connection
+from config.storage import dialect_for
+from config.stats_cache import get_stats_cache
+
+PERIODS = ('Today', 'This Week', 'This Month', 'All Time')
+TREND_DAYS = 7
+# Trend indicators compare each window with the one right before it, in days
+TREND_WINDOWS = {'day': 1, 'week': 7, 'month': 30}
+TREND_METRICS = ('resumes', 'ats', 'high_performing', 'success_rate')
+DEFAULT_TREND_WINDOW = os.getenv('DASHBOARD_TREND_WINDOW', 'week')
+TOP_CATEGORIES = 5
+TOP_SKILLS = 3
+CACHE_KEY = 'dashboard_snapshot'
+
+
+@dataclass
+class PeriodMetrics:
+    total: int = 0
+    ats_score: float = 0.0
+    keyword_score: float = 0.0
+    high_scoring: int = 0
+
+
+@dataclass
+class CategoryStats:
+    category: str
+    submissions: int
+    success_rate: float
+    avg_ats_score: Optional[float]
+    analyses: int
+
+
+@dataclass
+class TrendIndicator:
+    current: Optional[float]
+    previous: Optional[float]
+    # Percentage change from the previous window (None without a baseline)
+    change: Optional[float]
+
+
+@dataclass
+class DashboardSnapshot:
+    periods: Dict[str, PeriodMetrics]
+    total_resumes: int
+    today_submissions: int
+    avg_ats_score: float
+    high_performing: int
+    success_rate: float
+    # Trend indicators by window name, then metric
+    trends: Dict[str, Dict[str, TrendIndicator]]
+    recent_ats_score: Optional[float]
+    previous_ats_score: Optional[float]
+    weekly_days: List[str]
+    weekly_submissions: List[int]
+    job_categories: List[CategoryStats]
+    top_category: Optional[CategoryStats]
+    skill_categories: List[Tuple[str, int]]
+    top_skills: List[Tuple[str, int]]
+    generated_at: datetime = field(default_factory=datetime.now)
+    section_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_ms(self):
+        return round(sum(self.section_ms.values()), 2)
+
+
+TOTALS_QUERY = """
+    WITH resumes AS (
+        SELECT
+            SUM(submissions) as total,
+            SUM(CASE WHEN day >= :today THEN submissions END) as today,
+            SUM(CASE WHEN day >= :week THEN submissions END) as week,
+            SUM(CASE WHEN day >= :month THEN submissions END) as month,
+            SUM(CASE WHEN day = :utc_today THEN submissions END) as utc_today
+        FROM daily_resume_stats
+    ),
+    scores AS (
+        SELECT
+            SUM(CASE WHEN day >= :today THEN ats_sum END) as today_ats, SUM(CASE WHEN day >= :today THEN ats_count END) as today_ats_n,
+            SUM(CASE WHEN day >= :today THEN keyword_sum END) as today_kw, SUM(CASE WHEN day >= :today THEN keyword_count END) as today_kw_n,
+            SUM(CASE WHEN day >= :today THEN high_scoring END) as today_high,
+            SUM(CASE WHEN day >= :week THEN ats_sum END) as week_ats, SUM(CASE WHEN day >= :week THEN ats_count END) as week_ats_n,
+            SUM(CASE WHEN day >= :week THEN keyword_sum END) as week_kw, SUM(CASE WHEN day >= :week THEN keyword_count END) as week_kw_n,
+            SUM(CASE WHEN day >= :week THEN high_scoring END) as week_high,
+            SUM(CASE WHEN day >= :month THEN ats_sum END) as month_ats, SUM(CASE WHEN day >= :month THEN ats_count END) as month_ats_n,
+            SUM(CASE WHEN day >= :month THEN keyword_sum END) as month_kw, SUM(CASE WHEN day >= :month THEN keyword_count END) as month_kw_n,
+            SUM(CASE WHEN day >= :month THEN high_scoring END) as month_high,
+            SUM(ats_sum) as all_ats, SUM(ats_count) as all_ats_n,
+            SUM(keyword_sum) as all_kw, SUM(keyword_count) as all_kw_n,
+            SUM(high_scoring) as all_high,
+            SUM(CASE WHEN day >= :trend_start THEN ats_sum END) as recent_ats,
+            SUM(CASE WHEN day >= :trend_start THEN ats_count END) as recent_ats_n,
+            SUM(CASE WHEN day < :trend_start THEN ats_sum END) as previous_ats,
+            SUM(CASE WHEN day < :trend_start THEN ats_count END) as previous_ats_n
+        FROM daily_ats_stats
+    )
+    SELECT * FROM resumes, scores
+"""
+
+# Current and previous window totals for every trend window in one pass over the
+# last 2 x longest window days of both rollups
+TREND_QUERY = """
+    WITH daily AS (
+        SELECT day, submissions, 0 as ats_sum, 0 as ats_count, 0 as high_scoring
+        FROM daily_resume_stats
+        WHERE day >= :since
+        UNION ALL
+        SELECT day, 0, ats_sum, ats_count, high_scoring
+        FROM daily_ats_stats
+        WHERE day >= :since
+    ),
+    windows (name, current_start, previous_start) AS (
+        VALUES {windows}
+    )
+    SELECT
+        w.name,
+        SUM(CASE WHEN d.day >= w.current_start THEN d.submissions END),
+        SUM(CASE WHEN d.day < w.current_start THEN d.submissions END),
+        SUM(CASE WHEN d.day >= w.current_start THEN d.ats_sum END),
+        SUM(CASE WHEN d.day >= w.current_start THEN d.ats_count END),
+        SUM(CASE WHEN d.day < w.current_start THEN d.ats_sum END),
+        SUM(CASE WHEN d.day < w.current_start THEN d.ats_count END),
+        SUM(CASE WHEN d.day >= w.current_start THEN d.high_scoring END),
+        SUM(CASE WHEN d.day < w.current_start THEN d.high_scoring END)
+    FROM windows w
+    JOIN daily d ON d.day >= w.previous_start
+    GROUP BY w.name
+"""
+
+WEEKLY_QUERY = """
+    SELECT day, SUM(submissions)
+    FROM daily_resume_stats
+    WHERE day >= ? AND day <= ?
+    GROUP BY day
+"""
+
+# Ranks by volume (job category chart) and by average ATS score (top category insight)
+CATEGORY_QUERY = """
+    WITH submissions AS (
+        SELECT COALESCE(NULLIF(target_category, ''), 'Other') as category, SUM(submissions) as submissions
+        FROM daily_resume_stats
+        GROUP BY category
+    ),
+    scores AS (
+        SELECT COALESCE(NULLIF(target_category, ''), 'Other') as category,
+               SUM(ats_sum) / NULLIF(SUM(ats_count), 0) as avg_ats_score,
+               SUM(high_scoring) as high_scoring,
+               SUM(analyses) as analyses
+        FROM daily_ats_stats
+        GROUP BY category
+    )
+    SELECT
+        s.category,
+        s.submissions,
+        ROUND(COALESCE(sc.high_scoring, 0) * 100.0 / s.submissions, 1) as success_rate,
+        sc.avg_ats_score,
+        COALESCE(sc.analyses, 0) as analyses,
+        ROW_NUMBER() OVER (ORDER BY s.submissions DESC) as volume_rank,
+        ROW_NUMBER() OVER (ORDER BY sc.avg_ats_score IS NULL, sc.avg_ats_score DESC) as score_rank
+    FROM submissions s
+    LEFT JOIN scores sc ON sc.category = s.category
+    ORDER BY volume_rank
+"""
+
+SKILL_QUERY = """
+    SELECT 'category', skill_category, COUNT(*) as count
+    FROM resume_skills
+    GROUP BY skill_category
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'skill', MIN(skill_name), COUNT(*) as count
+        FROM resume_skills
+        GROUP BY {skill_key}
+        ORDER BY count DESC
+        LIMIT ?
+    ) AS top_skills
+"""
+
+
+def _ratio(total, count, digits=1):
+    return round(total / count, digits) if count else 0.0
+
+
+def _change(current, previous):
+    if current is None or not previous:
+        return None
+    return (current - previous) * 100.0 / previous
+
+
+def _window_metrics(submissions, ats_sum, ats_count, high_scoring):
+    submissions, high_scoring = submissions or 0, high_scoring or 0
+    return {
+        'resumes': submissions,
+        'ats': ats_sum / ats_count if ats_count else None,
+        'high_performing': high_scoring,
+        'success_rate': high_scoring * 100.0 / submissions if submissions else None,
+    }
+
+
+def compute_trends(cursor, windows=None, today=None):
+    """Current vs previous window value and change of every trend metric, for each window"""
+    windows = windows or TREND_WINDOWS
+    today = today or datetime.utcnow().date()
+    bounds = {
+        name: ((today - timedelta(days=days - 1)).isoformat(), (today - timedelta(days=2 * days - 1)).isoformat())
+        for name, days in windows.items()
+    }
+    params = {'since': min(previous for _, previous in bounds.values())}
+    values = []
+    for i, (name, (current_start, previous_start)) in enumerate(bounds.items()):
+        values.append(f"(:name{i}, :current{i}, :previous{i})")
+        params.update({f'name{i}': name, f'current{i}': current_start, f'previous{i}': previous_start})
+    cursor.execute(TREND_QUERY.format(windows=", ".join(values)), params)
+    rows = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    trends = {}
+    for name in windows:
+        (submissions, previous_submissions, ats_sum, ats_count,
+         previous_ats_sum, previous_ats_count, high_scoring, previous_high_scoring) = rows.get(name, (None,) * 8)
+        current = _window_metrics(submissions, ats_sum, ats_count, high_scoring)
+        previous = _window_metrics(previous_submissions, previous_ats_sum, previous_ats_count, previous_high_scoring)
+        trends[name] = {
+            metric: TrendIndicator(current[metric], previous[metric], _change(current[metric], previous[metric]))
+            for metric in TREND_METRICS
+        }
+    return trends
+
+
+def compute_dashboard_snapshot(conn, now=None):
+    """Compute the full dashboard bundle in one read transaction"""
+    now = now or datetime.now()
+    utc_now = datetime.utcnow()
+    section_ms = {}
+
+    def timed(name, compute):
+        start = time.perf_counter()
+        result = compute()
+        section_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    params = {
+        'today': now.strftime('%Y-%m-%d'),
+        'week': (now - timedelta(days=now.weekday())).strftime('%Y-%m-%d'),
+        'month': now.replace(day=1).strftime('%Y-%m-%d'),
+        'utc_today': utc_now.strftime('%Y-%m-%d'),
+        'trend_start': (utc_now - timedelta(days=TREND_DAYS)).strftime('%Y-%m-%d'),
+    }
+    weekly_days = [(now - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(6, -1, -1)]
+
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        # One snapshot of the database for every section
+        conn.execute("BEGIN")
+    try:
+        cursor = conn.cursor()
+
+        def totals():
+            cursor.execute(TOTALS_QUERY, params)
+            columns = [description[0] for description in cursor.description]
+            return {column: value or 0 for column, value in zip(columns, cursor.fetchone())}
+
+        def weekly():
+            cursor.execute(WEEKLY_QUERY, (weekly_days[0], weekly_days[-1]))
+            counts = dict(cursor.fetchall())
+            return [counts.get(day, 0) for day in weekly_days]
+
+        def categories():
+            cursor.execute(CATEGORY_QUERY)
+            return cursor.fetchall()
+
+        def skills():
+            # Skills group case-insensitively, as the skill index does
+            cursor.execute(SKILL_QUERY.format(skill_key=dialect_for(conn).nocase('skill_name')), (TOP_SKILLS,))
+            return cursor.fetchall()
+
+        row = timed('totals', totals)
+        trends = timed('trends', lambda: compute_trends(cursor, today=utc_now.date()))
+        weekly_submissions = timed('weekly_trends', weekly)
+        category_rows = timed('categories', categories)
+        skill_rows = timed('skills', skills)
+    finally:
+        if own_transaction:
+            conn.commit()
+
+    periods = {}
+    for period, prefix in zip(PERIODS, ('today', 'week', 'month', 'all')):
+        periods[period] = PeriodMetrics(
+            total=row['total'] if prefix == 'all' else row[prefix],
+            ats_score=_ratio(row[f'{prefix}_ats'], row[f'{prefix}_ats_n']),
+            keyword_score=_ratio(row[f'{prefix}_kw'], row[f'{prefix}_kw_n']),
+            high_scoring=row[f'{prefix}_high'],
+        )
+
+    all_ats = row['all_ats'] / row['all_ats_n'] if row['all_ats_n'] else None
+    previous_ats = row['previous_ats'] / row['previous_ats_n'] if row['previous_ats_n'] else None
+    recent_ats = row['recent_ats'] / row['recent_ats_n'] if row['recent_ats_n'] else None
+
+    categories = [
+        CategoryStats(category, submissions, success_rate or 0, avg_score, analyses)
+        for category, submissions, success_rate, avg_score, analyses, _, _ in category_rows
+    ]
+    top_category = next(
+        (stats for stats, row_ in zip(categories, category_rows) if row_[6] == 1 and stats.avg_ats_score is not None),
+        None
+    )
+
+    total_resumes = row['total']
+    high_performing = row['all_high']
+    return DashboardSnapshot(
+        periods=periods,
+        total_resumes=total_resumes,
+        today_submissions=row['utc_today'],
+        avg_ats_score=all_ats or 0.0,
+        high_performing=high_performing,
+        success_rate=high_performing * 100.0 / total_resumes if total_resumes else 0.0,
+        trends=trends,
+        recent_ats_score=recent_ats,
+        previous_ats_score=previous_ats,
+        weekly_days=weekly_days,
+        weekly_submissions=weekly_submissions,
+        job_categories=categories[:TOP_CATEGORIES],
+        top_category=top_category,
+        skill_categories=sorted(
+            ((name, count) for kind, name, count in skill_rows if kind == 'category'),
+            key=lambda item: item[1], reverse=True
+        ),
+        top_skills=[(name, count) for kind, name, count in skill_rows if kind == 'skill'],
+        section_ms=section_ms,
+    )
+
+
+def _load_dashboard_snapshot():
+    conn = get_database_connection()
+    try:
+        return compute_dashboard_snapshot(conn)
+    finally:
+        conn.close()
+
+
+def get_dashboard_snapshot(refresh=False):
+    """Shared dashboard snapshot from the statistics cache; refresh=True recomputes it now"""
+    cache = get_stats_cache()
+    if refresh:
+        return cache.refresh(CACHE_KEY, _load_dashboard_snapshot)
+    return cache.get(CACHE_KEY, _load_dashboard_snapshot)
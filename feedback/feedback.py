@@ -1,17 +1,17 @@
 import streamlit as st
-import sqlite3
 from datetime import datetime
-import pandas as pd
 import time
+from config.storage import get_storage, get_feedback_database_url
 
 class FeedbackManager:
     def __init__(self):
-        self.db_path = "feedback/feedback.db"
+        # FEEDBACK_DATABASE_URL (feedback/feedback.db unless DATABASE_URL is a server database)
+        self.storage = get_storage(get_feedback_database_url())
         self.setup_database()
 
     def setup_database(self):
         """Create feedback table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.storage.connection()
         c = conn.cursor()
         c.execute('''
             CREATE TABLE IF NOT EXISTS feedback (
@@ -30,7 +30,7 @@ class FeedbackManager:
 
     def save_feedback(self, feedback_data):
         """Save feedback to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.storage.connection()
         c = conn.cursor()
         c.execute('''
             INSERT INTO feedback (
@@ -52,11 +52,16 @@ class FeedbackManager:
 
     def get_feedback_stats(self):
         """Get feedback statistics"""
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM feedback", conn)
-        conn.close()
+        conn = self.storage.connection()
+        try:
+            row = conn.execute("""
+                SELECT AVG(rating), AVG(usability_score), AVG(feature_satisfaction), COUNT(*)
+                FROM feedback
+            """).fetchone()
+        finally:
+            conn.close()
         
-        if df.empty:
+        if not row[3]:
             return {
                 'avg_rating': 0,
                 'avg_usability': 0,
@@ -65,10 +70,10 @@ class FeedbackManager:
             }
         
         return {
-            'avg_rating': df['rating'].mean(),
-            'avg_usability': df['usability_score'].mean(),
-            'avg_satisfaction': df['feature_satisfaction'].mean(),
-            'total_responses': len(df)
+            'avg_rating': row[0],
+            'avg_usability': row[1],
+            'avg_satisfaction': row[2],
+            'total_responses': row[3]
         }
 
     def render_feedback_form(self):
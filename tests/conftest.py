@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh SQLite resume database (DATABASE_PATH) for one test"""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.delenv("FEEDBACK_DATABASE_URL", raising=False)
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "resume_data.db"))
+
+    from config.database import init_database
+
+    init_database()
+    return tmp_path / "resume_data.db"
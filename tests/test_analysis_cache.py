@@ -0,0 +1,72 @@
+from utils.analysis_cache import (
+    AnalysisCache, minhash_signature, estimate_similarity, lsh_buckets, shingles,
+    context_key, resume_diff, NUM_PERMUTATIONS, LSH_BANDS
+)
+
+RESUME = "\n".join(
+    f"Built service number {i} handling payments, search and reporting for customers" for i in range(30)
+)
+EDITED = RESUME.replace("service number 7 ", "platform number 7 ")
+OTHER = "\n".join(f"Taught course {i} on poetry, painting and music history to students" for i in range(30))
+
+
+def test_signature_is_deterministic_and_sized():
+    signature = minhash_signature(RESUME)
+
+    assert signature == minhash_signature(RESUME)
+    assert len(signature) == NUM_PERMUTATIONS
+    assert len(lsh_buckets(signature)) == LSH_BANDS
+
+
+def test_similarity_tracks_jaccard():
+    a, b = shingles(RESUME), shingles(EDITED)
+    jaccard = len(a & b) / len(a | b)
+
+    near = estimate_similarity(minhash_signature(RESUME), minhash_signature(EDITED))
+    far = estimate_similarity(minhash_signature(RESUME), minhash_signature(OTHER))
+
+    assert abs(near - jaccard) < 0.15
+    assert far < 0.1
+
+
+def test_short_and_empty_texts():
+    assert shingles("two words") == {"two words"}
+    assert shingles("") == set()
+    assert estimate_similarity(minhash_signature(""), minhash_signature("")) == 1.0
+
+
+def test_context_key_separates_models_roles_and_job_descriptions():
+    assert context_key("Gemini", "Engineer") == context_key("Gemini", "Engineer", "  ")
+    assert context_key("Gemini", "Engineer") != context_key("Gemini", "Designer")
+    assert context_key("Gemini", "Engineer", "Python") != context_key("Gemini", "Engineer")
+
+
+def test_resume_diff_lists_changed_lines_only():
+    assert resume_diff(RESUME, EDITED).split("\n") == [
+        "-Built service number 7 handling payments, search and reporting for customers",
+        "+Built platform number 7 handling payments, search and reporting for customers",
+    ]
+
+
+def test_cache_finds_near_duplicates_in_the_same_context(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.db"))
+    key = context_key("Gemini", "Engineer")
+    cache.store(key, RESUME, {"resume_score": 80})
+
+    match, similarity = cache.lookup(key, EDITED)
+    assert match["result"] == {"resume_score": 80}
+    assert similarity > 0.6
+
+    assert cache.lookup(key, OTHER) == (None, 0.0)
+    assert cache.lookup(context_key("Gemini", "Designer"), RESUME) == (None, 0.0)
+
+
+def test_cache_evicts_oldest_entries(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.db"), max_entries=2)
+    key = context_key("Gemini", "Engineer")
+    for i in range(3):
+        cache.store(key, f"{OTHER}\nEntry {i} is unique to this resume text", {"n": i})
+
+    assert cache.stats()["entries"] == 2
+    match, _ = cache.lookup(key, f"{OTHER}\nEntry 2 is unique to this resume text")
+    assert match["result"] == {"n": 2}
@@ -0,0 +1,68 @@
+from utils.analysis_parser import (
+    parse_analysis_sections, extract_list_items, extract_skill_items, clean_markdown
+)
+
+ANALYSIS = """Intro line
+
+## Overall Assessment
+Solid backend profile.
+
+## **Skills Analysis**
+- **Current Skills**:
+  - Python
+  - SQL
+- **Missing Skills**:
+  - Kubernetes
+
+## Strengths
+- Clear impact metrics
+* Strong **Python** background
+**Leadership**: mentored four engineers
+1. Open-source work
+
+## Areas to Improve
+2) Add a summary
+"""
+
+
+def test_sections_are_keyed_by_canonical_name():
+    sections = parse_analysis_sections(ANALYSIS)
+
+    assert sections.preamble == "Intro line"
+    assert sections.get("Overall Assessment") == "Solid backend profile."
+    assert "Key Strengths" in sections
+    assert sections.get("strong points") == sections.get("Key Strengths")
+    assert sections.first("Recommendations", "Areas for Improvement") == "2) Add a summary"
+    assert [name for _, name, _ in sections.items()] == [
+        "Overall Assessment", "Skills Analysis", "Key Strengths", "Areas for Improvement"
+    ]
+
+
+def test_labelled_skill_blocks_become_sections():
+    sections = parse_analysis_sections(ANALYSIS)
+
+    assert extract_skill_items(sections.get("Current Skills")) == ["Python", "SQL"]
+    assert extract_skill_items(sections.get("Missing Skills")) == ["Kubernetes"]
+
+
+def test_list_items_strip_bullets_but_not_bold():
+    items = extract_list_items(parse_analysis_sections(ANALYSIS).get("Key Strengths"))
+
+    assert items == [
+        "Clear impact metrics",
+        "Strong Python background",
+        "Leadership: mentored four engineers",
+        "Open-source work",
+    ]
+
+
+def test_colon_lines_are_opt_in():
+    text = "Note: not a bullet\n- bullet"
+
+    assert extract_list_items(text) == ["bullet"]
+    assert extract_list_items(text, include_colon_lines=True) == ["Note: not a bullet", "bullet"]
+
+
+def test_clean_markdown():
+    assert clean_markdown("### **Bold** and _it_ [link](http://x)") == "Bold and it link"
+    assert clean_markdown("") == ""
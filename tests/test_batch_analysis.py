@@ -0,0 +1,93 @@
+import pytest
+
+from utils import llm_providers
+from utils.batch_analysis import pack_resumes, split_batch_response, analyze_resumes_batch
+
+
+def test_pack_resumes_respects_count_and_token_limits():
+    items = [("a", "", 400), ("b", "", 400), ("c", "", 400), ("d", "", 100), ("e", "", 100), ("f", "", 100)]
+
+    packs = pack_resumes(items, max_resumes=3, max_tokens=1000)
+
+    assert [[item[0] for item in pack] for pack in packs] == [["a", "b"], ["c", "d", "e"], ["f"]]
+    assert pack_resumes([], 3, 1000) == []
+
+
+def test_oversized_item_gets_its_own_pack():
+    packs = pack_resumes([("a", "", 100), ("b", "", 5000), ("c", "", 100)], max_resumes=5, max_tokens=1000)
+
+    assert [[item[0] for item in pack] for pack in packs] == [["a"], ["b"], ["c"]]
+
+
+def test_split_batch_response_matches_ids():
+    text = (
+        "preamble\n"
+        "<<<ANALYSIS 1>>>\nfirst\n<<<END ANALYSIS 1>>>\n"
+        "<<<ANALYSIS 9>>>\nunexpected\n<<<END ANALYSIS 9>>>\n"
+        "<<<ANALYSIS 2>>>\nsecond\n<<<END ANALYSIS 1>>>\n"
+        "<<<ANALYSIS 1>>>\nduplicate\n<<<END ANALYSIS 1>>>\n"
+        "<<<ANALYSIS 3>>>\n  third  \n<<<END ANALYSIS 3>>>"
+    )
+
+    # 2 is not closed with its own id, 9 was not asked for, the first block for 1 wins
+    assert split_batch_response(text, ["1", "2", "3"]) == {"1": "first", "3": "third"}
+    assert split_batch_response(None, ["1"]) == {}
+
+
+class CountingProvider(llm_providers.LocalProvider):
+    """Offline stub that records prompts and can leave one resume out of packed responses"""
+
+    def __init__(self, drop_id=None):
+        super().__init__()
+        self.model_path = None
+        self.drop_id = drop_id
+        self.prompts = []
+
+    def generate(self, model_id, prompt, temperature=0.7, max_tokens=3000, on_wait=None):
+        self.prompts.append(prompt)
+        response = super().generate(model_id, prompt, temperature, max_tokens, on_wait)
+        if self.drop_id is not None:
+            response = response.replace(f"<<<ANALYSIS {self.drop_id}>>>", "")
+        return response
+
+
+@pytest.fixture
+def local_provider(monkeypatch):
+    monkeypatch.setenv("ANALYSIS_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_PROVIDER", "local")
+
+    def install(provider):
+        monkeypatch.setitem(llm_providers._providers, "local", provider)
+        return provider
+    return install
+
+
+def _resume(name, lines=8):
+    return "\n".join(f"{name} built feature {i} with Python and SQL for the payments team" for i in range(lines))
+
+
+def test_short_resumes_share_one_request(local_provider):
+    from utils.ai_resume_analyzer import AIResumeAnalyzer
+
+    provider = local_provider(CountingProvider())
+    resumes = {"a": _resume("Ada"), "b": _resume("Grace"), "c": _resume("Alan")}
+
+    results = analyze_resumes_batch(AIResumeAnalyzer(), resumes, model="Local (Offline)", job_role="Engineer")
+
+    assert list(results) == ["a", "b", "c"]
+    assert all("error" not in result and result["analysis"] for result in results.values())
+    assert len(provider.prompts) == 1
+    assert "=== RESUME b ===" in provider.prompts[0]
+
+
+def test_resume_missing_from_packed_response_is_retried_alone(local_provider):
+    from utils.ai_resume_analyzer import AIResumeAnalyzer
+
+    provider = local_provider(CountingProvider(drop_id="b"))
+    resumes = {"a": _resume("Ada"), "b": _resume("Grace"), "c": _resume("Alan")}
+
+    results = analyze_resumes_batch(AIResumeAnalyzer(), resumes, model="Local (Offline)", job_role="Engineer")
+
+    assert all("error" not in result and result["analysis"] for result in results.values())
+    assert len(provider.prompts) == 2
+    assert "=== RESUME" not in provider.prompts[1]
@@ -0,0 +1,93 @@
+import pytest
+
+from config import stats_cache
+from config.database import (
+    get_database_connection, save_resume_data_bulk, save_analysis_data, save_ai_analysis_data,
+    get_resume_page, count_resumes, search_resumes, search_ai_analyses
+)
+from config.stats_cache import StatsCache
+
+
+def _resume(name, role="Developer"):
+    return {"personal_info": {"full_name": name, "email": f"{name}@example.com", "phone": ""},
+            "target_role": role, "target_category": "Engineering", "skills": ["Python"]}
+
+
+@pytest.fixture
+def resumes(database, monkeypatch):
+    """Ten resumes: ATS scores 50, 50, 60, 60, ... (ids 1-8) and two without an analysis"""
+    monkeypatch.setattr(stats_cache, "_cache", StatsCache(0))
+    ids = save_resume_data_bulk([_resume(f"user{i}", "Developer" if i % 2 else "Analyst") for i in range(10)])
+    for i, resume_id in enumerate(ids[:8]):
+        # An older analysis the listing must ignore
+        save_analysis_data(resume_id, {"ats_score": 99 - i})
+        save_analysis_data(resume_id, {"ats_score": 50 + 10 * (i // 2)})
+    return ids
+
+
+def _all_pages(sort, filters=None, page_size=3):
+    ids, after = [], None
+    while True:
+        rows, after = get_resume_page(filters, sort, after, page_size)
+        ids.extend(row[0] for row in rows)
+        if after is None:
+            return ids
+
+
+def test_pages_cover_every_resume_once_in_sort_order(resumes):
+    assert _all_pages("newest") == sorted(resumes, reverse=True)
+    assert _all_pages("oldest") == sorted(resumes)
+    # Equal scores are ordered by id, resumes without an analysis come last
+    assert _all_pages("highest_ats") == [8, 7, 6, 5, 4, 3, 2, 1, 10, 9]
+    assert _all_pages("lowest_ats") == [9, 10, 1, 2, 3, 4, 5, 6, 7, 8]
+
+
+def test_rows_show_the_latest_analysis(resumes):
+    rows, _ = get_resume_page({}, "highest_ats", None, 2)
+    assert [(row[0], row[10]) for row in rows] == [(8, 80.0), (7, 80.0)]
+
+
+def test_score_filters_exclude_resumes_without_an_analysis(resumes):
+    assert _all_pages("lowest_ats", {"max_score": 60}) == [1, 2, 3, 4]
+    assert _all_pages("highest_ats", {"min_score": 70, "role": "Developer"}) == [8, 6]
+    assert count_resumes({"max_score": 60}) == 4
+    assert count_resumes({"min_score": 70, "role": "Developer"}) == 2
+
+
+def test_listing_pages_by_score_from_the_index(resumes):
+    conn = get_database_connection()
+    try:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM resume_data r "
+            "WHERE (r.latest_ats_score, r.id) < (?, ?) ORDER BY r.latest_ats_score DESC, r.id DESC LIMIT 3",
+            (70, 6)
+        ).fetchall()
+    finally:
+        conn.close()
+    assert "idx_resume_data_latest_ats_score" in str(plan)
+    assert "TEMP B-TREE" not in str(plan)
+
+
+def test_search_ranks_every_match_not_only_recent_ones(database):
+    best = _resume("Ada Lovelace", "Kubernetes Engineer")
+    best["summary"] = "Kubernetes operator, runs kubernetes clusters"
+    best["skills"] = ["Kubernetes"]
+    newer = [dict(_resume(f"user{i}"), summary=f"Once deployed kubernetes {i}") for i in range(30)]
+    ids = save_resume_data_bulk([best] + newer)
+
+    results = search_resumes("kubernetes", limit=5)
+    assert [result["id"] for result in results][0] == ids[0]
+    relevance = [result["relevance"] for result in results]
+    assert relevance == sorted(relevance, reverse=True)
+    # Raw scores, so close matches keep their order in the caller
+    assert isinstance(relevance[0], float) and relevance[0] != round(relevance[0], 3)
+
+
+def test_analysis_text_is_searchable_once_saved(database):
+    save_ai_analysis_data(None, {"model_used": "Google Gemini", "resume_score": 80, "job_role": "Data Scientist",
+                                 "analysis_text": "Strong pandas and Spark experience; add a Kaggle portfolio"})
+    save_ai_analysis_data(None, {"model_used": "Google Gemini", "resume_score": 70, "job_role": "Designer"})
+
+    results = search_ai_analyses("kaggle portfolio")
+    assert [(result["id"], result["job_role"]) for result in results] == [(1, "Data Scientist")]
+    assert "**Kaggle**" in results[0]["snippet"]
@@ -0,0 +1,20 @@
+from utils import llm_clients
+
+
+def test_a4f_client_is_shared_and_leaves_retries_to_the_governor():
+    llm_clients.close_clients()
+    try:
+        client = llm_clients.get_a4f_client("key", "http://127.0.0.1:9/v1")
+
+        assert llm_clients.get_a4f_client("key", "http://127.0.0.1:9/v1") is client
+        assert client.max_retries == 0
+        assert llm_clients.get_a4f_client("other", "http://127.0.0.1:9/v1") is not client
+    finally:
+        llm_clients.close_clients()
+
+
+def test_no_client_without_api_key(monkeypatch):
+    monkeypatch.delenv("A4F_API_KEY", raising=False)
+    monkeypatch.setattr(llm_clients, "_env_loaded", True)
+
+    assert llm_clients.get_a4f_client() is None
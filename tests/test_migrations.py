@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from config import database
+from config.database import get_database_connection, init_database, save_resume_data, save_analysis_data
+from config.migrations import MIGRATIONS, apply_migrations, get_schema_version
+
+
+@pytest.fixture
+def old_database(tmp_path, monkeypatch):
+    """A database created by a version that shipped only migrations up to `version`"""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "resume_data.db"))
+
+    def create(version):
+        shipped = [migration for migration in MIGRATIONS if migration[0] <= version]
+        monkeypatch.setattr(database, "apply_migrations", lambda conn: apply_migrations(conn, shipped))
+        init_database()
+        monkeypatch.setattr(database, "apply_migrations", apply_migrations)
+        return get_database_connection()
+
+    return create
+
+
+def test_fresh_database_is_at_the_latest_version(database):
+    conn = get_database_connection()
+    try:
+        assert get_schema_version(conn) == MIGRATIONS[-1][0]
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+        assert versions == [migration[0] for migration in MIGRATIONS]
+        # Already applied migrations are skipped
+        assert apply_migrations(conn) == []
+    finally:
+        conn.close()
+
+
+def test_statements_for_other_dialects_are_skipped(database):
+    conn = get_database_connection()
+    try:
+        applied = apply_migrations(conn, [(100, "Test", [
+            {"postgresql": "CREATE INDEX idx_test ON resume_data USING GIN (name)"},
+            {"sqlite": "CREATE TABLE lite_only (id INTEGER)", "postgresql": "NOT SQL"},
+        ])])
+        assert applied == [100]
+        assert conn.execute("SELECT COUNT(*) FROM lite_only").fetchone() == (0,)
+    finally:
+        conn.close()
+
+
+def test_a_failing_migration_is_rolled_back(database):
+    conn = get_database_connection()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            apply_migrations(conn, [(100, "Broken", [
+                "CREATE TABLE half_done (id INTEGER)",
+                "ALTER TABLE missing_table ADD COLUMN x TEXT",
+            ])])
+        assert get_schema_version(conn) == MIGRATIONS[-1][0]
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchall() == []
+    finally:
+        conn.close()
+
+
+def test_upgrade_backfills_existing_rows(old_database):
+    conn = old_database(7)
+    conn.close()
+    resume_id = save_resume_data({"personal_info": {"full_name": "Ada", "email": "ada@example.com", "phone": ""}})
+    save_analysis_data(resume_id, {"ats_score": 40})
+    save_analysis_data(resume_id, {"ats_score": 75})
+    unscored = save_resume_data({"personal_info": {"full_name": "Alan", "email": "alan@example.com", "phone": ""}})
+
+    conn = get_database_connection()
+    try:
+        assert apply_migrations(conn) == [migration[0] for migration in MIGRATIONS if migration[0] > 7]
+        rows = conn.execute("SELECT id, latest_analysis_id, latest_ats_score FROM resume_data ORDER BY id").fetchall()
+        assert rows == [(resume_id, 2, 75.0), (unscored, None, -1.0)]
+    finally:
+        conn.close()
+
+    # The trigger keeps the columns current from then on
+    save_analysis_data(unscored, {"ats_score": 55})
+    conn = get_database_connection()
+    try:
+        assert conn.execute("SELECT latest_ats_score FROM resume_data WHERE id = ?", (unscored,)).fetchone() == (55.0,)
+    finally:
+        conn.close()
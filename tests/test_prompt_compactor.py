@@ -0,0 +1,52 @@
+import pytest
+
+from utils import prompt_compactor
+from utils.prompt_compactor import normalize_resume_text, split_resume_sections, compact_resume_text
+
+
+@pytest.fixture(autouse=True)
+def char_estimate(monkeypatch):
+    # Deterministic token counts whether or not tiktoken is installed
+    monkeypatch.setattr(prompt_compactor, "TIKTOKEN_AVAILABLE", False)
+
+
+def test_normalize_drops_noise_page_numbers_and_repeated_headers():
+    text = (
+        "Jane Doe  Resume\nSenior engineer with ten years of experience\n----\n1\f"
+        "Jane Doe  Resume\nSenior engineer with ten years of experience\nPage 2 of 2"
+    )
+
+    assert normalize_resume_text(text) == "Jane Doe Resume\nSenior engineer with ten years of experience"
+
+
+def test_split_sections_by_heading():
+    sections = split_resume_sections("Jane Doe\nSUMMARY\nBuilds things\nTechnical Skills\nPython")
+
+    assert [key for key, _ in sections] == ["header", "summary", "skills"]
+
+
+def test_every_section_that_does_not_fit_is_truncated(monkeypatch):
+    monkeypatch.setitem(prompt_compactor.MODEL_TOKEN_BUDGETS, "tiny", 30)
+    experience = "\n".join(f"Shipped feature number {i:02d}" for i in range(10))
+    hobbies = "\n".join(f"Hobby {i} and more hobby text" for i in range(10))
+    text = f"Jane Doe\nExperience\n{experience}\nInterests\n{hobbies}"
+
+    result = compact_resume_text(text, model="tiny")
+
+    assert result["truncated_sections"] == ["experience", "interests"]
+    assert result["text"].startswith("Jane Doe\n\nExperience\nShipped feature number 00")
+    assert "[...]" in result["text"]
+    # Only the heading of the interests section fits, so the section is dropped
+    assert "Interests" not in result["text"]
+    assert result["compacted_tokens"] <= 30 + 2
+
+
+def test_lower_priority_sections_use_leftover_budget(monkeypatch):
+    monkeypatch.setitem(prompt_compactor.MODEL_TOKEN_BUDGETS, "tiny", 20)
+    experience = "\n".join(f"A very long experience line about work {i}" for i in range(5))
+    text = f"Jane\nExperience\n{experience}\nLanguages\nFrench"
+
+    result = compact_resume_text(text, model="tiny")
+
+    assert result["truncated_sections"] == ["experience"]
+    assert result["text"].endswith("Languages\nFrench")
@@ -0,0 +1,72 @@
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import TokenBucket, SQLiteTokenBucket, governed_call, is_rate_limit_error
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def test_token_bucket_allows_burst_then_reports_wait():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert 0.0 < bucket.try_acquire() <= 1.0
+
+
+def test_sqlite_bucket_is_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "buckets.db")
+    first = SQLiteTokenBucket("a4f:model", rate=0.001, capacity=2, db_path=db_path)
+    second = SQLiteTokenBucket("a4f:model", rate=0.001, capacity=2, db_path=db_path)
+
+    assert first.try_acquire() == 0.0
+    assert second.try_acquire() == 0.0
+    assert first.try_acquire() > 0
+    assert second.try_acquire() > 0
+    assert first.errors == second.errors == 0
+
+
+def test_unusable_bucket_file_falls_back_to_in_process_limit(tmp_path):
+    db_path = tmp_path / "buckets.db"
+    db_path.write_bytes(b"not a sqlite database" * 100)
+
+    bucket = SQLiteTokenBucket("a4f:model", rate=0.001, capacity=1, db_path=str(db_path))
+
+    assert bucket.try_acquire() == 0.0
+    # Still rate limited, not failing open
+    assert bucket.try_acquire() > 0
+    assert bucket.errors >= 2
+
+
+def test_governed_call_retries_rate_limit_errors(monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RateLimited("Too many requests")
+        return "ok"
+
+    assert governed_call("test-retry", "model", flaky, retries=2) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(RateLimited):
+        governed_call("test-retry", "model", flaky, retries=0)
+
+
+def test_other_errors_are_not_retried():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        governed_call("test-other", "model", broken, retries=3)
+    assert len(calls) == 1
+    assert not is_rate_limit_error(ValueError("bad prompt"))
+    assert is_rate_limit_error(Exception("429 Resource exhausted"))
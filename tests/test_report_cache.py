@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from config.database import get_report_artifact
+from utils import report_cache
+from utils.report_cache import submit_report, get_cached_report
+
+ANALYSIS = {
+    "score": 78,
+    "ats_score": 70,
+    "model_used": "Local (Offline)",
+    "full_response": "## Key Strengths\n- Clear metrics\n\n## Areas for Improvement\n- Add links\n",
+    "strengths": ["Clear metrics"],
+    "weaknesses": ["Add links"],
+}
+
+
+@pytest.fixture
+def report_dir(database, tmp_path, monkeypatch):
+    monkeypatch.setenv("REPORT_CACHE_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(report_cache, "_memory", type(report_cache._memory)())
+    monkeypatch.setattr(report_cache, "_memory_bytes", 0)
+    return tmp_path / "reports"
+
+
+def test_report_renders_once_and_is_served_from_cache(report_dir):
+    content_hash, future = submit_report(7, ANALYSIS, "Ada Lovelace", "Software Engineer")
+    pdf_bytes = future.result(timeout=60)
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert get_report_artifact(7, content_hash)["size_bytes"] == len(pdf_bytes)
+
+    same_hash, cached = submit_report(7, dict(ANALYSIS), "Ada Lovelace", "Software Engineer")
+    assert same_hash == content_hash
+    assert cached.done() and cached.result() == pdf_bytes
+
+    # A new process finds it on disk
+    report_cache._memory.clear()
+    assert get_cached_report(7, content_hash) == pdf_bytes
+
+
+def _wait_for_artifact(analysis_id, content_hash, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        artifact = get_report_artifact(analysis_id, content_hash)
+        if artifact is not None:
+            return artifact
+        time.sleep(0.05)
+    return None
+
+
+def test_queued_analysis_is_served_before_its_id_is_known(report_dir):
+    analysis_id = Future()
+    content_hash, future = submit_report(analysis_id, ANALYSIS, "Grace Hopper", "Data Scientist")
+
+    # Served without waiting for the write queue
+    pdf_bytes = future.result(timeout=60)
+    assert pdf_bytes.startswith(b"%PDF")
+    assert get_cached_report(None, content_hash) == pdf_bytes
+    assert not list(report_dir.glob("*.pdf"))
+
+    analysis_id.set_result(12)
+    assert _wait_for_artifact(12, content_hash)["size_bytes"] == len(pdf_bytes)
+    assert list(report_dir.glob("12-*.pdf"))
+
+
+def test_unsaved_analyses_do_not_hold_up_other_reports(report_dir):
+    stuck = [Future() for _ in range(report_cache._executor._max_workers + 1)]
+    queued = [submit_report(analysis_id, dict(ANALYSIS, score=i), "Alan Turing", "Engineer")[1]
+              for i, analysis_id in enumerate(stuck)]
+
+    content_hash, future = submit_report(8, ANALYSIS, "Ada Lovelace", "Software Engineer")
+    assert future.result(timeout=60).startswith(b"%PDF")
+    assert all(report.result(timeout=60).startswith(b"%PDF") for report in queued)
+
+    # A failed analysis write leaves the served report alone and stores nothing
+    stuck[0].set_exception(RuntimeError("database is locked"))
+    assert queued[0].result() is not None
+    assert [path.name.split("-")[0] for path in report_dir.glob("*.pdf")] == ["8"]
@@ -0,0 +1,51 @@
+import datetime
+import zipfile
+
+import pytest
+
+from config.database import save_ai_analysis_data, get_report_sources, get_report_input, get_report_artifact
+from utils.report_cache import render_and_store
+from utils.report_export import export_reports_zip
+
+TODAY = datetime.date.today()
+
+
+@pytest.fixture
+def analyses(database, tmp_path, monkeypatch):
+    monkeypatch.setenv("REPORT_CACHE_DIR", str(tmp_path / "reports"))
+    for role, text in [("Data Scientist", "## Key Strengths\n- Spark\n"), ("Designer", "## Key Strengths\n- Figma\n"),
+                       ("Engineer", "## Key Strengths\n- Go\n"), ("Analyst", "")]:
+        save_ai_analysis_data(None, {"model_used": "Local (Offline)", "resume_score": 70, "job_role": role,
+                                     "analysis_text": text})
+    # One analysis was rendered from the AI analysis tab
+    render_and_store(3, {"score": 70, "full_response": "## Key Strengths\n- Go\n"}, "Ken Thompson", "Engineer")
+
+
+def test_sources_carry_metadata_and_inputs_load_per_report(analyses):
+    sources = get_report_sources(TODAY, TODAY)
+
+    assert [(source["analysis_id"], source["available"]) for source in sources] == \
+        [(1, True), (2, True), (3, True), (4, False)]
+    assert "analysis_json" not in sources[0]
+    assert sources[2]["candidate_name"] == "Ken Thompson" and sources[2]["content_hash"]
+
+    analysis = get_report_input(sources[0])
+    assert analysis["full_response"].startswith("## Key Strengths") and analysis["score"] == 70
+    assert analysis["generated_on"] == TODAY.isoformat()
+    assert get_report_input(sources[2])["full_response"] == "## Key Strengths\n- Go\n"
+
+
+def test_analyses_without_a_rendered_report_are_exported(analyses, tmp_path):
+    output = tmp_path / "reports.zip"
+    summary = export_reports_zip(TODAY, TODAY, str(output), max_workers=1)
+
+    assert summary["reports"] == 3 and summary["unavailable"] == 1 and summary["failed"] == 0
+    assert summary["rendered"] == 2 and summary["reused"] == 1
+    with zipfile.ZipFile(output) as archive:
+        names = archive.namelist()
+    assert len(names) == 3 and any("Ken_Thompson" in name for name in names)
+    # Rendered reports are recorded, so the next export reuses them
+    source = get_report_sources(TODAY, TODAY)[0]
+    assert source["artifact_id"] is not None
+    assert get_report_artifact(1, source["content_hash"]) is not None
+    assert export_reports_zip(TODAY, TODAY, str(output), max_workers=1)["reused"] == 3
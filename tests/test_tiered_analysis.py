@@ -0,0 +1,90 @@
+import threading
+import time
+
+from utils.tiered_analysis import merge_analysis, start_tiered_analysis
+
+QUICK = {
+    "ats_score": 72,
+    "keyword_match": {"score": 60, "found_skills": ["Python"]},
+    "format_score": 80,
+    "section_score": 70,
+    "suggestions": ["Add a summary"],
+}
+
+LLM = {
+    "resume_score": 81,
+    "model_used": "Google Gemini",
+    "analysis": "## Key Strengths\n- Clear metrics\n\n## Areas for Improvement\n- Add links\n",
+}
+
+
+def test_merge_extracts_lists_and_keeps_rule_based_result_separate():
+    merged = merge_analysis(QUICK, LLM)
+
+    assert merged["strengths"] == ["Clear metrics"]
+    assert merged["weaknesses"] == ["Add links"]
+    assert merged["rule_based"]["ats_score"] == 72
+    assert merged["rule_based"]["suggestions"] == ["Add a summary"]
+
+
+def test_rule_based_ats_score_is_not_reported_as_the_ai_score():
+    assert "ats_score" not in merge_analysis(QUICK, LLM)
+    assert merge_analysis(QUICK, dict(LLM, ats_score=65))["ats_score"] == 65
+
+
+class RuleAnalyzer:
+    def analyze_resume(self, resume, role_info):
+        return dict(QUICK)
+
+
+class AIAnalyzer:
+    available_models = ["Google Gemini"]
+
+    def __init__(self, result):
+        self.result = result
+
+    def analyze_resume_with_model(self, text, model, job_role=None, job_description=None, on_wait=None):
+        if on_wait:
+            on_wait(3)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_tiered_job_returns_quick_result_then_merged_result():
+    job = start_tiered_analysis(RuleAnalyzer(), AIAnalyzer(LLM), "resume", {}, "Engineer", "Unknown model")
+
+    assert job.quick_result["ats_score"] == 72
+    result = job.wait(poll_interval=0.01)
+    assert job.done()
+    assert result["resume_score"] == 81
+    assert result["rule_based"]["format_score"] == 80
+
+
+def test_tiered_job_reports_llm_failures_as_errors():
+    job = start_tiered_analysis(RuleAnalyzer(), AIAnalyzer(RuntimeError("boom")), "resume", {}, "Engineer", "Google Gemini")
+
+    assert job.result(timeout=5) == {"error": "Analysis failed: boom"}
+
+
+class QueuedAnalyzer(AIAnalyzer):
+    """Both requests wait in the provider queue at once, at positions given by job role"""
+
+    def __init__(self, result):
+        super().__init__(result)
+        self.both_waiting = threading.Barrier(2, timeout=5)
+
+    def analyze_resume_with_model(self, text, model, job_role=None, job_description=None, on_wait=None):
+        on_wait(int(job_role))
+        self.both_waiting.wait()
+        return self.result
+
+
+def test_jobs_on_one_analyzer_report_their_own_queue_position():
+    analyzer = QueuedAnalyzer(LLM)
+    jobs = [start_tiered_analysis(RuleAnalyzer(), analyzer, "resume", {}, role, "Google Gemini") for role in "12"]
+
+    while not all(job.queue_position for job in jobs):
+        time.sleep(0.01)
+    assert [job.queue_position for job in jobs] == [1, 2]
+    assert all(job.result(timeout=5)["resume_score"] == 81 for job in jobs)
@@ -0,0 +1,194 @@
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from config import write_queue
+from config.database import get_database_connection
+from config.write_queue import WriteBehindQueue
+
+
+def _resume(name):
+    return {"resume": {"personal_info": {"full_name": name, "email": f"{name}@example.com", "phone": ""},
+                       "skills": ["Python"]}}
+
+
+def _count(table="resume_data"):
+    conn = get_database_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _journal_lines(*records):
+    return "".join(json.dumps({"seq": seq, "kind": "resume", "payload": _resume(name)}) + "\n"
+                   for seq, name in records)
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return tmp_path / "write_queue"
+
+
+@pytest.fixture
+def make_queue(database, journal_dir, monkeypatch):
+    monkeypatch.setattr(write_queue, "RETRY_DELAY_SECONDS", 0.05)
+    queues = []
+
+    def make(instance_id="web-1", batch_size=10, start=True):
+        queue = WriteBehindQueue(str(journal_dir / f"{instance_id}.journal"), instance_id,
+                                 batch_size=batch_size, flush_interval=0.01)
+        queues.append(queue)
+        if start:
+            assert queue.start()
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_records_are_written_and_journal_truncated(make_queue, journal_dir):
+    queue = make_queue()
+    futures = [queue.enqueue("resume", _resume(f"user{i}")) for i in range(25)]
+
+    assert queue.flush(timeout=10)
+    assert sorted(future.result() for future in futures) == list(range(1, 26))
+    assert _count() == 25 and _count("resume_skills") == 25
+    assert json.loads((journal_dir / "web-1.journal").read_text()) == {"seq": 25, "kind": "checkpoint"}
+    assert queue.stats()["written"] == 25
+
+
+def test_crash_leftovers_are_replayed_once(make_queue, journal_dir):
+    first = make_queue()
+    first.enqueue("resume", _resume("user1")).result(timeout=10)
+    first.shutdown()
+    # A crash after journaling seq 2-3, with a torn final line that was never acknowledged
+    with open(journal_dir / "web-1.journal", "a") as journal:
+        journal.write(_journal_lines((2, "user2"), (3, "user3")) + '{"seq": 4, "ki')
+
+    second = make_queue()
+    assert second.stats()["replayed"] == 2
+    assert second.enqueue("resume", _resume("user5")).result(timeout=10)
+    assert second.flush(timeout=10)
+    assert _count() == 4
+
+    # Records replayed again (e.g. the journal was restored from a backup) are not duplicated
+    second.shutdown()
+    (journal_dir / "web-1.journal").write_text(_journal_lines((2, "user2"), (3, "user3")))
+    third = make_queue()
+    assert third.flush(timeout=10)
+    assert _count() == 4
+
+
+def test_a_second_process_cannot_take_a_running_journal(make_queue, journal_dir):
+    running = make_queue()
+    running.enqueue("resume", _resume("user1"))
+
+    assert not make_queue(start=False).start()
+    assert running.flush(timeout=10)
+    assert _count() == 1
+
+
+def test_replicas_sharing_a_database_keep_separate_progress(make_queue, journal_dir):
+    other = make_queue("web-2")
+    for i in range(5):
+        other.enqueue("resume", _resume(f"other{i}"))
+    assert other.flush(timeout=10)
+    # web-1 crashed before writing its first two records (seq 1-2, below web-2's progress)
+    (journal_dir / "web-1.journal").write_text(_journal_lines((1, "user1"), (2, "user2")))
+
+    queue = make_queue()
+    assert queue.flush(timeout=10)
+    assert _count() == 7
+
+    conn = get_database_connection()
+    try:
+        progress = dict(conn.execute("SELECT instance_id, last_seq FROM write_queue_state").fetchall())
+    finally:
+        conn.close()
+    assert progress == {"web-1": 2, "web-2": 5}
+
+
+def test_start_survives_an_unreachable_database(make_queue, journal_dir, monkeypatch):
+    journal_dir.mkdir()
+    (journal_dir / "web-1.journal").write_text(_journal_lines((1, "user1"), (2, "user2")))
+    write_batch = WriteBehindQueue._write_batch
+    outage = {"attempts": 0}
+
+    def unreachable(self, *args):
+        outage["attempts"] += 1
+        if outage["attempts"] < 3:
+            raise sqlite3.OperationalError("unable to open database file")
+        return write_batch(self, *args)
+    monkeypatch.setattr(WriteBehindQueue, "_last_committed_seq", lambda self: unreachable(self))
+    monkeypatch.setattr(WriteBehindQueue, "_write_batch", unreachable)
+
+    queue = make_queue()
+    assert queue.flush(timeout=10)
+    assert _count() == 2
+    assert queue.stats()["replayed"] == 2
+
+
+@pytest.mark.skipif(write_queue.fcntl is None, reason="journals are only adopted where they can be locked")
+def test_journals_of_exited_processes_are_adopted(make_queue, journal_dir):
+    journal_dir.mkdir()
+    (journal_dir / "web-0.journal").write_text(_journal_lines((1, "user1"), (2, "user2")))
+    make_queue("web-2")
+    own = make_queue()
+
+    write_queue.adopt_orphaned_journals(str(journal_dir), own.journal_path)
+
+    deadline = time.time() + 10
+    while (journal_dir / "web-0.journal").exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert not (journal_dir / "web-0.journal").exists()
+    assert (journal_dir / "web-2.journal").exists()
+    assert _count() == 2
+
+
+
+def test_locked_database_retries_the_whole_batch(make_queue, database, monkeypatch):
+    monkeypatch.setenv("DB_BUSY_TIMEOUT_MS", "20")
+    blocker = sqlite3.connect(str(database), isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+
+    queue = make_queue()
+    futures = [queue.enqueue("resume", _resume(f"user{i}")) for i in range(5)]
+    assert not queue.flush(timeout=0.5)
+
+    blocker.execute("ROLLBACK")
+    blocker.close()
+    assert queue.flush(timeout=10)
+    assert all(isinstance(future.result(), int) for future in futures)
+    assert _count() == 5
+    assert queue.stats()["failed"] == 0
+
+
+def test_only_bad_records_are_skipped_and_retries_never_duplicate(make_queue, monkeypatch):
+    write_record = write_queue._write_record
+    failed_once = threading.Event()
+
+    def flaky_write(cursor, kind, payload):
+        name = payload["resume"]["personal_info"]["full_name"]
+        if name == "user2" and not failed_once.is_set():
+            # The connection drops after user0 and the bad record were committed one by one
+            failed_once.set()
+            raise sqlite3.OperationalError("disk I/O error")
+        return write_record(cursor, kind, payload)
+    monkeypatch.setattr(write_queue, "_write_record", flaky_write)
+
+    queue = make_queue()
+    futures = [queue.enqueue("resume", _resume("user0")),
+               queue.enqueue("resume", _resume(None)),  # name is NOT NULL
+               queue.enqueue("resume", _resume("user2")),
+               queue.enqueue("resume", _resume("user3"))]
+
+    assert queue.flush(timeout=10)
+    assert isinstance(futures[1].exception(), sqlite3.IntegrityError)
+    assert [isinstance(futures[i].result(), int) for i in (0, 2, 3)] == [True, True, True]
+    assert _count() == 3
+    assert queue.stats()["failed"] == 1
@@ -5,6 +5,4 @@ Utils package for Smart Resume AI
 from .resume_analyzer import ResumeAnalyzer
 from .resume_builder import ResumeBuilder
 from .resume_parser import ResumeParser
-from .excel_manager import ExcelManager
-from .database import * 
 from .ai_resume_analyzer import AIResumeAnalyzer
\ No newline at end of file
@@ -1,14 +1,20 @@
 import os
 import streamlit as st
-from dotenv import load_dotenv
-import google.generativeai as genai
 import pdfplumber
 import tempfile
 import requests
 import json
 import math
 import re
-from openai import OpenAI
+from utils.llm_clients import A4F_BASE_URL, load_environment, get_a4f_client
+from utils.llm_providers import get_provider, get_forced_provider, is_local_enabled, LOCAL_MODEL_NAME
+from utils.prompt_compactor import compact_resume_text, count_tokens
+from utils.analysis_cache import (get_analysis_cache, context_key, resume_diff,
+                                  get_reuse_threshold, get_diff_threshold)
+from utils.analysis_parser import (
+    clean_markdown, parse_analysis_sections, extract_list_items, extract_skill_items
+)
+from utils.report_renderer import render_report, append_detailed_analysis
 
 # Optional imports for OCR (not available in all cloud environments)
 try:
@@ -26,23 +32,16 @@ except ImportError:
 
 class AIResumeAnalyzer:
     def __init__(self):
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables (once per process)
+        load_environment()
         
         # Configure Google Gemini AI
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
         
-        # Configure A4F API
+        # Configure A4F API (the client itself is shared process-wide and created lazily)
         self.a4f_api_key = os.getenv("A4F_API_KEY")
-        self.a4f_base_url = "https://api.a4f.co/v1"
-        
-        # Initialize A4F client
-        if self.a4f_api_key:
-            self.a4f_client = OpenAI(
-                api_key=self.a4f_api_key,
-                base_url=self.a4f_base_url
-            )
+        self.a4f_base_url = A4F_BASE_URL
         
         # Available models - Only qualified models that provide both Resume and ATS scores
         self.available_models = {
@@ -53,11 +52,14 @@ class AIResumeAnalyzer:
             "Kimi K2": "provider-1/kimi-k2-instruct",
             "Qwen3 4B Thinking": "provider-1/qwen3-4b-thinking-2507",
             "Qwen2.5 Coder 3B": "provider-1/qwen2.5-coder-3b-instruct",
-            "Hunyuan A13B": "provider-1/hunyuan-a13b-instruct"
+            "Hunyuan A13B": "provider-1/hunyuan-a13b-instruct",
+            LOCAL_MODEL_NAME: "local"
         }
-        
-        if self.google_api_key:
-            genai.configure(api_key=self.google_api_key)
+    
+    @property
+    def a4f_client(self):
+        """Shared A4F (OpenAI-compatible) client with pooled keep-alive connections"""
+        return get_a4f_client(self.a4f_api_key, self.a4f_base_url)
     
     def get_available_models(self):
         """Get list of available AI models"""
@@ -79,29 +81,38 @@ class AIResumeAnalyzer:
                 "Hunyuan A13B"
             ])
         
+        # Offline backend (LOCAL_LLM_ENABLED=true, or LLM_PROVIDER=local for air-gapped runs)
+        if is_local_enabled():
+            if get_forced_provider() == "local":
+                return [LOCAL_MODEL_NAME]
+            models.append(LOCAL_MODEL_NAME)
+        
         return models if models else ["Google Gemini"]  # Default fallback
     
+    def get_provider_name(self, model):
+        """Provider backend for a model display name (LLM_PROVIDER overrides all models)"""
+        forced = get_forced_provider()
+        if forced:
+            return forced
+        if model == "Google Gemini":
+            return "gemini"
+        if model == LOCAL_MODEL_NAME:
+            return "local"
+        return "a4f"
+    
+    def get_model_display_name(self, model_name):
+        """Map a provider model id back to its display name in available_models"""
+        for display_name, model_id in self.available_models.items():
+            if model_id == model_name:
+                return display_name
+        return model_name
+    
     def clean_markdown(self, text):
         """Helper function to clean markdown formatting"""
-        if not text:
-            return ""
-        
-        # Remove markdown formatting for bold and italic
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
-        text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
-        text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
-        text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
-        
-        # Remove markdown formatting for headers
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-        
-        # Remove markdown formatting for links
-        text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-        
-        return text.strip()
+        return clean_markdown(text)
     
     def extract_text_from_pdf(self, pdf_file):
-        """Extract text from PDF using pdfplumber and OCR if needed"""
+        """Extract text from PDF using pdfplumber and OCR if needed (pages are separated by form feeds)"""
         text = ""
         
         # Save the uploaded file to a temporary file
@@ -129,7 +140,7 @@ class AIResumeAnalyzer:
                                 warnings.filterwarnings("ignore", message=".*Cannot convert.*")
                                 page_text = page.extract_text()
                                 if page_text:
-                                    text += page_text + "\n"
+                                    text += page_text + "\n\f"
                         except Exception as e:
                             # Don't show these specific errors to the user
                             if "PDFColorSpace" not in str(e) and "Cannot convert" not in str(e):
@@ -152,7 +163,7 @@ class AIResumeAnalyzer:
                     for page in pdf_reader.pages:
                         page_text = page.extract_text()
                         if page_text:
-                            pdf_text += page_text + "\n"
+                            pdf_text += page_text + "\n\f"
                 
                 if pdf_text.strip():
                     os.unlink(temp_path)  # Clean up the temp file
@@ -200,7 +211,7 @@ class AIResumeAnalyzer:
                         for i, image in enumerate(images):
                             st.info(f"Processing page {i+1} with OCR...")
                             page_text = pytesseract.image_to_string(image)
-                            ocr_text += page_text + "\n"
+                            ocr_text += page_text + "\n\f"
                         
                         if ocr_text.strip():
                             os.unlink(temp_path)  # Clean up the temp file
@@ -252,1068 +263,224 @@ class AIResumeAnalyzer:
         os.unlink(temp_path)  # Clean up the temp file
         return text
     
-    def analyze_resume_with_gemini(self, prompt_text, job_description=None, job_role=None):
-        """Analyze resume using Google Gemini AI - now supports both analysis and portfolio generation prompts"""
-        if not prompt_text:
-            return {"error": "Prompt text is required for analysis."}
+    def _build_analysis_instructions(self, job_description=None, job_role=None):
+        """Instruction block (response format, target role, job description) shared by single and batch prompts"""
+        base_prompt = """
+        You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
         
-        if not self.google_api_key:
-            return {"error": "Google API key is not configured. Please add it to your .env file."}
+        Please structure your response in the following format:
         
-        try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-            
-            # Check if this is a portfolio generation request (contains JSON schema)
-            if "JSON object" in prompt_text and "FULL_NAME" in prompt_text:
-                # This is a portfolio generation request
-                response = model.generate_content(prompt_text)
-                return {
-                    "analysis": response.text.strip()
-                }
-            
-            # This is a regular resume analysis request
-            resume_text = prompt_text
-            base_prompt = f"""
-            You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
-            
-            Please structure your response in the following format:
-            
-            ## Overall Assessment
-            [Provide a detailed assessment of the resume's overall quality, effectiveness, and alignment with industry standards. Include specific observations about formatting, content organization, and general impression. Be thorough and specific.]
-            
-            ## Professional Profile Analysis
-            [Analyze the candidate's professional profile, experience trajectory, and career narrative. Discuss how well their story comes across and whether their career progression makes sense for their apparent goals.]
-            
-            ## Skills Analysis
-            - **Current Skills**: [List ALL skills the candidate demonstrates in their resume, categorized by type (technical, soft, domain-specific, etc.). Be comprehensive.]
-            - **Skill Proficiency**: [Assess the apparent level of expertise in key skills based on how they're presented in the resume]
-            - **Missing Skills**: [List important skills that would improve the resume for their target role. Be specific and explain why each skill matters.]
-            
-            ## Experience Analysis
-            [Provide detailed feedback on how well the candidate has presented their experience. Analyze the use of action verbs, quantifiable achievements, and relevance to their target role. Suggest specific improvements.]
-            
-            ## Education Analysis
-            [Analyze the education section, including relevance of degrees, certifications, and any missing educational elements that would strengthen their profile.]
-            
-            ## Key Strengths
-            [List 5-7 specific strengths of the resume with detailed explanations of why these are effective]
-            
-            ## Areas for Improvement
-            [List 5-7 specific areas where the resume could be improved with detailed, actionable recommendations]
-            
-            ## ATS Optimization Assessment
-            [Analyze how well the resume is optimized for Applicant Tracking Systems. Provide a specific ATS score from 0-100, with 100 being perfectly optimized. Use this format: "ATS Score: XX/100". Then suggest specific keywords and formatting changes to improve ATS performance.]
-            
-            ## Recommended Courses/Certifications
-            [Suggest 5-7 specific courses or certifications that would enhance the candidate's profile, with a brief explanation of why each would be valuable]
+        ## Overall Assessment
+        [Provide a detailed assessment of the resume's overall quality, effectiveness, and alignment with industry standards. Include specific observations about formatting, content organization, and general impression. Be thorough and specific.]
+        
+        ## Professional Profile Analysis
+        [Analyze the candidate's professional profile, experience trajectory, and career narrative. Discuss how well their story comes across and whether their career progression makes sense for their apparent goals.]
+        
+        ## Skills Analysis
+        - **Current Skills**: [List ALL skills the candidate demonstrates in their resume, categorized by type (technical, soft, domain-specific, etc.). Be comprehensive.]
+        - **Skill Proficiency**: [Assess the apparent level of expertise in key skills based on how they're presented in the resume]
+        - **Missing Skills**: [List important skills that would improve the resume for their target role. Be specific and explain why each skill matters.]
+        
+        ## Experience Analysis
+        [Provide detailed feedback on how well the candidate has presented their experience. Analyze the use of action verbs, quantifiable achievements, and relevance to their target role. Suggest specific improvements.]
+        
+        ## Education Analysis
+        [Analyze the education section, including relevance of degrees, certifications, and any missing educational elements that would strengthen their profile.]
+        
+        ## Key Strengths
+        [List 5-7 specific strengths of the resume with detailed explanations of why these are effective]
+        
+        ## Areas for Improvement
+        [List 5-7 specific areas where the resume could be improved with detailed, actionable recommendations]
+        
+        ## ATS Optimization Assessment
+        [Analyze how well the resume is optimized for Applicant Tracking Systems. Provide a specific ATS score from 0-100, with 100 being perfectly optimized. Use this format: "ATS Score: XX/100". Then suggest specific keywords and formatting changes to improve ATS performance.]
+        
+        ## Recommended Courses/Certifications
+        [Suggest 5-7 specific courses or certifications that would enhance the candidate's profile, with a brief explanation of why each would be valuable]
+        
+        ## Resume Score
+        [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
+        """
+        
+        if job_role:
+            base_prompt += f"""
             
-            ## Resume Score
-            [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
+            The candidate is targeting a role as: {job_role}
             
-            Resume:
-            {resume_text}
+            ## Role Alignment Analysis
+            [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
             """
+        
+        if job_description:
+            base_prompt += f"""
             
-            if job_role:
-                base_prompt += f"""
-                
-                The candidate is targeting a role as: {job_role}
-                
-                ## Role Alignment Analysis
-                [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
-                """
-            
-            if job_description:
-                base_prompt += f"""
-                
-                Additionally, compare this resume to the following job description:
-                
-                Job Description:
-                {job_description}
-                
-                ## Job Match Analysis
-                [Provide a detailed analysis of how well the resume matches the job description, with a match percentage and specific areas of alignment and misalignment]
-                
-                ## Key Job Requirements Not Met
-                [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
-                """
-            
-            response = model.generate_content(base_prompt)
-            analysis = response.text.strip()
+            Additionally, compare the resume to the following job description:
             
-            # Extract resume score if present
-            resume_score = self._extract_score_from_text(analysis)
+            Job Description:
+            {job_description}
             
-            # Extract ATS score if present
-            ats_score = self._extract_ats_score_from_text(analysis)
+            ## Job Match Analysis
+            [Provide a detailed analysis of how well the resume matches the job description, with a match percentage and specific areas of alignment and misalignment]
             
-            return {
-                "analysis": analysis,
-                "resume_score": resume_score,
-                "ats_score": ats_score
-            }
+            ## Key Job Requirements Not Met
+            [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
+            """
         
-        except Exception as e:
-            return {"error": f"Analysis failed: {str(e)}"}
+        return base_prompt
 
-    def analyze_resume_with_a4f(self, prompt_text, job_description=None, job_role=None, model_name="provider-1/llama-3.2-1b-instruct-fp-16"):
-        """Analyze resume using A4F API models"""
+    def _build_analysis_prompt(self, resume_text, job_description=None, job_role=None):
+        """
+        Build the structured resume analysis prompt shared by all providers
+        
+        The resume goes last so that every prompt for the same role and job description starts
+        with an identical prefix, which providers with prompt caching can reuse.
+        """
+        return self._build_analysis_instructions(job_description, job_role) + f"""
+        
+        Resume:
+        {resume_text}
+        """
+
+    def _build_update_prompt(self, previous_analysis, changes):
+        """Prompt that updates a previous analysis with only the resume lines that changed"""
+        return f"""
+        You previously analyzed a resume and produced the analysis below. The candidate has since
+        made small edits to the resume. The changes are listed below: lines starting with "-" were
+        removed and lines starting with "+" were added.
+        
+        Update the analysis to reflect these changes. Keep exactly the same section headers and
+        format, update the "Resume Score: XX/100" and "ATS Score: XX/100" lines if the changes affect
+        them, and return the complete updated analysis.
+        
+        Previous analysis:
+        {previous_analysis}
+        
+        Resume changes:
+        {changes}
+        """
+
+    def _run_cached_analysis(self, model, resume_text, job_description, job_role, generate):
+        """
+        Run a resume analysis through the near-duplicate cache
+        
+        generate(prompt) sends a prompt to the model and returns the response text. Near-identical
+        resumes reuse the cached analysis; similar ones only send the changed lines to the model.
+        """
+        cache = get_analysis_cache()
+        key = context_key(model, job_role, job_description)
+        match, similarity = cache.lookup(key, resume_text) if cache else (None, 0.0)
+
+        if match and similarity >= get_reuse_threshold():
+            cache.hits += 1
+            print(f"Analysis cache hit ({model}, similarity {similarity:.2f})")
+            return dict(match["result"], cache_similarity=round(similarity, 2))
+
+        compacted = compact_resume_text(resume_text, model=model)
+        prompt = None
+        if match and similarity >= get_diff_threshold():
+            changes = resume_diff(match["resume_text"], resume_text)
+            # Only worth it while the diff is much smaller than the resume itself
+            if changes and count_tokens(changes) * 2 < compacted["compacted_tokens"]:
+                cache.partial_hits += 1
+                print(f"Analysis cache partial hit ({model}, similarity {similarity:.2f}); sending changes only")
+                prompt = self._build_update_prompt(match["result"]["analysis"], changes)
+        if prompt is None:
+            if cache:
+                cache.misses += 1
+            prompt = self._build_analysis_prompt(compacted["text"], job_description, job_role)
+
+        analysis = generate(prompt)
+        result = {
+            "analysis": analysis,
+            "resume_score": self._extract_score_from_text(analysis),
+            "ats_score": self._extract_ats_score_from_text(analysis)
+        }
+        if cache and analysis:
+            cache.store(key, resume_text, result)
+        return result
+
+    def resolve_model(self, model):
+        """Resolve a display name or model id to (display name, model id, provider name, model_used label)"""
+        display_name = model if model in self.available_models else self.get_model_display_name(model)
+        model_id = self.available_models.get(display_name, model)
+        provider_name = self.get_provider_name(display_name)
+        if provider_name == "local":
+            display_name = LOCAL_MODEL_NAME
+        # A4F results have always reported the provider model id
+        model_used = model_id if provider_name == "a4f" else display_name
+        return display_name, model_id, provider_name, model_used
+
+    def analyze_resume_with_model(self, prompt_text, model="Google Gemini", job_description=None, job_role=None,
+                                  on_wait=None):
+        """
+        Analyze a resume (or run a portfolio generation prompt) with any model
+        
+        model is a display name from available_models or a provider model id; the request
+        goes to the provider backend returned by get_provider_name. on_wait(position) is
+        called while the request waits in the provider queue.
+        """
         if not prompt_text:
             return {"error": "Prompt text is required for analysis."}
         
-        if not self.a4f_api_key:
-            return {"error": "A4F API key is not configured."}
+        display_name, model_id, provider_name, model_used = self.resolve_model(model)
+        provider = get_provider(provider_name)
+        if not provider.is_configured():
+            return {"error": provider.not_configured_message}
+        
+        def generate(prompt, max_tokens=3000):
+            return provider.generate(model_id, prompt, max_tokens=max_tokens, on_wait=on_wait)
         
         try:
             # Check if this is a portfolio generation request (contains JSON schema)
             if "JSON object" in prompt_text and "FULL_NAME" in prompt_text:
-                # This is a portfolio generation request
-                completion = self.a4f_client.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {"role": "user", "content": prompt_text}
-                    ],
-                    temperature=0.7,
-                    max_tokens=2000
-                )
                 return {
-                    "analysis": completion.choices[0].message.content.strip(),
-                    "model_used": model_name
+                    "analysis": generate(prompt_text, max_tokens=2000),
+                    "model_used": model_used
                 }
             
             # This is a regular resume analysis request
-            resume_text = prompt_text
-            base_prompt = f"""
-            You are an expert resume analyst with deep knowledge of industry standards, job requirements, and hiring practices across various fields. Your task is to provide a comprehensive, detailed analysis of the resume provided.
-            
-            Please structure your response in the following format:
-            
-            ## Overall Assessment
-            [Provide a detailed assessment of the resume's overall quality, effectiveness, and alignment with industry standards. Include specific observations about formatting, content organization, and general impression. Be thorough and specific.]
-            
-            ## Professional Profile Analysis
-            [Analyze the candidate's professional profile, experience trajectory, and career narrative. Discuss how well their story comes across and whether their career progression makes sense for their apparent goals.]
-            
-            ## Skills Analysis
-            - **Current Skills**: [List ALL skills the candidate demonstrates in their resume, categorized by type (technical, soft, domain-specific, etc.). Be comprehensive.]
-            - **Skill Proficiency**: [Assess the apparent level of expertise in key skills based on how they're presented in the resume]
-            - **Missing Skills**: [List important skills that would improve the resume for their target role. Be specific and explain why each skill matters.]
-            
-            ## Experience Analysis
-            [Provide detailed feedback on how well the candidate has presented their experience. Analyze the use of action verbs, quantifiable achievements, and relevance to their target role. Suggest specific improvements.]
-            
-            ## Education Analysis
-            [Analyze the education section, including relevance of degrees, certifications, and any missing educational elements that would strengthen their profile.]
-            
-            ## Key Strengths
-            [List 5-7 specific strengths of the resume with detailed explanations of why these are effective]
-            
-            ## Areas for Improvement
-            [List 5-7 specific areas where the resume could be improved with detailed, actionable recommendations]
-            
-            ## ATS Optimization Assessment
-            [Analyze how well the resume is optimized for Applicant Tracking Systems. Provide a specific ATS score from 0-100, with 100 being perfectly optimized. Use this format: "ATS Score: XX/100". Then suggest specific keywords and formatting changes to improve ATS performance.]
-            
-            ## Recommended Courses/Certifications
-            [Suggest 5-7 specific courses or certifications that would enhance the candidate's profile, with a brief explanation of why each would be valuable]
-            
-            ## Resume Score
-            [Provide a score from 0-100 based on the overall quality of the resume. Use this format exactly: "Resume Score: XX/100" where XX is the numerical score. Be consistent with your assessment - a resume with significant issues should score below 60, an average resume 60-75, a good resume 75-85, and an excellent resume 85-100.]
-            
-            Resume:
-            {resume_text}
-            """
-            
-            if job_role:
-                base_prompt += f"""
-                
-                The candidate is targeting a role as: {job_role}
-                
-                ## Role Alignment Analysis
-                [Analyze how well the resume aligns with the target role of {job_role}. Provide specific recommendations to better align the resume with this role.]
-                """
-            
-            if job_description:
-                base_prompt += f"""
-                
-                Additionally, compare this resume to the following job description:
-                
-                Job Description:
-                {job_description}
-                
-                ## Job Match Analysis
-                [Provide a detailed analysis of how well the resume matches the job description, with a match percentage and specific areas of alignment and misalignment]
-                
-                ## Key Job Requirements Not Met
-                [List specific requirements from the job description that are not addressed in the resume, with recommendations on how to address each gap]
-                """
-            
-            completion = self.a4f_client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "user", "content": base_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=3000
-            )
-            
-            analysis = completion.choices[0].message.content.strip()
-            
-            # Extract resume score if present
-            resume_score = self._extract_score_from_text(analysis)
-            
-            # Extract ATS score if present
-            ats_score = self._extract_ats_score_from_text(analysis)
-            
-            return {
-                "analysis": analysis,
-                "resume_score": resume_score,
-                "ats_score": ats_score,
-                "model_used": model_name
-            }
+            result = self._run_cached_analysis(display_name, prompt_text, job_description, job_role, generate)
+            result["model_used"] = model_used
+            return result
         
         except Exception as e:
-            return {"error": f"A4F Analysis failed: {str(e)}"}
+            prefix = "A4F Analysis failed" if provider_name == "a4f" else "Analysis failed"
+            return {"error": f"{prefix}: {str(e)}"}
+
+    def analyze_resume_with_gemini(self, prompt_text, job_description=None, job_role=None):
+        """Analyze resume using Google Gemini AI - now supports both analysis and portfolio generation prompts"""
+        return self.analyze_resume_with_model(prompt_text, "Google Gemini", job_description, job_role)
+
+    def analyze_resume_with_a4f(self, prompt_text, job_description=None, job_role=None, model_name="provider-1/llama-3.2-1b-instruct-fp-16"):
+        """Analyze resume using A4F API models"""
+        return self.analyze_resume_with_model(prompt_text, model_name, job_description, job_role)
 
     
     def generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a PDF report of the analysis"""
         try:
-            # Import required libraries
-            try:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, Flowable, KeepTogether
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                from reportlab.lib.units import inch
-                from reportlab.graphics.shapes import Drawing, Rect, String, Line
-                from reportlab.graphics.charts.piecharts import Pie
-                from reportlab.graphics.charts.barcharts import VerticalBarChart
-                from reportlab.graphics.charts.linecharts import HorizontalLineChart
-                from reportlab.graphics.charts.legends import Legend
-                import io
-                import datetime
-                import math
-            except ImportError as e:
-                st.error(f"Error importing PDF libraries: {str(e)}")
-                st.info("Please make sure reportlab is installed: pip install reportlab")
-                return self.simple_generate_pdf_report(analysis_result, candidate_name, job_role)
-            
-            # Helper function to clean markdown formatting
-            def clean_markdown(text):
-                if not text:
-                    return ""
-                
-                # Remove markdown formatting for bold and italic
-                text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
-                text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
-                text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
-                text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
-                
-                # Remove markdown formatting for headers
-                text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-                
-                # Remove markdown formatting for links
-                text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-                
-                return text.strip()
-            
             # Validate input data
             if not analysis_result:
                 st.error("No analysis result provided for PDF generation")
                 return None
-                
-            # Print debug info
-            st.info(f"Generating PDF report for {candidate_name} targeting {job_role}")
-            
-            # Create a buffer for the PDF
-            buffer = io.BytesIO()
-            
-            # Create the PDF document
-            doc = SimpleDocTemplate(buffer, pagesize=letter, 
-                                   leftMargin=0.5*inch, rightMargin=0.5*inch,
-                                   topMargin=0.5*inch, bottomMargin=0.5*inch)
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            title_style = ParagraphStyle(
-                'Title',
-                parent=styles['Heading1'],
-                fontSize=20,
-                textColor=colors.darkblue,
-                spaceAfter=12,
-                alignment=1  # Center alignment
-            )
-            
-            subtitle_style = ParagraphStyle(
-                'Subtitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.darkblue,
-                spaceAfter=12,
-                alignment=1  # Center alignment
-            )
-            
-            heading_style = ParagraphStyle(
-                'Heading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.white,
-                spaceAfter=6,
-                backColor=colors.darkblue,
-                borderWidth=1,
-                borderColor=colors.grey,
-                borderPadding=5,
-                borderRadius=5,
-                alignment=1  # Center alignment
-            )
-            
-            subheading_style = ParagraphStyle(
-                'SubHeading',
-                parent=styles['Heading3'],
-                fontSize=12,
-                textColor=colors.darkblue,
-                spaceAfter=6,
-                borderWidth=0,
-                borderPadding=0,
-                borderColor=colors.grey,
-                borderRadius=0
-            )
-            
-            normal_style = ParagraphStyle(
-                'Normal',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=6,
-                leading=14  # Line spacing
-            )
-            
-            list_item_style = ParagraphStyle(
-                'ListItem',
-                parent=normal_style,
-                leftIndent=20,
-                firstLineIndent=-15,
-                spaceBefore=2,
-                spaceAfter=2
-            )
-            
-            # Create a gauge chart class
-            class GaugeChart(Drawing):
-                def __init__(self, width, height, score, max_score=100, label=""):
-                    Drawing.__init__(self, width, height)
-                    self.width = width
-                    self.height = height
-                    self._score = int(score) if score is not None else 0  # Ensure score is an integer
-                    self._max_score = max_score  # Use _max_score to avoid attribute error
-                    self._label = label  # Use _label instead of label to avoid attribute error
-                    
-                    # Determine color based on score percentage
-                    score_percent = (self._score / self._max_score) * 100 if self._max_score > 0 else 0
-                    if score_percent >= 80:
-                        self._color = colors.green
-                        self._status = "Excellent"
-                    elif score_percent >= 60:
-                        self._color = colors.orange
-                        self._status = "Good"
-                    else:
-                        self._color = colors.red
-                        self._status = "Needs Improvement"
-                    
-                    self._draw()
-                
-                def _draw(self):
-                    # Background
-                    self.add(Rect(0, 0, self.width, self.height, 
-                                 fillColor=colors.white, strokeColor=None))
-                    
-                    # Draw gauge background (arc)
-                    center_x = self.width / 2
-                    center_y = self.height / 2 - 10
-                    radius = min(center_x, center_y) - 10
-                    
-                    # Draw the gauge background
-                    for i in range(0, 101, 2):
-                        angle = math.radians(180 - (i * 1.8))
-                        x = center_x + radius * math.cos(angle)
-                        y = center_y + radius * math.sin(angle)
-                        
-                        # Determine color for background segments
-                        if i < 60:
-                            segment_color = colors.lightgrey
-                        elif i < 80:
-                            segment_color = colors.lightgrey
-                        else:
-                            segment_color = colors.lightgrey
-                        
-                        # Draw a small line for each segment
-                        line_length = 5
-                        end_x = center_x + (radius + line_length) * math.cos(angle)
-                        end_y = center_y + (radius + line_length) * math.sin(angle)
-                        
-                        self.add(Line(x, y, end_x, end_y, strokeColor=segment_color, strokeWidth=2))
-                    
-                    # Draw the colored arc for the score
-                    score_angle = math.radians(180 - (self._score * 1.8))
-                    score_x = center_x + radius * math.cos(score_angle)
-                    score_y = center_y + radius * math.sin(score_angle)
-                    
-                    # Draw needle
-                    self.add(Line(center_x, center_y, score_x, score_y, 
-                                 strokeColor=self._color, strokeWidth=3))
-                    
-                    # Draw center circle
-                    self.add(Circle(center_x, center_y, 5, 
-                                   fillColor=self._color, strokeColor=None))
-                    
-                    # Draw score text
-                    self.add(String(center_x, center_y - 25, f"{self._score}",
-                                   fontSize=20, fillColor=self._color, 
-                                   textAnchor='middle', fontName='Helvetica-Bold'))
-                    
-                    # Draw status text
-                    self.add(String(center_x, center_y - 40, self._status,
-                                   fontSize=12, fillColor=colors.black, 
-                                   textAnchor='middle'))
-                    
-                    # Draw label
-                    if self._label:
-                        self.add(String(center_x, self.height - 15, self._label,
-                                       fontSize=12, fillColor=colors.darkblue, 
-                                       textAnchor='middle', fontName='Helvetica-Bold'))
-                    
-                    # Draw scale markers
-                    for i in range(0, 101, 20):
-                        angle = math.radians(180 - (i * 1.8))
-                        x = center_x + (radius - 15) * math.cos(angle)
-                        y = center_y + (radius - 15) * math.sin(angle)
-                        
-                        self.add(String(x, y, str(i),
-                                       fontSize=8, fillColor=colors.black, 
-                                       textAnchor='middle'))
-            
-            # Create a Circle class for the gauge
-            class Circle(Rect):
-                def __init__(self, cx, cy, r, **kw):
-                    Rect.__init__(self, cx-r, cy-r, 2*r, 2*r, **kw)
-                    self.rx = self.ry = r
-            
-            # Create a combined gauge chart class
-            class CombinedGaugeChart(Drawing):
-                def __init__(self, width, height, resume_score, ats_score, max_score=100):
-                    Drawing.__init__(self, width, height)
-                    self.width = width
-                    self.height = height
-                    self._resume_score = resume_score
-                    self._ats_score = ats_score
-                    self._max_score = max_score
-                    
-                    # Calculate combined score (weighted average)
-                    self._combined_score = int((self._resume_score * 0.6) + (self._ats_score * 0.4))
-                    
-                    # Determine color based on score percentage
-                    if self._combined_score >= 80:
-                        self._color = colors.green
-                        self._status = "Excellent"
-                    elif self._combined_score >= 60:
-                        self._color = colors.orange
-                        self._status = "Good"
-                    else:
-                        self._color = colors.red
-                        self._status = "Needs Improvement"
-                    
-                    self._draw()
-                
-                def _draw(self):
-                    # Background
-                    self.add(Rect(0, 0, self.width, self.height, 
-                                 fillColor=colors.white, strokeColor=None))
-                    
-                    # Draw gauge background (arc)
-                    center_x = self.width / 2
-                    center_y = self.height / 2
-                    radius = min(center_x, center_y) - 20
-                    
-                    # Draw the gauge background
-                    for i in range(0, 101, 2):
-                        angle = math.radians(180 - (i * 1.8))
-                        x = center_x + radius * math.cos(angle)
-                        y = center_y + radius * math.sin(angle)
-                        
-                        # Determine color for background segments
-                        segment_color = colors.lightgrey
-                        
-                        # Draw a small line for each segment
-                        line_length = 5
-                        end_x = center_x + (radius + line_length) * math.cos(angle)
-                        end_y = center_y + (radius + line_length) * math.sin(angle)
-                        
-                        self.add(Line(x, y, end_x, end_y, strokeColor=segment_color, strokeWidth=2))
-                    
-                    # Draw the colored arc for the combined score
-                    score_angle = math.radians(180 - (self._combined_score * 1.8))
-                    score_x = center_x + radius * math.cos(score_angle)
-                    score_y = center_y + radius * math.sin(score_angle)
-                    
-                    # Draw needle
-                    self.add(Line(center_x, center_y, score_x, score_y, 
-                                 strokeColor=self._color, strokeWidth=3))
-                    
-                    # Draw center circle
-                    self.add(Circle(center_x, center_y, 5, 
-                                   fillColor=self._color, strokeColor=None))
-                    
-                    # Draw combined score text
-                    self.add(String(center_x, center_y - 25, f"{self._combined_score}",
-                                   fontSize=24, fillColor=self._color, 
-                                   textAnchor='middle', fontName='Helvetica-Bold'))
-                    
-                    # Draw status text
-                    self.add(String(center_x, center_y - 45, self._status,
-                                   fontSize=12, fillColor=colors.black, 
-                                   textAnchor='middle'))
-                    
-                    # Draw individual scores
-                    self.add(String(center_x - 60, center_y - 70, f"Resume: {self._resume_score}",
-                                   fontSize=10, fillColor=colors.darkblue, 
-                                   textAnchor='middle'))
-                    
-                    self.add(String(center_x + 60, center_y - 70, f"ATS: {self._ats_score}",
-                                   fontSize=10, fillColor=colors.darkblue, 
-                                   textAnchor='middle'))
-                    
-                    # Draw "Overall Score" label
-                    self.add(String(center_x, self.height - 15, "Overall Score",
-                                   fontSize=14, fillColor=colors.darkblue, 
-                                   textAnchor='middle', fontName='Helvetica-Bold'))
-                    
-                    # Draw scale markers
-                    for i in range(0, 101, 20):
-                        angle = math.radians(180 - (i * 1.8))
-                        x = center_x + (radius - 15) * math.cos(angle)
-                        y = center_y + (radius - 15) * math.sin(angle)
-                        
-                        self.add(String(x, y, str(i),
-                                       fontSize=8, fillColor=colors.black, 
-                                       textAnchor='middle'))
-            
-            # Create the content
-            content = []
-            
-            # Add a header with date
-            current_date = datetime.datetime.now().strftime("%B %d, %Y")
-            content.append(Paragraph(f"Resume Analysis Report", title_style))
-            content.append(Paragraph(f"Generated on {current_date}", subtitle_style))
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Format candidate name - if it's just "Candidate", add a number
-            if not candidate_name or candidate_name.lower() == "candidate" or candidate_name.strip() == "":
-                import random
-                candidate_name = f"Candidate_{random.randint(1000, 9999)}"
-            
-            # Add candidate name and job role in a table
-            info_data = [
-                ["Candidate:", candidate_name],
-                ["Target Role:", job_role if job_role else "Not specified"]
-            ]
-            
-            info_table = Table(info_data, colWidths=[1.5*inch, 5*inch])
-            info_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 12),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ]))
-            
-            content.append(info_table)
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Analysis Content
-            analysis_text = analysis_result.get("full_response", "")
-            
-            # Extract key sections for the executive summary
-            strengths = analysis_result.get("strengths", [])
-            weaknesses = analysis_result.get("weaknesses", [])
-            
-            # If strengths and weaknesses are not in the structured data, try to extract from text
-            if not strengths:
-                if "## Key Strengths" in analysis_text:
-                    strengths_section = analysis_text.split("## Key Strengths")[1].split("##")[0].strip()
-                    strengths = [clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                for s in strengths_section.split("\n") 
-                                if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•"))]
-                
-                # Try another pattern for strengths
-                if not strengths and "Key Strengths" in analysis_text:
-                    strengths_section = analysis_text.split("Key Strengths")[1]
-                    if "Areas for Improvement" in strengths_section:
-                        strengths_section = strengths_section.split("Areas for Improvement")[0]
-                    
-                    # Extract lines that look like list items
-                    for line in strengths_section.split("\n"):
-                        line = line.strip()
-                        if line and (line.startswith("-") or line.startswith("*") or line.startswith("•")):
-                            strengths.append(clean_markdown(line.replace("- ", "").replace("* ", "").replace("• ", "")))
-                        elif line and ":" in line and not line.startswith("#"):
-                            strengths.append(clean_markdown(line))
-
-            if not weaknesses:
-                if "## Areas for Improvement" in analysis_text:
-                    weaknesses_section = analysis_text.split("## Areas for Improvement")[1].split("##")[0].strip()
-                    weaknesses = [clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                 for w in weaknesses_section.split("\n") 
-                                 if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•"))]
-                
-                # Try another pattern for weaknesses
-                if not weaknesses and "Areas for Improvement" in analysis_text:
-                    weaknesses_section = analysis_text.split("Areas for Improvement")[1]
-                    if "##" in weaknesses_section:
-                        weaknesses_section = weaknesses_section.split("##")[0]
-                    
-                    # Extract lines that look like list items
-                    for line in weaknesses_section.split("\n"):
-                        line = line.strip()
-                        if line and (line.startswith("-") or line.startswith("*") or line.startswith("•")):
-                            weaknesses.append(clean_markdown(line.replace("- ", "").replace("* ", "").replace("• ", "")))
-                        elif line and ":" in line and not line.startswith("#"):
-                            weaknesses.append(clean_markdown(line))
-            
-            # Extract scores
-            resume_score = analysis_result.get("score", 0)
-            if resume_score == 0:
-                # Try to get from resume_score
-                resume_score = analysis_result.get("resume_score", 0)
-                
-                # If still 0, try to extract from the analysis text
-                if resume_score == 0 and "Resume Score:" in analysis_text:
-                    score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', analysis_text)
-                    if score_match:
-                        resume_score = int(score_match.group(1))
-                    else:
-                        # Try another pattern
-                        score_match = re.search(r'\bResume Score:\s*(\d{1,3})\b', analysis_text)
-                        if score_match:
-                            resume_score = int(score_match.group(1))
-                        else:
-                            # Try to find any number after "Resume Score:"
-                            score_section = analysis_text.split("Resume Score:")[1].split("\n")[0].strip()
-                            score_match = re.search(r'\b(\d{1,3})\b', score_section)
-                            if score_match:
-                                resume_score = int(score_match.group(1))
-
-            # Ensure resume_score is a valid integer
-            resume_score = int(resume_score) if resume_score else 0
-            resume_score = max(0, min(resume_score, 100))  # Ensure it's between 0 and 100
-
-            ats_score = analysis_result.get("ats_score", 0)
-            model_used = analysis_result.get("model_used", "AI")
-
-            # Add model used information
-            model_data = [["Analysis performed by:",model_used]]
-            model_table = Table(model_data, colWidths=[1.9*inch, 5*inch])
-            model_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 12),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ]))
-
-            content.append(model_table)
-            content.append(Spacer(1, 0.25*inch))
-
-            # Add score gauges
-            content.append(Paragraph("Resume Evaluation", heading_style))
-            content.append(Spacer(1, 0.1*inch))
-
-            # Create a table with the gauge
-            score_table_data = [
-                ["Resume Score"],
-                [GaugeChart(width=300, height=200, score=resume_score, max_score=100, label="Resume Score")]
-            ]
-            score_table = Table(score_table_data, colWidths=[6*inch])
-            score_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (0, 0), 14),
-                ('TEXTCOLOR', (0, 0), (0, 0), colors.darkblue),
-                ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-            ]))
-
-            content.append(score_table)
-            content.append(Spacer(1, 0.25*inch))
-
-            # Add Executive Summary section
-            content.append(Paragraph("Executive Summary", heading_style))
-            content.append(Spacer(1, 0.1*inch))
-
-            # Extract overall assessment
-            overall_assessment = ""
-            if "## Overall Assessment" in analysis_text:
-                overall_section = analysis_text.split("## Overall Assessment")[1].split("##")[0].strip()
-                overall_assessment = clean_markdown(overall_section)
-
-            content.append(Paragraph(overall_assessment, normal_style))
-            content.append(Spacer(1, 0.2*inch))
-
-            # Key Strengths and Areas for Improvement section
-            content.append(Paragraph("Key Strengths and Areas for Improvement", subheading_style))
-            content.append(Spacer(1, 0.1*inch))
-
-            if strengths or weaknesses:
-                # Create data for strengths and weaknesses
-                sw_data = [["Key Strengths", "Areas for Improvement"]]
-                
-                # Get max length of strengths and weaknesses
-                max_len = max(len(strengths), len(weaknesses), 1)
-                
-                for i in range(max_len):
-                    strength = f"• {clean_markdown(strengths[i])}" if i < len(strengths) else ""
-                    weakness = f"• {clean_markdown(weaknesses[i])}" if i < len(weaknesses) else ""
-                    sw_data.append([
-                        Paragraph(strength, list_item_style) if strength else "",
-                        Paragraph(weakness, list_item_style) if weakness else ""
-                    ])
-                
-                sw_table = Table(sw_data, colWidths=[3*inch, 3*inch])
-                sw_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
-                    ('BACKGROUND', (1, 0), (1, 0), colors.salmon),
-                    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                    ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (1, 0), 10),
-                    ('GRID', (0, 0), (1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                
-                content.append(sw_table)
-            else:
-                # Add empty strengths and weaknesses with a message
-                empty_data = [
-                    ["Key Strengths", "Areas for Improvement"],
-                    [
-                        Paragraph("No specific strengths identified in the analysis.", normal_style),
-                        Paragraph("No specific areas for improvement identified in the analysis.", normal_style)
-                    ]
-                ]
-                empty_table = Table(empty_data, colWidths=[3*inch, 3*inch])
-                empty_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
-                    ('BACKGROUND', (1, 0), (1, 0), colors.salmon),
-                    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                    ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (1, 0), 10),
-                    ('GRID', (0, 0), (1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                
-                content.append(empty_table)
-
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Add Detailed Analysis section
-            content.append(Paragraph("Detailed Analysis", heading_style))
-            content.append(Spacer(1, 0.1*inch))
-            
-            # Parse the markdown-like content
-            sections = analysis_text.split("##")
-            
-            # Define sections to include in detailed analysis
-            detailed_sections = [
-                "Professional Profile Analysis",
-                "Skills Analysis",
-                "Experience Analysis",
-                "Education Analysis",
-                "ATS Optimization Assessment",
-                "Role Alignment Analysis",
-                "Job Match Analysis"
-            ]
-            
-            for section in sections:
-                if not section.strip():
-                    continue
-                
-                # Extract section title and content
-                lines = section.strip().split("\n")
-                section_title = lines[0].strip()
-                
-                # Skip sections we don't want in the detailed analysis
-                if section_title not in detailed_sections and section_title != "Overall Assessment":
-                    continue
-                
-                # Skip Overall Assessment as we've already included it
-                if section_title == "Overall Assessment":
-                    continue
-                
-                section_content = "\n".join(lines[1:]).strip()
-                
-                # Add section title
-                content.append(Paragraph(section_title, subheading_style))
-                content.append(Spacer(1, 0.1*inch))
-                
-                # Process content based on section
-                if section_title == "Skills Analysis":
-                    # Extract current and missing skills
-                    current_skills = []
-                    missing_skills = []
-                    
-                    if "Current Skills" in section_content:
-                        current_part = section_content.split("Current Skills")[1]
-                        if "Missing Skills" in current_part:
-                            current_part = current_part.split("Missing Skills")[0]
-                        
-                        for line in current_part.split("\n"):
-                            if line.strip() and ("-" in line or "*" in line or "•" in line):
-                                skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                                if skill:
-                                    current_skills.append(skill)
-                    
-                    if "Missing Skills" in section_content:
-                        missing_part = section_content.split("Missing Skills")[1]
-                        for line in missing_part.split("\n"):
-                            if line.strip() and ("-" in line or "*" in line or "•" in line):
-                                skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                                if skill:
-                                    missing_skills.append(skill)
-                    
-                    # Create skills table with better formatting
-                    if current_skills or missing_skills:
-                        # Create paragraphs for each skill to ensure proper wrapping
-                        current_skill_paragraphs = [Paragraph(skill, normal_style) for skill in current_skills]
-                        missing_skill_paragraphs = [Paragraph(skill, normal_style) for skill in missing_skills]
-                        
-                        # Make sure both lists have the same length
-                        max_len = max(len(current_skill_paragraphs), len(missing_skill_paragraphs))
-                        current_skill_paragraphs.extend([Paragraph("", normal_style)] * (max_len - len(current_skill_paragraphs)))
-                        missing_skill_paragraphs.extend([Paragraph("", normal_style)] * (max_len - len(missing_skill_paragraphs)))
-                        
-                        # Create data for the table
-                        data = [["Current Skills", "Missing Skills"]]
-                        for i in range(max_len):
-                            data.append([current_skill_paragraphs[i], missing_skill_paragraphs[i]])
-                        
-                        # Create the table with fixed column widths
-                        table = Table(data, colWidths=[3*inch, 3*inch])
-                        table.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
-                            ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                        ]))
-                        
-                        content.append(table)
-                    
-                    # We no longer need to add skill proficiency outside the table
-                    # as it's now included in the table itself
-                elif section_title == "ATS Optimization Assessment":
-                    # Special handling for ATS Optimization Assessment
-                    ats_score_line = ""
-                    ats_content = []
-                    
-                    # Extract ATS score if present
-                    for line in section_content.split("\n"):
-                        if "ATS Score:" in line:
-                            ats_score_line = clean_markdown(line)
-                        elif line.strip():
-                            # Check if it's a list item
-                            if line.strip().startswith("-") or line.strip().startswith("*") or line.strip().startswith("•"):
-                                ats_content.append("• " + clean_markdown(line.strip()[1:].strip()))
-                            else:
-                                ats_content.append(clean_markdown(line))
-                    
-                    # Add ATS score line if found
-                    if ats_score_line:
-                        content.append(Paragraph(ats_score_line, normal_style))
-                        content.append(Spacer(1, 0.1*inch))
-                    
-                    # Add the rest of the ATS content
-                    for para in ats_content:
-                        if para.startswith("• "):
-                            content.append(Paragraph(para, list_item_style))
-                        else:
-                            content.append(Paragraph(para, normal_style))
-                else:
-                    # Process regular paragraphs
-                    paragraphs = section_content.split("\n")
-                    for para in paragraphs:
-                        if para.strip():
-                            # Check if it's a list item
-                            if para.strip().startswith("-") or para.strip().startswith("*") or para.strip().startswith("•"):
-                                para = "• " + clean_markdown(para.strip()[1:].strip())
-                                content.append(Paragraph(para, list_item_style))
-                            else:
-                                content.append(Paragraph(clean_markdown(para), normal_style))
-                
-                content.append(Spacer(1, 0.2*inch))
-            
-            # Add course recommendations
-            course_recommendations = []
-            
-            # Try to get course recommendations from different sources
-            if "suggestions" in analysis_result:
-                course_recommendations = analysis_result.get("suggestions", [])
             
-            # If still no recommendations, try to extract from text
-            if not course_recommendations and "## Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
-                course_recommendations = [clean_markdown(r.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                              for r in recommendations_section.split("\n") 
-                              if r.strip() and (r.strip().startswith("-") or r.strip().startswith("*") or r.strip().startswith("•"))]
-            
-            # Try another pattern for course recommendations
-            if not course_recommendations and "Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("Recommended Courses")[1]
-                if "##" in recommendations_section:
-                    recommendations_section = recommendations_section.split("##")[0]
-                
-                # Extract lines that look like list items
-                for line in recommendations_section.split("\n"):
-                    line = line.strip()
-                    if line and ":" in line and not line.startswith("#"):
-                        course_recommendations.append(clean_markdown(line))
-            
-            content.append(Paragraph("Recommended Courses & Certifications", subheading_style))
-            
-            if course_recommendations:
-                # Create a table for course recommendations with better formatting
-                course_data = [["Recommended Courses & Certifications"]]  # Add header row
-                
-                for course in course_recommendations:
-                    # Clean the course text and ensure it doesn't have any markdown formatting
-                    cleaned_course = clean_markdown(course)
-                    course_data.append([Paragraph(f"• {cleaned_course}", list_item_style)])
-                
-                course_table = Table(course_data, colWidths=[6*inch])
-                course_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
-                    ('ALIGN', (0, 0), (0, 0), 'CENTER'),  # Center the header
-                    ('ALIGN', (0, 1), (0, -1), 'LEFT'),   # Left-align the content
-                    ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (0, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-                    ('GRID', (0, 0), (0, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (0, -1), 'TOP'),
-                ]))
-                
-                content.append(course_table)
-            else:
-                # If still no recommendations, add a text section instead of generic courses
-                content.append(Paragraph("Based on your resume and target role, consider the following types of courses and certifications:", normal_style))
-                content.append(Spacer(1, 0.1*inch))
-                
-                # Add role-specific recommendations based on job_role
-                role_specific_courses = []
-                if "data" in job_role.lower() or "scientist" in job_role.lower() or "analyst" in job_role.lower():
-                    role_specific_courses = [
-                        "Data Science Specialization (Coursera/edX)",
-                        "Machine Learning (Coursera/edX)",
-                        "Deep Learning Specialization (Coursera)",
-                        "Big Data Technologies (Cloud Provider Certifications)",
-                        "Statistical Modeling and Inference",
-                        "Data Visualization with Tableau/Power BI"
-                    ]
-                elif "developer" in job_role.lower() or "engineer" in job_role.lower() or "programming" in job_role.lower():
-                    role_specific_courses = [
-                        "Full Stack Web Development (Udemy/Coursera)",
-                        "Cloud Certifications (AWS/Azure/GCP)",
-                        "DevOps and CI/CD Pipelines",
-                        "Software Architecture and Design Patterns",
-                        "Agile and Scrum Methodologies",
-                        "Mobile App Development"
-                    ]
-                elif "security" in job_role.lower() or "cyber" in job_role.lower():
-                    role_specific_courses = [
-                        "Certified Information Systems Security Professional (CISSP)",
-                        "Certified Ethical Hacker (CEH)",
-                        "CompTIA Security+",
-                        "Offensive Security Certified Professional (OSCP)",
-                        "Cloud Security Certifications",
-                        "Security Operations and Incident Response"
-                    ]
-                else:
-                    # Generic professional development courses
-                    role_specific_courses = [
-                        "LinkedIn Learning - Professional Skills Development",
-                        "Coursera - Career Development Specialization",
-                        "Udemy - Job Interview Skills Training",
-                        "Project Management Professional (PMP)",
-                        "Leadership and Management Skills",
-                        "Technical Writing and Communication"
-                    ]
-                
-                # Create a table for role-specific courses
-                course_data = []
-                for course in role_specific_courses:
-                    course_data.append([Paragraph(f"• {clean_markdown(course)}", list_item_style)])
-                
-                course_table = Table(course_data, colWidths=[6*inch])
-                course_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                
-                content.append(course_table)
-            
-            content.append(Spacer(1, 0.2*inch))
-            
-            # Add footer with page numbers
-            def add_page_number(canvas, doc):
-                canvas.saveState()
-                canvas.setFont('Helvetica', 9)
-                page_num = canvas.getPageNumber()
-                text = f"Page {page_num}"
-                canvas.drawRightString(7.5*inch, 0.25*inch, text)
-                
-                # Add generation date at the bottom
-                canvas.setFont('Helvetica', 9)
-                date_text = f"Generated on: {datetime.datetime.now().strftime('%B %d, %Y')}"
-                canvas.drawString(0.5*inch, 0.25*inch, date_text)
-                
-                canvas.restoreState()
-            
-            # Build the PDF
-            doc.build(content, onFirstPage=add_page_number, onLaterPages=add_page_number)
-            
-            # Get the PDF from the buffer
-            buffer.seek(0)
-            return buffer
+            st.info(f"Generating PDF report for {candidate_name} targeting {job_role}")
+            return render_report(analysis_result, candidate_name, job_role)
         
         except Exception as e:
-            st.error(f"Error generating simple PDF report: {str(e)}")
+            st.error(f"Error generating PDF report: {str(e)}")
             import traceback
             st.code(traceback.format_exc())
-            return None
+            return self.simple_generate_pdf_report(analysis_result, candidate_name, job_role)
             
     def extract_skills_from_analysis(self, analysis_text):
         """Extract skills from the analysis text"""
         skills = []
         
         try:
-            if "Current Skills" in analysis_text:
-                skills_section = analysis_text.split("Current Skills")[1]
-                if "##" in skills_section:
-                    skills_section = skills_section.split("##")[0]
-                
-                for line in skills_section.split("\n"):
-                    if line.strip() and ("-" in line or "*" in line or "•" in line):
-                        skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                        if skill:
-                            skills.append(skill)
+            sections = parse_analysis_sections(analysis_text)
+            skills = extract_skill_items(sections.get("Current Skills"))
         except Exception as e:
             st.warning(f"Error extracting skills: {str(e)}")
         
@@ -1324,16 +491,8 @@ class AIResumeAnalyzer:
         missing_skills = []
         
         try:
-            if "Missing Skills" in analysis_text:
-                missing_section = analysis_text.split("Missing Skills")[1]
-                if "##" in missing_section:
-                    missing_section = missing_section.split("##")[0]
-                
-                for line in missing_section.split("\n"):
-                    if line.strip() and ("-" in line or "*" in line or "•" in line):
-                        skill = line.replace("-", "").replace("*", "").replace("•", "").strip()
-                        if skill:
-                            missing_skills.append(skill)
+            sections = parse_analysis_sections(analysis_text)
+            missing_skills = extract_skill_items(sections.get("Missing Skills"))
         except Exception as e:
             st.warning(f"Error extracting missing skills: {str(e)}")
         
@@ -1367,8 +526,8 @@ class AIResumeAnalyzer:
                             return score
             
             # If no explicit score found, look for numbers in Resume Score section
-            if "## Resume Score" in analysis_text:
-                score_section = analysis_text.split("## Resume Score")[1].split("##")[0].strip()
+            score_section = parse_analysis_sections(analysis_text).get("Resume Score")
+            if score_section:
                 numbers = re.findall(r'\b(\d{1,3})\b', score_section)
                 for num in numbers:
                     score = int(num)
@@ -1406,24 +565,17 @@ class AIResumeAnalyzer:
                         if 0 <= score <= 100:
                             return score
             
-            # Look specifically in ATS sections
-            ats_sections = [
-                "## ATS Optimization Assessment",
-                "## ATS Optimization",
-                "## ATS Score",
-                "## Applicant Tracking System"
-            ]
-            
-            for section_header in ats_sections:
-                if section_header in analysis_text:
-                    ats_section = analysis_text.split(section_header)[1].split("##")[0].strip()
-                    # Look for any number that could be a score
-                    numbers = re.findall(r'\b(\d{1,3})\b', ats_section)
-                    for num in numbers:
-                        score = int(num)
-                        if 0 <= score <= 100:
-                            return score
+            # Look specifically in the ATS section (all ATS header variants resolve to it)
+            ats_section = parse_analysis_sections(analysis_text).get("ATS Optimization Assessment")
+            if ats_section:
+                # Look for any number that could be a score
+                numbers = re.findall(r'\b(\d{1,3})\b', ats_section)
+                for num in numbers:
+                    score = int(num)
+                    if 0 <= score <= 100:
+                        return score
                             
+
             return 0
         except Exception as e:
             print(f"Error extracting ATS score: {str(e)}")
@@ -1453,55 +605,22 @@ class AIResumeAnalyzer:
                 Required Skills: {', '.join(role_info.get('required_skills', []))}
                 """
             
-            # Choose the appropriate model for analysis
-            if model == "Google Gemini":
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
-                model_used = "Google Gemini"
-            elif model in ["GPT 5 Nano", "Llama 3.2 1B", "Mistral Nemo", "Kimi K2", "Qwen3 4B Thinking", "Qwen2.5 Coder 3B", "Hunyuan A13B"]:
-                # Use A4F API for these models
-                a4f_model = self.available_models[model]
-                result = self.analyze_resume_with_a4f(resume_text, job_description, job_role, a4f_model)
-                model_used = result.get("model_used", model)
-            else:
-                # Default to Gemini if model not recognized
-                result = self.analyze_resume_with_gemini(resume_text, job_description, job_role)
-                model_used = "Google Gemini"
+            # Default to Gemini if model not recognized; the provider backend is chosen per model
+            if model not in self.available_models:
+                model = "Google Gemini"
+            result = self.analyze_resume_with_model(resume_text, model, job_description, job_role)
+            model_used = result.get("model_used", model)
             
             # Process the result to extract structured information
             analysis_text = result.get("analysis", "")
             
-            # Extract strengths with flexible section matching
-            strengths = []
-            strength_headers = ["## Key Strengths", "## Strengths", "## Strong Points", "## Positive Aspects"]
-            for header in strength_headers:
-                if header in analysis_text:
-                    strengths_section = analysis_text.split(header)[1].split("##")[0].strip()
-                    strengths = [self.clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                for s in strengths_section.split("\n") 
-                                if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•") or s.strip().startswith("1.") or s.strip().startswith("2."))]
-                    break
-            
-            # Extract weaknesses/areas for improvement with flexible section matching
-            weaknesses = []
-            weakness_headers = ["## Areas for Improvement", "## Weaknesses", "## Areas to Improve", "## Improvement Areas", "## Recommendations"]
-            for header in weakness_headers:
-                if header in analysis_text:
-                    weaknesses_section = analysis_text.split(header)[1].split("##")[0].strip()
-                    weaknesses = [self.clean_markdown(w.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                 for w in weaknesses_section.split("\n") 
-                                 if w.strip() and (w.strip().startswith("-") or w.strip().startswith("*") or w.strip().startswith("•") or w.strip().startswith("1.") or w.strip().startswith("2."))]
-                    break
+            # Tokenize the response into sections once; every extractor reads from this map
+            sections = parse_analysis_sections(analysis_text)
             
-            # Extract suggestions/recommendations with flexible section matching
-            suggestions = []
-            suggestion_headers = ["## Recommended Courses", "## Recommendations", "## Suggestions", "## Course Recommendations", "## Learning Recommendations"]
-            for header in suggestion_headers:
-                if header in analysis_text:
-                    suggestions_section = analysis_text.split(header)[1].split("##")[0].strip()
-                    suggestions = [self.clean_markdown(s.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                                     for s in suggestions_section.split("\n") 
-                                     if s.strip() and (s.strip().startswith("-") or s.strip().startswith("*") or s.strip().startswith("•") or s.strip().startswith("1.") or s.strip().startswith("2."))]
-                    break
+            # Extract strengths, weaknesses and suggestions (header variants resolve via aliases)
+            strengths = extract_list_items(sections.get("Key Strengths"))
+            weaknesses = extract_list_items(sections.first("Areas for Improvement", "Recommendations"))
+            suggestions = extract_list_items(sections.first("Recommended Courses", "Recommendations"))
             
             # Extract score
             score = result.get("resume_score", 0)
@@ -1539,522 +658,12 @@ class AIResumeAnalyzer:
     def simple_generate_pdf_report(self, analysis_result, candidate_name, job_role):
         """Generate a simple PDF report without complex charts as a fallback"""
         try:
-            # Import required libraries
-            try:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, Flowable, KeepTogether
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                from reportlab.lib.units import inch
-                from reportlab.graphics.shapes import Drawing, Rect, String, Line
-                from reportlab.graphics.charts.piecharts import Pie
-                from reportlab.graphics.charts.barcharts import VerticalBarChart
-                from reportlab.graphics.charts.linecharts import HorizontalLineChart
-                from reportlab.graphics.charts.legends import Legend
-                import io
-                import datetime
-                import math
-            except ImportError as e:
-                st.error(f"Error importing PDF libraries: {str(e)}")
-                st.info("Please make sure reportlab is installed: pip install reportlab")
-                return None
-            
-            # Helper function to clean markdown formatting
-            def clean_markdown(text):
-                if not text:
-                    return ""
-                
-                # Remove markdown formatting for bold and italic
-                text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove ** for bold
-                text = re.sub(r'\*(.*?)\*', r'\1', text)      # Remove * for italic
-                text = re.sub(r'__(.*?)__', r'\1', text)      # Remove __ for bold
-                text = re.sub(r'_(.*?)_', r'\1', text)        # Remove _ for italic
-                
-                # Remove markdown formatting for headers
-                text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-                
-                # Remove markdown formatting for links
-                text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-                
-                return text.strip()
-            
             # Validate input data
             if not analysis_result:
                 st.error("No analysis result provided for PDF generation")
                 return None
-                
-            # Create a buffer for the PDF
-            buffer = io.BytesIO()
-            
-            # Create the PDF document
-            doc = SimpleDocTemplate(buffer, pagesize=letter, 
-                                   leftMargin=0.5*inch, rightMargin=0.5*inch,
-                                   topMargin=0.5*inch, bottomMargin=0.5*inch)
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            title_style = ParagraphStyle(
-                'Title',
-                parent=styles['Heading1'],
-                fontSize=20,
-                textColor=colors.darkblue,
-                spaceAfter=12,
-                alignment=1  # Center alignment
-            )
-            
-            subtitle_style = ParagraphStyle(
-                'Subtitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.darkblue,
-                spaceAfter=12,
-                alignment=1  # Center alignment
-            )
-            
-            heading_style = ParagraphStyle(
-                'Heading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.white,
-                spaceAfter=6,
-                backColor=colors.darkblue,
-                borderWidth=1,
-                borderColor=colors.grey,
-                borderPadding=5,
-                borderRadius=5,
-                alignment=1  # Center alignment
-            )
-            
-            subheading_style = ParagraphStyle(
-                'SubHeading',
-                parent=styles['Heading3'],
-                fontSize=12,
-                textColor=colors.darkblue,
-                spaceAfter=6
-            )
             
-            normal_style = ParagraphStyle(
-                'Normal',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=6,
-                leading=14  # Line spacing
-            )
-            
-            list_item_style = ParagraphStyle(
-                'ListItem',
-                parent=normal_style,
-                leftIndent=20,
-                firstLineIndent=-15,
-                spaceBefore=2,
-                spaceAfter=2
-            )
-            
-            # Create a simple gauge chart class
-            class SimpleGaugeChart(Flowable):
-                def __init__(self, score, width=300, height=200, label="Resume Score"):
-                    Flowable.__init__(self)
-                    self.score = int(score) if score is not None else 0  # Ensure score is an integer
-                    self.width = width
-                    self.height = height
-                    self.label = label
-                    
-                    # Determine color based on score percentage
-                    if self.score >= 80:
-                        self.color = colors.green
-                        self.status = "Excellent"
-                    elif self.score >= 60:
-                        self.color = colors.orange
-                        self.status = "Good"
-                    else:
-                        self.color = colors.red
-                        self.status = "Needs Improvement"
-                
-                def draw(self):
-                    # Draw the gauge
-                    canvas = self.canv
-                    canvas.saveState()
-                    
-                    # Draw gauge background (semi-circle)
-                    center_x = self.width / 2
-                    center_y = self.height / 2
-                    radius = min(center_x, center_y) - 30
-                    
-                    # Draw the gauge background
-                    canvas.setFillColor(colors.lightgrey)
-                    canvas.setStrokeColor(colors.grey)
-                    canvas.setLineWidth(1)
-                    
-                    # Draw the semi-circle background
-                    p = canvas.beginPath()
-                    p.moveTo(center_x, center_y)
-                    p.arcTo(center_x - radius, center_y - radius, center_x + radius, center_y + radius, 0, 180)
-                    p.lineTo(center_x, center_y)
-                    p.close()
-                    canvas.drawPath(p, fill=1, stroke=1)
-                    
-                    # Draw the colored arc for the score
-                    if self.score > 0:  # Only draw if score > 0
-                        angle = 180 * self.score / 100
-                        p = canvas.beginPath()
-                        p.moveTo(center_x, center_y)
-                        p.arcTo(center_x - radius, center_y - radius, center_x + radius, center_y + radius, 180, 180-angle)
-                        p.lineTo(center_x, center_y)
-                        p.close()
-                        canvas.setFillColor(self.color)
-                        canvas.drawPath(p, fill=1, stroke=0)
-                    
-                    # Draw score text
-                    canvas.setFillColor(self.color)
-                    canvas.setFont("Helvetica-Bold", 24)
-                    canvas.drawCentredString(center_x, center_y - 15, f"{self.score}")
-                    
-                    # Draw status text
-                    canvas.setFillColor(self.color)
-                    canvas.setFont("Helvetica", 12)
-                    canvas.drawCentredString(center_x, center_y - 35, self.status)
-                    
-                    # Draw "Resume Score" label
-                    canvas.setFillColor(colors.darkblue)
-                    canvas.setFont("Helvetica-Bold", 14)
-                    canvas.drawCentredString(center_x, self.height - 20, self.label)
-                    
-                    # Draw scale markers
-                    canvas.setStrokeColor(colors.black)
-                    canvas.setLineWidth(1)
-                    for i in range(0, 101, 20):
-                        angle_rad = math.radians(180 - (i * 1.8))
-                        x = center_x + radius * math.cos(angle_rad)
-                        y = center_y + radius * math.sin(angle_rad)
-                        
-                        # Draw tick marks
-                        x2 = center_x + (radius - 5) * math.cos(angle_rad)
-                        y2 = center_y + (radius - 5) * math.sin(angle_rad)
-                        canvas.line(x, y, x2, y2)
-                        
-                        # Draw numbers
-                        canvas.setFont("Helvetica", 8)
-                        num_x = center_x + (radius - 15) * math.cos(angle_rad)
-                        num_y = center_y + (radius - 15) * math.sin(angle_rad)
-                        canvas.drawCentredString(num_x, num_y, str(i))
-                    
-                    canvas.restoreState()
-                
-                def wrap(self, availWidth, availHeight):
-                    return (self.width, self.height)
-            
-            # Create the content
-            content = []
-            
-            # Add a header with date
-            current_date = datetime.datetime.now().strftime("%B %d, %Y")
-            content.append(Paragraph(f"Resume Analysis Report", title_style))
-            content.append(Paragraph(f"Generated on {current_date}", subtitle_style))
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Format candidate name - if it's just "Candidate", add a number
-            if not candidate_name or candidate_name.lower() == "candidate" or candidate_name.strip() == "":
-                import random
-                candidate_name = f"Candidate_{random.randint(1000, 9999)}"
-            
-            # Add candidate name and job role in a table
-            info_data = [
-                ["Candidate:", candidate_name],
-                ["Target Role:", job_role if job_role else "Not specified"]
-            ]
-            
-            info_table = Table(info_data, colWidths=[1.5*inch, 5*inch])
-            info_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 12),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ]))
-            
-            content.append(info_table)
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Add model used information with proper spacing
-            model_used = analysis_result.get("model_used", "AI")
-            model_data = [["Analysis performed by:\u2003\u2003\u2003", "", model_used]]
-            model_table = Table(model_data, colWidths=[3.5*inch, 1*inch, 5*inch])
-            model_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 12),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-            ]))
-            
-            content.append(model_table)
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Add Resume Evaluation section
-            content.append(Paragraph("Resume Evaluation", heading_style))
-            content.append(Spacer(1, 0.1*inch))
-            
-            # Extract scores
-            resume_score = analysis_result.get("score", 0)
-            if resume_score == 0:
-                # Try to get from resume_score
-                resume_score = analysis_result.get("resume_score", 0)
-                
-                # If still 0, try to extract from the analysis text
-                if resume_score == 0 and "Resume Score:" in analysis_text:
-                    score_match = re.search(r'Resume Score:\s*(\d{1,3})/100', analysis_text)
-                    if score_match:
-                        resume_score = int(score_match.group(1))
-                    else:
-                        # Try another pattern
-                        score_match = re.search(r'\bResume Score:\s*(\d{1,3})\b', analysis_text)
-                        if score_match:
-                            resume_score = int(score_match.group(1))
-                        else:
-                            # Try to find any number after "Resume Score:"
-                            score_section = analysis_text.split("Resume Score:")[1].split("\n")[0].strip()
-                            score_match = re.search(r'\b(\d{1,3})\b', score_section)
-                            if score_match:
-                                resume_score = int(score_match.group(1))
-
-            # Ensure resume_score is a valid integer
-            resume_score = int(resume_score) if resume_score else 0
-            resume_score = max(0, min(resume_score, 100))  # Ensure it's between 0 and 100
-
-            # Create a table with the simple gauge
-            score_table_data = [
-                ["Resume Score"],
-                [SimpleGaugeChart(score=resume_score, width=300, height=200, label="Resume Score")]
-            ]
-            
-            score_table = Table(score_table_data, colWidths=[6*inch])
-            score_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (0, 0), 14),
-                ('TEXTCOLOR', (0, 0), (0, 0), colors.darkblue),
-                ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-            ]))
-            
-            content.append(score_table)
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Add Executive Summary section
-            content.append(Paragraph("Executive Summary", heading_style))
-            content.append(Spacer(1, 0.1*inch))
-            
-            # Extract overall assessment
-            analysis_text = analysis_result.get("full_response", "")
-            if not analysis_text:
-                analysis_text = analysis_result.get("analysis", "")
-                
-            overall_assessment = ""
-            if "## Overall Assessment" in analysis_text:
-                overall_section = analysis_text.split("## Overall Assessment")[1].split("##")[0].strip()
-                overall_assessment = clean_markdown(overall_section)
-            
-            content.append(Paragraph(overall_assessment, normal_style))
-            content.append(Spacer(1, 0.2*inch))
-            
-            # Key Strengths and Areas for Improvement section
-            content.append(Paragraph("Key Strengths and Areas for Improvement", subheading_style))
-            content.append(Spacer(1, 0.1*inch))
-
-            if strengths or weaknesses:
-                # Create data for strengths and weaknesses
-                sw_data = [["Key Strengths", "Areas for Improvement"]]
-                
-                # Get max length of strengths and weaknesses
-                max_len = max(len(strengths), len(weaknesses), 1)
-                
-                for i in range(max_len):
-                    strength = f"• {clean_markdown(strengths[i])}" if i < len(strengths) else ""
-                    weakness = f"• {clean_markdown(weaknesses[i])}" if i < len(weaknesses) else ""
-                    sw_data.append([
-                        Paragraph(strength, list_item_style) if strength else "",
-                        Paragraph(weakness, list_item_style) if weakness else ""
-                    ])
-                
-                sw_table = Table(sw_data, colWidths=[3*inch, 3*inch])
-                sw_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
-                    ('BACKGROUND', (1, 0), (1, 0), colors.salmon),
-                    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                    ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (1, 0), 10),
-                    ('GRID', (0, 0), (1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                
-                content.append(sw_table)
-            else:
-                # Add empty strengths and weaknesses with a message
-                empty_data = [
-                    ["Key Strengths", "Areas for Improvement"],
-                    [
-                        Paragraph("No specific strengths identified in the analysis.", normal_style),
-                        Paragraph("No specific areas for improvement identified in the analysis.", normal_style)
-                    ]
-                ]
-                empty_table = Table(empty_data, colWidths=[3*inch, 3*inch])
-                empty_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
-                    ('BACKGROUND', (1, 0), (1, 0), colors.salmon),
-                    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                    ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (1, 0), 10),
-                    ('GRID', (0, 0), (1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                
-                content.append(empty_table)
-
-            content.append(Spacer(1, 0.25*inch))
-            
-            # Use the process_sections method to handle detailed analysis
-            content = self.process_sections(analysis_text, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown)
-            
-            # Add course recommendations
-            course_recommendations = []
-            
-            # Try to get course recommendations from different sources
-            if "suggestions" in analysis_result:
-                course_recommendations = analysis_result.get("suggestions", [])
-            
-            # If still no recommendations, try to extract from text
-            if not course_recommendations and "## Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("## Recommended Courses")[1].split("##")[0].strip()
-                course_recommendations = [clean_markdown(r.strip().replace("- ", "").replace("* ", "").replace("• ", "")) 
-                              for r in recommendations_section.split("\n") 
-                              if r.strip() and (r.strip().startswith("-") or r.strip().startswith("*") or r.strip().startswith("•"))]
-            
-            # Try another pattern for course recommendations
-            if not course_recommendations and "Recommended Courses" in analysis_text:
-                recommendations_section = analysis_text.split("Recommended Courses")[1]
-                if "##" in recommendations_section:
-                    recommendations_section = recommendations_section.split("##")[0]
-                
-                # Extract lines that look like list items
-                for line in recommendations_section.split("\n"):
-                    line = line.strip()
-                    if line and ":" in line and not line.startswith("#"):
-                        course_recommendations.append(clean_markdown(line))
-            
-            content.append(Paragraph("Recommended Courses & Certifications", subheading_style))
-            
-            if course_recommendations:
-                # Create a table for course recommendations with better formatting
-                course_data = [["Recommended Courses & Certifications"]]  # Add header row
-                
-                for course in course_recommendations:
-                    # Clean the course text and ensure it doesn't have any markdown formatting
-                    cleaned_course = clean_markdown(course)
-                    course_data.append([Paragraph(f"• {cleaned_course}", list_item_style)])
-                
-                course_table = Table(course_data, colWidths=[6*inch])
-                course_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
-                    ('ALIGN', (0, 0), (0, 0), 'CENTER'),  # Center the header
-                    ('ALIGN', (0, 1), (0, -1), 'LEFT'),   # Left-align the content
-                    ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (0, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
-                    ('GRID', (0, 0), (0, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (0, -1), 'TOP'),
-                ]))
-                
-                content.append(course_table)
-            else:
-                # If still no recommendations, add a text section instead of generic courses
-                content.append(Paragraph("Based on your resume and target role, consider the following types of courses and certifications:", normal_style))
-                content.append(Spacer(1, 0.1*inch))
-                
-                # Add role-specific recommendations based on job_role
-                role_specific_courses = []
-                if "data" in job_role.lower() or "scientist" in job_role.lower() or "analyst" in job_role.lower():
-                    role_specific_courses = [
-                        "Data Science Specialization (Coursera/edX)",
-                        "Machine Learning (Coursera/edX)",
-                        "Deep Learning Specialization (Coursera)",
-                        "Big Data Technologies (Cloud Provider Certifications)",
-                        "Statistical Modeling and Inference",
-                        "Data Visualization with Tableau/Power BI"
-                    ]
-                elif "developer" in job_role.lower() or "engineer" in job_role.lower() or "programming" in job_role.lower():
-                    role_specific_courses = [
-                        "Full Stack Web Development (Udemy/Coursera)",
-                        "Cloud Certifications (AWS/Azure/GCP)",
-                        "DevOps and CI/CD Pipelines",
-                        "Software Architecture and Design Patterns",
-                        "Agile and Scrum Methodologies",
-                        "Mobile App Development"
-                    ]
-                elif "security" in job_role.lower() or "cyber" in job_role.lower():
-                    role_specific_courses = [
-                        "Certified Information Systems Security Professional (CISSP)",
-                        "Certified Ethical Hacker (CEH)",
-                        "CompTIA Security+",
-                        "Offensive Security Certified Professional (OSCP)",
-                        "Cloud Security Certifications",
-                        "Security Operations and Incident Response"
-                    ]
-                else:
-                    # Generic professional development courses
-                    role_specific_courses = [
-                        "LinkedIn Learning - Professional Skills Development",
-                        "Coursera - Career Development Specialization",
-                        "Udemy - Job Interview Skills Training",
-                        "Project Management Professional (PMP)",
-                        "Leadership and Management Skills",
-                        "Technical Writing and Communication"
-                    ]
-                
-                # Create a table for role-specific courses
-                course_data = []
-                for course in role_specific_courses:
-                    course_data.append([Paragraph(f"• {clean_markdown(course)}", list_item_style)])
-                
-                course_table = Table(course_data, colWidths=[6*inch])
-                course_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                
-                content.append(course_table)
-            
-            content.append(Spacer(1, 0.2*inch))
-            
-            # Add footer with page numbers
-            def add_page_number(canvas, doc):
-                canvas.saveState()
-                canvas.setFont('Helvetica', 9)
-                page_num = canvas.getPageNumber()
-                text = f"Page {page_num}"
-                canvas.drawRightString(7.5*inch, 0.25*inch, text)
-                
-                # Add generation date at the bottom
-                canvas.setFont('Helvetica', 9)
-                date_text = f"Generated on: {datetime.datetime.now().strftime('%B %d, %Y')}"
-                canvas.drawString(0.5*inch, 0.25*inch, date_text)
-                
-                canvas.restoreState()
-            
-            # Build the PDF
-            doc.build(content, onFirstPage=add_page_number, onLaterPages=add_page_number)
-            
-            # Get the PDF from the buffer
-            buffer.seek(0)
-            return buffer
+            return render_report(analysis_result, candidate_name, job_role, simple=True)
         
         except Exception as e:
             st.error(f"Error generating simple PDF report: {str(e)}")
@@ -2062,146 +671,6 @@ class AIResumeAnalyzer:
             st.code(traceback.format_exc())
             return None 
 
-    def process_sections(self, analysis_text, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown):
+    def process_sections(self, analysis_text, content, normal_style, list_item_style, subheading_style, heading_style, clean_markdown=None):
         """Process sections of the analysis text with special handling for certain sections"""
-        # Parse the markdown-like content
-        sections = analysis_text.split("##")
-        
-        # Define sections to include in detailed analysis
-        detailed_sections = [
-            "Professional Profile Analysis",
-            "Skills Analysis",
-            "Experience Analysis",
-            "Education Analysis",
-            "ATS Optimization Assessment",
-            "Role Alignment Analysis",
-            "Job Match Analysis"
-        ]
-        
-        # Add Detailed Analysis section
-        content.append(Paragraph("Detailed Analysis", heading_style))
-        content.append(Spacer(1, 0.1*inch))
-        
-        for section in sections:
-            if not section.strip():
-                continue
-            
-            # Extract section title and content
-            lines = section.strip().split("\n")
-            section_title = lines[0].strip()
-            
-            # Skip sections we don't want in the detailed analysis
-            if section_title not in detailed_sections and section_title != "Overall Assessment":
-                continue
-            
-            # Skip Overall Assessment as we've already included it
-            if section_title == "Overall Assessment":
-                continue
-            
-            section_content = "\n".join(lines[1:]).strip()
-            
-            # Add section title
-            content.append(Paragraph(section_title, subheading_style))
-            content.append(Spacer(1, 0.1*inch))
-            
-            # Process content based on section
-            if section_title == "Skills Analysis":
-                # Extract current and missing skills
-                current_skills = []
-                missing_skills = []
-                
-                if "Current Skills" in section_content:
-                    current_part = section_content.split("Current Skills")[1]
-                    if "Missing Skills" in current_part:
-                        current_part = current_part.split("Missing Skills")[0]
-                    
-                    for line in current_part.split("\n"):
-                        if line.strip() and ("-" in line or "*" in line or "•" in line):
-                            skill = clean_markdown(line.replace("-", "").replace("*", "").replace("•", "").strip())
-                            if skill:
-                                current_skills.append(skill)
-                
-                if "Missing Skills" in section_content:
-                    missing_part = section_content.split("Missing Skills")[1]
-                    for line in missing_part.split("\n"):
-                        if line.strip() and ("-" in line or "*" in line or "•" in line):
-                            skill = clean_markdown(line.replace("-", "").replace("*", "").replace("•", "").strip())
-                            if skill:
-                                missing_skills.append(skill)
-                
-                # Create skills table with better formatting
-                if current_skills or missing_skills:
-                    # Create paragraphs for each skill to ensure proper wrapping
-                    current_skill_paragraphs = [Paragraph(skill, normal_style) for skill in current_skills]
-                    missing_skill_paragraphs = [Paragraph(skill, normal_style) for skill in missing_skills]
-                    
-                    # Make sure both lists have the same length
-                    max_len = max(len(current_skill_paragraphs), len(missing_skill_paragraphs))
-                    current_skill_paragraphs.extend([Paragraph("", normal_style)] * (max_len - len(current_skill_paragraphs)))
-                    missing_skill_paragraphs.extend([Paragraph("", normal_style)] * (max_len - len(missing_skill_paragraphs)))
-                    
-                    # Create data for the table
-                    data = [["Current Skills", "Missing Skills"]]
-                    for i in range(max_len):
-                        data.append([current_skill_paragraphs[i], missing_skill_paragraphs[i]])
-                    
-                    # Create the table with fixed column widths
-                    table = Table(data, colWidths=[3*inch, 3*inch])
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
-                        ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                    ]))
-                    
-                    content.append(table)
-                
-                # We no longer need to add skill proficiency outside the table
-                # as it's now included in the table itself
-            elif section_title == "ATS Optimization Assessment":
-                # Special handling for ATS Optimization Assessment
-                ats_score_line = ""
-                ats_content = []
-                
-                # Extract ATS score if present
-                for line in section_content.split("\n"):
-                    if "ATS Score:" in line:
-                        ats_score_line = clean_markdown(line)
-                    elif line.strip():
-                        # Check if it's a list item
-                        if line.strip().startswith("-") or line.strip().startswith("*") or line.strip().startswith("•"):
-                            ats_content.append("• " + clean_markdown(line.strip()[1:].strip()))
-                        else:
-                            ats_content.append(clean_markdown(line))
-                
-                # Add ATS score line if found
-                if ats_score_line:
-                    content.append(Paragraph(ats_score_line, normal_style))
-                    content.append(Spacer(1, 0.1*inch))
-                
-                # Add the rest of the ATS content
-                for para in ats_content:
-                    if para.startswith("• "):
-                        content.append(Paragraph(para, list_item_style))
-                    else:
-                        content.append(Paragraph(para, normal_style))
-            else:
-                # Process regular paragraphs
-                paragraphs = section_content.split("\n")
-                for para in paragraphs:
-                    if para.strip():
-                        # Check if it's a list item
-                        if para.strip().startswith("-") or para.strip().startswith("*") or para.strip().startswith("•"):
-                            para = "• " + clean_markdown(para.strip()[1:].strip())
-                            content.append(Paragraph(para, list_item_style))
-                        else:
-                            content.append(Paragraph(clean_markdown(para), normal_style))
-            
-            content.append(Spacer(1, 0.2*inch))
-        
-        return content
\ No newline at end of file
+        return append_detailed_analysis(content, analysis_text, normal_style, list_item_style, subheading_style, heading_style)
@@ -0,0 +1,238 @@
+"""
+Near-duplicate cache for AI resume analyses
+
+Resumes are reduced to MinHash signatures over word shingles and indexed with
+locality-sensitive hashing (LSH) bands in a local SQLite file. A new resume whose
+estimated Jaccard similarity to a cached one (same model, role and job description)
+is above ANALYSIS_CACHE_THRESHOLD reuses the cached analysis; above
+ANALYSIS_CACHE_DIFF_THRESHOLD only the changed lines are sent to the model
+together with the previous analysis.
+"""
+import difflib
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+from utils.prompt_compactor import normalize_resume_text
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+WORD_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of word n-grams of the normalized resume text"""
+    words = WORD_PATTERN.findall(normalize_resume_text(text).lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text):
+    """MinHash signature (NUM_PERMUTATIONS values) of the text's shingle set"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERMUTATIONS
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    matches = sum(1 for x, y in zip(signature, other) if x == y)
+    return matches / len(signature)
+
+
+def lsh_buckets(signature):
+    """(band, bucket) keys; similar signatures share at least one bucket with high probability"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        buckets.append((band, hashlib.md5(",".join(map(str, rows)).encode()).hexdigest()[:16]))
+    return buckets
+
+
+def context_key(model, job_role=None, job_description=None):
+    """Analyses are only reused for the same model, role and job description"""
+    raw = f"{model}\n{job_role or ''}\n{(job_description or '').strip()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def resume_diff(old_text, new_text):
+    """Unified diff of the normalized resume texts (changed lines only)"""
+    old_lines = normalize_resume_text(old_text).split("\n")
+    new_lines = normalize_resume_text(new_text).split("\n")
+    diff = difflib.unified_diff(old_lines, new_lines, lineterm="", n=0)
+    return "\n".join(line for line in diff if not line.startswith(("---", "+++", "@@")))
+
+
+class AnalysisCache:
+    """SQLite-backed MinHash/LSH index of previous analyses"""
+
+    def __init__(self, db_path, max_entries=5000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    context_key TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    resume_text TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    hits INTEGER DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache_lsh (
+                    band INTEGER NOT NULL,
+                    bucket TEXT NOT NULL,
+                    cache_id INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_lsh ON analysis_cache_lsh (band, bucket)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_lsh_id ON analysis_cache_lsh (cache_id)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def lookup(self, key, resume_text):
+        """Return (entry, similarity) for the most similar cached analysis, or (None, 0.0)"""
+        signature = minhash_signature(resume_text)
+        conn = self._connect()
+        try:
+            candidates = set()
+            for band, bucket in lsh_buckets(signature):
+                rows = conn.execute(
+                    'SELECT cache_id FROM analysis_cache_lsh WHERE band = ? AND bucket = ?', (band, bucket)
+                ).fetchall()
+                candidates.update(row[0] for row in rows)
+            if not candidates:
+                return None, 0.0
+
+            placeholders = ",".join("?" * len(candidates))
+            rows = conn.execute(
+                f'SELECT id, signature, resume_text, result FROM analysis_cache '
+                f'WHERE context_key = ? AND id IN ({placeholders})',
+                [key, *candidates]
+            ).fetchall()
+
+            best, best_similarity = None, 0.0
+            for cache_id, cached_signature, cached_text, result in rows:
+                similarity = estimate_similarity(signature, json.loads(cached_signature))
+                if similarity > best_similarity:
+                    best_similarity = similarity
+                    best = {"id": cache_id, "resume_text": cached_text, "result": json.loads(result)}
+            if best:
+                conn.execute('UPDATE analysis_cache SET hits = hits + 1 WHERE id = ?', (best["id"],))
+                conn.commit()
+            return best, best_similarity
+        except Exception as e:
+            print(f"Error reading analysis cache: {str(e)}")
+            return None, 0.0
+        finally:
+            conn.close()
+
+    def store(self, key, resume_text, result):
+        """Index an analysis result under the resume's signature"""
+        signature = minhash_signature(resume_text)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                'INSERT INTO analysis_cache (context_key, signature, resume_text, result, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, json.dumps(signature), resume_text, json.dumps(result), time.time())
+            )
+            cache_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO analysis_cache_lsh (band, bucket, cache_id) VALUES (?, ?, ?)',
+                [(band, bucket, cache_id) for band, bucket in lsh_buckets(signature)]
+            )
+            # Evict the oldest entries beyond the size limit
+            cutoff = conn.execute(
+                'SELECT id FROM analysis_cache ORDER BY id DESC LIMIT 1 OFFSET ?', (self.max_entries,)
+            ).fetchone()
+            if cutoff:
+                conn.execute('DELETE FROM analysis_cache_lsh WHERE cache_id <= ?', (cutoff[0],))
+                conn.execute('DELETE FROM analysis_cache WHERE id <= ?', (cutoff[0],))
+            conn.commit()
+        except Exception as e:
+            print(f"Error writing analysis cache: {str(e)}")
+        finally:
+            conn.close()
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            entries = conn.execute('SELECT COUNT(*) FROM analysis_cache').fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    """Process-wide analysis cache, or None when ANALYSIS_CACHE_ENABLED is false"""
+    global _cache
+    if os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache(
+                    os.getenv("ANALYSIS_CACHE_DB", "analysis_cache.db"),
+                    max_entries=int(_env_float("ANALYSIS_CACHE_MAX_ENTRIES", 5000))
+                )
+    return _cache
+
+
+def get_reuse_threshold():
+    return _env_float("ANALYSIS_CACHE_THRESHOLD", 0.9)
+
+
+def get_diff_threshold():
+    return _env_float("ANALYSIS_CACHE_DIFF_THRESHOLD", 0.6)
@@ -0,0 +1,181 @@
+"""
+Single-pass parser for the markdown analysis returned by the AI models
+"""
+import re
+from functools import lru_cache
+
+# Section header variants the models emit, mapped to the canonical names used in the prompt
+SECTION_ALIASES = {
+    "overall assessment": "Overall Assessment",
+    "professional profile analysis": "Professional Profile Analysis",
+    "professional profile": "Professional Profile Analysis",
+    "skills analysis": "Skills Analysis",
+    "skills": "Skills Analysis",
+    "current skills": "Current Skills",
+    "skill proficiency": "Skill Proficiency",
+    "missing skills": "Missing Skills",
+    "experience analysis": "Experience Analysis",
+    "education analysis": "Education Analysis",
+    "key strengths": "Key Strengths",
+    "strengths": "Key Strengths",
+    "strong points": "Key Strengths",
+    "positive aspects": "Key Strengths",
+    "areas for improvement": "Areas for Improvement",
+    "weaknesses": "Areas for Improvement",
+    "areas to improve": "Areas for Improvement",
+    "improvement areas": "Areas for Improvement",
+    "ats optimization assessment": "ATS Optimization Assessment",
+    "ats optimization": "ATS Optimization Assessment",
+    "ats score": "ATS Optimization Assessment",
+    "applicant tracking system": "ATS Optimization Assessment",
+    "recommended courses": "Recommended Courses",
+    "recommended courses/certifications": "Recommended Courses",
+    "recommended courses & certifications": "Recommended Courses",
+    "recommended courses and certifications": "Recommended Courses",
+    "course recommendations": "Recommended Courses",
+    "learning recommendations": "Recommended Courses",
+    "suggestions": "Recommended Courses",
+    "resume score": "Resume Score",
+    "role alignment analysis": "Role Alignment Analysis",
+    "job match analysis": "Job Match Analysis",
+    "key job requirements not met": "Key Job Requirements Not Met",
+}
+
+# "## Header" lines; everything up to the next header belongs to the section
+HEADER_PATTERN = re.compile(r'^[ \t]*#{2,6}[ \t]*(.*?)[ \t#]*$', re.MULTILINE)
+
+# "- **Current Skills**:" style labels used inside the Skills Analysis section
+LABEL_PATTERN = re.compile(
+    r'^[ \t]*(?:[-*•][ \t]*)?(?:\*\*|__)?(Current Skills|Skill Proficiency|Missing Skills)'
+    r'(?:\*\*|__)?[ \t]*:?(?:\*\*|__)?[ \t]*:?',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# A single "*" is a bullet, "**" opens bold text
+LIST_ITEM_PATTERN = re.compile(r'^(?:[-•]|\*(?!\*)|\d+[.)])\s*')
+
+# Markdown cleanup patterns
+BOLD_PATTERN = re.compile(r'\*\*(.*?)\*\*')
+ITALIC_PATTERN = re.compile(r'\*(.*?)\*')
+UNDERSCORE_BOLD_PATTERN = re.compile(r'__(.*?)__')
+UNDERSCORE_ITALIC_PATTERN = re.compile(r'_(.*?)_')
+MD_HEADER_PATTERN = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+LINK_PATTERN = re.compile(r'\[(.*?)\]\(.*?\)')
+
+
+def clean_markdown(text):
+    """Remove markdown formatting (bold, italic, headers, links) from text"""
+    if not text:
+        return ""
+
+    text = BOLD_PATTERN.sub(r'\1', text)
+    text = ITALIC_PATTERN.sub(r'\1', text)
+    text = UNDERSCORE_BOLD_PATTERN.sub(r'\1', text)
+    text = UNDERSCORE_ITALIC_PATTERN.sub(r'\1', text)
+    text = MD_HEADER_PATTERN.sub('', text)
+    text = LINK_PATTERN.sub(r'\1', text)
+
+    return text.strip()
+
+
+def normalize_header(title):
+    """Normalize a header title so that formatting variants map to the same key"""
+    title = title.replace("**", "").replace("__", "").strip()
+    title = re.sub(r'^\d+[.)]\s*', '', title)
+    title = title.rstrip(":").strip()
+    return re.sub(r'\s+', ' ', title).lower()
+
+
+def resolve_section_name(title):
+    """Return the canonical section name for a header title"""
+    return SECTION_ALIASES.get(normalize_header(title), title.strip())
+
+
+class AnalysisSections:
+    """Header -> section map for an analysis response, built in a single pass"""
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.preamble = ""
+        self.order = []
+        self._sections = {}
+        self._parse()
+
+    def _parse(self):
+        matches = list(HEADER_PATTERN.finditer(self.text))
+        if not matches:
+            self.preamble = self.text.strip()
+            return
+
+        self.preamble = self.text[:matches[0].start()].strip()
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(self.text)
+            title = match.group(1).strip()
+            body = self.text[match.end():end].strip()
+            name = resolve_section_name(title)
+            self.order.append((title, name, body))
+            # The first occurrence wins, matching the prompt's section order
+            self._sections.setdefault(name, body)
+
+        # Labelled sub-blocks (Current/Missing Skills) become sections of their own
+        for _, name, body in list(self.order):
+            labels = list(LABEL_PATTERN.finditer(body))
+            for i, match in enumerate(labels):
+                end = labels[i + 1].start() if i + 1 < len(labels) else len(body)
+                label = resolve_section_name(match.group(1))
+                self._sections.setdefault(label, body[match.end():end].strip())
+
+    def get(self, name, default=""):
+        """Get a section body by canonical name or any of its aliases"""
+        return self._sections.get(resolve_section_name(name), default)
+
+    def first(self, *names):
+        """Get the first non-empty section among several candidate names"""
+        for name in names:
+            body = self.get(name)
+            if body:
+                return body
+        return ""
+
+    def __contains__(self, name):
+        return resolve_section_name(name) in self._sections
+
+    def items(self):
+        """Iterate over (original title, canonical name, body) in document order"""
+        return iter(self.order)
+
+
+@lru_cache(maxsize=64)
+def parse_analysis_sections(text):
+    """Parse an analysis response into sections, reusing the result for repeated calls"""
+    return AnalysisSections(text)
+
+
+def extract_list_items(section_text, include_colon_lines=False):
+    """Extract bullet/numbered list items from a section as cleaned strings"""
+    items = []
+    for line in section_text.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if LIST_ITEM_PATTERN.match(line):
+            item = clean_markdown(LIST_ITEM_PATTERN.sub('', line, count=1))
+        elif line.startswith("**") or (include_colon_lines and ":" in line):
+            # Bold-led lines ("**Leadership**: ...") are items too, kept whole
+            item = clean_markdown(line)
+        else:
+            continue
+        if item:
+            items.append(item)
+    return items
+
+
+def extract_skill_items(section_text):
+    """Extract skills from a Current/Missing Skills block"""
+    skills = []
+    for line in section_text.split("\n"):
+        if line.strip() and ("-" in line or "*" in line or "•" in line or not skills):
+            skill = clean_markdown(line.replace("*", "").replace("•", "").strip().lstrip("-:").strip())
+            if skill:
+                skills.append(skill)
+    return skills
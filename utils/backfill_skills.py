@@ -0,0 +1,31 @@
+"""
+Backfill resume_skills for resumes saved before skills were normalized on insert
+
+Safe to stop and rerun: resumes that already have skills are skipped and each
+batch is committed on its own.
+
+    python -m utils.backfill_skills --batch-size 1000
+"""
+import argparse
+
+from config.database import init_database, backfill_resume_skills
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate resume_skills from resume_data.skills")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Make sure the skill indexes exist before inserting
+    init_database()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} resumes", end="", flush=True)
+
+    resumes, skills = backfill_resume_skills(args.batch_size, on_progress=progress)
+    print()
+    print(f"Backfilled {skills} skills for {resumes} resumes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Batch mode for bulk AI resume analysis
+
+Short resumes are packed several per request behind the shared instruction block,
+with each analysis wrapped in id-tagged delimiters so the response splits back into
+per-resume results deterministically. Resumes that are too long to pack, or whose
+analysis is missing from a packed response, fall back to a single-resume request.
+Near-duplicate cache hits are served without any request.
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.analysis_cache import get_analysis_cache, context_key, get_reuse_threshold
+from utils.llm_providers import get_provider
+from utils.prompt_compactor import compact_resume_text, get_token_budget
+
+ANALYSIS_BLOCK_PATTERN = re.compile(r'<<<ANALYSIS (\S+?)>>>\s*\n(.*?)\n\s*<<<END ANALYSIS \1>>>', re.DOTALL)
+
+# Output tokens reserved per packed resume (matches the single-request max_tokens)
+OUTPUT_TOKENS_PER_RESUME = 3000
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_batch_limits(model):
+    """(max resumes per request, max resume tokens to be packable, total resume tokens per request)"""
+    max_output = _env_int("BATCH_MAX_OUTPUT_TOKENS", 16000)
+    max_resumes = min(_env_int("BATCH_MAX_RESUMES_PER_REQUEST", 5), max(1, max_output // OUTPUT_TOKENS_PER_RESUME))
+    return max_resumes, _env_int("BATCH_SHORT_RESUME_TOKENS", 1500), get_token_budget(model)
+
+
+def pack_resumes(items, max_resumes, max_tokens):
+    """Greedily group (id, text, tokens) items in input order into packs under both limits"""
+    packs = []
+    current, current_tokens = [], 0
+    for item in items:
+        if current and (len(current) >= max_resumes or current_tokens + item[2] > max_tokens):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += item[2]
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_batch_prompt(analyzer, pack, job_description=None, job_role=None):
+    """Shared instruction prefix followed by the delimited resumes"""
+    resumes = "\n\n".join(
+        f"=== RESUME {resume_id} ===\n{text}\n=== END RESUME {resume_id} ===" for resume_id, text, _ in pack
+    )
+    return analyzer._build_analysis_instructions(job_description, job_role) + f"""
+
+        You will receive {len(pack)} resumes, each between "=== RESUME <id> ===" and "=== END RESUME <id> ===" lines.
+        Analyze each resume independently using exactly the format above. Start each analysis with a line
+        "<<<ANALYSIS <id>>>>" and end it with a line "<<<END ANALYSIS <id>>>>", using that resume's id, and
+        write nothing outside these blocks.
+
+{resumes}
+        """
+
+
+def split_batch_response(text, ids):
+    """Map each expected id to its analysis block; unknown ids are ignored, first block wins"""
+    expected = set(ids)
+    analyses = {}
+    for resume_id, body in ANALYSIS_BLOCK_PATTERN.findall(text or ""):
+        if resume_id in expected and resume_id not in analyses:
+            analyses[resume_id] = body.strip()
+    return analyses
+
+
+def analyze_resumes_batch(analyzer, resumes, model="Google Gemini", job_role=None, job_description=None, max_workers=4,
+                          on_wait=None):
+    """
+    Analyze many resumes with as few model requests as possible
+
+    resumes is a dict of id -> resume text (or a list, indexed by position). Returns a dict
+    of id -> result in input order, each shaped like AIResumeAnalyzer.analyze_resume_with_model.
+    on_wait(position) is called while a request waits in the provider queue.
+    """
+    if not isinstance(resumes, dict):
+        resumes = {str(i): text for i, text in enumerate(resumes)}
+    resumes = {str(resume_id): text for resume_id, text in resumes.items()}
+    results = {resume_id: None for resume_id in resumes}
+
+    display_name, model_id, provider_name, model_used = analyzer.resolve_model(model)
+    provider = get_provider(provider_name)
+    if not provider.is_configured():
+        return {resume_id: {"error": provider.not_configured_message} for resume_id in resumes}
+
+    # Serve near-identical resumes from the cache
+    cache = get_analysis_cache()
+    key = context_key(display_name, job_role, job_description)
+    pending = []
+    for resume_id, text in resumes.items():
+        if not text:
+            results[resume_id] = {"error": "Prompt text is required for analysis."}
+            continue
+        match, similarity = cache.lookup(key, text) if cache else (None, 0.0)
+        if match and similarity >= get_reuse_threshold():
+            cache.hits += 1
+            results[resume_id] = dict(match["result"], cache_similarity=round(similarity, 2), model_used=model_used)
+        else:
+            pending.append(resume_id)
+
+    max_resumes, short_tokens, pack_tokens = get_batch_limits(display_name)
+    packable, singles = [], []
+    for resume_id in pending:
+        compacted = compact_resume_text(resumes[resume_id], model=display_name)
+        if max_resumes > 1 and compacted["compacted_tokens"] <= short_tokens:
+            packable.append((resume_id, compacted["text"], compacted["compacted_tokens"]))
+        else:
+            singles.append(resume_id)
+    packs = pack_resumes(packable, max_resumes, pack_tokens)
+    # A pack of one gains nothing over the regular (cached, compacted) path
+    singles.extend(pack[0][0] for pack in packs if len(pack) == 1)
+    packs = [pack for pack in packs if len(pack) > 1]
+
+    def run_pack(pack):
+        prompt = build_batch_prompt(analyzer, pack, job_description, job_role)
+        max_tokens = min(OUTPUT_TOKENS_PER_RESUME * len(pack), _env_int("BATCH_MAX_OUTPUT_TOKENS", 16000))
+        try:
+            response = provider.generate(model_id, prompt, max_tokens=max_tokens, on_wait=on_wait)
+        except Exception as e:
+            print(f"Batch request for {len(pack)} resumes failed: {str(e)}")
+            return {}
+        return split_batch_response(response, [resume_id for resume_id, _, _ in pack])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        split_results = list(pool.map(run_pack, packs))
+
+    for pack, analyses in zip(packs, split_results):
+        for resume_id, _, _ in pack:
+            analysis = analyses.get(resume_id)
+            if not analysis:
+                singles.append(resume_id)
+                continue
+            result = {
+                "analysis": analysis,
+                "resume_score": analyzer._extract_score_from_text(analysis),
+                "ats_score": analyzer._extract_ats_score_from_text(analysis)
+            }
+            if cache:
+                cache.misses += 1
+                cache.store(key, resumes[resume_id], result)
+            results[resume_id] = dict(result, model_used=model_used)
+
+    # Long resumes and anything missing from a packed response go one by one
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        single_results = list(pool.map(
+            lambda resume_id: analyzer.analyze_resume_with_model(resumes[resume_id], model, job_description, job_role,
+                                                                on_wait),
+            singles
+        ))
+    for resume_id, result in zip(singles, single_results):
+        results[resume_id] = result
+
+    print(
+        f"Batch analysis ({display_name}): {len(resumes)} resumes, "
+        f"{len(resumes) - len(pending)} cached, {len(packs)} packed requests, {len(singles)} single requests"
+    )
+    return results
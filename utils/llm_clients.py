@@ -0,0 +1,118 @@
+"""
+Process-wide registry of LLM clients and model handles
+
+Streamlit re-runs the script (and re-creates ResumeApp/AIResumeAnalyzer) on every
+interaction, so clients are created lazily once per process and shared by all sessions.
+The A4F client keeps a pooled keep-alive HTTP connection, so TLS handshakes and client
+construction stay out of the per-request path.
+"""
+import os
+import threading
+import httpx
+import google.generativeai as genai
+from dotenv import load_dotenv
+from openai import OpenAI, DefaultHttpxClient, Timeout
+
+A4F_BASE_URL = "https://api.a4f.co/v1"
+
+_lock = threading.RLock()
+_env_loaded = False
+_gemini_api_key = None
+_a4f_clients = {}
+_gemini_models = {}
+
+
+def load_environment():
+    """Load .env once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        with _lock:
+            if not _env_loaded:
+                load_dotenv()
+                _env_loaded = True
+
+
+def get_api_key(name):
+    """Get an API key from the environment, loading .env on first use"""
+    load_environment()
+    return os.getenv(name)
+
+
+def _int_env(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_a4f_client(api_key=None, base_url=A4F_BASE_URL):
+    """Get the shared OpenAI-compatible A4F client (created on first use)"""
+    api_key = api_key or get_api_key("A4F_API_KEY")
+    if not api_key:
+        return None
+
+    key = (api_key, base_url)
+    client = _a4f_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _a4f_clients.get(key)
+            if client is None:
+                http_client = DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=_int_env("LLM_HTTP_MAX_CONNECTIONS", 20),
+                        max_keepalive_connections=_int_env("LLM_HTTP_MAX_KEEPALIVE", 10),
+                        keepalive_expiry=_int_env("LLM_HTTP_KEEPALIVE_SECONDS", 120)
+                    ),
+                    timeout=Timeout(_int_env("LLM_HTTP_TIMEOUT_SECONDS", 120), connect=10.0)
+                )
+                # 429s are retried by governed_call (utils/rate_limiter.py); SDK retries would multiply them
+                client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+                _a4f_clients[key] = client
+    return client
+
+
+def get_gemini_model(model_name="gemini-2.5-flash", api_key=None):
+    """Get a shared Gemini GenerativeModel, configuring the SDK once per API key"""
+    global _gemini_api_key
+    api_key = api_key or get_api_key("GOOGLE_API_KEY")
+    if not api_key:
+        return None
+
+    key = (api_key, model_name)
+    model = _gemini_models.get(key)
+    if model is None:
+        with _lock:
+            model = _gemini_models.get(key)
+            if model is None:
+                if _gemini_api_key != api_key:
+                    # GEMINI_API_ENDPOINT points the SDK at a compatible REST server (e.g. a local stand-in)
+                    endpoint = os.getenv("GEMINI_API_ENDPOINT")
+                    if endpoint:
+                        genai.configure(api_key=api_key, transport="rest",
+                                        client_options={"api_endpoint": endpoint})
+                    else:
+                        genai.configure(api_key=api_key)
+                    _gemini_api_key = api_key
+                model = genai.GenerativeModel(model_name)
+                _gemini_models[key] = model
+    return model
+
+
+def get_client_stats():
+    """Number of live clients and model handles in the registry"""
+    return {
+        "a4f_clients": len(_a4f_clients),
+        "gemini_models": len(_gemini_models),
+    }
+
+
+def close_clients():
+    """Close pooled connections (e.g. on shutdown or in tests)"""
+    with _lock:
+        for client in _a4f_clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                print(f"Error closing A4F client: {str(e)}")
+        _a4f_clients.clear()
+        _gemini_models.clear()
@@ -0,0 +1,315 @@
+"""
+Pluggable LLM provider backends for AIResumeAnalyzer
+
+Each provider turns a prompt into response text. Gemini and A4F (any OpenAI-compatible
+endpoint) go through the shared clients and rate limiter; the local provider runs
+offline, either on a quantized GGUF model via llama-cpp-python (LOCAL_LLM_MODEL_PATH)
+or as a deterministic stub that produces a well-formed analysis with configurable
+latency. Setting LLM_PROVIDER=local routes every model to the local backend so the
+full pipeline can run and be load-tested without network access.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from utils.llm_clients import A4F_BASE_URL, get_api_key, get_a4f_client, get_gemini_model
+from utils.rate_limiter import governed_call
+
+# Optional local inference (falls back to the deterministic stub)
+try:
+    from llama_cpp import Llama
+    LLAMA_CPP_AVAILABLE = True
+except ImportError:
+    LLAMA_CPP_AVAILABLE = False
+
+LOCAL_MODEL_NAME = "Local (Offline)"
+
+RESUME_BLOCK_PATTERN = re.compile(
+    r'Resume:\s*\n(.*?)(?:\n\s*The candidate is targeting|\n\s*Additionally, compare|\Z)', re.DOTALL
+)
+BATCH_RESUME_PATTERN = re.compile(r'=== RESUME (\S+) ===\s*\n(.*?)\n\s*=== END RESUME \1 ===', re.DOTALL)
+CHANGES_BLOCK_PATTERN = re.compile(r'Resume changes:\s*\n(.*)\Z', re.DOTALL)
+PREVIOUS_SCORE_PATTERN = re.compile(r'(Resume Score|ATS Score):\s*(\d{1,3})/100')
+ROLE_PATTERN = re.compile(r'targeting a role as:\s*(.+)')
+
+# Skills the stub recognizes when building its deterministic analysis
+STUB_SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "node", "sql", "docker", "kubernetes",
+    "aws", "azure", "gcp", "machine learning", "data analysis", "excel", "git", "linux",
+    "communication", "leadership", "project management", "agile", "html", "css", "c++"
+]
+STUB_SECTIONS = ["experience", "education", "skills", "projects", "summary", "certifications"]
+
+
+_record_lock = threading.Lock()
+
+
+def record_response(provider, model_id, prompt, response):
+    """Append a response to LLM_RECORD_RESPONSES (JSONL) for replay by the stand-in server"""
+    path = os.getenv("LLM_RECORD_RESPONSES")
+    if not path:
+        return
+    record = {
+        "provider": provider,
+        "model": model_id,
+        "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "response": response,
+    }
+    try:
+        with _record_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except Exception as e:
+        print(f"Error recording LLM response: {str(e)}")
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class LLMProvider:
+    """Base class: turn a prompt into response text"""
+
+    name = "base"
+    not_configured_message = "LLM provider is not configured."
+
+    def is_configured(self):
+        return True
+
+    def generate(self, model_id, prompt, temperature=0.7, max_tokens=3000, on_wait=None):
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through the shared GenerativeModel handles"""
+
+    name = "gemini"
+    not_configured_message = "Google API key is not configured. Please add it to your .env file."
+
+    def is_configured(self):
+        return bool(get_api_key("GOOGLE_API_KEY"))
+
+    def generate(self, model_id, prompt, temperature=0.7, max_tokens=3000, on_wait=None):
+        model = get_gemini_model(model_id)
+        response = governed_call(self.name, model_id, lambda: model.generate_content(prompt), on_wait=on_wait)
+        text = response.text.strip()
+        record_response(self.name, model_id, prompt, text)
+        return text
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """A4F or any other OpenAI-compatible chat completions endpoint"""
+
+    name = "a4f"
+    not_configured_message = "A4F API key is not configured."
+
+    def __init__(self, api_key_name="A4F_API_KEY", base_url=None):
+        self.api_key_name = api_key_name
+        self.base_url = base_url or os.getenv("A4F_BASE_URL", A4F_BASE_URL)
+
+    def is_configured(self):
+        return bool(get_api_key(self.api_key_name))
+
+    def generate(self, model_id, prompt, temperature=0.7, max_tokens=3000, on_wait=None):
+        client = get_a4f_client(get_api_key(self.api_key_name), self.base_url)
+        completion = governed_call(self.name, model_id, lambda: client.chat.completions.create(
+            model=model_id,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        ), on_wait=on_wait)
+        text = completion.choices[0].message.content.strip()
+        record_response(self.name, model_id, prompt, text)
+        return text
+
+
+class LocalProvider(LLMProvider):
+    """
+    Offline backend: llama-cpp-python when LOCAL_LLM_MODEL_PATH is set, otherwise a stub
+
+    Latency is LOCAL_LLM_LATENCY_MS plus Gaussian LOCAL_LLM_LATENCY_JITTER_MS, plus output
+    tokens / LOCAL_LLM_TOKENS_PER_SECOND when set. Jitter is seeded from the prompt and
+    LOCAL_LLM_SEED, so identical runs see identical latencies.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.model_path = os.getenv("LOCAL_LLM_MODEL_PATH")
+        self._llama = None
+        self._llama_lock = threading.Lock()
+
+    def _get_llama(self):
+        if self._llama is None:
+            self._llama = Llama(
+                model_path=self.model_path,
+                n_ctx=int(_env_float("LOCAL_LLM_CONTEXT", 4096)),
+                n_threads=int(_env_float("LOCAL_LLM_THREADS", os.cpu_count() or 4)),
+                verbose=False
+            )
+        return self._llama
+
+    def _simulate_latency(self, prompt, response):
+        latency_ms = _env_float("LOCAL_LLM_LATENCY_MS", 0)
+        jitter_ms = _env_float("LOCAL_LLM_LATENCY_JITTER_MS", 0)
+        tokens_per_second = _env_float("LOCAL_LLM_TOKENS_PER_SECOND", 0)
+        if jitter_ms:
+            seed = f"{os.getenv('LOCAL_LLM_SEED', '0')}:{prompt}"
+            rng = random.Random(hashlib.md5(seed.encode("utf-8")).hexdigest())
+            latency_ms = max(0.0, rng.gauss(latency_ms, jitter_ms))
+        seconds = latency_ms / 1000.0
+        if tokens_per_second > 0:
+            seconds += (len(response) / 4) / tokens_per_second
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def generate(self, model_id, prompt, temperature=0.7, max_tokens=3000, on_wait=None):
+        if self.model_path and LLAMA_CPP_AVAILABLE:
+            # llama.cpp contexts are not thread-safe; requests run one at a time
+            with self._llama_lock:
+                output = self._get_llama().create_chat_completion(
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            return output["choices"][0]["message"]["content"].strip()
+
+        response = stub_response(prompt)
+        self._simulate_latency(prompt, response)
+        return response
+
+
+def stub_response(prompt):
+    """Deterministic, well-formed response for a prompt (analysis, batch, update or portfolio JSON)"""
+    if "JSON object" in prompt and "FULL_NAME" in prompt:
+        return json.dumps({"FULL_NAME": "Candidate", "SUMMARY": "Generated offline."})
+
+    role = ROLE_PATTERN.search(prompt)
+    job_role = role.group(1).strip() if role else None
+    job_match = "Job Description:" in prompt
+
+    batch = BATCH_RESUME_PATTERN.findall(prompt)
+    if batch:
+        # Packed request: one delimited analysis per resume id
+        return "\n\n".join(
+            f"<<<ANALYSIS {resume_id}>>>\n{stub_analysis(text, job_role, job_match)}\n<<<END ANALYSIS {resume_id}>>>"
+            for resume_id, text in batch
+        )
+
+    changes = CHANGES_BLOCK_PATTERN.search(prompt)
+    if changes:
+        # Update request: keep the previous scores, nudged by the size of the change
+        scores = dict(PREVIOUS_SCORE_PATTERN.findall(prompt))
+        added = sum(1 for line in changes.group(1).split("\n") if line.strip().startswith("+"))
+        return stub_analysis(
+            changes.group(1),
+            resume_score=min(100, int(scores.get("Resume Score", 70)) + min(added, 5)),
+            ats_score=min(100, int(scores.get("ATS Score", 65)) + min(added, 5))
+        )
+
+    match = RESUME_BLOCK_PATTERN.search(prompt)
+    return stub_analysis(match.group(1) if match else prompt, job_role=job_role, job_match=job_match)
+
+
+def stub_analysis(resume_text, job_role=None, job_match=False, resume_score=None, ats_score=None):
+    """Analysis in the prompt's section format, derived only from the resume text"""
+    text = resume_text.lower()
+    found = [skill for skill in STUB_SKILLS if skill in text]
+    missing = [skill for skill in STUB_SKILLS if skill not in text][:5]
+    sections = [section for section in STUB_SECTIONS if section in text]
+    words = len(text.split())
+
+    if resume_score is None:
+        resume_score = min(95, 45 + len(sections) * 5 + min(len(found), 6) * 3 + min(words // 100, 5))
+    if ats_score is None:
+        ats_score = min(95, 40 + len(sections) * 6 + min(len(found), 8) * 3)
+
+    def bullets(items, template):
+        return "\n".join(f"- {template.format(item=item)}" for item in items) or "- None identified"
+
+    analysis = f"""## Overall Assessment
+The resume contains {words} words across {len(sections)} recognized sections.
+
+## Professional Profile Analysis
+The profile covers {', '.join(sections) or 'no standard sections'}.
+
+## Skills Analysis
+- **Current Skills**: {', '.join(found) or 'None identified'}
+- **Skill Proficiency**: Proficiency is inferred from how often skills appear.
+- **Missing Skills**: {', '.join(missing) or 'None identified'}
+
+## Experience Analysis
+{'Experience section present.' if 'experience' in sections else 'No experience section found.'}
+
+## Education Analysis
+{'Education section present.' if 'education' in sections else 'No education section found.'}
+
+## Key Strengths
+{bullets(found[:5], 'Demonstrates {item}')}
+
+## Areas for Improvement
+{bullets(missing, 'Add evidence of {item}')}
+
+## ATS Optimization Assessment
+ATS Score: {ats_score}/100
+
+## Recommended Courses/Certifications
+{bullets(missing[:3], 'Introductory course in {item}')}
+
+## Resume Score
+Resume Score: {resume_score}/100
+"""
+    if job_role:
+        analysis += f"\n## Role Alignment Analysis\nThe resume mentions {len(found)} skills relevant to {job_role}.\n"
+    if job_match:
+        analysis += f"\n## Job Match Analysis\nEstimated match: {min(100, len(found) * 10)}%\n"
+        analysis += f"\n## Key Job Requirements Not Met\n{bullets(missing, '{item}')}\n"
+    return analysis
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+PROVIDER_FACTORIES = {
+    "gemini": GeminiProvider,
+    "a4f": OpenAICompatibleProvider,
+    "local": LocalProvider,
+}
+
+
+def register_provider(name, provider):
+    """Register (or replace) a provider instance under a name"""
+    with _providers_lock:
+        _providers[name] = provider
+
+
+def get_provider(name):
+    """Get the process-wide provider instance for a name"""
+    provider = _providers.get(name)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.get(name)
+            if provider is None:
+                factory = PROVIDER_FACTORIES.get(name)
+                if factory is None:
+                    raise ValueError(f"Unknown LLM provider: {name}")
+                provider = factory()
+                _providers[name] = provider
+    return provider
+
+
+def get_forced_provider():
+    """Provider that every model is routed to (LLM_PROVIDER), or None"""
+    return os.getenv("LLM_PROVIDER") or None
+
+
+def is_local_enabled():
+    return get_forced_provider() == "local" or os.getenv("LOCAL_LLM_ENABLED", "false").lower() in ("1", "true", "yes")
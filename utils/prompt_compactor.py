@@ -0,0 +1,231 @@
+"""
+Resume text compaction and per-model token budgeting for LLM prompts
+"""
+import re
+
+from utils.llm_providers import LOCAL_MODEL_NAME
+
+# Optional exact tokenizer (falls back to a character-based estimate)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Token budget for the resume portion of the analysis prompt, per model in AIResumeAnalyzer.available_models
+MODEL_TOKEN_BUDGETS = {
+    "Google Gemini": 24000,
+    "GPT 5 Nano": 12000,
+    "Llama 3.2 1B": 2500,
+    "Mistral Nemo": 8000,
+    "Kimi K2": 12000,
+    "Qwen3 4B Thinking": 4000,
+    "Qwen2.5 Coder 3B": 4000,
+    "Hunyuan A13B": 8000,
+    LOCAL_MODEL_NAME: 2500,
+}
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Resume sections in the order they are kept when a resume exceeds its budget
+SECTION_PRIORITY = [
+    "header", "summary", "experience", "skills", "projects", "education",
+    "certifications", "achievements", "publications", "activities",
+    "languages", "interests", "references"
+]
+
+SECTION_KEYWORDS = {
+    "summary": ("summary", "objective", "profile", "about me", "career objective"),
+    "experience": ("experience", "employment", "work history", "internships", "internship"),
+    "skills": ("skills", "technical skills", "technologies", "tech stack", "competencies"),
+    "projects": ("projects", "personal projects", "academic projects"),
+    "education": ("education", "academic background", "qualifications"),
+    "certifications": ("certifications", "certificates", "courses", "training", "licenses"),
+    "achievements": ("achievements", "awards", "honors", "accomplishments"),
+    "publications": ("publications", "research"),
+    "activities": ("activities", "volunteer", "volunteering", "leadership", "extracurricular"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies"),
+    "references": ("references",),
+}
+
+WHITESPACE_PATTERN = re.compile(r'[ \t\u00a0\u2000-\u200b]+')
+PAGE_NUMBER_PATTERN = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.IGNORECASE)
+HEADING_CLEAN_PATTERN = re.compile(r'[^a-z& ]')
+ALNUM_PATTERN = re.compile(r'[A-Za-z0-9]')
+
+MIN_DEDUPE_LENGTH = 20
+
+_encoding = None
+
+
+def count_tokens(text):
+    """Count tokens with tiktoken when available, otherwise estimate ~4 characters per token"""
+    global _encoding
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        try:
+            if _encoding is None:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            return len(_encoding.encode(text))
+        except Exception:
+            pass
+    return (len(text) + 3) // 4
+
+
+def get_token_budget(model):
+    """Get the resume token budget for a model display name"""
+    return MODEL_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+
+
+def _is_noise(line):
+    """OCR noise: lines without enough letters or digits to carry content"""
+    alnum = len(ALNUM_PATTERN.findall(line))
+    return alnum == 0 or (len(line) > 4 and alnum / len(line) < 0.3)
+
+
+def _section_for_heading(line):
+    """Return the section key if the line looks like a resume section heading"""
+    if len(line) > 40:
+        return None
+    heading = HEADING_CLEAN_PATTERN.sub('', line.lower()).strip()
+    if not heading or len(heading.split()) > 4:
+        return None
+    for section, keywords in SECTION_KEYWORDS.items():
+        for keyword in keywords:
+            if heading == keyword or heading.startswith(keyword + " ") or heading.endswith(" " + keyword):
+                return section
+    return None
+
+
+def _repeated_page_lines(pages):
+    """Find header/footer lines that repeat at the top or bottom of several pages"""
+    if len(pages) < 2:
+        return set()
+    counts = {}
+    for page in pages:
+        lines = [line for line in page if line]
+        edge_lines = set(lines[:2] + lines[-2:])
+        for line in edge_lines:
+            key = line.lower()
+            counts[key] = counts.get(key, 0) + 1
+    return {key for key, count in counts.items() if count >= 2}
+
+
+def normalize_resume_text(text):
+    """Normalize whitespace, drop OCR noise, per-page headers/footers and duplicate lines"""
+    if not text:
+        return ""
+
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    pages = [
+        [WHITESPACE_PATTERN.sub(' ', line).strip() for line in page.split("\n")]
+        for page in text.split("\f")
+    ]
+    repeated = _repeated_page_lines(pages)
+
+    seen = set()
+    lines = []
+    for page in pages:
+        for line in page:
+            if not line:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            key = line.lower()
+            if PAGE_NUMBER_PATTERN.match(line) or _is_noise(line):
+                continue
+            # Page headers/footers are kept once; other repeated content lines are dropped,
+            # except short ones (dates, single skills) that may legitimately recur
+            if key in repeated or (len(line) >= MIN_DEDUPE_LENGTH and not _section_for_heading(line)):
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+
+    return "\n".join(lines).strip()
+
+
+def split_resume_sections(text):
+    """Split resume text into (section key, lines) blocks in document order"""
+    sections = [["header", []]]
+    for line in text.split("\n"):
+        section = _section_for_heading(line) if line else None
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(key, lines) for key, lines in sections if any(lines)]
+
+
+def _fit_to_budget(text, budget):
+    """
+    Keep sections in priority order within the token budget
+
+    Every section that does not fit whole keeps the leading lines that still do
+    (dropped if that is only its heading), and lower-priority sections can use
+    whatever budget is left. Returns the text and the truncated section keys.
+    """
+    sections = split_resume_sections(text)
+    priority = {key: i for i, key in enumerate(SECTION_PRIORITY)}
+    order = sorted(range(len(sections)), key=lambda i: (priority.get(sections[i][0], len(priority)), i))
+
+    remaining = budget
+    kept = {}
+    truncated = []
+    for index in order:
+        key, lines = sections[index]
+        block = "\n".join(lines)
+        tokens = count_tokens(block)
+        if tokens <= remaining:
+            kept[index] = block
+            remaining -= tokens
+            continue
+
+        # Keep as many leading lines of this section as still fit
+        partial = []
+        partial_tokens = 0
+        for line in lines:
+            line_tokens = count_tokens(line) + 1
+            if partial_tokens + line_tokens > remaining:
+                break
+            partial.append(line)
+            partial_tokens += line_tokens
+        if len(partial) > 1:
+            kept[index] = "\n".join(partial) + "\n[...]"
+            remaining -= partial_tokens
+        if key not in truncated:
+            truncated.append(key)
+
+    return "\n\n".join(kept[i] for i in sorted(kept)), truncated
+
+
+def compact_resume_text(text, model="Google Gemini"):
+    """
+    Compact resume text before embedding it in an LLM prompt
+
+    Returns a dict with the compacted text, token counts before and after, and the
+    sections that had to be truncated to fit the model's budget.
+    """
+    original_tokens = count_tokens(text)
+    compacted = normalize_resume_text(text)
+    truncated_sections = []
+
+    budget = get_token_budget(model)
+    if count_tokens(compacted) > budget:
+        compacted, truncated_sections = _fit_to_budget(compacted, budget)
+
+    compacted_tokens = count_tokens(compacted)
+    print(
+        f"Prompt compaction ({model}): {original_tokens} -> {compacted_tokens} tokens "
+        f"(saved {original_tokens - compacted_tokens}, budget {budget}"
+        f"{', truncated: ' + ', '.join(truncated_sections) if truncated_sections else ''})"
+    )
+
+    return {
+        "text": compacted,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": original_tokens - compacted_tokens,
+        "truncated_sections": truncated_sections,
+    }
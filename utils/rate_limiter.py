@@ -0,0 +1,307 @@
+"""
+Per-provider rate limiting and concurrency control for LLM calls
+
+Every Streamlit session in the process shares one governor per (provider, model):
+a token bucket caps the request rate and a bounded slot count caps concurrent
+in-flight calls. Callers queue in FIFO order and can receive their queue position.
+Setting LLM_RATE_LIMIT_DB to a SQLite file path additionally shares the token
+buckets between processes (e.g. several app workers on one host).
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Default limits per provider: requests per minute, burst size and max concurrent calls
+PROVIDER_LIMITS = {
+    "gemini": {"rpm": 15, "burst": 5, "concurrency": 4},
+    "a4f": {"rpm": 60, "burst": 10, "concurrency": 8},
+}
+DEFAULT_LIMITS = {"rpm": 30, "burst": 5, "concurrency": 4}
+
+RATE_LIMIT_MARKERS = ("429", "rate limit", "ratelimit", "resource exhausted", "resourceexhausted", "quota")
+
+
+def _env_number(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_provider_limits(provider):
+    """Limits for a provider, overridable via LLM_<PROVIDER>_RPM/_BURST/_CONCURRENCY"""
+    limits = dict(PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS))
+    prefix = f"LLM_{provider.upper()}_"
+    limits["rpm"] = _env_number(prefix + "RPM", limits["rpm"])
+    limits["burst"] = _env_number(prefix + "BURST", limits["burst"])
+    limits["concurrency"] = int(_env_number(prefix + "CONCURRENCY", limits["concurrency"]))
+    return limits
+
+
+def is_rate_limit_error(error):
+    """Whether an exception from a provider SDK is a 429/quota error"""
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+class TokenBucket:
+    """In-process token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token if available; otherwise return the seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+
+
+class SQLiteTokenBucket:
+    """
+    Token bucket persisted in a SQLite file so several processes share one budget
+
+    If the file cannot be used (locked, corrupt, unwritable) the error is logged and
+    this process falls back to its own in-process bucket, which keeps limiting.
+    """
+
+    def __init__(self, key, rate, capacity, db_path):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.db_path = db_path
+        self.fallback = TokenBucket(rate, capacity)
+        self.errors = 0
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS llm_rate_buckets (
+                        bucket_key TEXT PRIMARY KEY,
+                        tokens REAL NOT NULL,
+                        updated REAL NOT NULL
+                    )
+                ''')
+                conn.execute(
+                    'INSERT OR IGNORE INTO llm_rate_buckets (bucket_key, tokens, updated) VALUES (?, ?, ?)',
+                    (key, capacity, time.time())
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            self.errors += 1
+            print(f"Error creating shared rate limit bucket in {db_path}, limiting per process: {str(e)}")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def try_acquire(self):
+        """Take a token from the shared bucket, or from the in-process one if the file fails"""
+        try:
+            conn = self._connect()
+        except Exception as e:
+            return self._fallback_acquire(e)
+        try:
+            # BEGIN IMMEDIATE takes the write lock, serializing refills across processes
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT tokens, updated FROM llm_rate_buckets WHERE bucket_key = ?', (self.key,)
+            ).fetchone()
+            now = time.time()
+            tokens, updated = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate if self.rate > 0 else 1.0
+            conn.execute(
+                'UPDATE llm_rate_buckets SET tokens = ?, updated = ? WHERE bucket_key = ?',
+                (tokens, now, self.key)
+            )
+            conn.execute('COMMIT')
+            return wait
+        except Exception as e:
+            try:
+                conn.execute('ROLLBACK')
+            except Exception:
+                pass
+            return self._fallback_acquire(e)
+        finally:
+            conn.close()
+
+    def _fallback_acquire(self, error):
+        self.errors += 1
+        print(f"Error using shared rate limit bucket {self.key}, limiting per process: {str(error)}")
+        return self.fallback.try_acquire()
+
+
+class ProviderGovernor:
+    """Token bucket plus bounded concurrency with a FIFO wait queue for one provider/model"""
+
+    def __init__(self, provider, model):
+        self.provider = provider
+        self.model = model
+        limits = get_provider_limits(provider)
+        self.concurrency = max(1, limits["concurrency"])
+        rate = limits["rpm"] / 60.0
+        db_path = os.getenv("LLM_RATE_LIMIT_DB")
+        if db_path:
+            self.bucket = SQLiteTokenBucket(f"{provider}:{model}", rate, limits["burst"], db_path)
+        else:
+            self.bucket = TokenBucket(rate, limits["burst"])
+
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._in_flight = 0
+        self._next_ticket = 0
+
+        # Saturation metrics
+        self.total_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_queue_length = 0
+        self.rate_limited_responses = 0
+        self.timeouts = 0
+
+    def acquire(self, on_wait=None, timeout=None):
+        """Wait for a concurrency slot and a rate token; returns the seconds waited"""
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._queue.append(ticket)
+            self.max_queue_length = max(self.max_queue_length, len(self._queue))
+            last_position = None
+            try:
+                while self._queue[0] != ticket or self._in_flight >= self.concurrency:
+                    position = self._queue.index(ticket) + 1
+                    if on_wait and position != last_position:
+                        on_wait(position)
+                        last_position = position
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        self.timeouts += 1
+                        raise TimeoutError(f"Timed out waiting for {self.provider} capacity")
+                    self._condition.wait(remaining if remaining is not None else 1.0)
+            except BaseException:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+            # Head of the queue with a free slot: claim it, then wait for a rate token
+            self._queue.popleft()
+            self._in_flight += 1
+            self._condition.notify_all()
+
+        try:
+            while True:
+                wait = self.bucket.try_acquire()
+                if wait <= 0:
+                    break
+                if deadline and time.monotonic() + wait > deadline:
+                    self.timeouts += 1
+                    raise TimeoutError(f"Timed out waiting for {self.provider} rate limit")
+                if on_wait:
+                    on_wait(0)
+                time.sleep(min(wait, 5.0))
+        except BaseException:
+            self.release()
+            raise
+
+        waited = time.monotonic() - start
+        with self._condition:
+            self.total_requests += 1
+            self.total_wait_seconds += waited
+        return waited
+
+    def release(self):
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify_all()
+
+    def metrics(self):
+        with self._condition:
+            return {
+                "provider": self.provider,
+                "model": self.model,
+                "in_flight": self._in_flight,
+                "concurrency_limit": self.concurrency,
+                "queued": len(self._queue),
+                "max_queue_length": self.max_queue_length,
+                "saturation": round(self._in_flight / self.concurrency, 2),
+                "total_requests": self.total_requests,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.total_requests, 3) if self.total_requests else 0.0,
+                "rate_limited_responses": self.rate_limited_responses,
+                "timeouts": self.timeouts,
+                "shared_bucket_errors": getattr(self.bucket, "errors", 0),
+            }
+
+
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(provider, model):
+    """Get the process-wide governor for a provider/model pair"""
+    key = (provider, model)
+    governor = _governors.get(key)
+    if governor is None:
+        with _governors_lock:
+            governor = _governors.get(key)
+            if governor is None:
+                governor = ProviderGovernor(provider, model)
+                _governors[key] = governor
+    return governor
+
+
+def governed_call(provider, model, func, on_wait=None, timeout=None, retries=None):
+    """
+    Run func() under the provider's rate limit and concurrency cap
+
+    Provider 429/quota errors are retried with exponential backoff (LLM_RATE_LIMIT_RETRIES,
+    default 2) before being raised to the caller.
+    """
+    governor = get_governor(provider, model)
+    if timeout is None:
+        timeout = _env_number("LLM_QUEUE_TIMEOUT_SECONDS", 180)
+    if retries is None:
+        retries = int(_env_number("LLM_RATE_LIMIT_RETRIES", 2))
+
+    attempt = 0
+    while True:
+        governor.acquire(on_wait=on_wait, timeout=timeout)
+        try:
+            return func()
+        except Exception as e:
+            if not is_rate_limit_error(e):
+                raise
+            with governor._condition:
+                governor.rate_limited_responses += 1
+            if attempt >= retries:
+                raise
+        finally:
+            governor.release()
+        time.sleep(min(2 ** attempt, 30))
+        attempt += 1
+
+
+def get_governor_metrics():
+    """Saturation metrics for every provider/model governor in this process"""
+    with _governors_lock:
+        governors = list(_governors.values())
+    return [governor.metrics() for governor in governors]
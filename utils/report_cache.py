@@ -0,0 +1,245 @@
+"""
+Background PDF report rendering with cached artifacts
+
+Reports are rendered on a small worker pool as soon as an analysis is saved and
+kept in memory by a hash of the report inputs, so the download button serves the
+bytes as soon as they render; identical inputs are never rendered twice. Each
+report is also stored under REPORT_CACHE_DIR, keyed by analysis ID and content
+hash, with its size and generation time recorded in the report_artifacts table.
+For an analysis still in the write queue that happens once its ID is known, so
+downloads never wait on the database.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config.database import save_report_artifact, get_report_artifact
+from utils.report_renderer import render_report
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REPORT_WORKER_THREADS", "2")),
+    thread_name_prefix="pdf-report"
+)
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+_memory_bytes = 0
+_pending = {}
+_stats = {"rendered": 0, "cache_hits": 0, "failures": 0, "total_generation_ms": 0.0, "total_bytes": 0}
+
+
+def _cache_dir():
+    path = os.getenv("REPORT_CACHE_DIR", "report_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _max_memory_bytes():
+    try:
+        return int(os.getenv("REPORT_CACHE_MAX_MEMORY_MB", "64")) * 1024 * 1024
+    except ValueError:
+        return 64 * 1024 * 1024
+
+
+def report_content_hash(analysis_result, candidate_name, job_role):
+    """Hash of everything that determines the report's content"""
+    payload = json.dumps(
+        {"analysis": analysis_result, "candidate_name": candidate_name, "job_role": job_role},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _report_key(analysis_id, content_hash):
+    return f"{analysis_id if analysis_id is not None else 'adhoc'}-{content_hash[:16]}"
+
+
+def report_cache_path(analysis_id, content_hash):
+    """Disk location of a cached report"""
+    return os.path.join(_cache_dir(), f"{_report_key(analysis_id, content_hash)}.pdf")
+
+
+def write_report_file(path, pdf_bytes):
+    """Write a report atomically so readers never see a partial file"""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(temp_path, path)
+
+
+def _remember(content_hash, pdf_bytes):
+    global _memory_bytes
+    with _lock:
+        if content_hash in _memory:
+            _memory.move_to_end(content_hash)
+            return
+        _memory[content_hash] = pdf_bytes
+        _memory_bytes += len(pdf_bytes)
+        while _memory_bytes > _max_memory_bytes() and len(_memory) > 1:
+            _, evicted = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+
+
+def get_cached_report(analysis_id, content_hash):
+    """Cached PDF bytes for an analysis/content hash (memory, then disk), or None"""
+    with _lock:
+        pdf_bytes = _memory.get(content_hash)
+        if pdf_bytes is not None:
+            _memory.move_to_end(content_hash)
+    if pdf_bytes is None:
+        path = report_cache_path(analysis_id, content_hash)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            _remember(content_hash, pdf_bytes)
+    if pdf_bytes is not None:
+        with _lock:
+            _stats["cache_hits"] += 1
+    return pdf_bytes
+
+
+def _render(analysis_result, candidate_name, job_role, content_hash):
+    """Render a report (falling back to the simple layout) and keep it in memory; (bytes, ms)"""
+    start = time.perf_counter()
+    try:
+        pdf_bytes = render_report(analysis_result, candidate_name, job_role).getvalue()
+    except Exception as e:
+        print(f"Error rendering PDF report, using simple layout: {str(e)}")
+        pdf_bytes = render_report(analysis_result, candidate_name, job_role, simple=True).getvalue()
+    generation_ms = (time.perf_counter() - start) * 1000
+
+    _remember(content_hash, pdf_bytes)
+    with _lock:
+        _stats["rendered"] += 1
+        _stats["total_generation_ms"] += generation_ms
+        _stats["total_bytes"] += len(pdf_bytes)
+    return pdf_bytes, generation_ms
+
+
+def _store(analysis_id, content_hash, pdf_bytes, generation_ms, analysis_result, candidate_name, job_role):
+    """Write a rendered report to disk under its analysis id and record it in report_artifacts"""
+    path = report_cache_path(analysis_id, content_hash)
+    write_report_file(path, pdf_bytes)
+    save_report_artifact(analysis_id, content_hash, {
+        "file_path": path,
+        "size_bytes": len(pdf_bytes),
+        "generation_ms": round(generation_ms, 1),
+        "candidate_name": candidate_name,
+        "job_role": job_role,
+        "analysis_json": json.dumps(analysis_result, default=str),
+    })
+
+
+def render_and_store(analysis_id, analysis_result, candidate_name, job_role, content_hash=None):
+    """Render a report, cache it and record its metrics"""
+    content_hash = content_hash or report_content_hash(analysis_result, candidate_name, job_role)
+    pdf_bytes, generation_ms = _render(analysis_result, candidate_name, job_role, content_hash)
+    _store(analysis_id, content_hash, pdf_bytes, generation_ms, analysis_result, candidate_name, job_role)
+    return pdf_bytes
+
+
+def _submit(key, job):
+    """Run job on the pool unless an identical one (same key) is in flight; None on failure"""
+    def run():
+        try:
+            return job()
+        except Exception as e:
+            print(f"Error generating PDF report {key}: {str(e)}")
+            with _lock:
+                _stats["failures"] += 1
+            return None
+        finally:
+            with _lock:
+                _pending.pop(key, None)
+
+    with _lock:
+        # Identical requests in flight share one render
+        future = _pending.get(key)
+        if future is None:
+            future = _executor.submit(run)
+            _pending[key] = future
+    return future
+
+
+def _store_when_saved(analysis_future, rendered, content_hash, analysis_result, candidate_name, job_role):
+    """Store a queued analysis' report once both its id and its (bytes, ms) render are ready"""
+    stored = []
+
+    def store():
+        try:
+            if rendered.result() is not None:
+                _store(analysis_future.result(), content_hash, *rendered.result(),
+                       analysis_result, candidate_name, job_role)
+        except Exception as e:
+            # Downloads are served from memory either way
+            print(f"Error storing PDF report {content_hash[:16]}: {str(e)}")
+
+    def on_done(_):
+        with _lock:
+            if stored or not (analysis_future.done() and rendered.done()):
+                return
+            stored.append(True)
+        try:
+            # Off the write queue's flusher thread, which resolves the analysis id
+            _executor.submit(store)
+        except RuntimeError:
+            # The pool is shut down with the interpreter
+            pass
+
+    analysis_future.add_done_callback(on_done)
+    rendered.add_done_callback(on_done)
+
+
+def submit_report(analysis_id, analysis_result, candidate_name, job_role):
+    """
+    Start rendering a report in the background
+
+    analysis_id may be a Future of the id of a queued analysis: the report is served as
+    soon as it renders and stored under the id once the write queue commits it. Returns
+    (content_hash, future); the future resolves to the PDF bytes (or None on failure)
+    and is already done when the report is cached.
+    """
+    content_hash = report_content_hash(analysis_result, candidate_name, job_role)
+    queued = isinstance(analysis_id, Future)
+    cached = get_cached_report(None if queued else analysis_id, content_hash)
+
+    if not queued:
+        if cached is None:
+            return content_hash, _submit(
+                _report_key(analysis_id, content_hash),
+                lambda: render_and_store(analysis_id, analysis_result, candidate_name, job_role, content_hash)
+            )
+        future = Future()
+        future.set_result(cached)
+        return content_hash, future
+
+    if cached is None:
+        # Keyed on the content alone: the analysis has no id yet
+        rendered = _submit(content_hash, lambda: _render(analysis_result, candidate_name, job_role, content_hash))
+    else:
+        rendered = Future()
+        rendered.set_result((cached, 0.0))
+    _store_when_saved(analysis_id, rendered, content_hash, analysis_result, candidate_name, job_role)
+
+    future = Future()
+    rendered.add_done_callback(lambda done: future.set_result(done.result() and done.result()[0]))
+    return content_hash, future
+
+
+def get_report_stats():
+    """Render counts, cache hits, average generation time and size in this process"""
+    with _lock:
+        rendered = _stats["rendered"]
+        return {
+            "rendered": rendered,
+            "cache_hits": _stats["cache_hits"],
+            "failures": _stats["failures"],
+            "pending": len(_pending),
+            "avg_generation_ms": round(_stats["total_generation_ms"] / rendered, 1) if rendered else 0.0,
+            "avg_size_kb": round(_stats["total_bytes"] / rendered / 1024, 1) if rendered else 0.0,
+            "memory_cached": len(_memory),
+        }
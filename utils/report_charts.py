@@ -0,0 +1,196 @@
+"""
+Deterministic vector charts for the PDF reports
+
+Chart geometry depends only on the chart size and the integer score, so the static
+parts of each chart (ticks, scale labels, backgrounds) are built once per size and
+the score-dependent parts once per score bucket, then shared by every report as
+immutable reportlab Groups. Each call only wraps the cached groups in a new Drawing,
+and identical inputs always produce identical drawing operations.
+"""
+import math
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.graphics.shapes import Drawing, Group, Rect, String, Line, Wedge
+
+# Number of cached score buckets (one per integer score 0-100)
+SCORE_BUCKETS = 101
+
+
+def score_bucket(score):
+    """Clamp a score to an integer bucket 0-100"""
+    try:
+        score = int(round(float(score)))
+    except (TypeError, ValueError):
+        score = 0
+    return max(0, min(score, SCORE_BUCKETS - 1))
+
+
+def score_status(score):
+    """(color, status label) for a 0-100 score"""
+    if score >= 80:
+        return colors.green, "Excellent"
+    if score >= 60:
+        return colors.orange, "Good"
+    return colors.red, "Needs Improvement"
+
+
+def _polar(center_x, center_y, radius, score):
+    """Point on the gauge arc for a 0-100 score (0 on the left, 100 on the right)"""
+    angle = math.radians(180 - score * 1.8)
+    return center_x + radius * math.cos(angle), center_y + radius * math.sin(angle)
+
+
+class Circle(Rect):
+    """Filled circle as a rounded Rect (used for the gauge hub)"""
+
+    def __init__(self, cx, cy, r, **kw):
+        Rect.__init__(self, cx - r, cy - r, 2 * r, 2 * r, **kw)
+        self.rx = self.ry = r
+
+
+def _needle_gauge_center(width, height):
+    center_x = width / 2
+    center_y = height / 2 - 10
+    return center_x, center_y, min(center_x, center_y) - 10
+
+
+@lru_cache(maxsize=8)
+def _needle_gauge_background(width, height, label, font_regular, font_bold):
+    center_x, center_y, radius = _needle_gauge_center(width, height)
+    group = Group(Rect(0, 0, width, height, fillColor=colors.white, strokeColor=None))
+    for i in range(0, 101, 2):
+        x, y = _polar(center_x, center_y, radius, i)
+        end_x, end_y = _polar(center_x, center_y, radius + 5, i)
+        group.add(Line(x, y, end_x, end_y, strokeColor=colors.lightgrey, strokeWidth=2))
+    for i in range(0, 101, 20):
+        x, y = _polar(center_x, center_y, radius - 15, i)
+        group.add(String(x, y, str(i), fontSize=8, fillColor=colors.black,
+                         textAnchor='middle', fontName=font_regular))
+    if label:
+        group.add(String(center_x, height - 15, label, fontSize=12, fillColor=colors.darkblue,
+                         textAnchor='middle', fontName=font_bold))
+    return group
+
+
+@lru_cache(maxsize=8 * SCORE_BUCKETS)
+def _needle_gauge_score(width, height, bucket, font_regular, font_bold):
+    center_x, center_y, radius = _needle_gauge_center(width, height)
+    color, status = score_status(bucket)
+    score_x, score_y = _polar(center_x, center_y, radius, bucket)
+    return Group(
+        Line(center_x, center_y, score_x, score_y, strokeColor=color, strokeWidth=3),
+        Circle(center_x, center_y, 5, fillColor=color, strokeColor=None),
+        String(center_x, center_y - 25, str(bucket), fontSize=20, fillColor=color,
+               textAnchor='middle', fontName=font_bold),
+        String(center_x, center_y - 40, status, fontSize=12, fillColor=colors.black,
+               textAnchor='middle', fontName=font_regular),
+    )
+
+
+def needle_gauge(score, width=300, height=200, label="", font_regular="Helvetica", font_bold="Helvetica-Bold"):
+    """Needle gauge used by the full report"""
+    bucket = score_bucket(score)
+    drawing = Drawing(width, height)
+    drawing.add(_needle_gauge_background(width, height, label, font_regular, font_bold))
+    drawing.add(_needle_gauge_score(width, height, bucket, font_regular, font_bold))
+    return drawing
+
+
+def _arc_gauge_center(width, height):
+    center_x = width / 2
+    center_y = height / 2
+    return center_x, center_y, min(center_x, center_y) - 30
+
+
+@lru_cache(maxsize=8)
+def _arc_gauge_background(width, height):
+    center_x, center_y, radius = _arc_gauge_center(width, height)
+    return Group(Wedge(center_x, center_y, radius, 0, 180,
+                       fillColor=colors.lightgrey, strokeColor=colors.grey, strokeWidth=1))
+
+
+@lru_cache(maxsize=8)
+def _arc_gauge_scale(width, height, label, font_regular, font_bold):
+    center_x, center_y, radius = _arc_gauge_center(width, height)
+    group = Group()
+    for i in range(0, 101, 20):
+        x, y = _polar(center_x, center_y, radius, i)
+        x2, y2 = _polar(center_x, center_y, radius - 5, i)
+        group.add(Line(x, y, x2, y2, strokeColor=colors.black, strokeWidth=1))
+        num_x, num_y = _polar(center_x, center_y, radius - 15, i)
+        group.add(String(num_x, num_y, str(i), fontSize=8, fillColor=colors.black,
+                         textAnchor='middle', fontName=font_regular))
+    group.add(String(center_x, height - 20, label, fontSize=14, fillColor=colors.darkblue,
+                     textAnchor='middle', fontName=font_bold))
+    return group
+
+
+@lru_cache(maxsize=8 * SCORE_BUCKETS)
+def _arc_gauge_score(width, height, bucket, font_regular, font_bold):
+    center_x, center_y, radius = _arc_gauge_center(width, height)
+    color, status = score_status(bucket)
+    group = Group()
+    if bucket > 0:
+        # Filled from the left end of the arc clockwise to the score
+        group.add(Wedge(center_x, center_y, radius, 180 - bucket * 1.8, 180,
+                        fillColor=color, strokeColor=None))
+    group.add(String(center_x, center_y - 15, str(bucket), fontSize=24, fillColor=color,
+                     textAnchor='middle', fontName=font_bold))
+    group.add(String(center_x, center_y - 35, status, fontSize=12, fillColor=color,
+                     textAnchor='middle', fontName=font_regular))
+    return group
+
+
+def arc_gauge(score, width=300, height=200, label="Resume Score", font_regular="Helvetica", font_bold="Helvetica-Bold"):
+    """Filled semi-circle gauge used by the simple report"""
+    bucket = score_bucket(score)
+    drawing = Drawing(width, height)
+    drawing.add(_arc_gauge_background(width, height))
+    drawing.add(_arc_gauge_score(width, height, bucket, font_regular, font_bold))
+    drawing.add(_arc_gauge_scale(width, height, label, font_regular, font_bold))
+    return drawing
+
+
+BAR_HEIGHT = 16
+BAR_GAP = 10
+BAR_LABEL_WIDTH = 110
+BAR_VALUE_WIDTH = 40
+
+
+@lru_cache(maxsize=32)
+def _bar_track(width, labels, font_regular):
+    track_width = width - BAR_LABEL_WIDTH - BAR_VALUE_WIDTH
+    height = len(labels) * (BAR_HEIGHT + BAR_GAP)
+    group = Group()
+    for row, label in enumerate(labels):
+        y = height - (row + 1) * (BAR_HEIGHT + BAR_GAP) + BAR_GAP / 2
+        group.add(String(0, y + 4, label, fontSize=10, fillColor=colors.black, fontName=font_regular))
+        group.add(Rect(BAR_LABEL_WIDTH, y, track_width, BAR_HEIGHT,
+                       fillColor=colors.whitesmoke, strokeColor=colors.lightgrey, strokeWidth=0.5))
+    return group
+
+
+@lru_cache(maxsize=4 * SCORE_BUCKETS)
+def _bar_fill(width, y, bucket, font_bold):
+    track_width = width - BAR_LABEL_WIDTH - BAR_VALUE_WIDTH
+    color, _ = score_status(bucket)
+    group = Group()
+    if bucket > 0:
+        group.add(Rect(BAR_LABEL_WIDTH, y, track_width * bucket / 100, BAR_HEIGHT,
+                       fillColor=color, strokeColor=None))
+    group.add(String(width, y + 4, str(bucket), fontSize=10, fillColor=color,
+                     textAnchor='end', fontName=font_bold))
+    return group
+
+
+def score_bars(scores, width=400, font_regular="Helvetica", font_bold="Helvetica-Bold"):
+    """Horizontal 0-100 bars comparing (label, score) pairs, one row each"""
+    labels = tuple(label for label, _ in scores)
+    height = len(labels) * (BAR_HEIGHT + BAR_GAP)
+    drawing = Drawing(width, height)
+    drawing.add(_bar_track(width, labels, font_regular))
+    for row, (_, score) in enumerate(scores):
+        y = height - (row + 1) * (BAR_HEIGHT + BAR_GAP) + BAR_GAP / 2
+        drawing.add(_bar_fill(width, y, score_bucket(score), font_bold))
+    return drawing
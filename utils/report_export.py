@@ -0,0 +1,168 @@
+"""
+Bulk PDF report export for a date range
+
+Reports for every AI analysis in the range are rendered on a process pool into the
+report cache (utils.report_cache) and streamed from disk into a ZIP file one entry at
+a time, so memory use does not grow with the number of reports. Reports already in
+the cache are reused rather than rendered again, which also makes an interrupted
+export resumable: running it again only renders what is missing.
+
+An analysis renders from the inputs of its latest recorded report, or else from its
+saved analysis text, score and model. Analyses with neither (saved before analysis
+text was stored, never rendered) are counted as unavailable. Each report's inputs
+are loaded only when its render is submitted.
+
+    python -m utils.report_export --start 2026-10-01 --end 2026-10-19 --output reports.zip
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from config.database import get_report_sources, get_report_input, save_report_artifact
+from utils.report_cache import report_cache_path, report_content_hash, write_report_file
+from utils.report_renderer import render_report
+
+SAFE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def _render_to_file(path, analysis_result, candidate_name, job_role):
+    """Process pool worker: render one report into the cache unless it is already there"""
+    if os.path.exists(path):
+        return {"path": path, "rendered": False}
+    start = time.perf_counter()
+    try:
+        pdf_bytes = render_report(analysis_result, candidate_name, job_role).getvalue()
+    except Exception:
+        pdf_bytes = render_report(analysis_result, candidate_name, job_role, simple=True).getvalue()
+    write_report_file(path, pdf_bytes)
+    return {
+        "path": path,
+        "rendered": True,
+        "size_bytes": len(pdf_bytes),
+        "generation_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+def report_entry_name(source):
+    """Archive name for a report: date, analysis ID, candidate and role"""
+    parts = [
+        str(source["created_at"])[:10],
+        str(source["analysis_id"]),
+        source.get("candidate_name") or "Candidate",
+        source.get("job_role") or "report",
+    ]
+    return SAFE_NAME_PATTERN.sub("_", "_".join(parts)).strip("_") + ".pdf"
+
+
+def export_reports_zip(start_date, end_date, output_path, max_workers=None, on_progress=None):
+    """
+    Render and archive the reports of every analysis created between two dates (inclusive)
+
+    on_progress(done, total) is called in the calling thread after each report. Returns a
+    summary dict with the archive path and counts of rendered, reused, unavailable and
+    failed reports.
+    """
+    sources = get_report_sources(start_date, end_date)
+    jobs = [source for source in sources if source["available"]]
+    summary = {
+        "path": output_path,
+        "analyses": len(sources),
+        "reports": 0,
+        "rendered": 0,
+        "reused": 0,
+        "unavailable": len(sources) - len(jobs),
+        "failed": 0,
+    }
+    total = len(jobs)
+    if on_progress:
+        on_progress(0, total)
+
+    max_workers = max_workers or int(os.getenv("REPORT_EXPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Keep a bounded number of renders in flight so finished reports are archived as they arrive
+    window = max(1, max_workers * 2)
+    temp_path = f"{output_path}.tmp"
+
+    # spawn avoids forking the app's threads (Streamlit, LLM and report pools) into the workers
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool, \
+            zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        pending = []
+        next_job = 0
+        done = 0
+        while next_job < total or pending:
+            while next_job < total and len(pending) < window:
+                source = jobs[next_job]
+                next_job += 1
+                candidate_name = source["candidate_name"] or "Candidate"
+                try:
+                    analysis_result = get_report_input(source)
+                except Exception as e:
+                    # Counted as failed with the renders
+                    future = Future()
+                    future.set_exception(e)
+                    pending.append((source, None, candidate_name, None, future))
+                    continue
+                content_hash = source["content_hash"] or report_content_hash(
+                    analysis_result, candidate_name, source["job_role"])
+                path = report_cache_path(source["analysis_id"], content_hash)
+                future = pool.submit(_render_to_file, path, analysis_result, candidate_name, source["job_role"])
+                pending.append((source, analysis_result, candidate_name, content_hash, future))
+
+            source, analysis_result, candidate_name, content_hash, future = pending.pop(0)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error rendering report for analysis {source['analysis_id']}: {str(e)}")
+                summary["failed"] += 1
+            else:
+                archive.write(result["path"], arcname=report_entry_name(source))
+                summary["reports"] += 1
+                if result["rendered"]:
+                    summary["rendered"] += 1
+                    save_report_artifact(source["analysis_id"], content_hash, {
+                        "file_path": result["path"],
+                        "size_bytes": result["size_bytes"],
+                        "generation_ms": result["generation_ms"],
+                        "candidate_name": candidate_name,
+                        "job_role": source["job_role"],
+                        "analysis_json": json.dumps(analysis_result, default=str),
+                    })
+                else:
+                    summary["reused"] += 1
+
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+
+    os.replace(temp_path, output_path)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the PDF reports of all analyses in a date range as a ZIP")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, required=True, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="last day (YYYY-MM-DD, default today)")
+    parser.add_argument("--output", default="reports.zip")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} reports", end="", flush=True)
+
+    summary = export_reports_zip(args.start, args.end, args.output, args.workers, on_progress=progress)
+    print()
+    print(
+        f"Wrote {summary['reports']} reports to {summary['path']} "
+        f"({summary['rendered']} rendered, {summary['reused']} reused, "
+        f"{summary['unavailable']} without report data, {summary['failed']} failed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
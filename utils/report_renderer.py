@@ -0,0 +1,492 @@
+"""
+Module-level PDF report renderer for AI resume analyses
+
+Styles, table styles, fonts and regexes are built once at import (chart geometry is
+cached in utils.report_charts), so rendering a report only builds the content
+flowables. The renderer has no Streamlit dependency and can run in worker threads or
+processes. Output is byte-identical for identical input: the report date comes from
+the input and the PDF is written in reportlab's invariant mode.
+"""
+import datetime
+import hashlib
+import io
+import os
+import re
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+from utils.analysis_parser import (
+    clean_markdown, parse_analysis_sections, extract_list_items, extract_skill_items
+)
+from utils.report_charts import needle_gauge, arc_gauge, score_bars
+
+
+def register_report_fonts():
+    """
+    Register REPORT_FONT_REGULAR/REPORT_FONT_BOLD TrueType fonts once per process
+
+    Returns the (regular, bold) font names; the built-in Helvetica fonts are used when no
+    font files are configured or they cannot be loaded.
+    """
+    regular_path = os.getenv("REPORT_FONT_REGULAR")
+    bold_path = os.getenv("REPORT_FONT_BOLD") or regular_path
+    if not regular_path:
+        return "Helvetica", "Helvetica-Bold"
+    try:
+        pdfmetrics.registerFont(TTFont("ReportRegular", regular_path))
+        pdfmetrics.registerFont(TTFont("ReportBold", bold_path))
+        return "ReportRegular", "ReportBold"
+    except Exception as e:
+        print(f"Error registering report fonts: {str(e)}")
+        return "Helvetica", "Helvetica-Bold"
+
+
+FONT_REGULAR, FONT_BOLD = register_report_fonts()
+
+# Score extraction patterns, tried in order
+RESUME_SCORE_PATTERNS = [
+    re.compile(r'Resume Score:\s*(\d{1,3})/100'),
+    re.compile(r'\bResume Score:\s*(\d{1,3})\b'),
+]
+NUMBER_PATTERN = re.compile(r'\b(\d{1,3})\b')
+
+_sample_styles = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'Title',
+    parent=_sample_styles['Heading1'],
+    fontName=FONT_BOLD,
+    fontSize=20,
+    textColor=colors.darkblue,
+    spaceAfter=12,
+    alignment=1  # Center alignment
+)
+
+SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=_sample_styles['Heading2'],
+    fontName=FONT_BOLD,
+    fontSize=14,
+    textColor=colors.darkblue,
+    spaceAfter=12,
+    alignment=1  # Center alignment
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'Heading',
+    parent=_sample_styles['Heading2'],
+    fontName=FONT_BOLD,
+    fontSize=14,
+    textColor=colors.white,
+    spaceAfter=6,
+    backColor=colors.darkblue,
+    borderWidth=1,
+    borderColor=colors.grey,
+    borderPadding=5,
+    borderRadius=5,
+    alignment=1  # Center alignment
+)
+
+SUBHEADING_STYLE = ParagraphStyle(
+    'SubHeading',
+    parent=_sample_styles['Heading3'],
+    fontName=FONT_BOLD,
+    fontSize=12,
+    textColor=colors.darkblue,
+    spaceAfter=6
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'Normal',
+    parent=_sample_styles['Normal'],
+    fontName=FONT_REGULAR,
+    fontSize=10,
+    spaceAfter=6,
+    leading=14  # Line spacing
+)
+
+LIST_ITEM_STYLE = ParagraphStyle(
+    'ListItem',
+    parent=NORMAL_STYLE,
+    leftIndent=20,
+    firstLineIndent=-15,
+    spaceBefore=2,
+    spaceAfter=2
+)
+
+INFO_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
+    ('FONTNAME', (1, 0), (-1, -1), FONT_REGULAR),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+SIMPLE_MODEL_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
+    ('FONTNAME', (1, 0), (-1, -1), FONT_REGULAR),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
+])
+
+SCORE_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (0, 0), FONT_BOLD),
+    ('FONTSIZE', (0, 0), (0, 0), 14),
+    ('TEXTCOLOR', (0, 0), (0, 0), colors.darkblue),
+    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
+])
+
+STRENGTHS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.lightgreen),
+    ('BACKGROUND', (1, 0), (1, 0), colors.salmon),
+    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+    ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (1, 0), FONT_BOLD),
+    ('FONTSIZE', (0, 0), (1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (1, 0), 10),
+    ('GRID', (0, 0), (1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+SKILLS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (1, 0), colors.lightgreen),
+    ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+])
+
+COURSE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
+    ('ALIGN', (0, 0), (0, 0), 'CENTER'),  # Center the header
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),   # Left-align the content
+    ('FONTNAME', (0, 0), (0, 0), FONT_BOLD),
+    ('FONTSIZE', (0, 0), (0, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (0, 0), 10),
+    ('GRID', (0, 0), (0, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (0, -1), 'TOP'),
+])
+
+ROLE_COURSE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (0, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), FONT_REGULAR),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+# Sections included under "Detailed Analysis" (Overall Assessment is in the executive summary)
+DETAILED_SECTIONS = [
+    "Professional Profile Analysis",
+    "Skills Analysis",
+    "Experience Analysis",
+    "Education Analysis",
+    "ATS Optimization Assessment",
+    "Role Alignment Analysis",
+    "Job Match Analysis"
+]
+
+# Fallback course suggestions when the analysis has none, keyed by role keywords
+ROLE_COURSES = [
+    (("data", "scientist", "analyst"), [
+        "Data Science Specialization (Coursera/edX)",
+        "Machine Learning (Coursera/edX)",
+        "Deep Learning Specialization (Coursera)",
+        "Big Data Technologies (Cloud Provider Certifications)",
+        "Statistical Modeling and Inference",
+        "Data Visualization with Tableau/Power BI"
+    ]),
+    (("developer", "engineer", "programming"), [
+        "Full Stack Web Development (Udemy/Coursera)",
+        "Cloud Certifications (AWS/Azure/GCP)",
+        "DevOps and CI/CD Pipelines",
+        "Software Architecture and Design Patterns",
+        "Agile and Scrum Methodologies",
+        "Mobile App Development"
+    ]),
+    (("security", "cyber"), [
+        "Certified Information Systems Security Professional (CISSP)",
+        "Certified Ethical Hacker (CEH)",
+        "CompTIA Security+",
+        "Offensive Security Certified Professional (OSCP)",
+        "Cloud Security Certifications",
+        "Security Operations and Incident Response"
+    ]),
+]
+GENERIC_COURSES = [
+    "LinkedIn Learning - Professional Skills Development",
+    "Coursera - Career Development Specialization",
+    "Udemy - Job Interview Skills Training",
+    "Project Management Professional (PMP)",
+    "Leadership and Management Skills",
+    "Technical Writing and Communication"
+]
+
+
+def resolve_resume_score(analysis_result, analysis_text):
+    """Resume score from the structured result, falling back to the analysis text (0-100)"""
+    resume_score = analysis_result.get("score", 0) or analysis_result.get("resume_score", 0)
+    if not resume_score and "Resume Score:" in analysis_text:
+        for pattern in RESUME_SCORE_PATTERNS:
+            match = pattern.search(analysis_text)
+            if match:
+                resume_score = int(match.group(1))
+                break
+        else:
+            # Any number on the "Resume Score:" line
+            score_line = analysis_text.split("Resume Score:")[1].split("\n")[0].strip()
+            match = NUMBER_PATTERN.search(score_line)
+            if match:
+                resume_score = int(match.group(1))
+
+    resume_score = int(resume_score) if resume_score else 0
+    return max(0, min(resume_score, 100))
+
+
+def role_specific_courses(job_role):
+    """Generic course suggestions for a role when the analysis recommends none"""
+    role = (job_role or "").lower()
+    for keywords, courses in ROLE_COURSES:
+        if any(keyword in role for keyword in keywords):
+            return courses
+    return GENERIC_COURSES
+
+
+def bullet_paragraph(text, style=LIST_ITEM_STYLE):
+    return Paragraph(f"• {clean_markdown(text)}", style)
+
+
+def append_detailed_analysis(content, analysis_text, normal_style=NORMAL_STYLE, list_item_style=LIST_ITEM_STYLE,
+                             subheading_style=SUBHEADING_STYLE, heading_style=HEADING_STYLE):
+    """Append the "Detailed Analysis" section, with special handling for skills and ATS"""
+    sections = parse_analysis_sections(analysis_text)
+
+    content.append(Paragraph("Detailed Analysis", heading_style))
+    content.append(Spacer(1, 0.1*inch))
+
+    for _, section_title, section_content in sections.items():
+        if section_title not in DETAILED_SECTIONS:
+            continue
+
+        content.append(Paragraph(section_title, subheading_style))
+        content.append(Spacer(1, 0.1*inch))
+
+        if section_title == "Skills Analysis":
+            current_skills = extract_skill_items(sections.get("Current Skills"))
+            missing_skills = extract_skill_items(sections.get("Missing Skills"))
+
+            if current_skills or missing_skills:
+                max_len = max(len(current_skills), len(missing_skills))
+                data = [["Current Skills", "Missing Skills"]]
+                for i in range(max_len):
+                    data.append([
+                        Paragraph(current_skills[i] if i < len(current_skills) else "", normal_style),
+                        Paragraph(missing_skills[i] if i < len(missing_skills) else "", normal_style)
+                    ])
+                table = Table(data, colWidths=[3*inch, 3*inch])
+                table.setStyle(SKILLS_TABLE_STYLE)
+                content.append(table)
+        elif section_title == "ATS Optimization Assessment":
+            ats_score_line = ""
+            ats_content = []
+            for line in section_content.split("\n"):
+                if "ATS Score:" in line:
+                    ats_score_line = clean_markdown(line)
+                elif line.strip():
+                    if line.strip().startswith(("-", "*", "•")):
+                        ats_content.append("• " + clean_markdown(line.strip()[1:].strip()))
+                    else:
+                        ats_content.append(clean_markdown(line))
+
+            if ats_score_line:
+                content.append(Paragraph(ats_score_line, normal_style))
+                content.append(Spacer(1, 0.1*inch))
+            for para in ats_content:
+                content.append(Paragraph(para, list_item_style if para.startswith("• ") else normal_style))
+        else:
+            for para in section_content.split("\n"):
+                if para.strip():
+                    if para.strip().startswith(("-", "*", "•")):
+                        content.append(Paragraph("• " + clean_markdown(para.strip()[1:].strip()), list_item_style))
+                    else:
+                        content.append(Paragraph(clean_markdown(para), normal_style))
+
+        content.append(Spacer(1, 0.2*inch))
+
+    return content
+
+
+def _strengths_table(strengths, weaknesses):
+    if strengths or weaknesses:
+        data = [["Key Strengths", "Areas for Improvement"]]
+        for i in range(max(len(strengths), len(weaknesses), 1)):
+            data.append([
+                bullet_paragraph(strengths[i]) if i < len(strengths) else "",
+                bullet_paragraph(weaknesses[i]) if i < len(weaknesses) else ""
+            ])
+    else:
+        data = [
+            ["Key Strengths", "Areas for Improvement"],
+            [
+                Paragraph("No specific strengths identified in the analysis.", NORMAL_STYLE),
+                Paragraph("No specific areas for improvement identified in the analysis.", NORMAL_STYLE)
+            ]
+        ]
+    table = Table(data, colWidths=[3*inch, 3*inch])
+    table.setStyle(STRENGTHS_TABLE_STYLE)
+    return table
+
+
+def _course_flowables(course_recommendations, job_role):
+    flowables = [Paragraph("Recommended Courses & Certifications", SUBHEADING_STYLE)]
+    if course_recommendations:
+        data = [["Recommended Courses & Certifications"]]
+        data.extend([bullet_paragraph(course)] for course in course_recommendations)
+        table = Table(data, colWidths=[6*inch])
+        table.setStyle(COURSE_TABLE_STYLE)
+    else:
+        flowables.append(Paragraph(
+            "Based on your resume and target role, consider the following types of courses and certifications:",
+            NORMAL_STYLE))
+        flowables.append(Spacer(1, 0.1*inch))
+        table = Table([[bullet_paragraph(course)] for course in role_specific_courses(job_role)],
+                      colWidths=[6*inch])
+        table.setStyle(ROLE_COURSE_TABLE_STYLE)
+    flowables.append(table)
+    return flowables
+
+
+def report_date(analysis_result):
+    """Report date from the analysis ("generated_on": date, datetime or ISO string), else today"""
+    value = analysis_result.get("generated_on")
+    if isinstance(value, str):
+        try:
+            value = datetime.date.fromisoformat(value[:10])
+        except ValueError:
+            value = None
+    if not isinstance(value, datetime.date):
+        value = datetime.date.today()
+    return value.strftime('%B %d, %Y')
+
+
+def default_candidate_name(analysis_text):
+    """Stable "Candidate_NNNN" name derived from the analysis text"""
+    digest = hashlib.sha256((analysis_text or "").encode("utf-8")).hexdigest()
+    return f"Candidate_{1000 + int(digest[:8], 16) % 9000}"
+
+
+def build_report_story(analysis_result, candidate_name, job_role, simple=False):
+    """Build the report flowables; simple selects the arc gauge used by the fallback report"""
+    analysis_text = analysis_result.get("full_response", "") or analysis_result.get("analysis", "")
+    sections = parse_analysis_sections(analysis_text)
+
+    strengths = analysis_result.get("strengths", []) or extract_list_items(
+        sections.get("Key Strengths"), include_colon_lines=True)
+    weaknesses = analysis_result.get("weaknesses", []) or extract_list_items(
+        sections.get("Areas for Improvement"), include_colon_lines=True)
+    resume_score = resolve_resume_score(analysis_result, analysis_text)
+    model_used = analysis_result.get("model_used", "AI")
+
+    # Format candidate name - if it's just "Candidate", add a number
+    if not candidate_name or candidate_name.strip() == "" or candidate_name.lower() == "candidate":
+        candidate_name = default_candidate_name(analysis_text)
+
+    content = [
+        Paragraph("Resume Analysis Report", TITLE_STYLE),
+        Paragraph(f"Generated on {report_date(analysis_result)}", SUBTITLE_STYLE),
+        Spacer(1, 0.25*inch),
+    ]
+
+    info_table = Table([
+        ["Candidate:", candidate_name],
+        ["Target Role:", job_role if job_role else "Not specified"]
+    ], colWidths=[1.5*inch, 5*inch])
+    info_table.setStyle(INFO_TABLE_STYLE)
+    content += [info_table, Spacer(1, 0.25*inch)]
+
+    if simple:
+        model_table = Table([["Analysis performed by:   ", "", model_used]],
+                            colWidths=[3.5*inch, 1*inch, 5*inch])
+        model_table.setStyle(SIMPLE_MODEL_TABLE_STYLE)
+        gauge = arc_gauge(resume_score, width=300, height=200, label="Resume Score",
+                          font_regular=FONT_REGULAR, font_bold=FONT_BOLD)
+    else:
+        model_table = Table([["Analysis performed by:", model_used]], colWidths=[1.9*inch, 5*inch])
+        model_table.setStyle(INFO_TABLE_STYLE)
+        gauge = needle_gauge(resume_score, width=300, height=200, label="Resume Score",
+                             font_regular=FONT_REGULAR, font_bold=FONT_BOLD)
+    content += [model_table, Spacer(1, 0.25*inch)]
+
+    # Score gauge
+    content += [Paragraph("Resume Evaluation", HEADING_STYLE), Spacer(1, 0.1*inch)]
+    score_table = Table([["Resume Score"], [gauge]], colWidths=[6*inch])
+    score_table.setStyle(SCORE_TABLE_STYLE)
+    content += [score_table, Spacer(1, 0.25*inch)]
+
+    ats_score = analysis_result.get("ats_score")
+    if ats_score and not simple:
+        content += [
+            score_bars([("Resume Score", resume_score), ("ATS Score", ats_score)], width=400,
+                       font_regular=FONT_REGULAR, font_bold=FONT_BOLD),
+            Spacer(1, 0.25*inch),
+        ]
+
+    # Executive summary
+    content += [
+        Paragraph("Executive Summary", HEADING_STYLE),
+        Spacer(1, 0.1*inch),
+        Paragraph(clean_markdown(sections.get("Overall Assessment")), NORMAL_STYLE),
+        Spacer(1, 0.2*inch),
+        Paragraph("Key Strengths and Areas for Improvement", SUBHEADING_STYLE),
+        Spacer(1, 0.1*inch),
+        _strengths_table(strengths, weaknesses),
+        Spacer(1, 0.25*inch),
+    ]
+
+    append_detailed_analysis(content, analysis_text)
+
+    course_recommendations = analysis_result.get("suggestions", []) or extract_list_items(
+        sections.get("Recommended Courses"), include_colon_lines=True)
+    content += _course_flowables(course_recommendations, job_role)
+    content.append(Spacer(1, 0.2*inch))
+    return content
+
+
+def render_report(analysis_result, candidate_name, job_role, simple=False):
+    """Render the analysis report; returns a BytesIO positioned at the start"""
+    buffer = io.BytesIO()
+    # invariant fixes the creation date and document ID so identical input gives identical bytes
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            leftMargin=0.5*inch, rightMargin=0.5*inch,
+                            topMargin=0.5*inch, bottomMargin=0.5*inch,
+                            invariant=1)
+    generated_on = f"Generated on: {report_date(analysis_result)}"
+
+    def add_page_number(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(FONT_REGULAR, 9)
+        canvas.drawRightString(7.5*inch, 0.25*inch, f"Page {canvas.getPageNumber()}")
+        canvas.drawString(0.5*inch, 0.25*inch, generated_on)
+        canvas.restoreState()
+
+    story = build_report_story(analysis_result, candidate_name, job_role, simple=simple)
+    doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+    buffer.seek(0)
+    return buffer
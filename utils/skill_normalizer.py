@@ -0,0 +1,77 @@
+"""
+Skill normalization for the resume_skills table
+
+Resumes store skills as the str() of a list (analyzer) or of a dict of lists keyed
+by skill type (builder). These helpers turn either form, or plain comma separated
+text, into clean de-duplicated skill names with the dashboard category of each, so
+skills are split and categorized once when a resume is saved instead of on every
+dashboard load.
+"""
+import ast
+import re
+
+# Checked in order; the first category with a matching keyword wins
+SKILL_CATEGORIES = [
+    ("Programming", ("python", "java", "javascript", "c++", "programming")),
+    ("Database", ("sql", "database", "mongodb")),
+    ("Cloud", ("aws", "cloud", "azure")),
+    ("Management", ("agile", "scrum", "management")),
+]
+DEFAULT_CATEGORY = "Other"
+
+MAX_SKILL_LENGTH = 100
+WHITESPACE_PATTERN = re.compile(r'\s+')
+STRIP_CHARS = "[]{}\"'`*•-:;, \t\n"
+
+
+def categorize_skill(name):
+    """Dashboard category for a skill name"""
+    lowered = name.lower()
+    for category, keywords in SKILL_CATEGORIES:
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def normalize_skill(name):
+    """Trimmed, whitespace-collapsed skill name, or None when nothing usable is left"""
+    name = WHITESPACE_PATTERN.sub(" ", str(name)).strip(STRIP_CHARS)
+    if not name or len(name) > MAX_SKILL_LENGTH:
+        return None
+    return name
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _flatten(item)
+    elif isinstance(value, str):
+        yield from value.split(",")
+    elif value is not None:
+        yield str(value)
+
+
+def parse_skills(value):
+    """Skill names from a list, a dict of lists, their str() form or comma separated text"""
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in "[{(":
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                pass
+    return list(_flatten(value))
+
+
+def skill_rows(value):
+    """(skill_name, skill_category) pairs, de-duplicated case-insensitively in input order"""
+    rows, seen = [], set()
+    for raw in parse_skills(value):
+        name = normalize_skill(raw)
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            rows.append((name, categorize_skill(name)))
+    return rows
@@ -0,0 +1,108 @@
+"""
+Two-tier resume analysis: an instant rule-based result, refined by the LLM in the background
+
+The rule-based ResumeAnalyzer produces an ATS score, keyword match and section
+suggestions in milliseconds, so the AI Analyzer can render those immediately while
+the LLM analysis runs on a shared worker pool.
+"""
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.analysis_parser import parse_analysis_sections, extract_list_items
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_WORKER_THREADS", "8")),
+    thread_name_prefix="llm-analysis"
+)
+
+
+class TieredAnalysisJob:
+    """Rule-based result available immediately plus a pending LLM refinement"""
+
+    def __init__(self, quick_result):
+        self.job_id = uuid.uuid4().hex
+        self.quick_result = quick_result
+        self.queue_position = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    def on_wait(self, position):
+        # Called from the worker thread; the UI thread polls queue_position
+        self.queue_position = position
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        """Merged rule-based + LLM result (blocks until the LLM finishes)"""
+        return self.future.result(timeout=timeout)
+
+    def wait(self, on_progress=None, poll_interval=0.25):
+        """Block until the LLM result is ready, reporting queue position changes"""
+        last_position = None
+        while not self.future.done():
+            if on_progress and self.queue_position != last_position:
+                last_position = self.queue_position
+                on_progress(last_position)
+            time.sleep(poll_interval)
+        return self.future.result()
+
+
+def run_quick_analysis(rule_analyzer, resume_text, role_info):
+    """Rule-based ATS score, keyword match and suggestions (milliseconds)"""
+    return rule_analyzer.analyze_resume({'raw_text': resume_text}, role_info or {})
+
+
+def run_llm_analysis(ai_analyzer, resume_text, job_role, model, job_description=None, on_wait=None):
+    """Run the LLM analysis on the selected model's provider backend"""
+    if model not in ai_analyzer.available_models:
+        model = "Google Gemini"
+    return ai_analyzer.analyze_resume_with_model(
+        resume_text, model, job_role=job_role, job_description=job_description, on_wait=on_wait)
+
+
+def merge_analysis(quick_result, llm_result):
+    """Merge the LLM's refined strengths/weaknesses into the rule-based result"""
+    merged = dict(llm_result or {})
+    quick_result = quick_result or {}
+
+    sections = parse_analysis_sections(merged.get("analysis", ""))
+    if not merged.get("strengths"):
+        merged["strengths"] = extract_list_items(sections.get("Key Strengths"))
+    if not merged.get("weaknesses"):
+        merged["weaknesses"] = extract_list_items(sections.first("Areas for Improvement", "Recommendations"))
+
+    merged["rule_based"] = {
+        "ats_score": quick_result.get("ats_score", 0),
+        "keyword_match": quick_result.get("keyword_match", {}),
+        "format_score": quick_result.get("format_score", 0),
+        "section_score": quick_result.get("section_score", 0),
+        "suggestions": quick_result.get("suggestions", []),
+    }
+    # The rule-based ATS score stays under rule_based; copying it into "ats_score" would save
+    # it as the AI's score. Pages that only display a score may fall back to it.
+    return merged
+
+
+def start_tiered_analysis(rule_analyzer, ai_analyzer, resume_text, role_info, job_role, model, job_description=None):
+    """Compute the rule-based tier now and submit the LLM tier to the worker pool"""
+    job = TieredAnalysisJob(run_quick_analysis(rule_analyzer, resume_text, role_info))
+
+    def refine():
+        try:
+            llm_result = run_llm_analysis(
+                ai_analyzer, resume_text, job_role, model, job_description, on_wait=job.on_wait)
+            if not llm_result or "error" in llm_result:
+                return llm_result or {"error": "Analysis failed: empty response"}
+            return merge_analysis(job.quick_result, llm_result)
+        except Exception as e:
+            return {"error": f"Analysis failed: {str(e)}"}
+        finally:
+            job.finished_at = time.time()
+
+    job.future = _executor.submit(refine)
+    return job
+